@@ -0,0 +1,50 @@
+"""partial indexes for queue backlog metrics
+
+Revision ID: 38c291325424
+Revises: 83146c58f3e9
+Create Date: 2026-10-19 16:40:27.913604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '38c291325424'
+down_revision: Union[str, Sequence[str], None] = '83146c58f3e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_provisioning_tasks_pending_created_at',
+        'provisioning_tasks',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        'ix_billing_cycles_open_due_date',
+        'billing_cycles',
+        ['due_date'],
+        unique=False,
+        postgresql_where=sa.text("status NOT IN ('PAID', 'CANCELLED')"),
+    )
+    op.create_index(
+        'ix_email_logs_draft_created_at',
+        'email_logs',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'DRAFT'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_logs_draft_created_at', table_name='email_logs')
+    op.drop_index('ix_billing_cycles_open_due_date', table_name='billing_cycles')
+    op.drop_index('ix_provisioning_tasks_pending_created_at', table_name='provisioning_tasks')
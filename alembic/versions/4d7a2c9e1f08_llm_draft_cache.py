@@ -0,0 +1,40 @@
+"""llm draft cache
+
+Revision ID: 4d7a2c9e1f08
+Revises: 9e4b1f2c7d35
+Create Date: 2026-10-19 19:05:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d7a2c9e1f08'
+down_revision: Union[str, Sequence[str], None] = '9e4b1f2c7d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('llm_draft_cache',
+    sa.Column('key_hash', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('template', sa.String(length=100), nullable=False),
+    sa.Column('prompt_hash', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('body_hash', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['body_hash'], ['email_bodies.hash'], ),
+    sa.ForeignKeyConstraint(['prompt_hash'], ['email_bodies.hash'], ),
+    sa.PrimaryKeyConstraint('key_hash')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('llm_draft_cache')
@@ -0,0 +1,45 @@
+"""document number counters
+
+Revision ID: 5c2e8f4a1d93
+Revises: e3a91c5f7b20
+Create Date: 2026-10-19 22:12:40.518263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8f4a1d93'
+down_revision: Union[str, Sequence[str], None] = 'e3a91c5f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_counters',
+    sa.Column('prefix', sa.String(length=20), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('prefix', 'year')
+    )
+    # Lanjutkan dari nomor quotation yang sudah ada (format PREFIX/YYYY/NNNNNNN)
+    op.execute(
+        """
+        INSERT INTO document_counters (prefix, year, next_value)
+        SELECT split_part(number, '/', 1), split_part(number, '/', 2)::int,
+               max(split_part(number, '/', 3)::bigint) + 1
+        FROM quotations
+        WHERE number ~ '^[A-Z]+/[0-9]{4}/[0-9]+$'
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('document_counters')
@@ -0,0 +1,48 @@
+"""artifact cache
+
+Revision ID: 7f3c1a9d5e28
+Revises: d2b7e94c3a61
+Create Date: 2026-10-20 01:04:18.226913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3c1a9d5e28'
+down_revision: Union[str, Sequence[str], None] = 'd2b7e94c3a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('artifacts',
+    sa.Column('url', sa.String(length=2048), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('content_type', sa.String(length=255), nullable=False),
+    sa.Column('pinned', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_accessed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('url')
+    )
+    op.create_index(op.f('ix_artifacts_sha256'), 'artifacts', ['sha256'], unique=False)
+    op.create_index(
+        'ix_artifacts_lru',
+        'artifacts',
+        ['last_accessed_at'],
+        unique=False,
+        postgresql_where=sa.text('NOT pinned'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_artifacts_lru', table_name='artifacts')
+    op.drop_index(op.f('ix_artifacts_sha256'), table_name='artifacts')
+    op.drop_table('artifacts')
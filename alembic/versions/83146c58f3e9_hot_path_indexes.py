@@ -0,0 +1,38 @@
+"""hot path indexes for billing run and webhook queue
+
+Revision ID: 83146c58f3e9
+Revises: 418cb89b6b6b
+Create Date: 2026-10-19 14:02:11.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '83146c58f3e9'
+down_revision: Union[str, Sequence[str], None] = '418cb89b6b6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_subscription_items_subscription_id'), 'subscription_items', ['subscription_id'], unique=False)
+    op.create_index('ix_subscriptions_status_next_billing_date', 'subscriptions', ['status', 'next_billing_date'], unique=False)
+    op.create_index(
+        'ix_webhook_events_unprocessed_created_at',
+        'webhook_events',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('processed = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_webhook_events_unprocessed_created_at', table_name='webhook_events')
+    op.drop_index('ix_subscriptions_status_next_billing_date', table_name='subscriptions')
+    op.drop_index(op.f('ix_subscription_items_subscription_id'), table_name='subscription_items')
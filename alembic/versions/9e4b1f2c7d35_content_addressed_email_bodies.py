@@ -0,0 +1,185 @@
+"""content-addressed compressed email bodies
+
+Revision ID: 9e4b1f2c7d35
+Revises: c5d0e7a19b42
+Create Date: 2026-10-19 18:12:40.206117
+
+"""
+import hashlib
+from typing import Sequence, Union
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b1f2c7d35'
+down_revision: Union[str, Sequence[str], None] = 'c5d0e7a19b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BODY_FIELDS = ('ai_prompt', 'ai_generated_body', 'final_body')
+BATCH_SIZE = 5000
+
+# Salinan codec app.models.email_body saat migration ini dibuat (dibekukan)
+MIN_COMPRESS_BYTES = 64
+
+
+def _encode(text):
+    raw = text.encode('utf-8')
+    digest = hashlib.sha256(raw).digest()
+    if len(raw) >= MIN_COMPRESS_BYTES:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            return digest, 'zlib', compressed, len(raw)
+    return digest, 'raw', raw, len(raw)
+
+
+def _decode(codec, content, zdict=None):
+    content = bytes(content)
+    if codec != 'zlib':
+        return content.decode('utf-8')
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS, zdict=bytes(zdict)) if zdict else zlib.decompressobj()
+    return (decompressor.decompress(content) + decompressor.flush()).decode('utf-8')
+
+
+def _ref_table(value_type):
+    return sa.table(
+        'email_body_refs',
+        sa.column('id', postgresql.UUID(as_uuid=True)),
+        *(sa.column(field, value_type) for field in BODY_FIELDS),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('email_body_dictionaries',
+    sa.Column('id', sa.SmallInteger(), autoincrement=True, nullable=False),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.Column('sample_size', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('email_bodies',
+    sa.Column('hash', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('codec', sa.String(length=10), nullable=False),
+    sa.Column('dictionary_id', sa.SmallInteger(), nullable=True),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['dictionary_id'], ['email_body_dictionaries.id'], ),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    for field in BODY_FIELDS:
+        op.add_column('email_logs', sa.Column(f'{field}_hash', sa.LargeBinary(length=32), nullable=True))
+
+    # Backfill per batch (keyset by id): hash + kompres di Python, body unik
+    # di-insert sekali, referensi di-update lewat temp table (satu UPDATE per batch).
+    # Belum ada dictionary di sini; jalankan `python -m scripts.email_bodies train`
+    # lalu `recompress` setelah migration.
+    bind = op.get_bind()
+    bind.execute(sa.text(
+        'CREATE TEMP TABLE email_body_refs (id uuid PRIMARY KEY, '
+        'ai_prompt bytea, ai_generated_body bytea, final_body bytea) ON COMMIT DROP'
+    ))
+    bodies = sa.table(
+        'email_bodies',
+        sa.column('hash', sa.LargeBinary), sa.column('codec', sa.String),
+        sa.column('content', sa.LargeBinary), sa.column('size_bytes', sa.Integer),
+    )
+    refs = _ref_table(sa.LargeBinary)
+    last_id = None
+    while True:
+        stmt = sa.text(
+            'SELECT id, ai_prompt, ai_generated_body, final_body FROM email_logs '
+            + ('WHERE id > :last_id ' if last_id is not None else '')
+            + 'ORDER BY id LIMIT :limit'
+        )
+        rows = bind.execute(stmt, {'last_id': last_id, 'limit': BATCH_SIZE}).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        new_bodies = {}
+        ref_rows = []
+        for row in rows:
+            ref = {'id': row.id}
+            for field in BODY_FIELDS:
+                text = getattr(row, field)
+                if text is None:
+                    ref[field] = None
+                    continue
+                digest, codec, content, size = _encode(text)
+                new_bodies[digest] = {'hash': digest, 'codec': codec, 'content': content, 'size_bytes': size}
+                ref[field] = digest
+            ref_rows.append(ref)
+        if new_bodies:
+            bind.execute(
+                postgresql.insert(bodies).on_conflict_do_nothing(index_elements=['hash']),
+                list(new_bodies.values()),
+            )
+        bind.execute(sa.insert(refs), ref_rows)
+        bind.execute(sa.text(
+            'UPDATE email_logs e SET ai_prompt_hash = r.ai_prompt, '
+            'ai_generated_body_hash = r.ai_generated_body, final_body_hash = r.final_body '
+            'FROM email_body_refs r WHERE e.id = r.id'
+        ))
+        bind.execute(sa.text('TRUNCATE email_body_refs'))
+
+    for field in BODY_FIELDS:
+        op.create_foreign_key(op.f(f'email_logs_{field}_hash_fkey'), 'email_logs', 'email_bodies', [f'{field}_hash'], ['hash'])
+        op.drop_column('email_logs', field)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for field in BODY_FIELDS:
+        op.add_column('email_logs', sa.Column(field, sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    bind.execute(sa.text(
+        'CREATE TEMP TABLE email_body_refs (id uuid PRIMARY KEY, '
+        'ai_prompt text, ai_generated_body text, final_body text) ON COMMIT DROP'
+    ))
+    refs = _ref_table(sa.Text)
+    dictionaries = dict(bind.execute(sa.text('SELECT id, content FROM email_body_dictionaries')).all())
+    last_id = None
+    while True:
+        stmt = sa.text(
+            'SELECT e.id, '
+            'p.codec AS p_codec, p.content AS p_content, p.dictionary_id AS p_dict, '
+            'g.codec AS g_codec, g.content AS g_content, g.dictionary_id AS g_dict, '
+            'f.codec AS f_codec, f.content AS f_content, f.dictionary_id AS f_dict '
+            'FROM email_logs e '
+            'LEFT JOIN email_bodies p ON p.hash = e.ai_prompt_hash '
+            'LEFT JOIN email_bodies g ON g.hash = e.ai_generated_body_hash '
+            'LEFT JOIN email_bodies f ON f.hash = e.final_body_hash '
+            + ('WHERE e.id > :last_id ' if last_id is not None else '')
+            + 'ORDER BY e.id LIMIT :limit'
+        )
+        rows = bind.execute(stmt, {'last_id': last_id, 'limit': BATCH_SIZE}).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        ref_rows = []
+        for row in rows:
+            ref_rows.append({
+                'id': row.id,
+                'ai_prompt': _decode(row.p_codec, row.p_content, dictionaries.get(row.p_dict)) if row.p_codec else None,
+                'ai_generated_body': _decode(row.g_codec, row.g_content, dictionaries.get(row.g_dict)) if row.g_codec else None,
+                'final_body': _decode(row.f_codec, row.f_content, dictionaries.get(row.f_dict)) if row.f_codec else None,
+            })
+        bind.execute(sa.insert(refs), ref_rows)
+        bind.execute(sa.text(
+            'UPDATE email_logs e SET ai_prompt = r.ai_prompt, '
+            'ai_generated_body = r.ai_generated_body, final_body = r.final_body '
+            'FROM email_body_refs r WHERE e.id = r.id'
+        ))
+        bind.execute(sa.text('TRUNCATE email_body_refs'))
+
+    for field in BODY_FIELDS:
+        op.drop_constraint(op.f(f'email_logs_{field}_hash_fkey'), 'email_logs', type_='foreignkey')
+        op.drop_column('email_logs', f'{field}_hash')
+    op.drop_table('email_bodies')
+    op.drop_table('email_body_dictionaries')
@@ -0,0 +1,38 @@
+"""exchange rate time series
+
+Revision ID: a6f0d3b8c514
+Revises: 5c2e8f4a1d93
+Create Date: 2026-10-19 23:02:57.104381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f0d3b8c514'
+down_revision: Union[str, Sequence[str], None] = '5c2e8f4a1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('exchange_rates',
+    sa.Column('base_currency', sa.String(length=10), nullable=False),
+    sa.Column('quote_currency', sa.String(length=10), nullable=False),
+    sa.Column('effective_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('rate', sa.Numeric(precision=18, scale=6), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('base_currency', 'quote_currency', 'effective_at')
+    )
+    op.add_column('billing_cycles', sa.Column('exchange_rate', sa.Numeric(precision=18, scale=6), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('billing_cycles', 'exchange_rate')
+    op.drop_table('exchange_rates')
@@ -0,0 +1,37 @@
+"""subscriptions billing anchor day
+
+Revision ID: a7d2e5b9c146
+Revises: d6f3a9c1e284
+Create Date: 2026-10-22 09:41:07.318264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e5b9c146'
+down_revision: Union[str, Sequence[str], None] = 'd6f3a9c1e284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('subscriptions', sa.Column('billing_anchor_day', sa.SmallInteger(), nullable=True))
+    # Aturan lama meng-clamp hari 29–31 ke 28 secara permanen: anchor asli
+    # diambil dari start_date bila next_billing_date sudah di-clamp
+    op.execute(
+        "UPDATE subscriptions SET billing_anchor_day = CASE"
+        " WHEN extract(day FROM next_billing_date) = 28 AND extract(day FROM start_date) > 28"
+        " THEN extract(day FROM start_date)"
+        " ELSE extract(day FROM next_billing_date) END"
+        " WHERE next_billing_date IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('subscriptions', 'billing_anchor_day')
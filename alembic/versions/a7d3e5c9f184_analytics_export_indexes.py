@@ -0,0 +1,34 @@
+"""analytics export indexes
+
+Revision ID: a7d3e5c9f184
+Revises: f1c6b8e3a472
+Create Date: 2026-10-20 09:12:44.518207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5c9f184'
+down_revision: Union[str, Sequence[str], None] = 'f1c6b8e3a472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_payments_updated_at', 'payments', ['updated_at'], unique=False)
+    op.create_index('ix_billing_cycles_updated_at', 'billing_cycles', ['updated_at'], unique=False)
+    op.create_index('ix_subscription_items_updated_at', 'subscription_items', ['updated_at'], unique=False)
+    op.create_index('ix_wallet_transactions_created_at', 'wallet_transactions', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_wallet_transactions_created_at', table_name='wallet_transactions')
+    op.drop_index('ix_subscription_items_updated_at', table_name='subscription_items')
+    op.drop_index('ix_billing_cycles_updated_at', table_name='billing_cycles')
+    op.drop_index('ix_payments_updated_at', table_name='payments')
@@ -0,0 +1,28 @@
+"""email logs send lease
+
+Revision ID: b4e8d1f62a57
+Revises: c8f2a6d4e913
+Create Date: 2026-10-21 09:12:44.318027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d1f62a57'
+down_revision: Union[str, Sequence[str], None] = 'c8f2a6d4e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('email_logs', sa.Column('send_lease_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('email_logs', 'send_lease_until')
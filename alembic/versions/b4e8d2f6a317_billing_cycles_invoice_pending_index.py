@@ -0,0 +1,28 @@
+"""billing cycles invoice pending index
+
+Revision ID: b4e8d2f6a317
+Revises: 7f3c1a9d5e28
+Create Date: 2026-10-20 02:17:53.604219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d2f6a317'
+down_revision: Union[str, Sequence[str], None] = '7f3c1a9d5e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_billing_cycles_invoice_pending', 'billing_cycles', ['id'], unique=False, postgresql_where=sa.text('invoice_file_url IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_billing_cycles_invoice_pending', table_name='billing_cycles', postgresql_where=sa.text('invoice_file_url IS NULL'))
@@ -0,0 +1,33 @@
+"""mailbox cursors for inbound email sync
+
+Revision ID: b81f3e6d2a47
+Revises: 4d7a2c9e1f08
+Create Date: 2026-10-19 19:48:31.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f3e6d2a47'
+down_revision: Union[str, Sequence[str], None] = '4d7a2c9e1f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('mailbox_cursors',
+    sa.Column('mailbox', sa.String(length=320), nullable=False),
+    sa.Column('cursor', sa.String(length=255), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('mailbox')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('mailbox_cursors')
@@ -0,0 +1,30 @@
+"""traceparent columns for trace propagation
+
+Revision ID: c5d0e7a19b42
+Revises: 38c291325424
+Create Date: 2026-10-19 17:25:03.551270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d0e7a19b42'
+down_revision: Union[str, Sequence[str], None] = '38c291325424'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('webhook_events', sa.Column('traceparent', sa.String(length=55), nullable=True))
+    op.add_column('provisioning_tasks', sa.Column('traceparent', sa.String(length=55), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('provisioning_tasks', 'traceparent')
+    op.drop_column('webhook_events', 'traceparent')
@@ -0,0 +1,45 @@
+"""client risk scores
+
+Revision ID: c8f2a6d4e913
+Revises: a7d3e5c9f184
+Create Date: 2026-10-20 14:27:31.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a6d4e913'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e5c9f184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('client_risk_scores',
+    sa.Column('client_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('score', sa.SmallInteger(), nullable=False),
+    sa.Column('band', sa.String(length=10), nullable=False),
+    sa.Column('model_version', sa.SmallInteger(), nullable=False),
+    sa.Column('cycles', sa.Integer(), nullable=False),
+    sa.Column('late_ratio', postgresql.REAL(), nullable=False),
+    sa.Column('avg_days_late', postgresql.REAL(), nullable=False),
+    sa.Column('failed_ratio', postgresql.REAL(), nullable=False),
+    sa.Column('reminders_per_cycle', postgresql.REAL(), nullable=False),
+    sa.Column('as_of', sa.Date(), nullable=False),
+    sa.Column('scored_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('client_id')
+    )
+    op.create_index('ix_client_risk_scores_score', 'client_risk_scores', ['score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_client_risk_scores_score', table_name='client_risk_scores')
+    op.drop_table('client_risk_scores')
@@ -0,0 +1,28 @@
+"""quotation expiry index
+
+Revision ID: d2b7e94c3a61
+Revises: a6f0d3b8c514
+Create Date: 2026-10-20 00:12:41.538207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e94c3a61'
+down_revision: Union[str, Sequence[str], None] = 'a6f0d3b8c514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_quotations_status_valid_until', 'quotations', ['status', 'valid_until'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_quotations_status_valid_until', table_name='quotations')
@@ -0,0 +1,36 @@
+"""email logs rfc message id
+
+Revision ID: d6f3a9c1e284
+Revises: b4e8d1f62a57
+Create Date: 2026-10-21 10:03:18.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f3a9c1e284'
+down_revision: Union[str, Sequence[str], None] = 'b4e8d1f62a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('email_logs', sa.Column('rfc_message_id', sa.String(length=998), nullable=True))
+    # Provider SMTP menyimpan Message-ID sebagai gmail_message_id; id Gmail API
+    # tidak bisa dipetakan balik
+    op.execute(
+        "UPDATE email_logs SET rfc_message_id = gmail_message_id"
+        " WHERE gmail_message_id LIKE '<%>'"
+    )
+    op.create_index('ix_email_logs_rfc_message_id', 'email_logs', ['rfc_message_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_logs_rfc_message_id', table_name='email_logs')
+    op.drop_column('email_logs', 'rfc_message_id')
@@ -0,0 +1,32 @@
+"""full-text search vector on email_logs
+
+Revision ID: e3a91c5f7b20
+Revises: b81f3e6d2a47
+Create Date: 2026-10-19 21:05:14.337820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a91c5f7b20'
+down_revision: Union[str, Sequence[str], None] = 'b81f3e6d2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Kolom diisi aplikasi (body terkompresi di email_bodies); baris lama
+    # di-backfill dengan `python -m scripts.email_search reindex`
+    op.add_column('email_logs', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.create_index('ix_email_logs_search_vector', 'email_logs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_logs_search_vector', table_name='email_logs', postgresql_using='gin')
+    op.drop_column('email_logs', 'search_vector')
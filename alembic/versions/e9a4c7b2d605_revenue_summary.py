@@ -0,0 +1,53 @@
+"""revenue summary
+
+Revision ID: e9a4c7b2d605
+Revises: b4e8d2f6a317
+Create Date: 2026-10-20 03:02:36.118452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a4c7b2d605'
+down_revision: Union[str, Sequence[str], None] = 'b4e8d2f6a317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revenue_summary',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('product_type', sa.String(length=50), nullable=False),
+    sa.Column('currency', sa.String(length=10), nullable=False),
+    sa.Column('client_status', sa.String(length=20), nullable=False),
+    sa.Column('subscriptions', sa.Integer(), nullable=False),
+    sa.Column('mrr', sa.Numeric(precision=18, scale=4), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('month', 'product_type', 'currency', 'client_status')
+    )
+    op.create_table('subscription_revenue',
+    sa.Column('subscription_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('product_type', sa.String(length=50), nullable=False),
+    sa.Column('currency', sa.String(length=10), nullable=False),
+    sa.Column('client_status', sa.String(length=20), nullable=False),
+    sa.Column('mrr', sa.Numeric(precision=18, scale=4), nullable=False),
+    sa.PrimaryKeyConstraint('subscription_id', 'product_type')
+    )
+    op.create_table('revenue_dirty_subscriptions',
+    sa.Column('subscription_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('marked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('subscription_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('revenue_dirty_subscriptions')
+    op.drop_table('subscription_revenue')
+    op.drop_table('revenue_summary')
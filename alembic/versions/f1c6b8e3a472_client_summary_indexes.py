@@ -0,0 +1,46 @@
+"""client summary indexes
+
+Revision ID: f1c6b8e3a472
+Revises: e9a4c7b2d605
+Create Date: 2026-10-20 03:41:09.872315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6b8e3a472'
+down_revision: Union[str, Sequence[str], None] = 'e9a4c7b2d605'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_subscriptions_client_id_status', 'subscriptions', ['client_id', 'status'], unique=False)
+    op.create_index('ix_quotations_client_id_status', 'quotations', ['client_id', 'status'], unique=False)
+    op.create_index(
+        'ix_payments_client_paid_at',
+        'payments',
+        ['client_id', 'paid_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'SUCCESS'"),
+    )
+    op.create_index(
+        'ix_billing_cycles_open_subscription_id',
+        'billing_cycles',
+        ['subscription_id'],
+        unique=False,
+        postgresql_where=sa.text("status NOT IN ('PAID', 'CANCELLED')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_billing_cycles_open_subscription_id', table_name='billing_cycles')
+    op.drop_index('ix_payments_client_paid_at', table_name='payments')
+    op.drop_index('ix_quotations_client_id_status', table_name='quotations')
+    op.drop_index('ix_subscriptions_client_id_status', table_name='subscriptions')
@@ -0,0 +1,55 @@
+"""email search vector trigger
+
+Revision ID: f4b8c2d7e915
+Revises: a7d2e5b9c146
+Create Date: 2026-10-22 14:18:52.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8c2d7e915'
+down_revision: Union[str, Sequence[str], None] = 'a7d2e5b9c146'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Body terkompresi tidak bisa dibaca PostgreSQL: vektor body dihitung saat
+    # insert (`insert_bodies`); body lama di-backfill dengan
+    # `python -m scripts.email_search reindex`
+    op.add_column('email_bodies', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # Konfigurasi harus sama dengan SEARCH_TEXT_CONFIG
+    op.execute(
+        """
+        CREATE FUNCTION email_logs_search_vector() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('indonesian'::regconfig, coalesce(NEW.subject, '')), 'A')
+                || setweight(
+                    coalesce((SELECT b.search_vector FROM email_bodies AS b WHERE b.hash = NEW.final_body_hash), ''),
+                    'B'
+                );
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER email_logs_search_vector"
+        " BEFORE INSERT OR UPDATE OF subject, final_body_hash ON email_logs"
+        " FOR EACH ROW EXECUTE FUNCTION email_logs_search_vector()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER email_logs_search_vector ON email_logs")
+    op.execute("DROP FUNCTION email_logs_search_vector()")
+    op.drop_column('email_bodies', 'search_vector')
@@ -1,4 +1,9 @@
-from typing import Generator
+import hmac
+from typing import Generator, Optional
+
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
 from app.db.session import SessionLocal
 
 
@@ -8,3 +13,11 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def require_api_token(x_api_token: Optional[str] = Header(default=None)) -> None:
+    """Endpoint internal (dashboard Support/Finance): header `X-Api-Token` harus sama dengan `API_ACCESS_TOKEN`."""
+    if not settings.API_ACCESS_TOKEN or not hmac.compare_digest(
+        (x_api_token or "").encode(), settings.API_ACCESS_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API token")
@@ -0,0 +1,25 @@
+"""
+Endpoint ringkasan client (client 360).
+
+Satu query agregat dengan lateral subquery + cache per proses, lihat
+`app.services.client_summary`. Wajib header `X-Api-Token`
+(`require_api_token`).
+"""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_api_token
+from app.services.client_summary import default_client_summary_cache
+
+router = APIRouter(prefix="/clients", tags=["clients"], dependencies=[Depends(require_api_token)])
+
+
+@router.get("/{client_id}/summary")
+def client_summary(client_id: uuid.UUID, db: Session = Depends(get_db)):
+    summary = default_client_summary_cache().get(db, client_id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client tidak ditemukan")
+    return summary.__dict__
@@ -0,0 +1,53 @@
+"""
+Endpoint pencarian full-text email (Support & Sales).
+
+Lihat `app.services.email_search` untuk detail query & ranking. Isi email
+client, jadi wajib header `X-Api-Token` (`require_api_token`).
+"""
+
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_api_token
+from app.models.email_log import EmailDirection, EmailRelatedType
+from app.services.email_search import MAX_PAGE_SIZE, EmailSearchError, search_emails
+
+router = APIRouter(prefix="/email-logs", tags=["email"], dependencies=[Depends(require_api_token)])
+
+
+@router.get("/search")
+def search_email_logs(
+    q: str = Query(..., min_length=2, max_length=500),
+    related_type: Optional[EmailRelatedType] = None,
+    direction: Optional[EmailDirection] = None,
+    user_id: Optional[uuid.UUID] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0, le=10_000),
+    db: Session = Depends(get_db),
+):
+    try:
+        page = search_emails(
+            db,
+            q,
+            related_type=related_type,
+            direction=direction,
+            user_id=user_id,
+            date_from=date_from,
+            date_to=date_to,
+            limit=limit,
+            offset=offset,
+        )
+    except EmailSearchError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    return {
+        "items": [hit.__dict__ for hit in page.hits],
+        "limit": page.limit,
+        "offset": page.offset,
+        "has_more": page.has_more,
+    }
@@ -0,0 +1,106 @@
+"""
+Download dokumen untuk portal client: PDF quotation, invoice & faktur pajak.
+
+File dilayani dari cache lokal (`app.services.artifacts`), bukan diambil
+ulang dari Cosmic / store upload Finance tiap kali dibuka. `FileResponse`
+streaming dari disk dan mendukung header `Range` (206, resume download,
+viewer PDF yang membaca per halaman).
+
+Semua endpoint mewajibkan header `X-Files-Token` sama dengan
+`FILES_ACCESS_TOKEN` (dipanggil backend portal, bukan browser langsung);
+bila token tidak di-set, semua request ditolak. Lookup baris ada di
+dependency sync (dijalankan FastAPI di threadpool) supaya query DB tidak
+memblokir event loop; handler async hanya menunggu artifact store.
+"""
+
+import hmac
+import re
+from typing import NamedTuple, Optional
+import uuid
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.core.config import settings
+from app.models.billing import BillingCycle
+from app.models.quotation import Quotation
+from app.services.artifacts import ArtifactError, ArtifactNotFoundError, default_artifact_store
+
+
+def require_files_token(x_files_token: Optional[str] = Header(default=None)) -> None:
+    if not settings.FILES_ACCESS_TOKEN or not hmac.compare_digest(
+        (x_files_token or "").encode(), settings.FILES_ACCESS_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid files token")
+
+
+router = APIRouter(prefix="/files", tags=["files"], dependencies=[Depends(require_files_token)])
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+async def _serve(url: Optional[str], filename: str) -> FileResponse:
+    if not url:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dokumen belum tersedia")
+    try:
+        artifact = await default_artifact_store().get(url)
+    except ArtifactNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except ArtifactError as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    return FileResponse(
+        artifact.path,
+        media_type=artifact.content_type,
+        filename=_UNSAFE_FILENAME.sub("_", filename),
+        content_disposition_type="inline",
+        headers={"Cache-Control": "private, max-age=3600", "ETag": f'"{artifact.sha256}"'},
+    )
+
+
+class Document(NamedTuple):
+    url: Optional[str]
+    filename: str
+
+
+def quotation_pdf_document(quotation_id: uuid.UUID, db: Session = Depends(get_db)) -> Document:
+    row = db.execute(select(Quotation.number, Quotation.pdf_url).where(Quotation.id == quotation_id)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quotation tidak ditemukan")
+    return Document(row.pdf_url, f"{row.number}.pdf")
+
+
+def _billing_cycle_row(db: Session, cycle_id: uuid.UUID, url_column):
+    row = db.execute(
+        select(BillingCycle.invoice_number_external, url_column.label("url")).where(BillingCycle.id == cycle_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Billing cycle tidak ditemukan")
+    return row
+
+
+def invoice_document(cycle_id: uuid.UUID, db: Session = Depends(get_db)) -> Document:
+    row = _billing_cycle_row(db, cycle_id, BillingCycle.invoice_file_url)
+    return Document(row.url, f"invoice-{row.invoice_number_external or cycle_id}.pdf")
+
+
+def tax_invoice_document(cycle_id: uuid.UUID, db: Session = Depends(get_db)) -> Document:
+    row = _billing_cycle_row(db, cycle_id, BillingCycle.tax_invoice_file_url)
+    return Document(row.url, f"faktur-{row.invoice_number_external or cycle_id}.pdf")
+
+
+@router.get("/quotations/{quotation_id}/pdf")
+async def quotation_pdf(document: Document = Depends(quotation_pdf_document)):
+    return await _serve(document.url, document.filename)
+
+
+@router.get("/billing-cycles/{cycle_id}/invoice")
+async def invoice_file(document: Document = Depends(invoice_document)):
+    return await _serve(document.url, document.filename)
+
+
+@router.get("/billing-cycles/{cycle_id}/tax-invoice")
+async def tax_invoice_file(document: Document = Depends(tax_invoice_document)):
+    return await _serve(document.url, document.filename)
@@ -0,0 +1,44 @@
+"""
+Endpoint admin untuk profiling on-demand.
+
+Hanya dipasang bila `PROFILING_ENABLED=true`; semua endpoint mewajibkan header
+`X-Admin-Token` sama dengan `PROFILING_TOKEN`. Arming berlaku per proses
+worker uvicorn.
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+
+from app.core.config import settings
+from app.core.profiling import list_profiles, triggers
+
+
+def require_profiling_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    if not settings.PROFILING_TOKEN or not hmac.compare_digest(
+        (x_admin_token or "").encode(), settings.PROFILING_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["admin"],
+    dependencies=[Depends(require_profiling_token)],
+)
+
+
+@router.post("/arm")
+def arm_profiling(
+    count: int = Query(default=1, ge=0, le=1000),
+    path_prefix: str = Query(default=""),
+):
+    """Profile `count` request berikutnya yang path-nya diawali `path_prefix` (0 = batal)."""
+    triggers.arm(count, path_prefix)
+    return {"status": "armed", **triggers.status()}
+
+
+@router.get("")
+def profiling_status(limit: int = Query(default=50, ge=1, le=500)):
+    return {"armed": triggers.status(), "profiles": list_profiles(limit)}
@@ -0,0 +1,124 @@
+"""
+Endpoint laporan dashboard: MRR/ARR per bulan dan aging piutang.
+
+MRR dibaca dari REVENUE_SUMMARY (`app.services.revenue_summary`): satu range
+scan primary key untuk rentang bulan, konversi ke mata uang laporan di memori
+(`ExchangeRateCache`). Bulan berjalan tertinggal dari transaksi paling baru
+sejauh interval job `scripts.revenue refresh`.
+
+Aging piutang (`app.services.ar_aging`) dihitung di SQL; export CSV / XLSX
+di-stream dari server-side cursor dengan session milik response sendiri
+(session request sudah ditutup saat body dikirim).
+
+Semua laporan wajib header `X-Api-Token` (`require_api_token`).
+"""
+
+from datetime import date
+from typing import Iterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_api_token
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.client import ClientStatus
+from app.services import ar_aging
+from app.services.exchange_rates import default_rate_cache
+from app.services.revenue_summary import add_months, current_month, monthly_mrr, mrr_totals
+
+router = APIRouter(prefix="/reports", tags=["reports"], dependencies=[Depends(require_api_token)])
+
+MAX_MONTHS = 36
+
+
+@router.get("/mrr")
+def mrr_report(
+    month_from: Optional[date] = None,
+    month_to: Optional[date] = None,
+    product_type: Optional[str] = None,
+    client_status: Optional[str] = None,
+    currency: Optional[str] = Query(default=None, min_length=3, max_length=10),
+    db: Session = Depends(get_db),
+):
+    month_to = (month_to or current_month()).replace(day=1)
+    month_from = (month_from or add_months(month_to, -11)).replace(day=1)
+    if month_from > month_to or add_months(month_from, MAX_MONTHS) <= month_to:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Rentang bulan tidak valid (maksimum {MAX_MONTHS} bulan)",
+        )
+    rows = monthly_mrr(db, month_from, month_to, product_type=product_type, client_status=client_status)
+    reporting_currency = (currency or settings.REPORTING_CURRENCY).upper()
+    totals = mrr_totals(rows, default_rate_cache(), reporting_currency)
+    return {
+        "currency": reporting_currency,
+        "months": [
+            {
+                "month": total.month,
+                "mrr": total.mrr,
+                "arr": total.arr,
+                "by_product_type": total.by_product_type,
+                "unconverted": total.unconverted,
+            }
+            for total in totals
+        ],
+        "rows": [
+            {
+                "month": row.month,
+                "product_type": row.product_type,
+                "currency": row.currency,
+                "client_status": row.client_status,
+                "subscriptions": row.subscriptions,
+                "mrr": row.mrr,
+                "arr": row.mrr * 12,
+            }
+            for row in rows
+        ],
+    }
+
+
+def _export_stream(
+    level: ar_aging.AgingLevel,
+    export_format: ar_aging.ExportFormat,
+    as_of: date,
+    client_statuses: List[ClientStatus],
+) -> Iterator[bytes]:
+    db = SessionLocal()
+    try:
+        yield from ar_aging.export_chunks(db, level, export_format, as_of, client_statuses)
+    finally:
+        db.close()
+
+
+@router.get("/ar-aging")
+def ar_aging_report(
+    as_of: Optional[date] = None,
+    client_status: List[ClientStatus] = Query(default=[]),
+    level: ar_aging.AgingLevel = ar_aging.AgingLevel.SUMMARY,
+    format: Optional[ar_aging.ExportFormat] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Tanpa `format`: total bucket per mata uang (JSON). Dengan `format=csv|xlsx`:
+    file per client × mata uang (`level=summary`) atau per billing cycle
+    (`level=detail`).
+    """
+    as_of = as_of or date.today()
+    if format is None:
+        totals = ar_aging.aging_totals(db, as_of, client_status)
+        return {
+            "as_of": as_of,
+            "buckets": [label for label, _, _ in ar_aging.AGING_BUCKETS],
+            "currencies": [
+                {"currency": total.currency, "cycles": total.cycles, "buckets": total.buckets, "total": total.total}
+                for total in totals
+            ],
+        }
+    filename = ar_aging.filename(level, format, as_of)
+    return StreamingResponse(
+        _export_stream(level, format, as_of, client_status),
+        media_type=ar_aging.media_type(format),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
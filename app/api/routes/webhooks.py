@@ -0,0 +1,63 @@
+"""
+Endpoint penerima webhook Xendit.
+
+Endpoint hanya menyimpan payload mentah ke WEBHOOK_EVENTS lalu langsung
+membalas 200; parsing & update PAYMENTS / BILLING_CYCLES dikerjakan background
+job (lihat `app.services.webhook_events.claim_unprocessed`). Dengan begitu
+latency endpoint tetap kecil walaupun Xendit mengirim burst / retry.
+
+Header `x-callback-token` wajib sama dengan `XENDIT_CALLBACK_TOKEN`; bila
+token tidak di-set, semua request ditolak.
+"""
+
+import hmac
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.core.config import settings
+from app.services.webhook_events import record_event
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+# Status invoice Xendit (callback tanpa field "event") → event_type internal
+INVOICE_STATUS_EVENTS = {
+    "PAID": "PAYMENT_SUCCEEDED",
+    "SETTLED": "PAYMENT_SUCCEEDED",
+    "FAILED": "PAYMENT_FAILED",
+    "EXPIRED": "PAYMENT_FAILED",
+}
+
+
+def resolve_event_type(payload: Dict[str, Any]) -> str:
+    """`payment.succeeded` → `PAYMENT_SUCCEEDED`; fallback ke status invoice."""
+    event = payload.get("event")
+    if event:
+        return str(event).upper().replace(".", "_")
+    invoice_status = str(payload.get("status", "")).upper()
+    return INVOICE_STATUS_EVENTS.get(invoice_status, "UNKNOWN")
+
+
+@router.post("/xendit")
+def receive_xendit_webhook(
+    payload: Dict[str, Any],
+    db: Session = Depends(get_db),
+    x_callback_token: Optional[str] = Header(default=None),
+):
+    if not settings.XENDIT_CALLBACK_TOKEN or not hmac.compare_digest(
+        (x_callback_token or "").encode(), settings.XENDIT_CALLBACK_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid callback token")
+
+    data = payload.get("data") if isinstance(payload.get("data"), dict) else payload
+    event = record_event(
+        db,
+        resolve_event_type(payload),
+        payload,
+        xendit_subscription_id=data.get("recurring_plan_id") or data.get("subscription_id"),
+        xendit_invoice_id=data.get("id"),
+    )
+    db.commit()
+    return {"status": "accepted", "id": str(event.id)}
@@ -0,0 +1,321 @@
+"""
+Metrics Prometheus untuk API, database, antrian (backlog) dan background job.
+
+Komponen:
+- `http_request_duration_seconds`  : histogram latency per method + route template.
+- `db_query_duration_seconds`      : histogram durasi statement SQL (via engine events).
+- `db_pool_*`                       : gauge pool SQLAlchemy, dibaca saat scrape.
+- `cloudsales_backlog_*`            : jumlah & umur item tertua di tiap antrian
+  (webhook belum diproses, provisioning PENDING, billing cycle lewat jatuh tempo,
+  email DRAFT). Nilainya dari count query yang dilayani partial index dan
+  di-cache `METRICS_BACKLOG_TTL_SECONDS`, jadi scrape tidak memicu full scan.
+- `cloudsales_job_*`                : durasi, item, dan waktu sukses terakhir job batch.
+- `cloudsales_llm_*`                : hasil cache drafting LLM (hit/miss/collapsed)
+  dan ukuran batch ke model.
+
+Catatan: dengan beberapa worker uvicorn, tiap proses punya registry sendiri;
+gunakan mode multiprocess prometheus_client bila perlu agregasi per host.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.core.profiling import maybe_profile_job
+from app.core.request_context import job_scope, route_label
+from app.core.tracing import tracer
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+HTTP_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Latency request HTTP per route template.",
+    ("method", "route", "status"),
+    buckets=HTTP_LATENCY_BUCKETS,
+)
+
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "Jumlah request HTTP yang sedang diproses.",
+)
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Durasi eksekusi statement SQL per jenis statement.",
+    ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+job_duration = Histogram(
+    "cloudsales_job_duration_seconds",
+    "Durasi eksekusi job batch.",
+    ("job", "outcome"),
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+
+job_items = Counter(
+    "cloudsales_job_items_total",
+    "Jumlah item yang diproses job batch.",
+    ("job",),
+)
+
+job_last_success = Gauge(
+    "cloudsales_job_last_success_timestamp_seconds",
+    "Unix timestamp job terakhir selesai tanpa error.",
+    ("job",),
+)
+
+# ---------------------------------------------------------------------------
+# LLM drafting
+# ---------------------------------------------------------------------------
+
+llm_draft_requests = Counter(
+    "cloudsales_llm_draft_requests_total",
+    "Prompt draft unik per panggilan draft_many, per hasil cache (hit, miss, collapsed).",
+    ("model", "result"),
+)
+
+llm_batch_size = Histogram(
+    "cloudsales_llm_batch_size",
+    "Jumlah prompt per panggilan batch ke model.",
+    ("model",),
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+
+class JobRun:
+    """Handle yang dipakai job untuk melaporkan jumlah item yang diproses."""
+
+    def __init__(self, job: str) -> None:
+        self.job = job
+
+    def add_items(self, count: int) -> None:
+        if count:
+            job_items.labels(self.job).inc(count)
+
+
+@contextmanager
+def track_job(job: str) -> Iterator[JobRun]:
+    started = time.perf_counter()
+    run = JobRun(job)
+    try:
+        with job_scope(job), maybe_profile_job(job), tracer.start_as_current_span(
+            f"job {job}", attributes={"job.name": job}
+        ):
+            yield run
+    except Exception:
+        job_duration.labels(job, "error").observe(time.perf_counter() - started)
+        raise
+    job_duration.labels(job, "success").observe(time.perf_counter() - started)
+    job_last_success.labels(job).set(time.time())
+
+
+# ---------------------------------------------------------------------------
+# Engine instrumentation
+# ---------------------------------------------------------------------------
+
+_QUERY_START_KEY = "_metrics_query_start"
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Pasang histogram durasi query + gauge pool pada engine."""
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    engine._metrics_instrumented = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(_QUERY_START_KEY)
+        if starts:
+            db_query_duration.labels(_operation(statement)).observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_QUERY_START_KEY):
+            conn.info[_QUERY_START_KEY].pop()
+
+    REGISTRY.register(PoolCollector(engine))
+
+
+class PoolCollector:
+    """Gauge pool SQLAlchemy, dibaca langsung dari objek pool saat scrape."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def describe(self):
+        # Tanpa describe(), REGISTRY.register memanggil collect() saat import
+        return []
+
+    def collect(self):
+        pool = self.engine.pool
+        readings = {
+            "db_pool_size": ("Ukuran pool yang dikonfigurasi.", "size"),
+            "db_pool_checked_out": ("Koneksi yang sedang dipakai.", "checkedout"),
+            "db_pool_checked_in": ("Koneksi idle di pool.", "checkedin"),
+            "db_pool_overflow": ("Koneksi overflow di atas pool_size.", "overflow"),
+        }
+        for name, (documentation, attribute) in readings.items():
+            reader = getattr(pool, attribute, None)
+            if reader is None:
+                continue
+            yield GaugeMetricFamily(name, documentation, value=reader())
+
+
+# ---------------------------------------------------------------------------
+# Backlog gauges (cached count queries)
+# ---------------------------------------------------------------------------
+
+# nama antrian → SQL (count, oldest timestamp). Setiap WHERE sama persis
+# dengan predicate partial index-nya supaya planner bisa memakai index tsb.
+BACKLOG_QUERIES: Dict[str, str] = {
+    "webhook_events_unprocessed": (
+        "SELECT count(*), min(created_at) FROM webhook_events WHERE processed = false"
+    ),
+    "provisioning_tasks_pending": (
+        "SELECT count(*), min(created_at) FROM provisioning_tasks WHERE status = 'PENDING'"
+    ),
+    "billing_cycles_past_due": (
+        "SELECT count(*), min(due_date)::timestamptz FROM billing_cycles "
+        "WHERE status NOT IN ('PAID', 'CANCELLED') AND due_date < current_date"
+    ),
+    "email_logs_draft": (
+        "SELECT count(*), min(created_at) FROM email_logs WHERE status = 'DRAFT'"
+    ),
+    "revenue_dirty_subscriptions": (
+        "SELECT count(*), min(marked_at) FROM revenue_dirty_subscriptions"
+    ),
+}
+
+
+class BacklogCollector:
+    """
+    Menghitung backlog antrian dengan TTL cache.
+
+    Scrape dalam jendela TTL memakai nilai cache; hanya satu thread yang
+    me-refresh (scrape lain tetap memakai nilai lama), sehingga beban ke DB
+    maksimal satu set count query per TTL berapa pun frekuensi scrape.
+    """
+
+    def __init__(self, engine: Engine, ttl_seconds: float = 30.0) -> None:
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[int, Optional[float]]] = {}
+        self._refreshed_at = 0.0
+        self._refresh_ok = True
+
+    def describe(self):
+        # Tanpa describe(), REGISTRY.register memanggil collect() → query DB saat import
+        return []
+
+    def refresh(self) -> None:
+        values: Dict[str, Tuple[int, Optional[float]]] = {}
+        now = time.time()
+        try:
+            with job_scope("metrics_backlog"), self.engine.connect() as connection:
+                # Jangan biarkan count yang lambat menahan scrape
+                connection.execute(text("SET LOCAL statement_timeout = 5000"))
+                for name, sql in BACKLOG_QUERIES.items():
+                    count, oldest = connection.execute(text(sql)).one()
+                    values[name] = (count, now - oldest.timestamp() if oldest is not None else None)
+            self._values = values
+            self._refresh_ok = True
+        except Exception:
+            self._refresh_ok = False
+        self._refreshed_at = time.monotonic()
+
+    def collect(self):
+        if time.monotonic() - self._refreshed_at > self.ttl_seconds and self._lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            finally:
+                self._lock.release()
+
+        size = GaugeMetricFamily("cloudsales_backlog_items", "Jumlah item di antrian.", labels=["queue"])
+        age = GaugeMetricFamily(
+            "cloudsales_backlog_oldest_age_seconds",
+            "Umur item tertua di antrian (0 jika kosong).",
+            labels=["queue"],
+        )
+        for name, (count, oldest_age) in self._values.items():
+            size.add_metric([name], count)
+            age.add_metric([name], max(oldest_age or 0.0, 0.0))
+        yield size
+        yield age
+        yield GaugeMetricFamily(
+            "cloudsales_backlog_refresh_ok",
+            "1 jika refresh backlog terakhir berhasil.",
+            value=1 if self._refresh_ok else 0,
+        )
+
+
+_backlog_collector: Optional[BacklogCollector] = None
+
+
+def register_backlog_collector(engine: Engine, ttl_seconds: float) -> BacklogCollector:
+    global _backlog_collector
+    if _backlog_collector is None:
+        _backlog_collector = BacklogCollector(engine, ttl_seconds)
+        REGISTRY.register(_backlog_collector)
+    return _backlog_collector
+
+
+class MetricsMiddleware:
+    """ASGI middleware (tanpa BaseHTTPMiddleware) untuk histogram latency HTTP."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_progress.dec()
+            # scope["route"] diisi router setelah matching
+            http_request_duration.labels(
+                scope["method"], route_label(scope), str(status_code)
+            ).observe(time.perf_counter() - started)
+
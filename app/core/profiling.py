@@ -0,0 +1,356 @@
+"""
+Profiling on-demand (sampling) untuk request API dan job batch.
+
+Sampler: thread terpisah membaca `sys._current_frames()` tiap
+`PROFILING_INTERVAL_MS` dan menghitung stack yang dimiliki target. Hasil:
+
+- `<id>.collapsed`   : format folded stack (`a;b;c <jumlah>`), langsung bisa
+  dipakai `flamegraph.pl` / speedscope / inferno.
+- `<id>.summary.txt` : top fungsi berdasarkan self time + total time.
+
+Trigger:
+- Request: header `X-Profile: <PROFILING_TOKEN>`, atau di-arm lewat admin
+  endpoint (`POST /admin/profiling/arm`) untuk N request berikutnya
+  (opsional per prefix path). Response membawa header `X-Profile-Id`.
+- Job: `PROFILE_JOBS=billing_run,provisioning` (atau `*`); `track_job`
+  memprofile job tersebut. Kode lain bisa memakai `profile_block(label)`.
+
+Atribusi stack per request tanpa menelusuri locals tiap frame: di thread
+event loop, sample dihitung bila task asyncio yang sedang berjalan adalah
+task request (`asyncio.current_task(loop)`); di worker threadpool anyio
+(endpoint/dependency sync), bila `contextvars.Context` item yang sedang
+dijalankan worker membawa sesi profiling request tersebut. Frame
+`WorkerThread.run` dicari sekali per thread lalu di-cache di sesi, jadi tiap
+sample cukup satu lookup. Request lain yang berjalan paralel tidak ikut
+tercatat; task anak yang dibuat request (mis. task group streaming response)
+juga tidak.
+
+Saat `PROFILING_ENABLED=false` middleware & endpoint admin tidak dipasang dan
+`track_job` hanya melakukan satu lookup set, jadi overhead praktis nol.
+"""
+
+import asyncio
+import contextvars
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+Stack = Tuple[str, ...]
+
+# Sesi profiling request aktif (dibawa ke threadpool lewat contextvars)
+_active_session: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # Path relatif ke site-packages / repo supaya flamegraph tidak terlalu lebar
+    for marker in ("site-packages" + os.sep, os.getcwd() + os.sep):
+        index = filename.find(marker)
+        if index >= 0:
+            filename = filename[index + len(marker):]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _stack(frame: Optional[FrameType]) -> Stack:
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+# ---------------------------------------------------------------------------
+# Hasil profiling
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ProfileResult:
+    profile_id: str
+    label: str
+    interval_seconds: float
+    duration_seconds: float
+    samples: Counter = field(default_factory=Counter)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed_lines(self) -> List[str]:
+        return [f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common() if stack]
+
+    def top_functions(self, limit: int = 25) -> List[Tuple[str, int, int]]:
+        """(fungsi, self samples, total samples) diurut self samples."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.samples.items():
+            if not stack:
+                continue
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+        return [(label, count, total_counts[label]) for label, count in self_counts.most_common(limit)]
+
+    def summary(self, limit: int = 25) -> str:
+        total = self.sample_count or 1
+        lines = [
+            f"profile {self.profile_id} ({self.label})",
+            f"durasi {self.duration_seconds * 1000:.1f} ms, {self.sample_count} sample "
+            f"@ {self.interval_seconds * 1000:.1f} ms",
+            "",
+            f"{'self %':>7} {'self ms':>9} {'total %':>8}  fungsi",
+        ]
+        for label, self_count, total_count in self.top_functions(limit):
+            lines.append(
+                f"{self_count / total * 100:6.1f}% {self_count * self.interval_seconds * 1000:9.1f} "
+                f"{total_count / total * 100:7.1f}%  {label}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str) -> Tuple[Path, Path]:
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        collapsed = target / f"{self.profile_id}.collapsed"
+        summary = target / f"{self.profile_id}.summary.txt"
+        collapsed.write_text("\n".join(self.collapsed_lines()) + "\n", encoding="utf-8")
+        summary.write_text(self.summary(), encoding="utf-8")
+        return collapsed, summary
+
+
+# ---------------------------------------------------------------------------
+# Sampler
+# ---------------------------------------------------------------------------
+
+
+class SamplingProfiler:
+    """
+    Sampler berbasis thread. `owns(thread_id, frame)` memutuskan apakah stack
+    sebuah thread milik target yang sedang diprofile.
+    """
+
+    def __init__(self, label: str, owns: Callable[[int, FrameType], bool], interval_seconds: float = 0.005) -> None:
+        self.result = ProfileResult(
+            profile_id=f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}",
+            label=label,
+            interval_seconds=interval_seconds,
+            duration_seconds=0.0,
+        )
+        self._owns = owns
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> ProfileResult:
+        self._stop.set()
+        self._thread.join()
+        self.result.duration_seconds = time.perf_counter() - self._started
+        return self.result
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        samples = self.result.samples
+        interval = self.result.interval_seconds
+        while not self._stop.wait(interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id and self._owns(thread_id, frame):
+                    samples[_stack(frame)] += 1
+
+
+@contextmanager
+def profile_block(
+    label: str,
+    output_dir: str,
+    interval_seconds: float = 0.005,
+) -> Iterator[SamplingProfiler]:
+    """Profile thread pemanggil selama blok berjalan (dipakai untuk job batch)."""
+    target = threading.get_ident()
+    profiler = SamplingProfiler(label, lambda thread_id, frame: thread_id == target, interval_seconds)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop().write(output_dir)
+
+
+# ---------------------------------------------------------------------------
+# Job
+# ---------------------------------------------------------------------------
+
+_profiled_jobs: FrozenSet[str] = frozenset()
+_output_dir = "logs/profiles"
+_interval_seconds = 0.005
+
+
+def configure_profiling(output_dir: str, interval_ms: float, jobs: str = "") -> None:
+    global _profiled_jobs, _output_dir, _interval_seconds
+    _output_dir = output_dir
+    _interval_seconds = interval_ms / 1000
+    _profiled_jobs = frozenset(name.strip() for name in jobs.split(",") if name.strip())
+
+
+@contextmanager
+def maybe_profile_job(job: str) -> Iterator[None]:
+    if not _profiled_jobs or (job not in _profiled_jobs and "*" not in _profiled_jobs):
+        yield
+        return
+    with profile_block(f"job:{job}", _output_dir, _interval_seconds):
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Request
+# ---------------------------------------------------------------------------
+
+
+# Frame loop worker threadpool anyio; local `context` = Context item yang
+# sedang dijalankan (dihapus setelah item selesai)
+try:
+    from anyio._backends._asyncio import WorkerThread as _AnyioWorkerThread
+
+    _WORKER_RUN_CODE: Optional[CodeType] = _AnyioWorkerThread.run.__code__
+except (ImportError, AttributeError):  # versi anyio lain
+    _WORKER_RUN_CODE = None
+
+
+class ProfileSession:
+    """Sesi profiling satu request; dibuat di dalam coroutine middleware."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.task = asyncio.current_task()
+        # thread id → frame `WorkerThread.run` (None = bukan worker anyio)
+        self._worker_frames: Dict[int, Optional[FrameType]] = {}
+        self.profiler = SamplingProfiler(label, self.owns, _interval_seconds)
+
+    def owns(self, thread_id: int, frame: FrameType) -> bool:
+        if thread_id == self.loop_thread:
+            return asyncio.current_task(self.loop) is self.task
+        if thread_id not in self._worker_frames:
+            self._worker_frames[thread_id] = _find_worker_frame(frame)
+        worker_frame = self._worker_frames[thread_id]
+        if worker_frame is None:
+            return False
+        context = worker_frame.f_locals.get("context")
+        return type(context) is contextvars.Context and context.get(_active_session) is self
+
+
+def _find_worker_frame(frame: Optional[FrameType]) -> Optional[FrameType]:
+    while frame is not None and _WORKER_RUN_CODE is not None:
+        if frame.f_code is _WORKER_RUN_CODE:
+            return frame
+        frame = frame.f_back
+    return None
+
+
+@dataclass
+class _Arming:
+    remaining: int = 0
+    path_prefix: str = ""
+
+
+class ProfilingTriggers:
+    """Arming dari admin endpoint: profile N request berikutnya (per proses)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._arming = _Arming()
+
+    def arm(self, count: int, path_prefix: str = "") -> None:
+        with self._lock:
+            self._arming = _Arming(count, path_prefix)
+
+    def status(self) -> Dict[str, object]:
+        return {"remaining": self._arming.remaining, "path_prefix": self._arming.path_prefix}
+
+    def take(self, path: str) -> bool:
+        if self._arming.remaining <= 0:
+            return False
+        with self._lock:
+            if self._arming.remaining <= 0 or not path.startswith(self._arming.path_prefix):
+                return False
+            self._arming.remaining -= 1
+            return True
+
+
+triggers = ProfilingTriggers()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware: profile request yang di-trigger header atau arming admin."""
+
+    def __init__(self, app, token: Optional[str]) -> None:
+        self.app = app
+        self.token = token.encode("latin-1") if token else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(f"{scope['method']} {scope['path']}")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, session.profiler.result.profile_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = _active_session.set(session)
+        session.profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active_session.reset(token)
+            session.profiler.stop().write(_output_dir)
+
+    def _triggered(self, scope) -> bool:
+        if self.token is not None:
+            for key, value in scope.get("headers", ()):
+                if key == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return triggers.take(scope["path"])
+
+
+def list_profiles(limit: int = 50) -> List[Dict[str, object]]:
+    directory = Path(_output_dir)
+    if not directory.is_dir():
+        return []
+    summaries = sorted(directory.glob("*.summary.txt"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit]
+    profiles = []
+    for path in summaries:
+        profile_id = path.name[: -len(".summary.txt")]
+        first_line = path.read_text(encoding="utf-8").splitlines()[0]
+        profiles.append(
+            {
+                "id": profile_id,
+                "label": first_line.split("(", 1)[-1].rstrip(")"),
+                "collapsed": str(directory / f"{profile_id}.collapsed"),
+                "summary": str(path),
+            }
+        )
+    return profiles
@@ -0,0 +1,63 @@
+"""
+Konteks eksekusi (route HTTP atau nama job) yang sedang berjalan.
+
+Dipakai instrumentasi level engine (slow-query log, tracing) untuk menandai
+statement SQL dengan pemanggilnya tanpa harus meneruskan parameter ke setiap
+service. Nilainya disimpan di `ContextVar`, jadi ikut ke threadpool FastAPI
+(endpoint/dependency sync) dan aman untuk request paralel.
+
+- HTTP: `RequestContextMiddleware` menyimpan ASGI scope; route template baru
+  diketahui setelah routing, jadi label di-resolve saat dibaca.
+- Job batch: `job_scope("billing_run")`.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_http_scope: ContextVar[Optional[dict]] = ContextVar("http_scope", default=None)
+_job_name: ContextVar[Optional[str]] = ContextVar("job_name", default=None)
+
+
+def route_label(scope: dict) -> str:
+    """Route template (mis. `/clients/{client_id}`) supaya kardinalitas label terbatas."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
+def current_operation() -> Optional[str]:
+    """`job:<nama>` atau `<METHOD> <route template>`; None di luar keduanya."""
+    job = _job_name.get()
+    if job is not None:
+        return f"job:{job}"
+    scope = _http_scope.get()
+    if scope is not None:
+        return f"{scope['method']} {route_label(scope)}"
+    return None
+
+
+@contextmanager
+def job_scope(job: str) -> Iterator[None]:
+    token = _job_name.set(job)
+    try:
+        yield
+    finally:
+        _job_name.reset(token)
+
+
+class RequestContextMiddleware:
+    """ASGI middleware yang mengisi konteks HTTP untuk `current_operation`."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _http_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _http_scope.reset(token)
@@ -0,0 +1,281 @@
+"""
+Distributed tracing (OpenTelemetry) untuk API, database, integrasi eksternal dan job.
+
+Span yang dibuat:
+- `TracingMiddleware`        : satu span SERVER per request, nama `<METHOD> <route template>`;
+  header `traceparent` dari pemanggil (W3C Trace Context) dipakai sebagai parent.
+  Dilewati bila FastAPI sudah punya telemetry bawaan (`NATIVE_FASTAPI_TELEMETRY`).
+- `instrument_engine_tracing`: span CLIENT per statement SQL (`db.statement`), hanya
+  bila sudah ada span aktif, supaya query di luar request/job tidak membuat
+  trace yatim (mis. scrape /metrics).
+- `TracedTransport` / `AsyncTracedTransport`: transport httpx untuk client integrasi
+  (Xendit, Gmail, LLM, Cosmic); span CLIENT per request + inject header `traceparent`.
+- `integration_span`         : span manual untuk SDK yang bukan httpx.
+- `track_job` (app.core.metrics) membuka span `job <nama>`.
+
+Propagasi lintas proses lewat database: `current_traceparent()` disimpan di
+kolom `traceparent` (WEBHOOK_EVENTS, PROVISIONING_TASKS), lalu worker memakai
+`context_from_traceparent()` sebagai parent span eksekusinya. Trace webhook →
+provisioning jadi satu trace walaupun dieksekusi menit kemudian di proses lain.
+
+Exporter: `JsonLinesSpanExporter` menulis satu span per baris (format
+`ReadableSpan.to_json`) ke `TRACING_EXPORT_PATH` untuk analisis offline.
+Saat `TRACING_ENABLED=false` tracer API OpenTelemetry bersifat no-op.
+"""
+
+import importlib.util
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import httpx
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.request_context import route_label
+
+tracer = trace.get_tracer("cloudsales")
+
+_propagator = TraceContextTextMapPropagator()
+
+MAX_STATEMENT_CHARS = 2_000
+
+# FastAPI versi baru membuat span SERVER sendiri begitu TracerProvider SDK
+# terpasang; `TracingMiddleware` hanya dipakai bila fitur itu tidak ada.
+NATIVE_FASTAPI_TELEMETRY = importlib.util.find_spec("fastapi.telemetry") is not None
+
+
+# ---------------------------------------------------------------------------
+# Setup & exporter
+# ---------------------------------------------------------------------------
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Exporter ke file lokal: satu span JSON per baris."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = [json.dumps(json.loads(span.to_json()), separators=(",", ":")) for span in spans]
+        with self._lock:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_provider: Optional[TracerProvider] = None
+
+
+def configure_tracing(service_name: str, export_path: str, sample_ratio: float = 1.0) -> TracerProvider:
+    """Pasang TracerProvider global (idempotent)."""
+    global _provider
+    if _provider is None:
+        _provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name}),
+            sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+        )
+        _provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(export_path)))
+        trace.set_tracer_provider(_provider)
+    return _provider
+
+
+# ---------------------------------------------------------------------------
+# Propagasi konteks
+# ---------------------------------------------------------------------------
+
+
+def current_traceparent() -> Optional[str]:
+    """Header W3C `traceparent` span aktif; None bila tidak ada span yang di-sample."""
+    carrier: dict = {}
+    _propagator.inject(carrier)
+    return carrier.get("traceparent")
+
+
+def context_from_traceparent(traceparent: Optional[str]) -> Optional[Context]:
+    if not traceparent:
+        return None
+    return _propagator.extract({"traceparent": traceparent})
+
+
+# ---------------------------------------------------------------------------
+# FastAPI
+# ---------------------------------------------------------------------------
+
+
+class TracingMiddleware:
+    """ASGI middleware: satu span SERVER per request HTTP."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=_propagator.extract(headers),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Route template baru diketahui setelah routing
+                route = route_label(scope)
+                span.update_name(f"{scope['method']} {route}")
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+
+_SPAN_STACK_KEY = "_tracing_spans"
+
+
+def instrument_engine_tracing(engine: Engine) -> None:
+    if getattr(engine, "_tracing_instrumented", False):
+        return
+    engine._tracing_instrumented = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.setdefault(_SPAN_STACK_KEY, [])
+        if not trace.get_current_span().is_recording():
+            stack.append(None)
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        stack.append(
+            tracer.start_span(
+                f"db {operation}",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "db.system": "postgresql",
+                    "db.operation.name": operation,
+                    "db.statement": statement[:MAX_STATEMENT_CHARS],
+                    "db.executemany": bool(executemany),
+                },
+            )
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get(_SPAN_STACK_KEY)
+        span = stack.pop() if stack else None
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.response.rows", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        stack = conn.info.get(_SPAN_STACK_KEY) if conn is not None else None
+        span = stack.pop() if stack else None
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+
+
+# ---------------------------------------------------------------------------
+# Integrasi eksternal
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def integration_span(system: str, operation: str, **attributes) -> Iterator[Span]:
+    """Span CLIENT untuk panggilan ke sistem eksternal (`peer.service` = system)."""
+    with tracer.start_as_current_span(
+        f"{system} {operation}",
+        kind=SpanKind.CLIENT,
+        attributes={"peer.service": system, **attributes},
+    ) as span:
+        yield span
+
+
+class TracedTransport(httpx.BaseTransport):
+    """
+    Bungkus transport httpx: span per request + header `traceparent`.
+
+        client = httpx.Client(base_url=..., transport=TracedTransport("xendit"))
+    """
+
+    def __init__(self, system: str, transport: Optional[httpx.BaseTransport] = None) -> None:
+        self.system = system
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with integration_span(
+            self.system,
+            request.method,
+            **{"http.request.method": request.method, "server.address": request.url.host},
+        ) as span:
+            carrier: dict = {}
+            _propagator.inject(carrier)
+            request.headers.update(carrier)
+            response = self._transport.handle_request(request)
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status(Status(StatusCode.ERROR))
+            return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncTracedTransport(httpx.AsyncBaseTransport):
+    """Versi async `TracedTransport` untuk `httpx.AsyncClient`."""
+
+    def __init__(self, system: str, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self.system = system
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with integration_span(
+            self.system,
+            request.method,
+            **{"http.request.method": request.method, "server.address": request.url.host},
+        ) as span:
+            carrier: dict = {}
+            _propagator.inject(carrier)
+            request.headers.update(carrier)
+            response = await self._transport.handle_async_request(request)
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status(Status(StatusCode.ERROR))
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
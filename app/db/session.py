@@ -1,6 +1,10 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.profiling import configure_profiling
+from app.core.tracing import configure_tracing, instrument_engine_tracing
+from app.db.slow_query import install_slow_query_log
 
 engine = create_engine(
     settings.DATABASE_URL,
@@ -8,4 +12,25 @@ engine = create_engine(
     echo=False,
 )
 
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+
+if settings.TRACING_ENABLED:
+    configure_tracing(settings.PROJECT_NAME, settings.TRACING_EXPORT_PATH, settings.TRACING_SAMPLE_RATIO)
+    instrument_engine_tracing(engine)
+
+if settings.PROFILING_ENABLED or settings.PROFILE_JOBS:
+    configure_profiling(settings.PROFILING_OUTPUT_DIR, settings.PROFILING_INTERVAL_MS, settings.PROFILE_JOBS)
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    install_slow_query_log(
+        engine,
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        log_path=settings.SLOW_QUERY_LOG_PATH,
+        explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        explain_max_per_minute=settings.SLOW_QUERY_EXPLAIN_MAX_PER_MINUTE,
+        max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backup_count=settings.SLOW_QUERY_LOG_BACKUP_COUNT,
+    )
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
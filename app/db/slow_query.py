@@ -0,0 +1,253 @@
+"""
+Slow-query log dengan capture EXPLAIN otomatis.
+
+Setiap statement yang durasinya >= `SLOW_QUERY_THRESHOLD_MS` ditulis sebagai
+satu baris JSON ke file rotating (`SLOW_QUERY_LOG_PATH`):
+
+    {"kind": "slow_query", "id": ..., "duration_ms": ..., "operation": "GET /clients/{client_id}",
+     "statement": "SELECT ...", "params": {"id_1": "UUID"}, "executemany": 1, "explain": "queued"}
+
+- `params` hanya berisi *bentuk* bind parameter (tipe, panjang list), bukan
+  nilainya, supaya data client tidak bocor ke log.
+- `operation` diambil dari `app.core.request_context` (route HTTP / nama job).
+
+Sebagian (`SLOW_QUERY_EXPLAIN_SAMPLE_RATE`) juga di-EXPLAIN, dibatasi
+`SLOW_QUERY_EXPLAIN_MAX_PER_MINUTE`. EXPLAIN dijalankan oleh satu thread
+background di koneksi terpisah (engine NullPool sendiri, tidak memakan slot
+pool aplikasi), di transaksi READ ONLY yang selalu di-rollback dan dengan
+`statement_timeout`. Hasilnya ditulis sebagai baris `"kind": "explain"` dengan
+`id` yang sama.
+
+- SELECT/WITH read-only → `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`.
+- DML atau `SELECT ... FOR UPDATE/SHARE` → `EXPLAIN (FORMAT JSON)` tanpa
+  ANALYZE: menjalankan ulang write tidak aman, dan row lock transaksi asal
+  masih dipegang sehingga ANALYZE akan menunggu.
+- executemany tidak di-EXPLAIN.
+"""
+
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.core.request_context import current_operation
+
+logger = logging.getLogger("cloudsales.slow_query")
+
+_QUERY_START_KEY = "_slow_query_start"
+_WHITESPACE = re.compile(r"\s+")
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(UPDATE|SHARE|NO\s+KEY\s+UPDATE|KEY\s+SHARE)\b", re.IGNORECASE)
+
+MAX_STATEMENT_CHARS = 10_000
+
+
+def parameter_shape(value: Any) -> str:
+    """Deskripsi tipe bind parameter tanpa nilainya (mis. `list[UUID](50)`)."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (list, tuple)):
+        inner = type(value[0]).__name__ if value else "empty"
+        return f"{type(value).__name__}[{inner}]({len(value)})"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    return type(value).__name__
+
+
+def parameters_shape(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        parameters = parameters[0] if parameters else {}
+    if isinstance(parameters, dict):
+        return {key: parameter_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [parameter_shape(value) for value in parameters]
+    return None
+
+
+def _is_read_only(statement: str) -> bool:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword in ("SELECT", "WITH") and not _LOCKING_CLAUSE.search(statement)
+
+
+class _RateLimiter:
+    """Sliding window: maksimal `limit` izin per `window_seconds`."""
+
+    def __init__(self, limit: int, window_seconds: float = 60.0) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._granted: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            while self._granted and now - self._granted[0] > self.window_seconds:
+                self._granted.popleft()
+            if len(self._granted) >= self.limit:
+                return False
+            self._granted.append(now)
+            return True
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        database_url: str,
+        threshold_ms: float,
+        log_path: str,
+        explain_sample_rate: float = 0.1,
+        explain_max_per_minute: int = 6,
+        explain_timeout_ms: int = 30_000,
+        max_bytes: int = 20 * 1024 * 1024,
+        backup_count: int = 5,
+    ) -> None:
+        self.database_url = database_url
+        self.threshold_seconds = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self._rate_limiter = _RateLimiter(explain_max_per_minute)
+        self._explain_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=16)
+        self._explain_engine: Optional[Engine] = None
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._file_logger = logging.getLogger(f"cloudsales.slow_query.file.{id(self)}")
+        self._file_logger.setLevel(logging.INFO)
+        self._file_logger.propagate = False
+        self._file_logger.addHandler(handler)
+
+    # -- engine events -------------------------------------------------------
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    def _error(self, exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_QUERY_START_KEY):
+            conn.info[_QUERY_START_KEY].pop()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(_QUERY_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if elapsed < self.threshold_seconds:
+            return
+        try:
+            self._record(statement, parameters, executemany, elapsed)
+        except Exception:
+            # Logging tidak boleh menggagalkan query aplikasi
+            logger.exception("gagal menulis slow-query log")
+
+    # -- logging -------------------------------------------------------------
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file_logger.info(json.dumps(record, default=str))
+
+    def _record(self, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        query_id = uuid.uuid4().hex
+        explain = "skipped"
+        if not executemany and random.random() < self.explain_sample_rate:
+            if not self._rate_limiter.allow():
+                explain = "rate_limited"
+            else:
+                try:
+                    self._explain_queue.put_nowait(
+                        {
+                            "id": query_id,
+                            "statement": statement,
+                            "parameters": dict(parameters) if isinstance(parameters, dict) else parameters,
+                            "analyze": _is_read_only(statement),
+                        }
+                    )
+                    self._ensure_worker()
+                    explain = "queued"
+                except queue.Full:
+                    explain = "queue_full"
+
+        self._write(
+            {
+                "kind": "slow_query",
+                "id": query_id,
+                "logged_at": datetime.now(timezone.utc).isoformat(),
+                "duration_ms": round(elapsed * 1000, 3),
+                "operation": current_operation(),
+                "statement": _WHITESPACE.sub(" ", statement).strip()[:MAX_STATEMENT_CHARS],
+                "params": parameters_shape(parameters, executemany),
+                "executemany": len(parameters) if executemany else 1,
+                "explain": explain,
+            }
+        )
+
+    # -- EXPLAIN worker ------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _run_worker(self) -> None:
+        while True:
+            job = self._explain_queue.get()
+            try:
+                self._write(self.explain(job))
+            except Exception:
+                logger.exception("EXPLAIN slow query gagal")
+            finally:
+                self._explain_queue.task_done()
+
+    def explain(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        if self._explain_engine is None:
+            # Engine terpisah tanpa listener → EXPLAIN tidak ikut tercatat di log ini
+            self._explain_engine = create_engine(self.database_url, future=True, poolclass=NullPool)
+
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if job["analyze"] else "FORMAT JSON"
+        started = time.perf_counter()
+        record: Dict[str, Any] = {"kind": "explain", "id": job["id"], "analyze": job["analyze"]}
+        with self._explain_engine.connect() as connection:
+            try:
+                connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+                connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                connection.exec_driver_sql("SET LOCAL lock_timeout = 1000")
+                plan = connection.exec_driver_sql(f"EXPLAIN ({options}) {job['statement']}", job["parameters"]).scalar()
+                record["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+            except Exception as exc:
+                record["error"] = f"{type(exc).__name__}: {exc}".splitlines()[0]
+            finally:
+                connection.rollback()
+        record["explain_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return record
+
+
+_slow_query_log: Optional[SlowQueryLog] = None
+
+
+def install_slow_query_log(engine: Engine, **kwargs: Any) -> SlowQueryLog:
+    global _slow_query_log
+    if _slow_query_log is None:
+        _slow_query_log = SlowQueryLog(engine.url.render_as_string(hide_password=False), **kwargs)
+        _slow_query_log.install(engine)
+    return _slow_query_log
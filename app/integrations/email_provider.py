@@ -0,0 +1,235 @@
+"""
+Provider pengiriman email (pluggable) untuk worker outbox (`app.services.email_outbox`).
+
+- `GmailApiProvider` : Gmail API `users.messages.send` lewat `httpx.AsyncClient`
+  (span tracing per request via `AsyncTracedTransport`).
+- `SmtpEmailProvider`: SMTP biasa (stdlib `smtplib` di thread). Untuk development
+  & test arahkan ke stand-in lokal `python -m loadtest.smtp_sink`.
+
+Provider membedakan kegagalan sementara (`TransientEmailError`: 429, 5xx,
+koneksi putus, kode SMTP 4xx) yang di-retry worker dengan backoff, dan
+kegagalan permanen (`PermanentEmailError`) yang langsung menandai email FAILED.
+"""
+
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import smtplib
+import threading
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.utils import make_msgid
+from pathlib import Path
+from typing import List, Optional, Protocol
+
+import httpx
+
+from app.core.tracing import AsyncTracedTransport, integration_span
+
+GMAIL_SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/{user}/messages/send"
+
+
+class EmailProviderError(Exception):
+    pass
+
+
+class TransientEmailError(EmailProviderError):
+    """Boleh di-retry; `retry_after` (detik) dari provider bila ada."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PermanentEmailError(EmailProviderError):
+    pass
+
+
+@dataclass
+class EmailAttachment:
+    filename: str
+    content_type: str
+    # File lokal (mis. dari cache artifact); dibaca saat MIME dibuat
+    path: Path
+
+
+@dataclass
+class OutboundEmail:
+    from_email: str
+    to_email: str
+    subject: Optional[str]
+    body: str
+    attachments: List[EmailAttachment] = field(default_factory=list)
+    # Header Message-ID; dibuat sekali per email, jadi sama di setiap retry
+    message_id: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.message_id:
+            self.message_id = make_msgid(domain=self.from_email.rpartition("@")[2] or None)
+
+    def to_mime(self) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.from_email
+        message["To"] = self.to_email
+        message["Subject"] = self.subject or ""
+        message["Message-ID"] = self.message_id
+        message.set_content(self.body)
+        for attachment in self.attachments:
+            maintype, _, subtype = attachment.content_type.partition("/")
+            message.add_attachment(
+                Path(attachment.path).read_bytes(),
+                maintype=maintype,
+                subtype=subtype or "octet-stream",
+                filename=attachment.filename,
+            )
+        return message
+
+
+class EmailProvider(Protocol):
+    async def send(self, email: OutboundEmail) -> str:
+        """Kirim satu email; return message id dari provider."""
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class GmailApiProvider:
+    def __init__(
+        self,
+        access_token: str,
+        user: str = "me",
+        timeout_seconds: float = 30.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        # `me` = pemilik token; alamat mailbox lain untuk delegasi domain-wide
+        self._send_url = GMAIL_SEND_URL.format(user=user)
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout_seconds,
+            headers={"Authorization": f"Bearer {access_token}"},
+            transport=AsyncTracedTransport("gmail"),
+        )
+
+    async def send(self, email: OutboundEmail) -> str:
+        raw = base64.urlsafe_b64encode(email.to_mime().as_bytes()).decode("ascii")
+        try:
+            response = await self._client.post(self._send_url, json={"raw": raw})
+        except httpx.TransportError as exc:
+            raise TransientEmailError(f"{type(exc).__name__}: {exc}") from exc
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("retry-after")
+            raise TransientEmailError(
+                f"Gmail {response.status_code}",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        if response.status_code >= 400:
+            raise PermanentEmailError(f"Gmail {response.status_code}: {response.text[:500]}")
+        return response.json()["id"]
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class SmtpEmailProvider:
+    """
+    SMTP lewat `smtplib` di thread pool sendiri (`max_connections` thread);
+    koneksi dipakai ulang per thread (satu sesi SMTP untuk banyak email, tanpa
+    handshake per pesan). Message id = header `Message-ID` yang kita buat.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout_seconds: float = 30.0,
+        max_connections: int = 10,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout_seconds = timeout_seconds
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_connections, thread_name_prefix="smtp")
+
+    async def send(self, email: OutboundEmail) -> str:
+        with integration_span("smtp", "send", **{"server.address": self.host}):
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._send, email.to_mime())
+
+    def _connection(self) -> smtplib.SMTP:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout_seconds)
+            if self.starttls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password or "")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _drop_connection(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _send(self, message: EmailMessage) -> str:
+        try:
+            self._connection().send_message(message)
+        except smtplib.SMTPResponseException as exc:
+            if exc.smtp_code == 421:
+                self._drop_connection()
+            if 400 <= exc.smtp_code < 500:
+                raise TransientEmailError(f"SMTP {exc.smtp_code}: {exc.smtp_error!r}") from exc
+            raise PermanentEmailError(f"SMTP {exc.smtp_code}: {exc.smtp_error!r}") from exc
+        except smtplib.SMTPRecipientsRefused as exc:
+            codes = [code for code, _ in exc.recipients.values()]
+            if all(400 <= code < 500 for code in codes):
+                raise TransientEmailError(f"SMTP recipients refused: {exc.recipients!r}") from exc
+            raise PermanentEmailError(f"SMTP recipients refused: {exc.recipients!r}") from exc
+        except (smtplib.SMTPServerDisconnected, OSError) as exc:
+            self._drop_connection()
+            raise TransientEmailError(f"{type(exc).__name__}: {exc}") from exc
+        return message["Message-ID"]
+
+    async def aclose(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                await asyncio.to_thread(connection.quit)
+            except Exception:
+                pass
+        self._executor.shutdown(wait=False)
+
+
+def build_provider(settings) -> EmailProvider:
+    """Provider sesuai `settings.EMAIL_PROVIDER` (`smtp` / `gmail`)."""
+    if settings.EMAIL_PROVIDER == "gmail":
+        if not settings.GMAIL_ACCESS_TOKEN:
+            raise EmailProviderError("GMAIL_ACCESS_TOKEN belum di-set")
+        return GmailApiProvider(settings.GMAIL_ACCESS_TOKEN, settings.GMAIL_USER)
+    if settings.EMAIL_PROVIDER == "smtp":
+        return SmtpEmailProvider(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            username=settings.SMTP_USERNAME,
+            password=settings.SMTP_PASSWORD,
+            starttls=settings.SMTP_STARTTLS,
+            max_connections=settings.EMAIL_SEND_CONCURRENCY,
+        )
+    raise EmailProviderError(f"EMAIL_PROVIDER tidak dikenal: {settings.EMAIL_PROVIDER}")
@@ -0,0 +1,111 @@
+"""
+Client LLM untuk drafting email (`app.services.email_drafts`).
+
+Interface-nya batch: `generate_batch(model, prompts)` → satu teks per prompt.
+
+- `GeminiClient`: Gemini API `generateContent`. API sinkronnya tidak punya
+  endpoint multi-prompt, jadi satu batch = beberapa request paralel (dibatasi
+  `concurrency`) dalam satu koneksi HTTP/keep-alive.
+- `FakeLlmClient`: model lokal deterministik untuk test/benchmark offline;
+  latency = `latency_ms` per panggilan + `per_item_ms` per prompt, sehingga
+  efek batching & cache bisa diukur tanpa API key.
+"""
+
+import asyncio
+import hashlib
+from typing import List, Optional, Protocol, Sequence
+
+import httpx
+
+from app.core.tracing import AsyncTracedTransport
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class LlmError(Exception):
+    pass
+
+
+class LlmClient(Protocol):
+    async def generate_batch(self, model: str, prompts: Sequence[str]) -> List[str]:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        api_key: str,
+        concurrency: int = 4,
+        timeout_seconds: float = 60.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self._client = client or httpx.AsyncClient(
+            base_url=GEMINI_BASE_URL,
+            timeout=timeout_seconds,
+            headers={"x-goog-api-key": api_key},
+            transport=AsyncTracedTransport("llm"),
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _generate(self, model: str, prompt: str) -> str:
+        async with self._semaphore:
+            response = await self._client.post(
+                f"/models/{model}:generateContent",
+                json={"contents": [{"role": "user", "parts": [{"text": prompt}]}]},
+            )
+        if response.status_code >= 400:
+            raise LlmError(f"Gemini {response.status_code}: {response.text[:500]}")
+        try:
+            parts = response.json()["candidates"][0]["content"]["parts"]
+        except (KeyError, IndexError) as exc:
+            raise LlmError(f"Respons Gemini tanpa kandidat: {response.text[:500]}") from exc
+        return "".join(part.get("text", "") for part in parts).strip()
+
+    async def generate_batch(self, model: str, prompts: Sequence[str]) -> List[str]:
+        return list(await asyncio.gather(*(self._generate(model, prompt) for prompt in prompts)))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class FakeLlmClient:
+    """Model palsu: body berisi placeholder personalisasi, deterministik per prompt."""
+
+    def __init__(self, latency_ms: float = 800.0, per_item_ms: float = 20.0) -> None:
+        self.latency_seconds = latency_ms / 1000
+        self.per_item_seconds = per_item_ms / 1000
+        self.calls = 0
+        self.prompts = 0
+
+    async def generate_batch(self, model: str, prompts: Sequence[str]) -> List[str]:
+        self.calls += 1
+        self.prompts += len(prompts)
+        await asyncio.sleep(self.latency_seconds + self.per_item_seconds * len(prompts))
+        return [self._draft(model, prompt) for prompt in prompts]
+
+    @staticmethod
+    def _draft(model: str, prompt: str) -> str:
+        variant = hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()[:8]
+        return (
+            "Yth. {{client_name}},\n\n"
+            f"{prompt.splitlines()[0]}\n\n"
+            "Salam,\nTim CloudSales\n"
+            f"[draft {variant}]"
+        )
+
+    async def aclose(self) -> None:
+        pass
+
+
+def build_llm_client(settings) -> LlmClient:
+    """Client sesuai `settings.LLM_PROVIDER` (`gemini` / `fake`)."""
+    if settings.LLM_PROVIDER == "gemini":
+        if not settings.GEMINI_API_KEY:
+            raise LlmError("GEMINI_API_KEY belum di-set")
+        return GeminiClient(settings.GEMINI_API_KEY, concurrency=settings.LLM_CONCURRENCY)
+    if settings.LLM_PROVIDER == "fake":
+        return FakeLlmClient()
+    raise LlmError(f"LLM_PROVIDER tidak dikenal: {settings.LLM_PROVIDER}")
@@ -0,0 +1,155 @@
+"""
+Sumber email inbound untuk `app.services.inbound_email`.
+
+Interface `MailboxSource`:
+- `list_since(cursor)`  → id pesan baru setelah cursor + cursor baru (murah, id saja);
+- `fetch_raw(id)`       → pesan mentah RFC 822 + thread id.
+
+Implementasi:
+- `GmailMailboxSource`: Gmail API `users.history.list` (incremental sejak
+  `historyId`) + `users.messages.get?format=raw`. Cursor kosong = mulai dari
+  `historyId` profil saat ini (pesan lama tidak diimpor).
+- `LocalMailboxSource`: direktori file `.eml` (fixture pengganti Gmail, lihat
+  `loadtest.mailbox_fixture`). Cursor = nama file terakhir (urut leksikal).
+"""
+
+import asyncio
+import base64
+from dataclasses import dataclass
+from email.parser import BytesHeaderParser
+from pathlib import Path
+from typing import List, Optional, Protocol
+
+import httpx
+
+from app.core.tracing import AsyncTracedTransport
+
+GMAIL_BASE_URL = "https://gmail.googleapis.com/gmail/v1/users"
+
+# Header fixture lokal untuk meniru id Gmail
+LOCAL_MESSAGE_ID_HEADER = "X-Gmail-Message-Id"
+LOCAL_THREAD_ID_HEADER = "X-Gmail-Thread-Id"
+
+
+class MailboxError(Exception):
+    pass
+
+
+class MailboxCursorExpiredError(MailboxError):
+    """`historyId` terlalu lama (Gmail hanya menyimpan history terbatas); perlu reset cursor."""
+
+
+@dataclass
+class MailboxChanges:
+    message_ids: List[str]
+    cursor: str
+
+
+@dataclass
+class RawMessage:
+    message_id: str
+    thread_id: Optional[str]
+    raw: bytes
+
+
+class MailboxSource(Protocol):
+    name: str
+
+    async def list_since(self, cursor: Optional[str]) -> MailboxChanges:
+        ...
+
+    async def fetch_raw(self, message_id: str) -> RawMessage:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class GmailMailboxSource:
+    def __init__(self, access_token: str, user: str = "me", timeout_seconds: float = 30.0) -> None:
+        self.name = user
+        self._client = httpx.AsyncClient(
+            base_url=f"{GMAIL_BASE_URL}/{user}",
+            timeout=timeout_seconds,
+            headers={"Authorization": f"Bearer {access_token}"},
+            transport=AsyncTracedTransport("gmail"),
+        )
+
+    async def _get(self, path: str, **params) -> dict:
+        response = await self._client.get(path, params=params)
+        if response.status_code == 404 and path == "/history":
+            raise MailboxCursorExpiredError("startHistoryId sudah tidak tersedia di Gmail")
+        if response.status_code >= 400:
+            raise MailboxError(f"Gmail {response.status_code}: {response.text[:500]}")
+        return response.json()
+
+    async def list_since(self, cursor: Optional[str]) -> MailboxChanges:
+        if cursor is None:
+            profile = await self._get("/profile")
+            return MailboxChanges([], str(profile["historyId"]))
+
+        message_ids: List[str] = []
+        seen = set()
+        page_token = None
+        history_id = cursor
+        while True:
+            params = {"startHistoryId": cursor, "historyTypes": "messageAdded", "maxResults": 500}
+            if page_token:
+                params["pageToken"] = page_token
+            page = await self._get("/history", **params)
+            for record in page.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    message = added["message"]
+                    # Pesan keluar (SENT) sudah tercatat sebagai OUTBOUND
+                    if "SENT" in message.get("labelIds", []) or message["id"] in seen:
+                        continue
+                    seen.add(message["id"])
+                    message_ids.append(message["id"])
+            history_id = str(page.get("historyId", history_id))
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return MailboxChanges(message_ids, history_id)
+
+    async def fetch_raw(self, message_id: str) -> RawMessage:
+        message = await self._get(f"/messages/{message_id}", format="raw")
+        return RawMessage(message["id"], message.get("threadId"), base64.urlsafe_b64decode(message["raw"]))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class LocalMailboxSource:
+    def __init__(self, directory: str, name: str = "local") -> None:
+        self.name = name
+        self.directory = Path(directory)
+        self._paths = {}
+
+    async def list_since(self, cursor: Optional[str]) -> MailboxChanges:
+        paths = sorted(path for path in self.directory.glob("*.eml") if cursor is None or path.name > cursor)
+        headers = BytesHeaderParser()
+        message_ids = []
+        for path in paths:
+            with path.open("rb") as file:
+                message_id = headers.parse(file)[LOCAL_MESSAGE_ID_HEADER] or path.stem
+            self._paths[message_id] = path
+            message_ids.append(message_id)
+        return MailboxChanges(message_ids, paths[-1].name if paths else (cursor or ""))
+
+    async def fetch_raw(self, message_id: str) -> RawMessage:
+        raw = await asyncio.to_thread(self._paths[message_id].read_bytes)
+        thread_id = BytesHeaderParser().parsebytes(raw)[LOCAL_THREAD_ID_HEADER]
+        return RawMessage(message_id, thread_id, raw)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def build_mailbox_source(settings) -> MailboxSource:
+    """Sumber sesuai `settings.INBOUND_MAILBOX` (`gmail` / `local`)."""
+    if settings.INBOUND_MAILBOX == "gmail":
+        if not settings.GMAIL_ACCESS_TOKEN:
+            raise MailboxError("GMAIL_ACCESS_TOKEN belum di-set")
+        return GmailMailboxSource(settings.GMAIL_ACCESS_TOKEN, settings.GMAIL_USER)
+    if settings.INBOUND_MAILBOX == "local":
+        return LocalMailboxSource(settings.INBOUND_LOCAL_MAILBOX_DIR)
+    raise MailboxError(f"INBOUND_MAILBOX tidak dikenal: {settings.INBOUND_MAILBOX}")
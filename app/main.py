@@ -3,8 +3,35 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.api.routes import clients, email_search, files, metrics, profiling, reports, webhooks
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, register_backlog_collector
+from app.core.profiling import ProfilingMiddleware
+from app.core.request_context import RequestContextMiddleware
+from app.core.tracing import NATIVE_FASTAPI_TELEMETRY, TracingMiddleware
+from app.db.session import engine
 
 app = FastAPI(title="Subscription Platform")
+app.include_router(webhooks.router)
+app.include_router(email_search.router)
+app.include_router(files.router)
+app.include_router(clients.router)
+app.include_router(reports.router)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    register_backlog_collector(engine, settings.METRICS_BACKLOG_TTL_SECONDS)
+    app.include_router(metrics.router)
+
+if settings.TRACING_ENABLED and not NATIVE_FASTAPI_TELEMETRY:
+    app.add_middleware(TracingMiddleware)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, token=settings.PROFILING_TOKEN)
+    app.include_router(profiling.router)
+
+# Paling luar: konteks route/job untuk slow-query log
+app.add_middleware(RequestContextMiddleware)
 
 @app.get("/health")
 def health_check(db: Session = Depends(get_db)):
@@ -0,0 +1,49 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Index, Integer, String, text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class Artifact(Base):
+    """
+    Cache lokal file dokumen (PDF quotation, invoice, faktur pajak).
+
+    - url        : URL sumber (Cosmic / upload Finance) atau URL internal
+      `artifact://...` untuk file yang dibuat sendiri.
+    - sha256     : isi file di disk (`ARTIFACT_CACHE_DIR/ab/abcdef...`),
+      content-addressed: URL berbeda dengan isi sama berbagi satu file.
+    - pinned     : file tanpa sumber remote (tidak boleh di-evict).
+    - last_accessed_at : urutan LRU untuk eviction saat ukuran melewati batas.
+    """
+
+    __tablename__ = "artifacts"
+
+    url = Column(String(2048), primary_key=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    size_bytes = Column(BigInteger, nullable=False)
+    content_type = Column(String(255), nullable=False, default="application/octet-stream")
+    pinned = Column(Boolean, nullable=False, default=False, server_default="false")
+    hit_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    fetched_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    last_accessed_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    __table_args__ = (
+        # Eviction LRU: entry non-pinned paling lama tidak diakses
+        Index(
+            "ix_artifacts_lru",
+            "last_accessed_at",
+            postgresql_where=text("NOT pinned"),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Artifact(url={self.url}, sha256={self.sha256[:12]}, size={self.size_bytes})>"
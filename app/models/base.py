@@ -10,3 +10,11 @@ from app.models.wallet import WalletAccount, WalletTransaction  # noqa
 from app.models.email_log import EmailLog  # noqa
 from app.models.webhook_event import WebhookEvent  # noqa
 from app.models.provisioning_task import ProvisioningTask  # noqa
+from app.models.email_body import EmailBody, EmailBodyDictionary  # noqa
+from app.models.llm_draft import LlmDraftCache  # noqa
+from app.models.mailbox_cursor import MailboxCursor  # noqa
+from app.models.document_counter import DocumentCounter  # noqa
+from app.models.exchange_rate import ExchangeRate  # noqa
+from app.models.artifact import Artifact  # noqa
+from app.models.revenue import RevenueDirtySubscription, RevenueSummary, SubscriptionRevenue  # noqa
+from app.models.risk_score import ClientRiskScore  # noqa
@@ -8,8 +8,10 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Numeric,
     String,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -67,6 +69,10 @@ class BillingCycle(Base):
     # Mata uang invoice Finance (saat ini IDR)
     currency = Column(String(10), nullable=False, default="IDR")
 
+    # Kurs REPORTING_CURRENCY → currency pada period_start (dari EXCHANGE_RATES
+    # saat cycle dibuat); NULL = sama dengan mata uang reporting / kurs belum ada
+    exchange_rate = Column(Numeric(18, 6), nullable=True)
+
     # Status lifecycle billing cycle
     status = Column(
         Enum(BillingCycleStatus, name="billing_cycle_status"),
@@ -120,8 +126,35 @@ class BillingCycle(Base):
         back_populates="billing_cycle",
     )
 
-    # Satu billing cycle → banyak email logs
+    # Satu billing cycle → banyak email logs (invoice request, reminder, status pembayaran).
+    # Pointer polimorfik di EMAIL_LOGS, join condition ditulis eksplisit.
     email_logs = relationship(
         "EmailLog",
         back_populates="billing_cycle",
+        primaryjoin="and_(BillingCycle.id == foreign(EmailLog.related_id), "
+        "EmailLog.related_type.in_(['INVOICE_REQUEST', 'REMINDER', 'PAYMENT_STATUS']))",
+        overlaps="email_logs,quotation",
+    )
+
+    __table_args__ = (
+        # Billing cycle yang belum lunas, diurut due_date (gauge backlog /metrics, reminder)
+        Index(
+            "ix_billing_cycles_open_due_date",
+            "due_date",
+            postgresql_where=text("status NOT IN ('PAID', 'CANCELLED')"),
+        ),
+        # Antrian render draft invoice PDF (keyset per id)
+        Index(
+            "ix_billing_cycles_invoice_pending",
+            "id",
+            postgresql_where=text("invoice_file_url IS NULL"),
+        ),
+        # Ringkasan client: billing cycle belum lunas per subscription
+        Index(
+            "ix_billing_cycles_open_subscription_id",
+            "subscription_id",
+            postgresql_where=text("status NOT IN ('PAID', 'CANCELLED')"),
+        ),
+        # Export analitik inkremental (watermark updated_at)
+        Index("ix_billing_cycles_updated_at", "updated_at"),
     )
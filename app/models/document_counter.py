@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class DocumentCounter(Base):
+    """
+    Counter nomor dokumen per (prefix, tahun), mis. ("QUO", 2025).
+
+    - next_value : nomor berikutnya yang belum pernah di-lease.
+
+    Worker tidak mengambil nomor satu per satu dari sini, melainkan me-lease
+    blok (`next_value += block_size`) lalu membagikannya dari memori; lihat
+    `app.services.document_numbers`.
+    """
+
+    __tablename__ = "document_counters"
+
+    prefix = Column(String(20), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    next_value = Column(BigInteger, nullable=False, default=1)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<DocumentCounter(prefix={self.prefix}, year={self.year}, next_value={self.next_value})>"
@@ -0,0 +1,187 @@
+import hashlib
+import zlib
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, SmallInteger, String, cast, select
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR, insert as pg_insert
+from sqlalchemy.orm import Session, deferred, relationship
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+CODEC_RAW = "raw"
+CODEC_ZLIB = "zlib"
+
+# Tanpa dictionary, body pendek hampir tidak mengecil (header zlib)
+MIN_COMPRESS_BYTES = 64
+
+# Konfigurasi text search untuk `search_vector` & query pencarian; harus sama
+# dengan fungsi trigger `email_logs_search_vector` (migration f4b8c2d7e915)
+SEARCH_TEXT_CONFIG = "indonesian"
+
+
+def body_hash(text: str) -> bytes:
+    """SHA-256 dari body (UTF-8, sebelum kompresi) — kunci content-addressed."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def encode_body(text: str, zdict: Optional[bytes] = None) -> Tuple[bytes, str, bytes, int]:
+    """
+    text → (hash, codec, content, size_bytes).
+
+    `zdict` = preset dictionary zlib (`EmailBodyDictionary`); dengan
+    dictionary, body template pendek pun mengecil karena frasa bakunya sudah
+    ada di dictionary.
+    """
+    raw = text.encode("utf-8")
+    digest = hashlib.sha256(raw).digest()
+    if zdict or len(raw) >= MIN_COMPRESS_BYTES:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS, zdict=zdict) if zdict else zlib.compressobj(6)
+        compressed = compressor.compress(raw) + compressor.flush()
+        if len(compressed) < len(raw):
+            return digest, CODEC_ZLIB, compressed, len(raw)
+    return digest, CODEC_RAW, raw, len(raw)
+
+
+def decode_body(codec: str, content: bytes, zdict: Optional[bytes] = None) -> str:
+    if codec == CODEC_ZLIB:
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS, zdict=zdict) if zdict else zlib.decompressobj()
+        return (decompressor.decompress(bytes(content)) + decompressor.flush()).decode("utf-8")
+    if codec == CODEC_RAW:
+        return bytes(content).decode("utf-8")
+    raise ValueError(f"Codec body tidak dikenal: {codec}")
+
+
+class EmailBodyDictionary(Base):
+    """
+    Preset dictionary zlib (maks. 32 KB) hasil training dari sampel body.
+
+    Immutable: body yang dikompresi dengan dictionary tertentu selalu butuh
+    dictionary yang sama untuk dibaca. Dictionary aktif = id terbesar.
+    """
+
+    __tablename__ = "email_body_dictionaries"
+
+    id = Column(SmallInteger, primary_key=True, autoincrement=True)
+    content = Column(LargeBinary, nullable=False)
+    sample_size = Column(Integer, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<EmailBodyDictionary(id={self.id}, bytes={len(self.content)})>"
+
+
+class EmailBody(Base):
+    """
+    Body email / prompt AI yang disimpan sekali per konten (content-addressed).
+
+    - hash          : SHA-256 body asli (primary key), dirujuk EMAIL_LOGS
+                      (`ai_prompt_hash`, `ai_generated_body_hash`, `final_body_hash`).
+    - codec         : `zlib` atau `raw` (body pendek / tidak mengecil).
+    - dictionary_id : preset dictionary zlib yang dipakai (NULL = tanpa dictionary).
+    - content       : body setelah kompresi.
+    - size_bytes    : ukuran body asli (UTF-8).
+    - search_vector : `to_tsvector` body, dihitung sekali per konten saat
+                      insert; dipakai trigger `email_logs.search_vector`.
+
+    Hash hanya bergantung pada teks, jadi insert memakai `ON CONFLICT DO NOTHING`
+    dan body boleh dikompres ulang (dictionary baru) tanpa mengubah referensi.
+    """
+
+    __tablename__ = "email_bodies"
+
+    hash = Column(LargeBinary(32), primary_key=True)
+    codec = Column(String(10), nullable=False, default=CODEC_ZLIB)
+    dictionary_id = Column(SmallInteger, ForeignKey("email_body_dictionaries.id"), nullable=True)
+    content = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    # Deferred: tidak ikut di-load saat body dibaca
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    # Many-to-one by PK: satu query per session, sisanya dari identity map
+    dictionary = relationship(EmailBodyDictionary)
+
+    # Cache teks (bukan kolom)
+    _text = None
+
+    @classmethod
+    def pending(cls, text: str) -> "EmailBody":
+        """Body baru yang belum dikompres; encode dilakukan saat flush."""
+        body = cls(hash=body_hash(text))
+        body._text = text
+        return body
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            zdict = self.dictionary.content if self.dictionary_id is not None else None
+            self._text = decode_body(self.codec, self.content, zdict)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"<EmailBody(hash={bytes(self.hash).hex()[:12]}, codec={self.codec}, size_bytes={self.size_bytes})>"
+
+
+_ACTIVE_DICTIONARY_KEY = "email_body_active_dictionary"
+
+
+class ActiveDictionary(NamedTuple):
+    id: int
+    content: bytes
+
+
+def active_dictionary(session: Session) -> Optional[ActiveDictionary]:
+    """
+    Dictionary terbaru, di-cache per session (dictionary baru jarang dibuat).
+
+    Disimpan sebagai nilai biasa, bukan instance ORM, supaya tetap terbaca
+    setelah commit / expunge.
+    """
+    if _ACTIVE_DICTIONARY_KEY not in session.info:
+        row = session.execute(
+            select(EmailBodyDictionary.id, EmailBodyDictionary.content)
+            .order_by(EmailBodyDictionary.id.desc())
+            .limit(1)
+        ).first()
+        session.info[_ACTIVE_DICTIONARY_KEY] = ActiveDictionary(row.id, bytes(row.content)) if row else None
+    return session.info[_ACTIVE_DICTIONARY_KEY]
+
+
+def reset_active_dictionary(session: Session) -> None:
+    session.info.pop(_ACTIVE_DICTIONARY_KEY, None)
+
+
+def insert_bodies(session: Session, texts: Iterable[str]) -> None:
+    """
+    Encode + insert body yang belum ada (dedup via ON CONFLICT, satu
+    statement). Teks masih ada di sini, jadi vektor full-text body dihitung
+    PostgreSQL di INSERT yang sama.
+    """
+    dictionary = active_dictionary(session)
+    zdict = dictionary.content if dictionary is not None else None
+    rows = {}
+    for text in texts:
+        digest, codec, content, size = encode_body(text, zdict)
+        rows[digest] = {
+            "hash": digest,
+            "codec": codec,
+            "dictionary_id": dictionary.id if zdict and codec == CODEC_ZLIB else None,
+            "content": content,
+            "size_bytes": size,
+            "search_vector": func.to_tsvector(cast(SEARCH_TEXT_CONFIG, REGCONFIG), text),
+        }
+    if rows:
+        session.execute(
+            pg_insert(EmailBody).values(list(rows.values())).on_conflict_do_nothing(index_elements=["hash"])
+        )
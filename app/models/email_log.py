@@ -1,21 +1,26 @@
 import uuid
 from enum import Enum
 
+from typing import Dict, Optional
+
 from sqlalchemy import (
     Column,
     String,
     Boolean,
     DateTime,
-    Text,
     Enum as SAEnum,
     ForeignKey,
     Index,
+    LargeBinary,
+    event,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID, JSONB
+from sqlalchemy.orm import Session, deferred, relationship
 from sqlalchemy.sql import func
 
 from app.db.base import Base
+from app.models.email_body import EmailBody, insert_bodies
 
 
 class EmailDirection(str, Enum):
@@ -106,6 +111,23 @@ class EmailLog(Base):
         nullable=True,
     )
 
+    # Entitas terkait via pointer polimorfik (tanpa FK fisik)
+    quotation = relationship(
+        "Quotation",
+        back_populates="email_logs",
+        primaryjoin="and_(foreign(EmailLog.related_id) == Quotation.id, "
+        "EmailLog.related_type == 'QUOTATION')",
+        overlaps="billing_cycle,email_logs",
+    )
+
+    billing_cycle = relationship(
+        "BillingCycle",
+        back_populates="email_logs",
+        primaryjoin="and_(foreign(EmailLog.related_id) == BillingCycle.id, "
+        "EmailLog.related_type.in_(['INVOICE_REQUEST', 'REMINDER', 'PAYMENT_STATUS']))",
+        overlaps="quotation,email_logs",
+    )
+
     # User terkait (Sales/Admin/Finance/Client) – optional
     user_id = Column(
         UUID(as_uuid=True),
@@ -126,9 +148,17 @@ class EmailLog(Base):
 
     # Informasi AI
     ai_model = Column(String(100), nullable=True)        # contoh: "gemini-1.5-pro"
-    ai_prompt = Column(Text, nullable=True)
-    ai_generated_body = Column(Text, nullable=True)      # draft hasil AI
-    final_body = Column(Text, nullable=True)             # body final yang benar-benar dikirim/disimpan
+
+    # Body besar disimpan sekali per konten di EMAIL_BODIES (terkompresi);
+    # di sini hanya referensi hash. Akses teks lewat property `ai_prompt`,
+    # `ai_generated_body`, `final_body` (lazy: query EMAIL_BODIES saat dibaca).
+    ai_prompt_hash = Column(LargeBinary(32), ForeignKey("email_bodies.hash"), nullable=True)
+    ai_generated_body_hash = Column(LargeBinary(32), ForeignKey("email_bodies.hash"), nullable=True)  # draft hasil AI
+    final_body_hash = Column(LargeBinary(32), ForeignKey("email_bodies.hash"), nullable=True)         # body final yang dikirim
+
+    ai_prompt_content = relationship(EmailBody, foreign_keys=[ai_prompt_hash], viewonly=True)
+    ai_generated_body_content = relationship(EmailBody, foreign_keys=[ai_generated_body_hash], viewonly=True)
+    final_body_content = relationship(EmailBody, foreign_keys=[final_body_hash], viewonly=True)
 
     # Status lifecycle email (DRAFT, SENT, FAILED, RECEIVED, PARSED)
     status = Column(
@@ -137,14 +167,30 @@ class EmailLog(Base):
         default=EmailStatus.DRAFT,
     )
 
-    # Metadata terkait Gmail / provider lain
+    # Metadata terkait Gmail / provider lain: id pesan di provider (Gmail API id,
+    # atau Message-ID untuk SMTP / mailbox lokal)
     gmail_message_id = Column(String(255), nullable=True)
+    # Header `Message-ID` RFC 5322 (`<...>`); dicocokkan dengan In-Reply-To /
+    # References balasan yang masuk (`app.services.inbound_email`)
+    rfc_message_id = Column(String(998), nullable=True)
+
+    # Lease worker outbox: DRAFT dengan lease yang masih berlaku sedang dikirim
+    # worker lain (`app.services.email_outbox.claim_drafts`)
+    send_lease_until = Column(DateTime(timezone=True), nullable=True)
 
     # Lampiran
     has_attachments = Column(Boolean, nullable=False, default=False)
     attachments_meta_json = Column(JSONB, nullable=True)
     # contoh isi JSON: [{ "filename": "invoice-123.pdf", "mime_type": "application/pdf", ... }, ...]
 
+    # Full-text search subject (bobot A) + final body (bobot B). Diisi trigger
+    # `email_logs_search_vector` saat INSERT / UPDATE subject atau
+    # final_body_hash (termasuk tulis di luar ORM); vektor body diambil dari
+    # `email_bodies.search_vector` karena teksnya terkompresi. Deferred: tidak
+    # ikut di-load di query biasa; tanpa FetchedValue supaya INSERT tidak
+    # me-RETURNING vektor yang tidak dipakai.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
     # Waktu penting
     sent_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -173,6 +219,11 @@ class EmailLog(Base):
             "ix_email_logs_gmail_message_id",
             "gmail_message_id",
         ),
+        # Threading balasan inbound
+        Index(
+            "ix_email_logs_rfc_message_id",
+            "rfc_message_id",
+        ),
         # Untuk cepat ambil semua email per user
         Index(
             "ix_email_logs_user_id",
@@ -183,4 +234,91 @@ class EmailLog(Base):
             "ix_email_logs_direction",
             "direction",
         ),
+        # Antrian draft yang belum dikirim (gauge backlog /metrics)
+        Index(
+            "ix_email_logs_draft_created_at",
+            "created_at",
+            postgresql_where=text("status = 'DRAFT'"),
+        ),
+        # Pencarian full-text (`app.services.email_search`)
+        Index(
+            "ix_email_logs_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
     )
+
+    # ==========================
+    # Body (content-addressed)
+    # ==========================
+
+    def _get_body(self, field: str) -> Optional[str]:
+        pending: Dict[str, Optional[EmailBody]] = self.__dict__.get("_pending_bodies", {})
+        if field in pending:
+            body = pending[field]
+        else:
+            body = getattr(self, f"{field}_content")
+        return body.text if body is not None else None
+
+    def _set_body(self, field: str, value: Optional[str]) -> None:
+        body = EmailBody.pending(value) if value is not None else None
+        self.__dict__.setdefault("_pending_bodies", {})[field] = body
+        setattr(self, f"{field}_hash", body.hash if body is not None else None)
+
+    @property
+    def ai_prompt(self) -> Optional[str]:
+        return self._get_body("ai_prompt")
+
+    @ai_prompt.setter
+    def ai_prompt(self, value: Optional[str]) -> None:
+        self._set_body("ai_prompt", value)
+
+    @property
+    def ai_generated_body(self) -> Optional[str]:
+        return self._get_body("ai_generated_body")
+
+    @ai_generated_body.setter
+    def ai_generated_body(self, value: Optional[str]) -> None:
+        self._set_body("ai_generated_body", value)
+
+    @property
+    def final_body(self) -> Optional[str]:
+        return self._get_body("final_body")
+
+    @final_body.setter
+    def final_body(self, value: Optional[str]) -> None:
+        self._set_body("final_body", value)
+
+
+_BODIES_IN_TRANSACTION_KEY = "email_bodies_in_transaction"
+
+
+@event.listens_for(Session, "before_flush")
+def _store_pending_bodies(session: Session, flush_context, instances) -> None:
+    """Insert body baru (dedup via ON CONFLICT) sebelum EMAIL_LOGS yang merujuknya."""
+    # Body yang sudah di-insert di transaksi ini (belum commit): hash → EmailBody
+    in_transaction = session.info.setdefault(_BODIES_IN_TRANSACTION_KEY, {})
+    pending = {}
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, EmailLog):
+            # Body tetap disimpan di instance sebagai cache teks; flag `_stored`
+            # (di-set setelah commit) mencegah insert ulang di transaksi berikutnya
+            for body in obj.__dict__.get("_pending_bodies", {}).values():
+                if body is not None and not body.__dict__.get("_stored") and body.hash not in in_transaction:
+                    in_transaction[body.hash] = body
+                    pending[body.hash] = body.text
+    if pending:
+        insert_bodies(session, pending.values())
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_bodies_stored(session: Session) -> None:
+    for body in session.info.pop(_BODIES_IN_TRANSACTION_KEY, {}).values():
+        body.__dict__["_stored"] = True
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_bodies_in_transaction(session: Session, previous_transaction) -> None:
+    # Insert body ikut di-rollback (termasuk rollback savepoint): flush ulang
+    # EmailLog yang sama harus meng-insert body lagi
+    session.info.pop(_BODIES_IN_TRANSACTION_KEY, None)
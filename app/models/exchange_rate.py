@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, Numeric, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ExchangeRate(Base):
+    """
+    EXCHANGE_RATES
+
+    Kurs per pasangan mata uang & waktu berlaku (time series):
+    1 `base_currency` = `rate` `quote_currency`, berlaku sejak `effective_at`
+    sampai titik berikutnya di pasangan yang sama.
+
+    - source : asal data (mis. "csv", "bi-jisdor", "manual").
+
+    Dibaca lewat `app.services.exchange_rates.ExchangeRateCache` (in-memory,
+    binary search), bukan query per konversi.
+    """
+
+    __tablename__ = "exchange_rates"
+
+    base_currency = Column(String(10), primary_key=True)
+    quote_currency = Column(String(10), primary_key=True)
+    effective_at = Column(DateTime(timezone=True), primary_key=True)
+
+    rate = Column(Numeric(18, 6), nullable=False)
+    source = Column(String(50), nullable=False, default="manual")
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExchangeRate({self.base_currency}/{self.quote_currency} "
+            f"at={self.effective_at}, rate={self.rate})>"
+        )
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+from app.models.email_body import EmailBody
+
+
+class LlmDraftCache(Base):
+    """
+    Cache persisten hasil drafting LLM.
+
+    - key_hash   : SHA-256 dari (model, template, prompt ternormalisasi).
+    - prompt_hash / body_hash : prompt & draft di EMAIL_BODIES (content-addressed,
+      jadi draft yang sama dengan EMAIL_LOGS tidak disimpan dua kali).
+    - Draft masih berisi placeholder personalisasi (`{{client_name}}`, dst.);
+      nilai per client diisi setelah cache, sehingga satu entry dipakai semua client.
+
+    Entry lebih tua dari `LLM_DRAFT_CACHE_TTL_DAYS` dianggap miss dan ditimpa.
+    """
+
+    __tablename__ = "llm_draft_cache"
+
+    key_hash = Column(LargeBinary(32), primary_key=True)
+    model = Column(String(100), nullable=False)
+    template = Column(String(100), nullable=False)
+    prompt_hash = Column(LargeBinary(32), ForeignKey("email_bodies.hash"), nullable=False)
+    body_hash = Column(LargeBinary(32), ForeignKey("email_bodies.hash"), nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
+    body = relationship(EmailBody, foreign_keys=[body_hash], viewonly=True)
+
+    def __repr__(self) -> str:
+        return f"<LlmDraftCache(model={self.model}, template={self.template}, hits={self.hit_count})>"
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class MailboxCursor(Base):
+    """
+    Posisi sinkronisasi inbound per mailbox.
+
+    - mailbox : alamat / nama mailbox (mis. "billing@cloudsales.id").
+    - cursor  : Gmail `historyId` terakhir yang sudah diproses (atau nama file
+                terakhir untuk mailbox lokal).
+
+    Ingestion berikutnya hanya mengambil pesan setelah cursor ini.
+    """
+
+    __tablename__ = "mailbox_cursors"
+
+    mailbox = Column(String(320), primary_key=True)
+    cursor = Column(String(255), nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<MailboxCursor(mailbox={self.mailbox}, cursor={self.cursor})>"
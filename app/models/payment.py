@@ -7,6 +7,8 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum,
+    Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, NUMERIC
 from sqlalchemy.sql import func
@@ -45,6 +47,17 @@ class Payment(Base):
     """
 
     __tablename__ = "payments"
+    __table_args__ = (
+        # Ringkasan client: payment sukses terakhir (index scan mundur, LIMIT 1)
+        Index(
+            "ix_payments_client_paid_at",
+            "client_id",
+            "paid_at",
+            postgresql_where=text("status = 'SUCCESS'"),
+        ),
+        # Export analitik inkremental (watermark updated_at)
+        Index("ix_payments_updated_at", "updated_at"),
+    )
 
     # Primary key
     id = Column(
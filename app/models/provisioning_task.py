@@ -5,8 +5,10 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -117,12 +119,27 @@ class ProvisioningTask(Base):
         doc="Waktu task benar-benar dieksekusi (berhasil/gagal).",
     )
 
+    traceparent = Column(
+        String(55),
+        nullable=True,
+        doc="Header W3C traceparent pembuat task (mis. webhook); parent span eksekusi.",
+    )
+
     # Relationships
     subscription_item = relationship(
         "SubscriptionItem",
         back_populates="provisioning_tasks",
     )
 
+    __table_args__ = (
+        # Antrian task PENDING (worker provisioning + gauge backlog /metrics)
+        Index(
+            "ix_provisioning_tasks_pending_created_at",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<ProvisioningTask(id={self.id}, "
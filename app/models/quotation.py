@@ -4,6 +4,7 @@ from typing import List, Optional
 
 from sqlalchemy import (
     Column,
+    Index,
     String,
     DateTime,
     Numeric,
@@ -39,6 +40,21 @@ class Quotation(Base):
     __tablename__ = "quotations"
     __allow_unmapped__ = True
 
+    __table_args__ = (
+        # Sweeper kedaluwarsa: cari quotation SENT yang valid_until-nya sudah lewat
+        Index(
+            "ix_quotations_status_valid_until",
+            "status",
+            "valid_until",
+        ),
+        # Ringkasan client: quotation terbuka per client
+        Index(
+            "ix_quotations_client_id_status",
+            "client_id",
+            "status",
+        ),
+    )
+
     id: uuid.UUID = Column(
         UUID(as_uuid=True),
         primary_key=True,
@@ -187,12 +203,17 @@ class Quotation(Base):
         passive_deletes=True,
     )
 
-    # Satu quotation dapat memiliki banyak email_logs (akan diimplementasikan di model EmailLog)
+    # Satu quotation dapat memiliki banyak email_logs.
+    # EMAIL_LOGS memakai pointer polimorfik (related_type + related_id) tanpa FK,
+    # jadi join condition ditulis eksplisit.
     email_logs = relationship(
         "EmailLog",
         back_populates="quotation",
+        primaryjoin="and_(Quotation.id == foreign(EmailLog.related_id), "
+        "EmailLog.related_type == 'QUOTATION')",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        overlaps="email_logs,billing_cycle",
     )
 
 
@@ -0,0 +1,153 @@
+from sqlalchemy import Column, Date, DateTime, Integer, Numeric, String, event, inspect
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func, select
+
+from app.db.base import Base
+from app.models.client import Client
+from app.models.subscription import Subscription, SubscriptionItem
+
+
+class RevenueSummary(Base):
+    """
+    Ringkasan MRR per bulan × tipe produk × mata uang × status client.
+
+    Baris bulan berjalan di-update inkremental (`app.services.revenue_summary`);
+    baris bulan yang sudah lewat adalah posisi akhir bulan itu. ARR = MRR × 12.
+    Nilai dalam mata uang subscription; konversi ke mata uang laporan saat baca.
+    """
+
+    __tablename__ = "revenue_summary"
+
+    month = Column(Date, primary_key=True)
+    product_type = Column(String(50), primary_key=True)
+    currency = Column(String(10), primary_key=True)
+    client_status = Column(String(20), primary_key=True)
+
+    subscriptions = Column(Integer, nullable=False, default=0)
+    mrr = Column(Numeric(18, 4), nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RevenueSummary(month={self.month}, product_type={self.product_type}, "
+            f"currency={self.currency}, client_status={self.client_status}, mrr={self.mrr})>"
+        )
+
+
+class SubscriptionRevenue(Base):
+    """
+    Kontribusi MRR yang sedang dihitung di RevenueSummary, per subscription ×
+    tipe produk. Dipakai untuk delta: kontribusi baru − kontribusi lama.
+    Hanya subscription ACTIVE yang punya baris.
+    """
+
+    __tablename__ = "subscription_revenue"
+
+    subscription_id = Column(UUID(as_uuid=True), primary_key=True)
+    product_type = Column(String(50), primary_key=True)
+    currency = Column(String(10), nullable=False)
+    client_status = Column(String(20), nullable=False)
+    mrr = Column(Numeric(18, 4), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SubscriptionRevenue(subscription_id={self.subscription_id}, product_type={self.product_type}, mrr={self.mrr})>"
+
+
+class RevenueDirtySubscription(Base):
+    """
+    Antrian subscription yang kontribusi MRR-nya perlu dihitung ulang.
+    Diisi di transaksi yang sama dengan perubahan (listener di bawah / path
+    bulk memanggil `mark_dirty`), dikosongkan oleh `refresh_dirty`.
+    """
+
+    __tablename__ = "revenue_dirty_subscriptions"
+
+    subscription_id = Column(UUID(as_uuid=True), primary_key=True)
+    marked_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<RevenueDirtySubscription(subscription_id={self.subscription_id})>"
+
+
+# Atribut yang memengaruhi MRR
+SUBSCRIPTION_ATTRS = ("status", "billing_period", "currency", "client_id")
+ITEM_ATTRS = ("subscription_id", "product_id", "quantity", "unit_price", "amount")
+
+
+def _changed(obj, attrs) -> bool:
+    state = inspect(obj)
+    return any(getattr(state.attrs, attr).history.has_changes() for attr in attrs)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_revenue_dirty(session: Session, flush_context) -> None:
+    """
+    Tandai subscription yang berubah (status, item, status client) di antrian
+    RevenueDirtySubscription. `after_flush`: id sudah terisi dan history
+    atribut masih tersedia.
+    """
+    subscription_ids = set()
+    client_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Subscription):
+            subscription_ids.add(obj.id)
+        elif isinstance(obj, SubscriptionItem):
+            subscription_ids.add(obj.subscription_id)
+    for obj in session.dirty:
+        if isinstance(obj, Subscription) and _changed(obj, SUBSCRIPTION_ATTRS):
+            subscription_ids.add(obj.id)
+        elif isinstance(obj, SubscriptionItem) and _changed(obj, ITEM_ATTRS):
+            subscription_ids.add(obj.subscription_id)
+            # Item dipindah ke subscription lain: subscription lama ikut berubah
+            subscription_ids.update(inspect(obj).attrs.subscription_id.history.deleted)
+        elif isinstance(obj, Client) and _changed(obj, ("status",)):
+            client_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Subscription):
+            subscription_ids.add(obj.id)
+        elif isinstance(obj, SubscriptionItem):
+            subscription_ids.add(obj.subscription_id)
+    subscription_ids.discard(None)
+    if subscription_ids:
+        mark_dirty(session, subscription_ids)
+    if client_ids:
+        _enqueue(
+            session,
+            pg_insert(RevenueDirtySubscription.__table__).from_select(
+                ["subscription_id"],
+                select(Subscription.id).where(Subscription.client_id.in_(client_ids)),
+            ),
+        )
+
+
+def mark_dirty(session: Session, subscription_ids) -> None:
+    """Masukkan subscription ke antrian refresh (idempoten); untuk path bulk tanpa ORM."""
+    subscription_ids = list(subscription_ids)
+    if subscription_ids:
+        _enqueue(
+            session,
+            pg_insert(RevenueDirtySubscription.__table__).values(
+                [{"subscription_id": subscription_id} for subscription_id in subscription_ids]
+            ),
+        )
+
+
+def _enqueue(session: Session, stmt) -> None:
+    # DO UPDATE (bukan DO NOTHING): entry yang sudah ada ikut dikunci sampai
+    # commit, sehingga refresh yang sedang menghapusnya menunggu / melewatinya
+    # dan perubahan ini tidak terlewat. `marked_at` lama dipertahankan.
+    table = RevenueDirtySubscription.__table__
+    # Core langsung di koneksi sesi: aman dipanggil di tengah flush
+    session.connection().execute(
+        stmt.on_conflict_do_update(index_elements=["subscription_id"], set_={"marked_at": table.c.marked_at})
+    )
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, SmallInteger, String
+from sqlalchemy.dialects.postgresql import REAL, UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ClientRiskScore(Base):
+    """
+    CLIENT_RISK_SCORES
+
+    Skor risiko telat bayar per client, satu baris per client, ditimpa oleh
+    job malam (`app.services.risk_scoring`).
+
+    - score  : probabilitas telat bayar × 1000 (0–1000).
+    - band   : LOW / MEDIUM / HIGH.
+    - fitur utama disimpan sebagai REAL (4 byte) untuk penjelasan skor.
+    """
+
+    __tablename__ = "client_risk_scores"
+    __table_args__ = (
+        # Daftar client berisiko tertinggi (Finance, sebelum dunning)
+        Index("ix_client_risk_scores_score", "score"),
+    )
+
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True)
+
+    score = Column(SmallInteger, nullable=False)
+    band = Column(String(10), nullable=False)
+    model_version = Column(SmallInteger, nullable=False)
+
+    cycles = Column(Integer, nullable=False)
+    late_ratio = Column(REAL, nullable=False)
+    avg_days_late = Column(REAL, nullable=False)
+    failed_ratio = Column(REAL, nullable=False)
+    reminders_per_cycle = Column(REAL, nullable=False)
+
+    as_of = Column(Date, nullable=False)
+    scored_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ClientRiskScore(client_id={self.client_id}, score={self.score}, band={self.band})>"
@@ -8,8 +8,10 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
+    SmallInteger,
     String,
     Text,
 )
@@ -67,6 +69,20 @@ class Subscription(Base):
     """
 
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        # Billing run: cari subscription ACTIVE yang next_billing_date-nya sudah jatuh
+        Index(
+            "ix_subscriptions_status_next_billing_date",
+            "status",
+            "next_billing_date",
+        ),
+        # Ringkasan client & lateral per client
+        Index(
+            "ix_subscriptions_client_id_status",
+            "client_id",
+            "status",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -107,6 +123,9 @@ class Subscription(Base):
     start_date = Column(Date, nullable=True)  # setelah pembayaran pertama sukses
     end_date = Column(Date, nullable=True)  # boleh null untuk ongoing contract
     next_billing_date = Column(Date, nullable=True)
+    # Hari tagih asli (1–31); bulan yang lebih pendek memakai hari terakhirnya.
+    # Null → hari `next_billing_date`.
+    billing_anchor_day = Column(SmallInteger, nullable=True)
 
     # Payment method
     payment_method_type = Column(
@@ -200,6 +219,10 @@ class SubscriptionItem(Base):
     """
 
     __tablename__ = "subscription_items"
+    __table_args__ = (
+        # Export analitik inkremental (watermark updated_at)
+        Index("ix_subscription_items_updated_at", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -208,6 +231,7 @@ class SubscriptionItem(Base):
         UUID(as_uuid=True),
         ForeignKey("subscriptions.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     product_id = Column(
         UUID(as_uuid=True),
@@ -146,6 +146,14 @@ class User(Base):
         doc="Daftar quotation yang ditangani user ini (role SALES).",
     )
 
+    # Subscription yang dibuat oleh user ini (Sales/Admin)
+    created_subscriptions = relationship(
+        "Subscription",
+        back_populates="created_by_user",
+        foreign_keys="Subscription.created_by_user_id",
+        doc="Daftar subscription yang dibuat user ini.",
+    )
+
     # Relasi ke email logs (user sebagai actor/pengirim)
     email_logs = relationship(
         "EmailLog",
@@ -7,6 +7,7 @@ from sqlalchemy import (
     DateTime,
     Numeric,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -115,6 +116,10 @@ class WalletTransaction(Base):
     """
 
     __tablename__ = "wallet_transactions"
+    __table_args__ = (
+        # Export analitik inkremental (append-only, watermark created_at)
+        Index("ix_wallet_transactions_created_at", "created_at"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
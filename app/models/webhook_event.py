@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, String, Index
+from sqlalchemy import Boolean, Column, DateTime, String, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 
@@ -95,6 +95,13 @@ class WebhookEvent(Base):
         doc="Waktu ketika webhook pertama kali diterima oleh sistem.",
     )
 
+    # W3C traceparent request yang menerima event; parent span worker pemrosesnya
+    traceparent = Column(
+        String(55),
+        nullable=True,
+        doc="Header W3C traceparent saat event diterima (propagasi tracing ke worker).",
+    )
+
     # Relasi ke PAYMENTS akan ditambahkan di sisi Payment model,
     # misalnya dengan ForeignKey + relationship("WebhookEvent", back_populates="payments")
     # di sini nantinya bisa ditambahkan:
@@ -117,6 +124,13 @@ class WebhookEvent(Base):
             "ix_webhook_events_xendit_subscription_id",
             "xendit_subscription_id",
         ),
+        # Antrian worker: partial index hanya berisi event yang belum diproses,
+        # jadi tetap kecil walaupun tabel berisi puluhan juta event lama
+        Index(
+            "ix_webhook_events_unprocessed_created_at",
+            "created_at",
+            postgresql_where=text("processed = false"),
+        ),
     )
 
     def mark_processed(self, processed_at: datetime | None = None) -> None:
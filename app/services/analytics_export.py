@@ -0,0 +1,372 @@
+"""
+Export kolumnar (Parquet) tabel billing & payment untuk analis.
+
+Tabel: PAYMENTS, BILLING_CYCLES, SUBSCRIPTION_ITEMS, WALLET_TRANSACTIONS.
+Dijalankan sebagai job (`python -m scripts.analytics_export`), tidak pernah
+di proses API.
+
+Layout (partisi gaya Hive, langsung terbaca `pyarrow.dataset` / DuckDB /
+pandas):
+
+    <root>/<tabel>/month=YYYY-MM/part-<watermark awal>.parquet
+    <root>/_watermarks.json
+
+Inkremental per tabel dengan watermark `updated_at` (WALLET_TRANSACTIONS
+append-only: `created_at`): tiap run mengambil baris dengan
+`watermark_awal < kolom <= now() − lag`, di-stream dari server-side cursor
+(`yield_per`), diurut per bulan partisi, dan ditulis satu file per bulan.
+`lag` menutup transaksi yang sudah dimulai (timestamp = awal transaksi) tapi
+belum commit saat export membaca. Baris yang berubah ikut terekspor lagi di
+run berikutnya: versi terbaru per `id` = `updated_at` terbesar.
+
+Nama file berasal dari watermark awal, jadi run yang gagal di tengah lalu
+diulang menimpa file yang sama (watermark baru hanya disimpan setelah satu
+tabel selesai).
+
+Tipe: Numeric(p, s) → decimal128(p, s), UUID → `arrow.uuid`, enum →
+string dictionary-encoded, timestamptz → timestamp[us, UTC], date → date32,
+JSONB → string JSON.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from itertools import groupby
+import json
+from operator import itemgetter
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Integer,
+    Numeric,
+    SmallInteger,
+    String,
+    Table,
+    Text,
+    cast,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.types import JSON
+
+from app.core.metrics import track_job
+from app.models.billing import BillingCycle
+from app.models.payment import Payment
+from app.models.subscription import SubscriptionItem
+from app.models.wallet import WalletTransaction
+
+WATERMARKS_FILE = "_watermarks.json"
+PARTITION_KEY = "month"
+CHUNK_ROWS = 50_000
+COMPRESSION = "zstd"
+
+
+class AnalyticsExportError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    table: Table
+    # Kolom watermark inkremental (diindeks)
+    watermark: str
+    # Kolom penentu bulan partisi (tidak berubah setelah baris dibuat)
+    partition: str
+
+
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    "payments": ExportTable(Payment.__table__, "updated_at", "created_at"),
+    "billing_cycles": ExportTable(BillingCycle.__table__, "updated_at", "period_start"),
+    "subscription_items": ExportTable(SubscriptionItem.__table__, "updated_at", "created_at"),
+    "wallet_transactions": ExportTable(WalletTransaction.__table__, "created_at", "created_at"),
+}
+
+
+@dataclass
+class TableExportResult:
+    table: str
+    watermark_from: Optional[datetime]
+    watermark_to: Optional[datetime]
+    rows: int = 0
+    files: int = 0
+    bytes_written: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class AnalyticsExportResult:
+    tables: List[TableExportResult] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return sum(table.rows for table in self.tables)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Tipe SQLAlchemy → Arrow
+# ---------------------------------------------------------------------------
+
+_DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+
+def arrow_type(column: Column) -> pa.DataType:
+    column_type = column.type
+    if isinstance(column_type, UUID):
+        return pa.uuid()
+    if isinstance(column_type, Enum):
+        return _DICTIONARY_STRING
+    if isinstance(column_type, (JSON, JSONB)):
+        return pa.string()
+    if isinstance(column_type, Numeric):
+        if column_type.precision is None:
+            raise AnalyticsExportError(f"{column}: Numeric tanpa presisi tidak didukung")
+        return pa.decimal128(column_type.precision, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC") if column_type.timezone else pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, BigInteger):
+        return pa.int64()
+    if isinstance(column_type, SmallInteger):
+        return pa.int16()
+    if isinstance(column_type, Integer):
+        return pa.int32()
+    if isinstance(column_type, (String, Text)):
+        return pa.string()
+    raise AnalyticsExportError(f"{column}: tipe {column_type!r} belum dipetakan ke Arrow")
+
+
+def arrow_schema(table: Table) -> pa.Schema:
+    return pa.schema(
+        [pa.field(column.name, arrow_type(column), nullable=column.nullable) for column in table.columns]
+    )
+
+
+def _select_column(column: Column):
+    """
+    Kolom dibaca dalam bentuk yang murah untuk driver & Arrow, bukan objek
+    Python per nilai: UUID → 16 byte (`uuid_send`), Numeric → teks (di-cast
+    ke decimal oleh Arrow), timestamp → mikrodetik epoch, date → hari epoch,
+    enum & JSON → teks.
+    """
+    column_type = column.type
+    if isinstance(column_type, UUID):
+        return func.uuid_send(column).label(column.name)
+    if isinstance(column_type, (Enum, Numeric)):
+        return cast(column, String).label(column.name)
+    if isinstance(column_type, (JSON, JSONB)):
+        return cast(column, Text).label(column.name)
+    if isinstance(column_type, DateTime):
+        return cast(func.extract("epoch", column) * 1_000_000, BigInteger).label(column.name)
+    if isinstance(column_type, Date):
+        return (column - literal(date(1970, 1, 1), Date)).label(column.name)
+    return column
+
+
+def _converter(data_type: pa.DataType) -> Callable[[Sequence], pa.Array]:
+    if data_type == pa.uuid():
+        return lambda values: pa.ExtensionArray.from_storage(data_type, pa.array(values, pa.binary(16)))
+    if data_type == _DICTIONARY_STRING:
+        return lambda values: pa.array(values, pa.string()).dictionary_encode()
+    if pa.types.is_decimal(data_type):
+        return lambda values: pa.array(values, pa.string()).cast(data_type)
+    if pa.types.is_timestamp(data_type):
+        return lambda values: pa.array(values, pa.int64()).cast(data_type)
+    if pa.types.is_date32(data_type):
+        return lambda values: pa.array(values, pa.int32()).cast(data_type)
+    return lambda values: pa.array(values, data_type)
+
+
+# ---------------------------------------------------------------------------
+# Watermark
+# ---------------------------------------------------------------------------
+
+
+def load_watermarks(root: str) -> Dict[str, datetime]:
+    try:
+        with open(os.path.join(root, WATERMARKS_FILE), encoding="utf-8") as handle:
+            state = json.load(handle)
+    except FileNotFoundError:
+        return {}
+    return {name: datetime.fromisoformat(entry["watermark"]) for name, entry in state.items()}
+
+
+def _save_watermark(root: str, table: str, watermark: datetime, rows: int) -> None:
+    path = os.path.join(root, WATERMARKS_FILE)
+    try:
+        with open(path, encoding="utf-8") as handle:
+            state = json.load(handle)
+    except FileNotFoundError:
+        state = {}
+    state[table] = {
+        "watermark": watermark.isoformat(),
+        "rows": rows,
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _part_name(watermark_from: Optional[datetime]) -> str:
+    if watermark_from is None:
+        return "part-initial.parquet"
+    return f"part-{watermark_from.astimezone(timezone.utc):%Y%m%dT%H%M%S%fZ}.parquet"
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+
+def _partition_expression(column: Column):
+    if isinstance(column.type, DateTime) and column.type.timezone:
+        column = func.timezone("UTC", column)
+    return func.to_char(column, "YYYY-MM")
+
+
+class _PartitionWriter:
+    """Satu file Parquet terbuka pada satu waktu (baris datang terurut per bulan)."""
+
+    def __init__(self, directory: str, part_name: str, schema: pa.Schema) -> None:
+        self.directory = directory
+        self.part_name = part_name
+        self.schema = schema
+        self.files = 0
+        self.bytes_written = 0
+        self._month: Optional[str] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._path: Optional[str] = None
+
+    def write(self, month: str, batch: pa.RecordBatch) -> None:
+        if month != self._month:
+            self.close()
+            partition_dir = os.path.join(self.directory, f"{PARTITION_KEY}={month}")
+            os.makedirs(partition_dir, exist_ok=True)
+            self._path = os.path.join(partition_dir, self.part_name)
+            self._writer = pq.ParquetWriter(f"{self._path}.tmp", self.schema, compression=COMPRESSION)
+            self._month = month
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        os.replace(f"{self._path}.tmp", self._path)
+        self.files += 1
+        self.bytes_written += os.path.getsize(self._path)
+        self._writer = None
+        self._month = None
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            os.unlink(f"{self._path}.tmp")
+            self._writer = None
+
+
+def export_table(
+    db: Session,
+    root: str,
+    name: str,
+    watermark_from: Optional[datetime],
+    watermark_to: datetime,
+    chunk_rows: int = CHUNK_ROWS,
+    on_rows: Optional[Callable[[int], None]] = None,
+) -> TableExportResult:
+    """Export baris `watermark_from < watermark <= watermark_to` satu tabel."""
+    spec = EXPORT_TABLES[name]
+    started = time.perf_counter()
+    result = TableExportResult(name, watermark_from, watermark_to)
+    schema = arrow_schema(spec.table)
+    converters = [_converter(field.type) for field in schema]
+    watermark_column = spec.table.c[spec.watermark]
+    month = _partition_expression(spec.table.c[spec.partition])
+
+    stmt = select(*[_select_column(column) for column in spec.table.columns], month.label("_month")).where(
+        watermark_column <= watermark_to
+    )
+    if watermark_from is not None:
+        stmt = stmt.where(watermark_column > watermark_from)
+    stmt = stmt.order_by(month)
+
+    writer = _PartitionWriter(os.path.join(root, name), _part_name(watermark_from), schema)
+    try:
+        partitions = db.execute(stmt.execution_options(yield_per=chunk_rows)).partitions()
+        for rows in partitions:
+            # Potong chunk di batas bulan (baris sudah terurut per bulan)
+            for month_value, group in groupby(rows, key=itemgetter(-1)):
+                columns = list(zip(*group))
+                batch = pa.RecordBatch.from_arrays(
+                    [convert(values) for convert, values in zip(converters, columns)], schema=schema
+                )
+                writer.write(month_value, batch)
+            result.rows += len(rows)
+            if on_rows is not None:
+                on_rows(len(rows))
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    result.files = writer.files
+    result.bytes_written = writer.bytes_written
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def export_incremental(
+    db: Session,
+    root: str,
+    tables: Optional[Iterable[str]] = None,
+    lag: timedelta = timedelta(minutes=10),
+    chunk_rows: int = CHUNK_ROWS,
+) -> AnalyticsExportResult:
+    """Export semua (atau `tables`) sejak watermark terakhir di `root`."""
+    names = list(tables) if tables is not None else list(EXPORT_TABLES)
+    unknown = [name for name in names if name not in EXPORT_TABLES]
+    if unknown:
+        raise AnalyticsExportError(f"Tabel tidak didukung: {', '.join(unknown)}")
+    os.makedirs(root, exist_ok=True)
+    started = time.perf_counter()
+    result = AnalyticsExportResult()
+    watermarks = load_watermarks(root)
+    watermark_to = db.scalar(select(func.now())) - lag
+    with track_job("analytics_export") as job:
+        for name in names:
+            watermark_from = watermarks.get(name)
+            if watermark_from is not None and watermark_from >= watermark_to:
+                result.tables.append(TableExportResult(name, watermark_from, watermark_from))
+                continue
+            table_result = export_table(
+                db, root, name, watermark_from, watermark_to, chunk_rows, on_rows=job.add_items
+            )
+            # Akhiri transaksi baca (server-side cursor) sebelum tabel berikutnya
+            db.rollback()
+            _save_watermark(root, name, watermark_to, table_result.rows)
+            result.tables.append(table_result)
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,229 @@
+"""
+Laporan aging piutang (AR aging) untuk Finance.
+
+Piutang = BILLING_CYCLES yang belum PAID / CANCELLED (partial index
+`ix_billing_cycles_open_subscription_id`), dikelompokkan menurut umur lewat
+jatuh tempo pada tanggal `as_of`:
+
+    current (belum jatuh tempo), 1-30, 31-60, 61-90, 90+ hari
+
+Bucket dihitung di SQL (`sum(...) FILTER (WHERE ...)`), per client × mata
+uang (`summary`) atau per billing cycle (`detail`). Export membaca hasil
+lewat server-side cursor (`yield_per`) dan langsung di-stream sebagai CSV /
+XLSX (`app.services.spreadsheet`), jadi memori tetap konstan walaupun
+seluruh buku piutang diekspor.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+import enum
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, Integer, String, case, cast, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.billing import BillingCycle, BillingCycleStatus
+from app.models.client import Client, ClientStatus
+from app.models.subscription import Subscription
+from app.services.spreadsheet import CSV_MEDIA_TYPE, XLSX_MEDIA_TYPE, csv_chunks, xlsx_chunks
+
+# (label, batas bawah hari lewat jatuh tempo, batas atas inklusif)
+AGING_BUCKETS: Tuple[Tuple[str, Optional[int], Optional[int]], ...] = (
+    ("current", None, 0),
+    ("1-30", 1, 30),
+    ("31-60", 31, 60),
+    ("61-90", 61, 90),
+    ("90+", 91, None),
+)
+OPEN_STATUSES = tuple(
+    status for status in BillingCycleStatus if status not in (BillingCycleStatus.PAID, BillingCycleStatus.CANCELLED)
+)
+STREAM_CHUNK_ROWS = 2000
+
+
+class AgingError(Exception):
+    pass
+
+
+class AgingLevel(str, enum.Enum):
+    SUMMARY = "summary"
+    DETAIL = "detail"
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+SUMMARY_HEADER = (
+    "client_id", "client", "client_status", "currency", "cycles",
+    *(label for label, _, _ in AGING_BUCKETS), "total", "oldest_due_date", "max_days_past_due",
+)
+DETAIL_HEADER = (
+    "client_id", "client", "client_status", "subscription_id", "billing_cycle_id", "invoice_number",
+    "status", "period_start", "period_end", "due_date", "currency", "amount", "days_past_due", "bucket",
+)
+
+
+@dataclass
+class AgingTotals:
+    currency: str
+    cycles: int = 0
+    buckets: Dict[str, Decimal] = field(default_factory=dict)
+    total: Decimal = Decimal("0.00")
+
+
+def _in_bucket(days, low: Optional[int], high: Optional[int]):
+    conditions = []
+    if low is not None:
+        conditions.append(days >= low)
+    if high is not None:
+        conditions.append(days <= high)
+    return conditions[0] if len(conditions) == 1 else conditions[0] & conditions[1]
+
+
+def _open_cycles(as_of: date, client_statuses: Optional[Sequence[ClientStatus]]):
+    """Billing cycle belum lunas + client + umur (hari) pada `as_of`."""
+    days = (literal(as_of, Date) - BillingCycle.due_date).label("days_past_due")
+    stmt = (
+        select(
+            Client.id.label("client_id"),
+            Client.name.label("client_name"),
+            cast(Client.status, String).label("client_status"),
+            BillingCycle.subscription_id,
+            BillingCycle.id.label("billing_cycle_id"),
+            BillingCycle.invoice_number_external,
+            cast(BillingCycle.status, String).label("status"),
+            BillingCycle.period_start,
+            BillingCycle.period_end,
+            BillingCycle.due_date,
+            BillingCycle.currency,
+            BillingCycle.amount,
+            cast(days, Integer).label("days_past_due"),
+        )
+        .join(Subscription, Subscription.id == BillingCycle.subscription_id)
+        .join(Client, Client.id == Subscription.client_id)
+        .where(BillingCycle.status.in_(OPEN_STATUSES))
+    )
+    if client_statuses:
+        stmt = stmt.where(Client.status.in_(list(client_statuses)))
+    return stmt.subquery("open_cycles")
+
+
+def summary_query(as_of: date, client_statuses: Optional[Sequence[ClientStatus]] = None):
+    cycles = _open_cycles(as_of, client_statuses)
+    bucket_columns = [
+        func.coalesce(func.sum(cycles.c.amount).filter(_in_bucket(cycles.c.days_past_due, low, high)), 0).label(label)
+        for label, low, high in AGING_BUCKETS
+    ]
+    return (
+        select(
+            cycles.c.client_id,
+            cycles.c.client_name,
+            cycles.c.client_status,
+            cycles.c.currency,
+            func.count().label("cycles"),
+            *bucket_columns,
+            func.sum(cycles.c.amount).label("total"),
+            func.min(cycles.c.due_date).label("oldest_due_date"),
+            func.greatest(func.max(cycles.c.days_past_due), 0).label("max_days_past_due"),
+        )
+        .group_by(cycles.c.client_id, cycles.c.client_name, cycles.c.client_status, cycles.c.currency)
+        .order_by(cycles.c.client_name, cycles.c.client_id, cycles.c.currency)
+    )
+
+
+def detail_query(as_of: date, client_statuses: Optional[Sequence[ClientStatus]] = None):
+    cycles = _open_cycles(as_of, client_statuses)
+    bucket = case(
+        *[
+            (_in_bucket(cycles.c.days_past_due, low, high), label)
+            for label, low, high in AGING_BUCKETS[:-1]
+        ],
+        else_=AGING_BUCKETS[-1][0],
+    )
+    return select(
+        cycles.c.client_id,
+        cycles.c.client_name,
+        cycles.c.client_status,
+        cycles.c.subscription_id,
+        cycles.c.billing_cycle_id,
+        cycles.c.invoice_number_external,
+        cycles.c.status,
+        cycles.c.period_start,
+        cycles.c.period_end,
+        cycles.c.due_date,
+        cycles.c.currency,
+        cycles.c.amount,
+        func.greatest(cycles.c.days_past_due, 0),
+        bucket,
+    ).order_by(cycles.c.client_name, cycles.c.client_id, cycles.c.due_date, cycles.c.billing_cycle_id)
+
+
+def aging_totals(
+    db: Session, as_of: date, client_statuses: Optional[Sequence[ClientStatus]] = None
+) -> List[AgingTotals]:
+    """Total bucket per mata uang untuk seluruh buku (satu query, beberapa baris)."""
+    cycles = _open_cycles(as_of, client_statuses)
+    labels = [label for label, _, _ in AGING_BUCKETS]
+    rows = db.execute(
+        select(
+            cycles.c.currency,
+            func.count(),
+            *[
+                func.coalesce(func.sum(cycles.c.amount).filter(_in_bucket(cycles.c.days_past_due, low, high)), 0)
+                for _, low, high in AGING_BUCKETS
+            ],
+            func.sum(cycles.c.amount),
+        )
+        .group_by(cycles.c.currency)
+        .order_by(cycles.c.currency)
+    ).all()
+    return [
+        AgingTotals(row[0], row[1], dict(zip(labels, row[2:-1])), row[-1])
+        for row in rows
+    ]
+
+
+def stream_rows(
+    db: Session,
+    level: AgingLevel,
+    as_of: date,
+    client_statuses: Optional[Sequence[ClientStatus]] = None,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> Iterator[tuple]:
+    """Baris laporan lewat server-side cursor (`yield_per`), `chunk_rows` per fetch."""
+    query = summary_query if level == AgingLevel.SUMMARY else detail_query
+    result = db.execute(query(as_of, client_statuses).execution_options(yield_per=chunk_rows))
+    try:
+        for row in result:
+            yield tuple(row)
+    finally:
+        result.close()
+
+
+def export_chunks(
+    db: Session,
+    level: AgingLevel,
+    export_format: ExportFormat,
+    as_of: date,
+    client_statuses: Optional[Sequence[ClientStatus]] = None,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Bytes file export (CSV / XLSX), di-yield per chunk."""
+    header = SUMMARY_HEADER if level == AgingLevel.SUMMARY else DETAIL_HEADER
+    rows = stream_rows(db, level, as_of, client_statuses, chunk_rows)
+    if export_format == ExportFormat.CSV:
+        return csv_chunks(header, rows, chunk_rows)
+    if export_format == ExportFormat.XLSX:
+        return xlsx_chunks(f"AR aging {as_of:%Y-%m-%d}", header, rows, chunk_rows)
+    raise AgingError(f"Format export tidak dikenal: {export_format}")
+
+
+def media_type(export_format: ExportFormat) -> str:
+    return CSV_MEDIA_TYPE if export_format == ExportFormat.CSV else XLSX_MEDIA_TYPE
+
+
+def filename(level: AgingLevel, export_format: ExportFormat, as_of: date) -> str:
+    return f"ar-aging-{level.value}-{as_of:%Y%m%d}.{export_format.value}"
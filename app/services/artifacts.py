@@ -0,0 +1,344 @@
+"""
+Cache lokal file dokumen: PDF quotation (Cosmic), invoice & faktur pajak
+(upload Finance), dan file yang dibuat CloudSales sendiri.
+
+- Isi file disimpan content-addressed di `ARTIFACT_CACHE_DIR/ab/abcdef...`
+  (sha256): URL berbeda dengan isi sama berbagi satu file, tulis file lewat
+  file sementara + rename atomik sehingga pembaca tidak pernah melihat file
+  setengah jadi.
+- Indeks URL → sha256 di tabel ARTIFACTS. Hit = satu `UPDATE ... RETURNING`
+  (sekaligus menyegarkan `last_accessed_at` untuk LRU), tanpa request ke
+  sumber.
+- Miss: download streaming (chunk 64 KB, tidak pernah seluruh file di
+  memori). Fetch bersamaan untuk URL yang sama di satu proses digabung jadi
+  satu download (single-flight); antar proses hasilnya tetap benar karena
+  file content-addressed dan indeks di-upsert.
+- Eviction LRU: setelah entry baru, bila total ukuran entry non-pinned
+  melewati `max_bytes`, entry paling lama tidak diakses dihapus sampai 90%
+  batas; file dihapus bila tidak dirujuk entry lain. Entry `pinned` (file
+  buatan sendiri, URL `artifact://...`) tidak pernah di-evict.
+
+Response portal (range/streaming) dilayani `FileResponse` dari path di disk,
+lihat `app.api.routes.files`.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+import httpx
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.artifact import Artifact
+
+ARTIFACT_SCHEME = "artifact://"
+CHUNK_SIZE = 64 * 1024
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+# Eviction berhenti di 90% batas supaya tidak berjalan di setiap insert
+EVICTION_LOW_WATER = 0.9
+
+
+class ArtifactError(Exception):
+    pass
+
+
+class ArtifactNotFoundError(ArtifactError):
+    pass
+
+
+class ArtifactFetchError(ArtifactError):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredArtifact:
+    url: str
+    sha256: str
+    path: Path
+    size_bytes: int
+    content_type: str
+
+
+def blob_path(root: str, sha256: str) -> Path:
+    return Path(root) / sha256[:2] / sha256
+
+
+class BlobWriter:
+    """Tulis file secara streaming sambil di-hash; `commit` memindahkan ke path content-addressed."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        tmp_dir = Path(root) / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=tmp_dir, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> Tuple[str, int]:
+        self._file.close()
+        sha256 = self._digest.hexdigest()
+        target = blob_path(self.root, sha256)
+        if target.exists():
+            os.unlink(self._tmp)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp, target)
+        self._tmp = None
+        return sha256, self.size
+
+    def abort(self) -> None:
+        if self._tmp is not None:
+            self._file.close()
+            Path(self._tmp).unlink(missing_ok=True)
+            self._tmp = None
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.abort()
+
+
+def write_blob(root: str, chunks: Iterable[bytes]) -> Tuple[str, int]:
+    """Simpan stream ke store; aman dipanggil dari proses worker. Return (sha256, ukuran)."""
+    with BlobWriter(root) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+        return writer.commit()
+
+
+class ArtifactStore:
+    def __init__(
+        self,
+        root: str,
+        max_bytes: int,
+        session_factory: sessionmaker,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout_seconds: float = 60.0,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.session_factory = session_factory
+        self.timeout_seconds = timeout_seconds
+        self.hits = 0
+        self.fetches = 0
+        self.evicted = 0
+        self._client = client
+        self._owns_client = client is None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._evicting = threading.Lock()
+
+    def path_for(self, sha256: str) -> Path:
+        return blob_path(self.root, sha256)
+
+    def _artifact(self, url: str, sha256: str, size_bytes: int, content_type: str) -> StoredArtifact:
+        return StoredArtifact(url, sha256, self.path_for(sha256), size_bytes, content_type)
+
+    # -----------------------------------------------------------------------
+    # Baca
+    # -----------------------------------------------------------------------
+
+    def lookup(self, url: str) -> Optional[StoredArtifact]:
+        """Entry yang ada di disk (sekaligus tandai diakses), atau None."""
+        with self.session_factory() as db:
+            row = db.execute(
+                update(Artifact)
+                .where(Artifact.url == url)
+                .values(last_accessed_at=func.now(), hit_count=Artifact.hit_count + 1)
+                .returning(Artifact.sha256, Artifact.size_bytes, Artifact.content_type)
+            ).first()
+            db.commit()
+        if row is None:
+            return None
+        artifact = self._artifact(url, row.sha256, row.size_bytes, row.content_type)
+        if artifact.path.exists():
+            return artifact
+        # File hilang dari disk (dihapus manual / disk diganti): buang entry
+        # supaya tidak dihitung di total ukuran & URL di-download ulang
+        with self.session_factory() as db:
+            db.execute(delete(Artifact).where(Artifact.url == url, Artifact.sha256 == row.sha256))
+            db.commit()
+        return None
+
+    async def get(self, url: str) -> StoredArtifact:
+        """File untuk `url` dari cache; download dari sumber bila belum ada."""
+        artifact = await asyncio.to_thread(self.lookup, url)
+        if artifact is not None:
+            self.hits += 1
+            return artifact
+        if url.startswith(ARTIFACT_SCHEME):
+            raise ArtifactNotFoundError(f"Artifact {url} tidak ada di store")
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _, url=url: self._inflight.pop(url, None))
+        # shield: pemanggil yang dibatalkan tidak membatalkan download untuk yang lain
+        return await asyncio.shield(task)
+
+    def _http(self) -> httpx.AsyncClient:
+        """Client milik store terikat ke satu event loop; loop baru → client baru."""
+        loop = asyncio.get_running_loop()
+        if self._owns_client and self._client_loop is not loop:
+            self._retire_client()
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds, follow_redirects=True)
+            self._client_loop = loop
+        return self._client
+
+    def _retire_client(self) -> None:
+        """Tutup client loop sebelumnya di loop-nya sendiri (koneksinya terikat ke sana)."""
+        client, loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is None or loop is None:
+            return
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        # Loop sudah berhenti / ditutup: aclose tidak bisa dijalankan lagi,
+        # referensi dilepas sehingga socket-nya ditutup saat client di-GC
+
+    async def _fetch(self, url: str) -> StoredArtifact:
+        self.fetches += 1
+        try:
+            async with self._http().stream("GET", url) as response:
+                if response.status_code >= 400:
+                    raise ArtifactFetchError(f"{url}: HTTP {response.status_code}")
+                content_type = response.headers.get("content-type", DEFAULT_CONTENT_TYPE).split(";")[0].strip()
+                with BlobWriter(self.root) as writer:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        writer.write(chunk)
+                    sha256, size = writer.commit()
+        except httpx.HTTPError as exc:
+            raise ArtifactFetchError(f"{url}: {type(exc).__name__}: {exc}") from exc
+        artifact = self._artifact(url, sha256, size, content_type or DEFAULT_CONTENT_TYPE)
+        await asyncio.to_thread(self.register, artifact)
+        return artifact
+
+    # -----------------------------------------------------------------------
+    # Tulis
+    # -----------------------------------------------------------------------
+
+    def register(self, artifact: StoredArtifact, pinned: bool = False) -> None:
+        """Upsert indeks URL → file, lalu evict bila perlu."""
+        self.register_many([artifact], pinned)
+
+    def register_many(self, artifacts: Sequence[StoredArtifact], pinned: bool = False) -> None:
+        """Upsert multi-row (mis. hasil render batch) dalam satu statement."""
+        if not artifacts:
+            return
+        stmt = pg_insert(Artifact).values(
+            [
+                {
+                    "url": artifact.url,
+                    "sha256": artifact.sha256,
+                    "size_bytes": artifact.size_bytes,
+                    "content_type": artifact.content_type,
+                    "pinned": pinned,
+                }
+                for artifact in artifacts
+            ]
+        )
+        with self.session_factory() as db:
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["url"],
+                    set_={
+                        "sha256": stmt.excluded.sha256,
+                        "size_bytes": stmt.excluded.size_bytes,
+                        "content_type": stmt.excluded.content_type,
+                        "pinned": stmt.excluded.pinned,
+                        "fetched_at": func.now(),
+                        "last_accessed_at": func.now(),
+                    },
+                )
+            )
+            db.commit()
+        if not pinned:
+            self.evict()
+
+    def put(self, url: str, chunks: Iterable[bytes], content_type: str, pinned: bool = True) -> StoredArtifact:
+        """Simpan file buatan sendiri (default pinned, tidak di-evict)."""
+        sha256, size = write_blob(self.root, chunks)
+        artifact = self._artifact(url, sha256, size, content_type)
+        self.register(artifact, pinned=pinned)
+        return artifact
+
+    def evict(self) -> int:
+        """Hapus entry LRU non-pinned sampai total di bawah batas; return jumlah entry."""
+        # Satu eviction per proses; thread lain tidak ikut menghapus set yang sama
+        if not self._evicting.acquire(blocking=False):
+            return 0
+        try:
+            return self._evict()
+        finally:
+            self._evicting.release()
+
+    def _evict(self) -> int:
+        with self.session_factory() as db:
+            total = db.scalar(select(func.coalesce(func.sum(Artifact.size_bytes), 0)).where(Artifact.pinned.is_(False)))
+            if total <= self.max_bytes:
+                return 0
+            excess = total - int(self.max_bytes * EVICTION_LOW_WATER)
+            urls, hashes, freed = [], set(), 0
+            rows = db.execute(
+                select(Artifact.url, Artifact.sha256, Artifact.size_bytes)
+                .where(Artifact.pinned.is_(False))
+                .order_by(Artifact.last_accessed_at)
+                .execution_options(yield_per=500)
+            )
+            for url, sha256, size in rows:
+                if freed >= excess:
+                    break
+                urls.append(url)
+                hashes.add(sha256)
+                freed += size
+            rows.close()
+            deleted = db.execute(delete(Artifact).where(Artifact.url.in_(urls))).rowcount
+            still_used: Set[str] = set(db.scalars(select(Artifact.sha256).where(Artifact.sha256.in_(hashes))))
+            db.commit()
+        for sha256 in hashes - still_used:
+            self.path_for(sha256).unlink(missing_ok=True)
+        self.evicted += deleted
+        return deleted
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+
+_default_store: Optional[ArtifactStore] = None
+_default_lock = threading.Lock()
+
+
+def default_artifact_store() -> ArtifactStore:
+    """Store per proses dengan SessionLocal & `settings`."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                from app.core.config import settings
+                from app.db.session import SessionLocal
+
+                _default_store = ArtifactStore(
+                    settings.ARTIFACT_CACHE_DIR,
+                    settings.ARTIFACT_CACHE_MAX_BYTES,
+                    SessionLocal,
+                    timeout_seconds=settings.ARTIFACT_FETCH_TIMEOUT_SECONDS,
+                )
+    return _default_store
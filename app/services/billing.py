@@ -0,0 +1,175 @@
+"""
+Recurring billing run.
+
+Membuat BILLING_CYCLES untuk subscription ACTIVE yang `next_billing_date`-nya
+sudah jatuh (<= as_of) dan belum lewat `end_date`, lalu memajukan
+`next_billing_date` satu periode.
+
+Diproses per batch:
+1. Lock batch subscription (`FOR UPDATE SKIP LOCKED`, aman untuk worker paralel).
+2. Satu query agregat total item per subscription.
+3. Multi-row INSERT billing_cycles + bulk UPDATE next_billing_date.
+4. Commit per batch.
+
+Kurs `reporting_currency` → mata uang cycle pada `period_start` dicatat di
+`billing_cycles.exchange_rate` dari `ExchangeRateCache` (dimuat sekali per run).
+
+Subscription yang tertinggal beberapa periode akan terambil lagi di iterasi
+berikutnya sampai `next_billing_date` > as_of atau > `end_date`.
+
+Tanggal tagih: tagihan pertama di `next_billing_date` apa adanya; tagihan
+berikutnya di hari anchor (`subscriptions.billing_anchor_day`, default hari
+`next_billing_date`), di-clamp ke hari terakhir bulan yang lebih pendek
+(`add_billing_period`). Clamp hanya berlaku untuk bulan itu: subscription
+tanggal 31 ditagih 31 Jan → 28 Feb → 31 Mar → 30 Apr → …. Anchor disimpan
+saat run supaya tidak hilang setelah tanggal di-clamp. Proyeksi revenue
+(`app.services.revenue_forecast`) mengikuti aturan yang sama.
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+import time
+from typing import Optional
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.models.billing import BillingCycle, BillingCycleStatus
+from app.models.subscription import (
+    BillingPeriod,
+    Subscription,
+    SubscriptionItem,
+    SubscriptionStatus,
+)
+from app.services.exchange_rates import ExchangeRateCache
+
+# Jarak due date dari awal periode (hari)
+DEFAULT_DUE_DAYS = 14
+
+
+@dataclass
+class BillingRunResult:
+    batches: int = 0
+    cycles_created: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def add_billing_period(start: date, billing_period: BillingPeriod, anchor_day: Optional[int] = None) -> date:
+    """
+    Tanggal awal periode berikutnya.
+
+    Hari = `anchor_day` (default `start.day`), di-clamp ke hari terakhir
+    bulan tujuan saja: anchor 31 → 28 Feb → 31 Mar (lihat docstring modul).
+    """
+    months = 12 if billing_period == BillingPeriod.YEARLY else 1
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(anchor_day or start.day, calendar.monthrange(year, month)[1]))
+
+
+def run_billing(
+    db: Session,
+    as_of: date,
+    batch_size: int = 500,
+    commit: bool = True,
+    max_batches: Optional[int] = None,
+    rates: Optional[ExchangeRateCache] = None,
+    reporting_currency: str = "USD",
+) -> BillingRunResult:
+    """
+    Jalankan billing run sampai tidak ada subscription jatuh tempo.
+
+    `commit=False` dipakai benchmark: semua batch tetap di transaksi caller.
+    `max_batches` membatasi jumlah batch per pemanggilan.
+    """
+    result = BillingRunResult()
+    started = time.perf_counter()
+    rates = rates or ExchangeRateCache.snapshot(db, pivot=reporting_currency)
+
+    with track_job("billing_run") as job:
+        while max_batches is None or result.batches < max_batches:
+            created = run_billing_batch(db, as_of, batch_size, rates, reporting_currency)
+            if not created:
+                break
+            result.batches += 1
+            result.cycles_created += created
+            job.add_items(created)
+            if commit:
+                db.commit()
+
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def run_billing_batch(
+    db: Session,
+    as_of: date,
+    batch_size: int = 500,
+    rates: Optional[ExchangeRateCache] = None,
+    reporting_currency: str = "USD",
+) -> int:
+    """Proses satu batch; return jumlah billing cycle yang dibuat."""
+    due_subscriptions = db.execute(
+        select(
+            Subscription.id,
+            Subscription.billing_period,
+            Subscription.next_billing_date,
+            Subscription.billing_anchor_day,
+            Subscription.currency,
+        )
+        .where(
+            Subscription.status == SubscriptionStatus.ACTIVE,
+            Subscription.next_billing_date <= as_of,
+            or_(Subscription.end_date.is_(None), Subscription.next_billing_date <= Subscription.end_date),
+        )
+        .order_by(Subscription.next_billing_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not due_subscriptions:
+        return 0
+
+    rates = rates or ExchangeRateCache.snapshot(db, pivot=reporting_currency)
+    ids = [row.id for row in due_subscriptions]
+    totals = dict(
+        db.execute(
+            select(SubscriptionItem.subscription_id, func.sum(SubscriptionItem.amount))
+            .where(SubscriptionItem.subscription_id.in_(ids))
+            .group_by(SubscriptionItem.subscription_id)
+        ).all()
+    )
+
+    cycles = []
+    next_dates = []
+    for row in due_subscriptions:
+        period_start = row.next_billing_date
+        anchor_day = row.billing_anchor_day or period_start.day
+        next_start = add_billing_period(period_start, row.billing_period, anchor_day)
+        amount = totals.get(row.id) or Decimal("0")
+        cycles.append(
+            {
+                "subscription_id": row.id,
+                "period_start": period_start,
+                "period_end": next_start - timedelta(days=1),
+                "due_date": period_start + timedelta(days=DEFAULT_DUE_DAYS),
+                # amount final akan diganti Finance saat invoice diterbitkan
+                "amount": amount,
+                "quoted_amount": amount,
+                "currency": row.currency,
+                "exchange_rate": (
+                    None
+                    if row.currency == reporting_currency
+                    else rates.find_rate(reporting_currency, row.currency, period_start)
+                ),
+                "status": BillingCycleStatus.PENDING,
+                "is_initial_cycle": False,
+            }
+        )
+        next_dates.append({"id": row.id, "next_billing_date": next_start, "billing_anchor_day": anchor_day})
+
+    db.execute(insert(BillingCycle), cycles)
+    db.execute(update(Subscription), next_dates)
+    return len(cycles)
@@ -0,0 +1,293 @@
+"""
+Ringkasan client (client 360) untuk halaman overview Sales / Finance.
+
+Sebelumnya overview dibangun dengan memuat `Client` beserta semua koleksi
+`selectin` (users, quotations, subscriptions, payments, wallet) lalu billing
+cycle per subscription, dan agregasi di Python. Client besar (ratusan
+subscription, ribuan billing cycle & payment) berarti ribuan objek ORM per
+request.
+
+Sekarang satu statement: `clients` + satu `LEFT JOIN LATERAL` per bagian
+(subscription, billing cycle belum lunas per mata uang, payment sukses
+terakhir, MRR dari SUBSCRIPTION_REVENUE, quotation terbuka) + wallet. Setiap
+lateral memakai index per client (`ix_subscriptions_client_id_status`,
+`ix_billing_cycles_open_subscription_id`, `ix_payments_client_paid_at`,
+`ix_quotations_client_id_status`) sehingga biaya mengikuti jumlah baris milik
+client itu saja, tanpa membuat objek ORM.
+
+Hasil di-cache per proses (`ClientSummaryCache`, TTL pendek, LRU terbatas).
+Commit session di proses yang sama yang menyentuh baris milik client
+(client, subscription, billing cycle, payment, wallet, quotation) langsung
+meng-invalidate entry client itu; perubahan dari proses lain (job batch)
+terlihat paling lambat setelah TTL.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+import uuid
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.models.billing import BillingCycle
+from app.models.client import Client
+from app.models.payment import Payment
+from app.models.quotation import Quotation
+from app.models.subscription import Subscription
+from app.models.wallet import WalletAccount
+
+SESSION_INFO_KEY = "client_summary_dirty"
+
+CLIENT_SUMMARY_SQL = text(
+    """
+    SELECT
+        c.id, c.name, c.status::text AS status,
+        coalesce(subs.total, 0) AS subscriptions_total,
+        coalesce(subs.active, 0) AS subscriptions_active,
+        coalesce(subs.suspended, 0) AS subscriptions_suspended,
+        coalesce(open_cycles.cycles, 0) AS outstanding_cycles,
+        coalesce(open_cycles.overdue, 0) AS overdue_cycles,
+        open_cycles.oldest_due_date,
+        open_cycles.currencies AS outstanding_currencies,
+        open_cycles.amounts AS outstanding_amounts,
+        mrr.currencies AS mrr_currencies,
+        mrr.amounts AS mrr_amounts,
+        last_payment.paid_at AS last_payment_at,
+        last_payment.amount AS last_payment_amount,
+        last_payment.currency AS last_payment_currency,
+        w.balance AS wallet_balance,
+        w.currency AS wallet_currency,
+        coalesce(quotes.drafts, 0) AS quotations_draft,
+        coalesce(quotes.sent, 0) AS quotations_sent,
+        quotes.next_expiry AS quotation_next_expiry
+    FROM clients AS c
+    LEFT JOIN LATERAL (
+        SELECT count(*) AS total,
+               count(*) FILTER (WHERE s.status = 'ACTIVE') AS active,
+               count(*) FILTER (WHERE s.status = 'SUSPENDED') AS suspended
+        FROM subscriptions AS s
+        WHERE s.client_id = c.id
+    ) AS subs ON true
+    LEFT JOIN LATERAL (
+        SELECT sum(per_currency.cycles) AS cycles,
+               sum(per_currency.overdue) AS overdue,
+               min(per_currency.oldest_due_date) AS oldest_due_date,
+               array_agg(per_currency.currency ORDER BY per_currency.currency) AS currencies,
+               array_agg(per_currency.amount ORDER BY per_currency.currency) AS amounts
+        FROM (
+            SELECT bc.currency,
+                   count(*) AS cycles,
+                   count(*) FILTER (WHERE bc.due_date < current_date) AS overdue,
+                   min(bc.due_date) AS oldest_due_date,
+                   sum(bc.amount) AS amount
+            FROM subscriptions AS s
+            JOIN billing_cycles AS bc ON bc.subscription_id = s.id
+            WHERE s.client_id = c.id AND bc.status NOT IN ('PAID', 'CANCELLED')
+            GROUP BY bc.currency
+        ) AS per_currency
+    ) AS open_cycles ON true
+    LEFT JOIN LATERAL (
+        SELECT array_agg(per_currency.currency ORDER BY per_currency.currency) AS currencies,
+               array_agg(per_currency.mrr ORDER BY per_currency.currency) AS amounts
+        FROM (
+            SELECT sr.currency, sum(sr.mrr) AS mrr
+            FROM subscriptions AS s
+            JOIN subscription_revenue AS sr ON sr.subscription_id = s.id
+            WHERE s.client_id = c.id AND s.status = 'ACTIVE'
+            GROUP BY sr.currency
+        ) AS per_currency
+    ) AS mrr ON true
+    LEFT JOIN LATERAL (
+        SELECT p.paid_at, p.amount, p.currency
+        FROM payments AS p
+        WHERE p.client_id = c.id AND p.status = 'SUCCESS' AND p.paid_at IS NOT NULL
+        ORDER BY p.paid_at DESC
+        LIMIT 1
+    ) AS last_payment ON true
+    LEFT JOIN LATERAL (
+        SELECT count(*) FILTER (WHERE q.status = 'DRAFT') AS drafts,
+               count(*) FILTER (WHERE q.status = 'SENT') AS sent,
+               min(q.valid_until) FILTER (WHERE q.status = 'SENT' AND q.valid_until >= now()) AS next_expiry
+        FROM quotations AS q
+        WHERE q.client_id = c.id AND q.status IN ('DRAFT', 'SENT')
+    ) AS quotes ON true
+    LEFT JOIN wallet_accounts AS w ON w.client_id = c.id
+    WHERE c.id = :client_id
+    """
+)
+
+
+@dataclass
+class ClientSummary:
+    client_id: uuid.UUID
+    name: str
+    status: str
+    subscriptions_total: int = 0
+    subscriptions_active: int = 0
+    subscriptions_suspended: int = 0
+    outstanding_cycles: int = 0
+    overdue_cycles: int = 0
+    oldest_due_date: Optional[date] = None
+    # mata uang → nilai
+    outstanding: Dict[str, Decimal] = field(default_factory=dict)
+    mrr: Dict[str, Decimal] = field(default_factory=dict)
+    last_payment_at: Optional[datetime] = None
+    last_payment_amount: Optional[Decimal] = None
+    last_payment_currency: Optional[str] = None
+    wallet_balance: Optional[Decimal] = None
+    wallet_currency: Optional[str] = None
+    quotations_draft: int = 0
+    quotations_sent: int = 0
+    quotation_next_expiry: Optional[datetime] = None
+
+
+def load_client_summary(db: Session, client_id: uuid.UUID) -> Optional[ClientSummary]:
+    """Satu query; None bila client tidak ada."""
+    row = db.execute(CLIENT_SUMMARY_SQL, {"client_id": client_id}).mappings().first()
+    if row is None:
+        return None
+    return ClientSummary(
+        client_id=row["id"],
+        name=row["name"],
+        status=row["status"],
+        subscriptions_total=row["subscriptions_total"],
+        subscriptions_active=row["subscriptions_active"],
+        subscriptions_suspended=row["subscriptions_suspended"],
+        outstanding_cycles=int(row["outstanding_cycles"]),
+        overdue_cycles=int(row["overdue_cycles"]),
+        oldest_due_date=row["oldest_due_date"],
+        outstanding=dict(zip(row["outstanding_currencies"] or (), row["outstanding_amounts"] or ())),
+        mrr=dict(zip(row["mrr_currencies"] or (), row["mrr_amounts"] or ())),
+        last_payment_at=row["last_payment_at"],
+        last_payment_amount=row["last_payment_amount"],
+        last_payment_currency=row["last_payment_currency"],
+        wallet_balance=row["wallet_balance"],
+        wallet_currency=row["wallet_currency"],
+        quotations_draft=row["quotations_draft"],
+        quotations_sent=row["quotations_sent"],
+        quotation_next_expiry=row["quotation_next_expiry"],
+    )
+
+
+class ClientSummaryCache:
+    """
+    Cache per proses client_id → ClientSummary dengan TTL & batas entry (LRU).
+
+    `invalidate` menaikkan generasi; hasil query yang dimulai sebelum
+    invalidasi tidak disimpan, jadi pembaca lambat tidak bisa memasukkan
+    kembali ringkasan lama setelah commit penulis.
+    """
+
+    def __init__(self, ttl_seconds: float = 15.0, max_entries: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[uuid.UUID, tuple]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, client_id: uuid.UUID) -> Optional[ClientSummary]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(client_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(client_id)
+                self.hits += 1
+                return entry[1]
+            generation = self._generation
+            self.misses += 1
+        summary = load_client_summary(db, client_id)
+        if summary is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[client_id] = (time.monotonic() + self.ttl_seconds, summary)
+                    self._entries.move_to_end(client_id)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return summary
+
+    def invalidate(self, client_ids: Iterable[uuid.UUID]) -> None:
+        with self._lock:
+            self._generation += 1
+            for client_id in client_ids:
+                self._entries.pop(client_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[ClientSummaryCache] = None
+_default_lock = threading.Lock()
+
+
+def default_client_summary_cache() -> ClientSummaryCache:
+    """Cache per proses dengan `settings`."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                from app.core.config import settings
+
+                _default_cache = ClientSummaryCache(
+                    ttl_seconds=settings.CLIENT_SUMMARY_CACHE_TTL_SECONDS,
+                    max_entries=settings.CLIENT_SUMMARY_CACHE_MAX_ENTRIES,
+                )
+    return _default_cache
+
+
+# ---------------------------------------------------------------------------
+# Invalidasi saat commit
+# ---------------------------------------------------------------------------
+
+# Model yang punya kolom client_id langsung
+_CLIENT_OWNED = (Subscription, Payment, Quotation, WalletAccount)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_clients(session: Session, flush_context) -> None:
+    """Kumpulkan client yang barisnya berubah di flush ini (di-invalidate saat commit)."""
+    if _default_cache is None:
+        return
+    client_ids: Set[uuid.UUID] = set()
+    subscription_ids: Set[uuid.UUID] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Client):
+            client_ids.add(obj.id)
+        elif isinstance(obj, _CLIENT_OWNED):
+            client_ids.add(obj.client_id)
+            # client_id dipindah: client lama ikut berubah
+            client_ids.update(inspect(obj).attrs.client_id.history.deleted)
+        elif isinstance(obj, BillingCycle):
+            subscription_ids.add(obj.subscription_id)
+    if subscription_ids:
+        client_ids.update(
+            session.connection().scalars(
+                select(Subscription.client_id).where(Subscription.id.in_(subscription_ids))
+            )
+        )
+    client_ids.discard(None)
+    if client_ids:
+        session.info.setdefault(SESSION_INFO_KEY, set()).update(client_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_touched_clients(session: Session) -> None:
+    client_ids = session.info.pop(SESSION_INFO_KEY, None)
+    if client_ids and _default_cache is not None:
+        _default_cache.invalidate(client_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_touched_clients(session: Session) -> None:
+    session.info.pop(SESSION_INFO_KEY, None)
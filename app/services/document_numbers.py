@@ -0,0 +1,165 @@
+"""
+Alokasi nomor dokumen (quotation, ...) berformat `PREFIX/YYYY/NNNNNNN`.
+
+`SELECT max(number) + 1` bentrok (dua request membaca max yang sama) atau,
+kalau dikunci, menserialisasi semua Sales. Di sini tiap proses me-lease blok
+nomor dari DOCUMENT_COUNTERS dengan satu upsert atomik
+(`next_value = next_value + block_size ... RETURNING`) di transaksi sendiri,
+lalu membagikan nomor dari memori:
+
+- hot path = increment di memori di bawah lock per (prefix, tahun), tanpa
+  round trip; round trip hanya tiap `block_size` nomor;
+- blok tidak pernah tumpang tindih antar worker, jadi nomor unik tanpa
+  mengandalkan retry pada unique constraint;
+- konsekuensi: ada celah (sisa blok hilang saat worker restart) dan nomor
+  antar worker tidak urut waktu. Cocok untuk quotation; dokumen yang wajib
+  tanpa celah (faktur pajak) harus pakai counter per nomor.
+
+Aman dipakai dari banyak thread. Setelah `fork` (mis. gunicorn `--preload`)
+blok warisan proses induk dibuang supaya tidak dipakai dua proses.
+"""
+
+from datetime import datetime
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.document_counter import DocumentCounter
+from app.models.quotation import Quotation
+
+QUOTATION_PREFIX = "QUO"
+
+_counters = DocumentCounter.__table__
+
+
+class DocumentNumberError(Exception):
+    pass
+
+
+class NumberAllocator:
+    def __init__(
+        self,
+        engine: Engine,
+        block_size: int = 50,
+        timezone: str = "Asia/Jakarta",
+        digits: int = 7,
+    ) -> None:
+        if block_size < 1:
+            raise DocumentNumberError("block_size minimal 1")
+        self.engine = engine
+        self.block_size = block_size
+        self.timezone = ZoneInfo(timezone)
+        self.digits = digits
+        self.leases = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._guard = threading.Lock()
+        self._locks: Dict[Tuple[str, int], threading.Lock] = {}
+        # (prefix, tahun) → [nomor berikutnya, batas eksklusif]
+        self._blocks: Dict[Tuple[str, int], List[int]] = {}
+
+    def _lock(self, key: Tuple[str, int]) -> threading.Lock:
+        if self._pid != os.getpid():
+            self._reset()
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(key, threading.Lock())
+        return lock
+
+    def format(self, prefix: str, year: int, value: int) -> str:
+        return f"{prefix}/{year}/{value:0{self.digits}d}"
+
+    def allocate(self, prefix: str = QUOTATION_PREFIX, year: Optional[int] = None) -> str:
+        return self.allocate_many(1, prefix, year)[0]
+
+    def allocate_many(self, count: int, prefix: str = QUOTATION_PREFIX, year: Optional[int] = None) -> List[str]:
+        year = year or datetime.now(self.timezone).year
+        key = (prefix, year)
+        values: List[int] = []
+        with self._lock(key):
+            block = self._blocks.get(key)
+            while len(values) < count:
+                if block is None or block[0] >= block[1]:
+                    # Permintaan besar (impor massal) di-lease sekaligus
+                    size = max(self.block_size, count - len(values))
+                    block = self._blocks[key] = list(self._lease(prefix, year, size))
+                take = min(count - len(values), block[1] - block[0])
+                values.extend(range(block[0], block[0] + take))
+                block[0] += take
+        return [self.format(prefix, year, value) for value in values]
+
+    def _lease(self, prefix: str, year: int, size: int) -> Tuple[int, int]:
+        """Blok [awal, akhir) milik proses ini; di-commit terpisah dari transaksi pemanggil."""
+        stmt = pg_insert(_counters).values(prefix=prefix, year=year, next_value=size + 1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_counters.c.prefix, _counters.c.year],
+            set_={"next_value": _counters.c.next_value + size, "updated_at": func.now()},
+        ).returning(_counters.c.next_value)
+        with self.engine.begin() as connection:
+            end = connection.execute(stmt).scalar_one()
+        self.leases += 1
+        return end - size, end
+
+    def discard(self) -> None:
+        """Lupakan blok di memori (nomor sisa jadi celah)."""
+        self._reset()
+
+
+def sync_counters(db: Session, prefix: str = QUOTATION_PREFIX) -> int:
+    """
+    Naikkan counter ke atas nomor quotation yang sudah ada (mis. setelah impor
+    atau load dataset sintetis). Tidak pernah menurunkan counter.
+    """
+    pattern = f"^{prefix}/[0-9]{{4}}/[0-9]+$"
+    year = func.split_part(Quotation.number, "/", 2).cast(_counters.c.year.type)
+    value = func.split_part(Quotation.number, "/", 3).cast(_counters.c.next_value.type)
+    rows = db.execute(
+        select(year, func.max(value) + 1).where(Quotation.number.regexp_match(pattern)).group_by(year)
+    ).all()
+    if not rows:
+        return 0
+    stmt = pg_insert(_counters).values([{"prefix": prefix, "year": y, "next_value": n} for y, n in rows])
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[_counters.c.prefix, _counters.c.year],
+            set_={
+                "next_value": func.greatest(_counters.c.next_value, stmt.excluded.next_value),
+                "updated_at": func.now(),
+            },
+        )
+    )
+    return len(rows)
+
+
+_default_allocator: Optional[NumberAllocator] = None
+_default_lock = threading.Lock()
+
+
+def default_allocator() -> NumberAllocator:
+    """Allocator per proses dengan engine aplikasi & `settings`."""
+    global _default_allocator
+    if _default_allocator is None:
+        with _default_lock:
+            if _default_allocator is None:
+                from app.core.config import settings
+                from app.db.session import engine
+
+                _default_allocator = NumberAllocator(
+                    engine,
+                    block_size=settings.DOCUMENT_NUMBER_BLOCK_SIZE,
+                    timezone=settings.DOCUMENT_NUMBER_TIMEZONE,
+                )
+    return _default_allocator
+
+
+def next_quotation_number(year: Optional[int] = None) -> str:
+    return default_allocator().allocate(QUOTATION_PREFIX, year)
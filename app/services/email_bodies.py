@@ -0,0 +1,219 @@
+"""
+Service layer untuk EMAIL_BODIES (body email & prompt AI content-addressed).
+
+- `build_dictionary` / `train_dictionary`: preset dictionary zlib dari frasa
+  yang berulang di sampel body (salam, kalimat template reminder, instruksi
+  prompt). Body template pendek yang tanpa dictionary hampir tidak mengecil
+  jadi terkompres baik.
+- `recompress`: kompres ulang body lama dengan dictionary aktif. Hash tidak
+  berubah, jadi referensi di EMAIL_LOGS tidak disentuh.
+- `measure`: ukuran tabel, rasio dedup & kompresi, serta latency list query
+  EMAIL_LOGS dengan dan tanpa memuat body.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+import re
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.email_body import (
+    CODEC_ZLIB,
+    EmailBody,
+    EmailBodyDictionary,
+    ActiveDictionary,
+    active_dictionary,
+    encode_body,
+    reset_active_dictionary,
+)
+from app.models.email_log import EmailLog
+
+# Batas zdict zlib = ukuran window (32 KB)
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+_TOKEN = re.compile(r"\S+\s*")
+
+
+def build_dictionary(
+    samples: Sequence[str],
+    max_bytes: int = MAX_DICTIONARY_BYTES,
+    ngram: int = 2,
+    min_share: float = 0.002,
+) -> bytes:
+    """
+    Dictionary dari rangkaian kata yang sering muncul di sampel.
+
+    1. Hitung document frequency n-gram kata.
+    2. Di tiap sampel, tandai kata yang tercakup n-gram sering, gabungkan
+       kata berurutan yang tertandai jadi satu frasa.
+    3. Urutkan frasa berdasarkan frekuensi × panjang; yang paling bernilai
+       ditaruh di akhir dictionary (jarak referensi zlib paling pendek).
+    """
+    tokenized = [_TOKEN.findall(sample) for sample in samples]
+    document_frequency: Counter = Counter()
+    for tokens in tokenized:
+        document_frequency.update({tuple(tokens[i:i + ngram]) for i in range(len(tokens) - ngram + 1)})
+    threshold = max(2, int(len(samples) * min_share))
+    frequent = {gram for gram, count in document_frequency.items() if count >= threshold}
+
+    phrases: Counter = Counter()
+    for tokens in tokenized:
+        covered = [False] * len(tokens)
+        for i in range(len(tokens) - ngram + 1):
+            if tuple(tokens[i:i + ngram]) in frequent:
+                covered[i:i + ngram] = [True] * ngram
+        run: List[str] = []
+        for token, is_covered in zip(tokens, covered):
+            if is_covered:
+                run.append(token)
+            elif run:
+                phrases["".join(run)] += 1
+                run = []
+        if run:
+            phrases["".join(run)] += 1
+
+    chosen: List[bytes] = []
+    size = 0
+    for phrase, count in sorted(phrases.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        encoded = phrase.encode("utf-8")
+        if size + len(encoded) > max_bytes:
+            continue
+        chosen.append(encoded)
+        size += len(encoded)
+    chosen.reverse()
+    return b"".join(chosen)
+
+
+def train_dictionary(db: Session, sample_size: int = 5000) -> Optional[EmailBodyDictionary]:
+    """Latih dictionary dari sampel acak body yang ada; None bila sampel kosong."""
+    bodies = db.scalars(select(EmailBody).order_by(func.random()).limit(sample_size)).all()
+    content = build_dictionary([body.text for body in bodies])
+    if not content:
+        return None
+    dictionary = EmailBodyDictionary(content=content, sample_size=len(bodies))
+    db.add(dictionary)
+    db.flush()
+    # Session ini langsung memakai dictionary baru untuk body berikutnya
+    reset_active_dictionary(db)
+    return dictionary
+
+
+@dataclass
+class RecompressResult:
+    bodies: int = 0
+    updated: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def recompress(
+    db: Session,
+    dictionary: Optional[EmailBodyDictionary] = None,
+    batch_size: int = 2000,
+    commit: bool = True,
+) -> RecompressResult:
+    """Kompres ulang body yang belum memakai `dictionary` (default: dictionary aktif)."""
+    if dictionary is not None:
+        target = ActiveDictionary(dictionary.id, bytes(dictionary.content))
+    else:
+        target = active_dictionary(db)
+    if target is None:
+        return RecompressResult()
+
+    result = RecompressResult()
+    last_hash = b""
+    while True:
+        batch = db.scalars(
+            select(EmailBody)
+            .options(selectinload(EmailBody.dictionary))
+            .where(EmailBody.hash > last_hash)
+            .where(EmailBody.dictionary_id.is_distinct_from(target.id))
+            .order_by(EmailBody.hash)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        last_hash = bytes(batch[-1].hash)
+
+        changes = []
+        for body in batch:
+            result.bodies += 1
+            result.bytes_before += len(body.content)
+            _, codec, content, _ = encode_body(body.text, target.content)
+            if codec == CODEC_ZLIB and len(content) < len(body.content):
+                changes.append({"hash": body.hash, "codec": codec, "content": content, "dictionary_id": target.id})
+                result.bytes_after += len(content)
+            else:
+                result.bytes_after += len(body.content)
+        if changes:
+            db.execute(update(EmailBody), changes)
+            result.updated += len(changes)
+        if commit:
+            db.commit()
+        db.expunge_all()
+    return result
+
+
+def _median_ms(fn, rounds: int) -> float:
+    fn()  # warmup
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def measure(db: Session, list_limit: int = 500, rounds: int = 15) -> Dict[str, Any]:
+    """Ukuran storage + latency list query EMAIL_LOGS (median ms)."""
+    sizes = {
+        table: db.execute(text("SELECT pg_total_relation_size(CAST(:table AS regclass))"), {"table": table}).scalar()
+        for table in ("email_logs", "email_bodies", "email_body_dictionaries")
+    }
+    references = db.execute(
+        text(
+            "SELECT count(*), coalesce(sum(b.size_bytes), 0) FROM email_logs e "
+            "CROSS JOIN LATERAL (VALUES (e.ai_prompt_hash), (e.ai_generated_body_hash), (e.final_body_hash)) AS r(hash) "
+            "JOIN email_bodies b ON b.hash = r.hash"
+        )
+    ).one()
+    bodies = db.execute(
+        text("SELECT count(*), coalesce(sum(size_bytes), 0), coalesce(sum(length(content)), 0) FROM email_bodies")
+    ).one()
+
+    def list_logs():
+        db.scalars(select(EmailLog).order_by(EmailLog.created_at.desc()).limit(list_limit)).unique().all()
+        db.expunge_all()
+
+    def list_logs_with_bodies():
+        logs = db.scalars(
+            select(EmailLog)
+            .options(
+                selectinload(EmailLog.ai_prompt_content).selectinload(EmailBody.dictionary),
+                selectinload(EmailLog.ai_generated_body_content).selectinload(EmailBody.dictionary),
+                selectinload(EmailLog.final_body_content).selectinload(EmailBody.dictionary),
+            )
+            .order_by(EmailLog.created_at.desc())
+            .limit(list_limit)
+        ).unique().all()
+        for log in logs:
+            log.ai_prompt, log.ai_generated_body, log.final_body  # noqa: B018 — paksa decode
+        db.expunge_all()
+
+    return {
+        "table_bytes": sizes,
+        "body_references": references[0],
+        "distinct_bodies": bodies[0],
+        "logical_body_bytes": int(references[1]),
+        "distinct_body_bytes": int(bodies[1]),
+        "stored_body_bytes": int(bodies[2]),
+        "dedup_ratio": (int(references[1]) / int(bodies[1])) if bodies[1] else None,
+        "compression_ratio": (int(bodies[1]) / int(bodies[2])) if bodies[2] else None,
+        "list_ms": _median_ms(list_logs, rounds),
+        "list_with_bodies_ms": _median_ms(list_logs_with_bodies, rounds),
+        "list_limit": list_limit,
+    }
@@ -0,0 +1,317 @@
+"""
+Drafting email via LLM dengan cache persisten, request collapsing dan micro-batching.
+
+Prompt dibangun dari `DraftTemplate` hanya dengan konteks yang sama untuk
+banyak client (periode, status jatuh tempo, jenis produk, ...). Data pribadi
+(nama client, nominal, nomor invoice, link) tidak masuk prompt: model diminta
+menulis placeholder `{{client_name}}` dst., lalu `personalize` mengisinya
+setelah cache. Reminder bulan yang sama untuk ribuan client = satu panggilan model.
+
+Urutan per `draft_many`:
+1. render + normalisasi prompt → key = SHA-256(model, template, prompt);
+2. key yang sedang di-generate coroutine lain ditunggu (collapsed, tanpa query);
+3. lookup LLM_DRAFT_CACHE untuk sisa key sekaligus (hit → tanpa model);
+4. sisanya dikirim ke `_MicroBatcher` (per model, maks. `batch_size` prompt
+   atau `batch_wait_ms`) lalu disimpan ke cache (`ON CONFLICT DO UPDATE`).
+
+`default_drafting_service()` membangun service per proses dari `settings`
+(`LLM_PROVIDER`, `LLM_MODEL`, `LLM_BATCH_SIZE`, `LLM_BATCH_WAIT_MS`,
+`LLM_DRAFT_CACHE_TTL_DAYS`).
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import hashlib
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.metrics import llm_batch_size, llm_draft_requests
+from app.integrations.llm import LlmClient, build_llm_client
+from app.models.email_body import EmailBody, body_hash, insert_bodies
+from app.models.llm_draft import LlmDraftCache
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+_SPACES = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+class DraftTemplateNotFoundError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class DraftTemplate:
+    name: str
+    # `str.format` dengan field konteks bersama (masuk cache key)
+    prompt: str
+    # Diisi setelah cache lewat `personalize` (tidak masuk prompt)
+    placeholders: Tuple[str, ...]
+
+    def render(self, context: Mapping[str, str]) -> str:
+        instructions = ", ".join("{{" + name + "}}" for name in self.placeholders)
+        return normalize_prompt(
+            self.prompt.format(**context)
+            + "\n\nTulis placeholder berikut persis apa adanya, jangan diisi: "
+            + instructions
+            + ".\nGunakan nada profesional dan ringkas."
+        )
+
+
+TEMPLATES: Dict[str, DraftTemplate] = {
+    template.name: template
+    for template in (
+        DraftTemplate(
+            "payment_reminder",
+            "Tulis email reminder pembayaran yang sopan dalam Bahasa Indonesia.\n"
+            "Konteks: tagihan langganan periode {period}, {due_state}.",
+            ("client_name", "invoice_number", "amount", "due_date", "payment_link"),
+        ),
+        DraftTemplate(
+            "payment_status",
+            "Tulis email konfirmasi status pembayaran dalam Bahasa Indonesia.\n"
+            "Konteks: pembayaran tagihan periode {period} {status}.",
+            ("client_name", "invoice_number", "amount", "paid_at"),
+        ),
+        DraftTemplate(
+            "quotation",
+            "Tulis email pengantar penawaran harga dalam Bahasa Indonesia.\n"
+            "Konteks: penawaran untuk {product_category}, dokumen penawaran terlampir.",
+            ("client_name", "quotation_number", "total", "valid_until", "sales_name"),
+        ),
+    )
+}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """NFC, spasi berulang → satu, maks. satu baris kosong, trim per baris."""
+    text = unicodedata.normalize("NFC", prompt).replace("\r\n", "\n")
+    text = "\n".join(_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def cache_key(model: str, template: str, prompt: str) -> bytes:
+    return hashlib.sha256(f"{model}\0{template}\0{prompt}".encode("utf-8")).digest()
+
+
+def personalize(body: str, values: Mapping[str, str]) -> str:
+    """Isi `{{nama}}`; placeholder tanpa nilai dibiarkan supaya mudah terlihat."""
+    return _PLACEHOLDER.sub(lambda match: str(values.get(match.group(1), match.group(0))), body)
+
+
+@dataclass
+class DraftRequest:
+    template: str
+    context: Mapping[str, str] = field(default_factory=dict)
+    personalization: Mapping[str, str] = field(default_factory=dict)
+    model: Optional[str] = None
+
+
+@dataclass
+class Draft:
+    model: str
+    template: str
+    prompt: str
+    # Draft dari model (masih berisi placeholder) dan hasil personalisasi
+    generated_body: str
+    body: str
+    cached: bool
+
+
+class _MicroBatcher:
+    """Kumpulkan prompt per model; kirim saat `batch_size` tercapai atau `wait_seconds` lewat."""
+
+    def __init__(self, client: LlmClient, batch_size: int, wait_seconds: float) -> None:
+        self.client = client
+        self.batch_size = batch_size
+        self.wait_seconds = wait_seconds
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, model: str, prompt: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._pending.setdefault(model, [])
+        queue.append((prompt, future))
+        if len(queue) >= self.batch_size:
+            self._flush(model)
+        elif model not in self._timers:
+            self._timers[model] = loop.call_later(self.wait_seconds, self._flush, model)
+        return future
+
+    def _flush(self, model: str) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(model, [])
+        if items:
+            task = asyncio.ensure_future(self._run(model, items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, model: str, items: List[Tuple[str, asyncio.Future]]) -> None:
+        llm_batch_size.labels(model).observe(len(items))
+        try:
+            results = await self.client.generate_batch(model, [prompt for prompt, _ in items])
+        except Exception as exc:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class DraftingService:
+    """
+    Satu instance per proses/worker (menyimpan batcher & request in-flight).
+    Semua method dipanggil dari event loop yang sama.
+    """
+
+    def __init__(
+        self,
+        client: LlmClient,
+        default_model: str,
+        batch_size: int = 16,
+        batch_wait_ms: float = 20.0,
+        cache_ttl: timedelta = timedelta(days=30),
+    ) -> None:
+        self.default_model = default_model
+        self.cache_ttl = cache_ttl
+        self._batcher = _MicroBatcher(client, batch_size, batch_wait_ms / 1000)
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+
+    async def draft(self, db: Session, request: DraftRequest) -> Draft:
+        return (await self.draft_many(db, [request]))[0]
+
+    async def draft_many(self, db: Session, requests: Sequence[DraftRequest]) -> List[Draft]:
+        rendered = []
+        unique: Dict[bytes, Tuple[str, str, str]] = {}
+        for request in requests:
+            template = TEMPLATES.get(request.template)
+            if template is None:
+                raise DraftTemplateNotFoundError(f"Template draft tidak dikenal: {request.template}")
+            model = request.model or self.default_model
+            prompt = template.render(request.context)
+            key = cache_key(model, template.name, prompt)
+            rendered.append((request, model, prompt, key))
+            unique.setdefault(key, (model, template.name, prompt))
+
+        # Key yang sedang di-generate coroutine lain langsung ditunggu, tanpa lookup DB
+        waiting: Dict[bytes, asyncio.Future] = {}
+        for key, (model, _, _) in unique.items():
+            if key in self._inflight:
+                waiting[key] = self._inflight[key]
+                llm_draft_requests.labels(model, "collapsed").inc()
+
+        bodies = self._lookup(db, [key for key in unique if key not in waiting])
+        cached_keys = set(bodies)
+
+        generated: Dict[bytes, asyncio.Future] = {}
+        for key, (model, _, prompt) in unique.items():
+            if key in bodies or key in waiting:
+                continue
+            future = self._batcher.submit(model, prompt)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+            waiting[key] = generated[key] = future
+            llm_draft_requests.labels(model, "miss").inc()
+        for key in cached_keys:
+            llm_draft_requests.labels(unique[key][0], "hit").inc()
+
+        if waiting:
+            # shield: future dipakai bersama coroutine lain (`_inflight`); pemanggil
+            # yang dibatalkan tidak boleh membatalkan draft untuk yang lain
+            results = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            bodies.update(zip(waiting, results))
+        if generated:
+            self._store(db, {key: (*unique[key], bodies[key]) for key in generated})
+
+        return [
+            Draft(
+                model=model,
+                template=request.template,
+                prompt=prompt,
+                generated_body=bodies[key],
+                body=personalize(bodies[key], request.personalization),
+                cached=key in cached_keys,
+            )
+            for request, model, prompt, key in rendered
+        ]
+
+    def _lookup(self, db: Session, keys: List[bytes]) -> Dict[bytes, str]:
+        if not keys:
+            return {}
+        now = datetime.now(timezone.utc)
+        rows = db.scalars(
+            select(LlmDraftCache)
+            .options(selectinload(LlmDraftCache.body).selectinload(EmailBody.dictionary))
+            .where(LlmDraftCache.key_hash.in_(keys), LlmDraftCache.created_at > now - self.cache_ttl)
+        ).all()
+        if rows:
+            # Satu UPDATE per lookup (bukan per hit)
+            db.execute(
+                update(LlmDraftCache)
+                .where(LlmDraftCache.key_hash.in_([row.key_hash for row in rows]))
+                .values(hit_count=LlmDraftCache.hit_count + 1, last_hit_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        return {bytes(row.key_hash): row.body.text for row in rows}
+
+    def _store(self, db: Session, entries: Dict[bytes, Tuple[str, str, str, str]]) -> None:
+        insert_bodies(db, [text for _, _, prompt, body in entries.values() for text in (prompt, body)])
+        stmt = pg_insert(LlmDraftCache).values(
+            [
+                {
+                    "key_hash": key,
+                    "model": model,
+                    "template": template,
+                    "prompt_hash": body_hash(prompt),
+                    "body_hash": body_hash(body),
+                }
+                for key, (model, template, prompt, body) in entries.items()
+            ]
+        )
+        # Entry kedaluwarsa (atau ditulis worker lain) ditimpa hasil terbaru
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["key_hash"],
+                set_={
+                    "prompt_hash": stmt.excluded.prompt_hash,
+                    "body_hash": stmt.excluded.body_hash,
+                    "hit_count": 0,
+                    "created_at": stmt.excluded.created_at,
+                    "last_hit_at": None,
+                },
+            )
+        )
+
+
+_default_service: Optional[DraftingService] = None
+_default_lock = threading.Lock()
+
+
+def default_drafting_service() -> DraftingService:
+    """Service per proses dengan client LLM & parameter dari `settings`."""
+    global _default_service
+    if _default_service is None:
+        with _default_lock:
+            if _default_service is None:
+                from app.core.config import settings
+
+                _default_service = DraftingService(
+                    build_llm_client(settings),
+                    settings.LLM_MODEL,
+                    batch_size=settings.LLM_BATCH_SIZE,
+                    batch_wait_ms=settings.LLM_BATCH_WAIT_MS,
+                    cache_ttl=timedelta(days=settings.LLM_DRAFT_CACHE_TTL_DAYS),
+                )
+    return _default_service
@@ -0,0 +1,294 @@
+"""
+Worker outbox untuk EMAIL_LOGS OUTBOUND berstatus DRAFT.
+
+Alur satu batch (`process_outbox`):
+1. Claim DRAFT yang sudah punya `final_body` dan tidak sedang di-lease
+   (`FOR UPDATE SKIP LOCKED`, dilayani partial index
+   `ix_email_logs_draft_created_at`), set `send_lease_until` lalu commit.
+   Row lock tidak dipegang selama pengiriman; worker lain melewati baris yang
+   lease-nya masih berlaku.
+2. Kirim concurrent lewat `EmailProvider` async, dibatasi semaphore
+   (`concurrency`) dan token bucket per alamat pengirim (`SenderRateLimiter`).
+3. `TransientEmailError` di-retry dengan exponential backoff + jitter
+   (atau `retry_after` dari provider); error lain langsung FAILED.
+4. Hasil disimpan di transaksi kedua dengan satu bulk UPDATE (status,
+   `gmail_message_id`, `rfc_message_id`, `sent_at`, lease dilepas).
+
+Worker yang mati di antara langkah 1 dan 4 meninggalkan baris DRAFT dengan
+lease; setelah `send_lease_until` lewat baris itu di-claim ulang (at-least-once:
+email yang sempat terkirim bisa terkirim dua kali). Lease harus lebih panjang
+dari durasi satu batch.
+
+Lampiran: entry `attachments_meta_json` dengan `url` (PDF quotation, invoice)
+diambil dari cache artifact lokal (`app.services.artifacts`); sumber remote
+hanya di-download sekali, meski URL yang sama dipakai banyak email. Lampiran
+yang gagal diambil hanya menggagalkan email-nya sendiri.
+
+Request handler cukup membuat EmailLog DRAFT; pengiriman tidak pernah
+memblokir API.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional
+import uuid
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.metrics import track_job
+from app.integrations.email_provider import (
+    EmailAttachment,
+    EmailProvider,
+    OutboundEmail,
+    TransientEmailError,
+)
+from app.models.email_body import EmailBody
+from app.models.email_log import EmailDirection, EmailLog, EmailStatus
+from app.services.artifacts import ArtifactError, ArtifactStore, default_artifact_store
+
+logger = logging.getLogger("cloudsales.email_outbox")
+
+MAX_BACKOFF_SECONDS = 30.0
+DEFAULT_LEASE_SECONDS = 600
+
+
+class TokenBucket:
+    """Token bucket async: `rate` token/detik, maksimal `capacity` token (burst)."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Lock dipegang selama menunggu → antrean FIFO per bucket
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SenderRateLimiter:
+    """Satu `TokenBucket` per alamat pengirim; simpan instance-nya antar batch."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, sender: str) -> None:
+        bucket = self._buckets.get(sender)
+        if bucket is None:
+            bucket = self._buckets[sender] = TokenBucket(self.rate, self.capacity)
+        await bucket.acquire()
+
+
+@dataclass
+class SendOutcome:
+    email_log_id: uuid.UUID
+    message_id: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class EmailOutboxRunResult:
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+
+
+@dataclass
+class ClaimedEmail:
+    """Salinan EmailLog yang di-claim; dipakai setelah commit claim (objek ORM sudah expired)."""
+
+    email_log_id: uuid.UUID
+    email: OutboundEmail
+    attachments_meta: List[Dict[str, Any]]
+
+
+def claim_drafts(db: Session, limit: int = 100, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[ClaimedEmail]:
+    """Claim DRAFT siap kirim dan set lease-nya; commit oleh pemanggil."""
+    now = datetime.now(timezone.utc)
+    stmt = (
+        select(EmailLog)
+        .options(selectinload(EmailLog.final_body_content).selectinload(EmailBody.dictionary))
+        .where(
+            EmailLog.status == EmailStatus.DRAFT,
+            EmailLog.direction == EmailDirection.OUTBOUND,
+            EmailLog.final_body_hash.isnot(None),
+            or_(EmailLog.send_lease_until.is_(None), EmailLog.send_lease_until < now),
+        )
+        .order_by(EmailLog.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=EmailLog)
+    )
+    logs = list(db.scalars(stmt))
+    if not logs:
+        return []
+    db.execute(
+        update(EmailLog)
+        .where(EmailLog.id.in_([log.id for log in logs]))
+        .values(send_lease_until=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    return [
+        ClaimedEmail(
+            log.id,
+            OutboundEmail(log.from_email, log.to_email, log.subject, log.final_body),
+            list(log.attachments_meta_json or ()),
+        )
+        for log in logs
+    ]
+
+
+def _backoff_seconds(attempt: int, base_seconds: float, retry_after: Optional[float]) -> float:
+    if retry_after is not None:
+        return min(retry_after, MAX_BACKOFF_SECONDS)
+    # Full jitter: acak di [0, base * 2^(attempt-1)]
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, base_seconds * 2 ** (attempt - 1)))
+
+
+async def _deliver(
+    email_log_id: uuid.UUID,
+    email: OutboundEmail,
+    provider: EmailProvider,
+    limiter: SenderRateLimiter,
+    semaphore: asyncio.Semaphore,
+    max_attempts: int,
+    backoff_base_seconds: float,
+) -> SendOutcome:
+    outcome = SendOutcome(email_log_id)
+    while True:
+        outcome.attempts += 1
+        await limiter.acquire(email.from_email)
+        async with semaphore:
+            try:
+                outcome.message_id = await provider.send(email)
+                outcome.sent_at = datetime.now(timezone.utc)
+                return outcome
+            except TransientEmailError as exc:
+                outcome.error = f"{type(exc).__name__}: {exc}"
+                retry_after = exc.retry_after
+            except Exception as exc:
+                outcome.error = f"{type(exc).__name__}: {exc}"
+                return outcome
+        if outcome.attempts >= max_attempts:
+            return outcome
+        # Backoff di luar semaphore supaya slot dipakai email lain
+        await asyncio.sleep(_backoff_seconds(outcome.attempts, backoff_base_seconds, retry_after))
+
+
+async def send_emails(
+    emails: Dict[uuid.UUID, OutboundEmail],
+    provider: EmailProvider,
+    limiter: SenderRateLimiter,
+    concurrency: int = 10,
+    max_attempts: int = 4,
+    backoff_base_seconds: float = 0.5,
+) -> List[SendOutcome]:
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(
+            _deliver(email_log_id, email, provider, limiter, semaphore, max_attempts, backoff_base_seconds)
+            for email_log_id, email in emails.items()
+        )
+    )
+
+
+async def _attachments(claimed: ClaimedEmail, artifacts: Optional[ArtifactStore]) -> List[EmailAttachment]:
+    entries = [entry for entry in claimed.attachments_meta if entry.get("url")]
+    if not entries:
+        return []
+    artifacts = artifacts or default_artifact_store()
+    stored = await asyncio.gather(*(artifacts.get(entry["url"]) for entry in entries))
+    return [
+        EmailAttachment(
+            entry.get("filename") or artifact.url.rsplit("/", 1)[-1] or artifact.sha256,
+            entry.get("mime_type") or artifact.content_type,
+            artifact.path,
+        )
+        for entry, artifact in zip(entries, stored)
+    ]
+
+
+async def process_outbox(
+    db: Session,
+    provider: EmailProvider,
+    limiter: SenderRateLimiter,
+    batch_size: int = 100,
+    concurrency: int = 10,
+    max_attempts: int = 4,
+    backoff_base_seconds: float = 0.5,
+    commit: bool = True,
+    artifacts: Optional[ArtifactStore] = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+) -> EmailOutboxRunResult:
+    """
+    Claim, kirim, dan simpan hasil satu batch DRAFT. `commit=False` (test,
+    benchmark): claim & hasil hanya di-flush, semuanya di satu transaksi.
+    """
+    result = EmailOutboxRunResult()
+    with track_job("email_outbox") as job:
+        claimed = claim_drafts(db, batch_size, lease_seconds)
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        attachments = await asyncio.gather(*(_attachments(item, artifacts) for item in claimed), return_exceptions=True)
+        emails = {}
+        outcomes = []
+        for item, resolved in zip(claimed, attachments):
+            if isinstance(resolved, BaseException):
+                # CancelledError / KeyboardInterrupt tetap menghentikan worker
+                if not isinstance(resolved, Exception):
+                    raise resolved
+                if not isinstance(resolved, ArtifactError):
+                    logger.error("lampiran email %s gagal diproses", item.email_log_id, exc_info=resolved)
+                error = f"lampiran: {type(resolved).__name__}: {resolved}"
+                outcomes.append(SendOutcome(item.email_log_id, attempts=1, error=error))
+                continue
+            item.email.attachments = resolved
+            emails[item.email_log_id] = item.email
+        outcomes += await send_emails(emails, provider, limiter, concurrency, max_attempts, backoff_base_seconds)
+
+        rows = []
+        for outcome in outcomes:
+            result.retries += outcome.attempts - 1
+            if outcome.message_id is not None:
+                result.sent += 1
+                rows.append(
+                    {
+                        "id": outcome.email_log_id,
+                        "status": EmailStatus.SENT,
+                        "gmail_message_id": outcome.message_id,
+                        "rfc_message_id": emails[outcome.email_log_id].message_id,
+                        "sent_at": outcome.sent_at,
+                        "send_lease_until": None,
+                    }
+                )
+            else:
+                result.failed += 1
+                logger.warning("email %s gagal dikirim (%d percobaan): %s", outcome.email_log_id, outcome.attempts, outcome.error)
+                rows.append({"id": outcome.email_log_id, "status": EmailStatus.FAILED, "send_lease_until": None})
+        if rows:
+            db.execute(update(EmailLog), rows)
+        job.add_items(len(claimed))
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+    return result
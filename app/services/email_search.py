@@ -0,0 +1,209 @@
+"""
+Pencarian full-text EMAIL_LOGS (subject + final body).
+
+`email_logs.search_vector` (GIN `ix_email_logs_search_vector`) diisi trigger
+`email_logs_search_vector` saat email ditulis, dari subject &
+`email_bodies.search_vector` (dihitung `insert_bodies`). Body yang dimuat di
+luar `insert_bodies` (COPY dataset sintetis, data sebelum migration) diisi
+`reindex`.
+
+`search_emails`:
+- query bebas ala web (`websearch_to_tsquery`: "kata", -kecuali, or);
+- filter `related_type`, `direction`, `user_id`, rentang `created_at`;
+- ranking `ts_rank_cd` (subject berbobot A, body B), lalu terbaru;
+- paginasi limit/offset, `has_more` dari satu baris ekstra (tanpa COUNT).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+import re
+from typing import Dict, List, Optional
+import uuid
+
+from sqlalchemy import cast, func, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.email_body import SEARCH_TEXT_CONFIG, EmailBody
+from app.models.email_log import (
+    EmailDirection,
+    EmailLog,
+    EmailRelatedType,
+    EmailStatus,
+)
+
+MAX_PAGE_SIZE = 100
+SNIPPET_CHARS = 200
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class EmailSearchError(Exception):
+    pass
+
+
+@dataclass
+class EmailSearchHit:
+    id: uuid.UUID
+    subject: Optional[str]
+    direction: EmailDirection
+    related_type: EmailRelatedType
+    related_id: Optional[uuid.UUID]
+    user_id: Optional[uuid.UUID]
+    from_email: str
+    to_email: str
+    status: EmailStatus
+    created_at: datetime
+    sent_at: Optional[datetime]
+    rank: float
+    snippet: Optional[str]
+
+
+@dataclass
+class EmailSearchPage:
+    hits: List[EmailSearchHit]
+    limit: int
+    offset: int
+    has_more: bool
+
+
+def _snippet(body: Optional[str], terms: List[str]) -> Optional[str]:
+    """Potongan body di sekitar kemunculan pertama salah satu kata query."""
+    if not body:
+        return None
+    lowered = body.lower()
+    positions = [position for position in (lowered.find(term) for term in terms) if position >= 0]
+    start = max(min(positions) - SNIPPET_CHARS // 4, 0) if positions else 0
+    snippet = " ".join(body[start:start + SNIPPET_CHARS].split())
+    return ("…" if start else "") + snippet + ("…" if start + SNIPPET_CHARS < len(body) else "")
+
+
+def search_emails(
+    db: Session,
+    query: str,
+    related_type: Optional[EmailRelatedType] = None,
+    direction: Optional[EmailDirection] = None,
+    user_id: Optional[uuid.UUID] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> EmailSearchPage:
+    if not query or not query.strip():
+        raise EmailSearchError("Query pencarian kosong")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise EmailSearchError(f"limit harus 1..{MAX_PAGE_SIZE}")
+
+    ts_query = func.websearch_to_tsquery(cast(SEARCH_TEXT_CONFIG, REGCONFIG), query)
+    rank = func.ts_rank_cd(EmailLog.search_vector, ts_query).label("rank")
+    stmt = select(
+        EmailLog.id,
+        EmailLog.subject,
+        EmailLog.direction,
+        EmailLog.related_type,
+        EmailLog.related_id,
+        EmailLog.user_id,
+        EmailLog.from_email,
+        EmailLog.to_email,
+        EmailLog.status,
+        EmailLog.created_at,
+        EmailLog.sent_at,
+        EmailLog.final_body_hash,
+        rank,
+    ).where(EmailLog.search_vector.op("@@")(ts_query))
+    if related_type is not None:
+        stmt = stmt.where(EmailLog.related_type == related_type)
+    if direction is not None:
+        stmt = stmt.where(EmailLog.direction == direction)
+    if user_id is not None:
+        stmt = stmt.where(EmailLog.user_id == user_id)
+    if date_from is not None:
+        stmt = stmt.where(EmailLog.created_at >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(EmailLog.created_at < date_to)
+
+    rows = db.execute(
+        stmt.order_by(rank.desc(), EmailLog.created_at.desc(), EmailLog.id).limit(limit + 1).offset(offset)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Snippet: hanya body di halaman ini yang di-decompress
+    hashes = {row.final_body_hash for row in rows if row.final_body_hash is not None}
+    bodies: Dict[bytes, str] = {}
+    if hashes:
+        bodies = {
+            bytes(body.hash): body.text
+            for body in db.scalars(
+                select(EmailBody).options(selectinload(EmailBody.dictionary)).where(EmailBody.hash.in_(hashes))
+            )
+        }
+    terms = [word.lower() for word in _WORD.findall(query) if word.lower() != "or"]
+
+    hits = [
+        EmailSearchHit(
+            id=row.id,
+            subject=row.subject,
+            direction=row.direction,
+            related_type=row.related_type,
+            related_id=row.related_id,
+            user_id=row.user_id,
+            from_email=row.from_email,
+            to_email=row.to_email,
+            status=row.status,
+            created_at=row.created_at,
+            sent_at=row.sent_at,
+            rank=float(row.rank),
+            snippet=_snippet(bodies.get(bytes(row.final_body_hash)) if row.final_body_hash else None, terms),
+        )
+        for row in rows
+    ]
+    return EmailSearchPage(hits, limit, offset, has_more)
+
+
+def reindex(db: Session, batch_size: int = 1000, rebuild: bool = False, commit: bool = True) -> int:
+    """
+    Isi `email_bodies.search_vector` yang masih NULL (`rebuild=True` = semua,
+    misalnya setelah SEARCH_TEXT_CONFIG diganti), lalu sentuh email yang
+    merujuk body itu supaya trigger menghitung ulang `search_vector`-nya.
+    Keyset per hash; satu `UPDATE ... FROM unnest(...)` per batch.
+    `updated_at` tidak diubah. Return jumlah email yang di-index ulang.
+    """
+    updated = 0
+    last_hash = None
+    while True:
+        stmt = select(EmailBody).options(selectinload(EmailBody.dictionary)).order_by(EmailBody.hash).limit(batch_size)
+        if not rebuild:
+            stmt = stmt.where(EmailBody.search_vector.is_(None))
+        if last_hash is not None:
+            stmt = stmt.where(EmailBody.hash > last_hash)
+        bodies = db.scalars(stmt).all()
+        if not bodies:
+            break
+        last_hash = bodies[-1].hash
+
+        hashes = [bytes(body.hash) for body in bodies]
+        db.execute(
+            text(
+                "UPDATE email_bodies AS b SET search_vector = to_tsvector(CAST(:config AS regconfig), d.body)"
+                " FROM unnest(CAST(:hashes AS bytea[]), CAST(:bodies AS text[])) AS d(hash, body)"
+                " WHERE b.hash = d.hash"
+            ),
+            {"config": SEARCH_TEXT_CONFIG, "hashes": hashes, "bodies": [body.text for body in bodies]},
+        )
+        updated += db.execute(
+            text("UPDATE email_logs SET final_body_hash = final_body_hash WHERE final_body_hash = ANY(:hashes)"),
+            {"hashes": hashes},
+        ).rowcount
+        if commit:
+            db.commit()
+        db.expunge_all()
+
+    # Email tanpa body: vektor subject saja (NULL = dimuat sebelum trigger ada)
+    stmt = "UPDATE email_logs SET subject = subject WHERE final_body_hash IS NULL"
+    if not rebuild:
+        stmt += " AND search_vector IS NULL"
+    updated += db.execute(text(stmt)).rowcount
+    if commit:
+        db.commit()
+    return updated
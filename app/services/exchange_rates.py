@@ -0,0 +1,275 @@
+"""
+Kurs mata uang: import feed CSV & lookup in-memory.
+
+EXCHANGE_RATES menyimpan time series per pasangan (base, quote). Pemakai
+(pricing quotation, billing run, laporan) tidak meng-query tabel per konversi,
+tetapi lewat `ExchangeRateCache`:
+
+- semua series dimuat dengan satu query, per pasangan jadi dua array terurut
+  (`effective_at` sebagai epoch detik di `array('d')` + kurs Decimal);
+- "kurs pada waktu T" = `bisect_right` → titik terakhir dengan
+  `effective_at <= T` (O(log n), tanpa I/O);
+- pasangan terbalik dihitung 1/kurs (Decimal presisi penuh), pasangan tanpa
+  data langsung ditriangulasi lewat `pivot` (REPORTING_CURRENCY);
+- dimuat ulang setelah `ttl_seconds` (atau `invalidate()` setelah import);
+  snapshot diganti utuh sehingga pembaca tidak perlu lock.
+
+Tanggal (`date`) dibaca sebagai 00:00 UTC hari itu: kurs yang sudah diketahui
+di awal hari, supaya hasil billing tidak bergantung jam proses berjalan.
+
+Format CSV import (header wajib)::
+
+    base_currency,quote_currency,effective_at,rate
+    USD,IDR,2025-11-28,15890.5
+    USD,IDR,2025-11-28T09:00:00+07:00,15902.25
+"""
+
+from array import array
+from bisect import bisect_right
+import csv
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal, InvalidOperation
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.metrics import track_job
+from app.models.exchange_rate import ExchangeRate
+from app.services.pricing import money
+
+Moment = Union[date, datetime]
+
+CSV_COLUMNS = ("base_currency", "quote_currency", "effective_at", "rate")
+
+
+class ExchangeRateError(Exception):
+    pass
+
+
+class RateNotFoundError(ExchangeRateError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    batches: int = 0
+
+
+def _as_datetime(moment: Moment) -> datetime:
+    if isinstance(moment, datetime):
+        return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return datetime.combine(moment, dt_time.min, tzinfo=timezone.utc)
+
+
+def _currency(value: str) -> str:
+    value = (value or "").strip().upper()
+    if not value.isalpha() or not 3 <= len(value) <= 10:
+        raise ValueError(f"kode mata uang tidak valid: {value!r}")
+    return value
+
+
+def parse_csv(file: TextIO, source: str = "csv") -> Iterable[dict]:
+    """Baris CSV → dict siap upsert; error menyebut nomor baris."""
+    reader = csv.DictReader(file)
+    missing = set(CSV_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ExchangeRateError(f"Kolom CSV kurang: {', '.join(sorted(missing))}")
+    for row in reader:
+        try:
+            base, quote = _currency(row["base_currency"]), _currency(row["quote_currency"])
+            try:
+                rate = Decimal(row["rate"].strip())
+            except InvalidOperation:
+                raise ValueError(f"kurs tidak valid: {row['rate']!r}") from None
+            if base == quote or not rate > 0:
+                raise ValueError("pasangan atau kurs tidak valid")
+            effective_at = _as_datetime(datetime.fromisoformat(row["effective_at"].strip()))
+        except (ValueError, AttributeError) as exc:
+            raise ExchangeRateError(f"Baris {reader.line_num}: {exc}") from exc
+        yield {
+            "base_currency": base,
+            "quote_currency": quote,
+            "effective_at": effective_at,
+            "rate": rate,
+            "source": source,
+        }
+
+
+def import_rates(db: Session, rows: Iterable[dict], batch_size: int = 5000, commit: bool = True) -> ImportResult:
+    """Upsert multi-row per batch; titik yang sama (pasangan + waktu) ditimpa."""
+    result = ImportResult()
+    with track_job("exchange_rate_import") as job:
+        batch: List[dict] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _upsert(db, batch, result)
+                job.add_items(len(batch))
+                batch = []
+                if commit:
+                    db.commit()
+        if batch:
+            _upsert(db, batch, result)
+            job.add_items(len(batch))
+            if commit:
+                db.commit()
+    return result
+
+
+def _upsert(db: Session, batch: Sequence[dict], result: ImportResult) -> None:
+    # Duplikat di dalam satu batch tidak boleh masuk satu INSERT ... ON CONFLICT
+    unique = {(row["base_currency"], row["quote_currency"], row["effective_at"]): row for row in batch}
+    stmt = pg_insert(ExchangeRate).values(list(unique.values()))
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["base_currency", "quote_currency", "effective_at"],
+            set_={"rate": stmt.excluded.rate, "source": stmt.excluded.source},
+        )
+    )
+    result.rows += len(unique)
+    result.batches += 1
+
+
+def import_csv(db: Session, file: TextIO, source: str = "csv", batch_size: int = 5000) -> ImportResult:
+    return import_rates(db, parse_csv(file, source), batch_size)
+
+
+class RateSeries:
+    """Satu pasangan: waktu (epoch detik, terurut naik) & kurs."""
+
+    __slots__ = ("times", "rates")
+
+    def __init__(self, times: array, rates: List[Decimal]) -> None:
+        self.times = times
+        self.rates = rates
+
+    def at(self, moment: Moment) -> Optional[Decimal]:
+        index = bisect_right(self.times, _as_datetime(moment).timestamp()) - 1
+        return self.rates[index] if index >= 0 else None
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+
+class ExchangeRateCache:
+    def __init__(
+        self,
+        session_factory: Optional[sessionmaker],
+        ttl_seconds: float = 300.0,
+        pivot: str = "USD",
+    ) -> None:
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.pivot = pivot
+        self.loads = 0
+        self._series: Dict[Tuple[str, str], RateSeries] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def snapshot(cls, db: Session, pivot: str = "USD") -> "ExchangeRateCache":
+        """Cache sekali-muat dari session `db`, tanpa reload (job batch: satu query per run)."""
+        cache = cls(None, ttl_seconds=float("inf"), pivot=pivot)
+        cache._series = cache._load(db)
+        cache._loaded_at = time.monotonic()
+        return cache
+
+    def invalidate(self) -> None:
+        if self.session_factory is not None:
+            self._loaded_at = None
+
+    def _snapshot(self) -> Dict[Tuple[str, str], RateSeries]:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl_seconds:
+            with self._lock:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                    with self.session_factory() as db:
+                        self._series = self._load(db)
+                    self._loaded_at = time.monotonic()
+        return self._series
+
+    def _load(self, db: Session) -> Dict[Tuple[str, str], RateSeries]:
+        series: Dict[Tuple[str, str], RateSeries] = {}
+        rows = db.execute(
+            select(
+                ExchangeRate.base_currency,
+                ExchangeRate.quote_currency,
+                ExchangeRate.effective_at,
+                ExchangeRate.rate,
+            ).order_by(ExchangeRate.base_currency, ExchangeRate.quote_currency, ExchangeRate.effective_at)
+        )
+        for base, quote, effective_at, rate in rows:
+            current = series.get((base, quote))
+            if current is None:
+                current = series[(base, quote)] = RateSeries(array("d"), [])
+            current.times.append(effective_at.timestamp())
+            current.rates.append(rate)
+        self.loads += 1
+        return series
+
+    def _direct(self, series: Dict[Tuple[str, str], RateSeries], base: str, quote: str, at: Moment) -> Optional[Decimal]:
+        if base == quote:
+            return Decimal(1)
+        forward = series.get((base, quote))
+        if forward is not None:
+            value = forward.at(at)
+            if value is not None:
+                return value
+        backward = series.get((quote, base))
+        if backward is not None:
+            value = backward.at(at)
+            if value is not None:
+                return Decimal(1) / value
+        return None
+
+    def rate(self, base: str, quote: str, at: Moment) -> Decimal:
+        """1 `base` = hasil × `quote` pada waktu `at`."""
+        series = self._snapshot()
+        value = self._direct(series, base, quote, at)
+        if value is None and self.pivot not in (base, quote):
+            to_pivot = self._direct(series, base, self.pivot, at)
+            from_pivot = self._direct(series, self.pivot, quote, at)
+            if to_pivot is not None and from_pivot is not None:
+                value = to_pivot * from_pivot
+        if value is None:
+            raise RateNotFoundError(f"Kurs {base}/{quote} pada {at} tidak tersedia")
+        return value
+
+    def find_rate(self, base: str, quote: str, at: Moment) -> Optional[Decimal]:
+        try:
+            return self.rate(base, quote, at)
+        except RateNotFoundError:
+            return None
+
+    def convert(self, amount, base: str, quote: str, at: Moment) -> Decimal:
+        return money(Decimal(amount) * self.rate(base, quote, at))
+
+    def pairs(self) -> Dict[Tuple[str, str], int]:
+        return {pair: len(series) for pair, series in self._snapshot().items()}
+
+
+_default_cache: Optional[ExchangeRateCache] = None
+_default_lock = threading.Lock()
+
+
+def default_rate_cache() -> ExchangeRateCache:
+    """Cache per proses dengan SessionLocal & `settings`."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                from app.core.config import settings
+                from app.db.session import SessionLocal
+
+                _default_cache = ExchangeRateCache(
+                    SessionLocal,
+                    ttl_seconds=settings.EXCHANGE_RATE_CACHE_TTL_SECONDS,
+                    pivot=settings.REPORTING_CURRENCY,
+                )
+    return _default_cache
@@ -0,0 +1,290 @@
+"""
+Ingestion email inbound (balasan client, upload invoice dari Finance).
+
+Alur `ingest_mailbox`:
+1. `source.list_since(cursor)` → id pesan baru sejak MAILBOX_CURSORS.cursor.
+2. Per batch `batch_size` id: fetch concurrent (`fetch_concurrency`), tiap pesan
+   langsung di-parse di worker pool (`executor`, biasanya ProcessPoolExecutor)
+   begitu selesai di-fetch. Batch berikutnya di-fetch selagi batch sekarang
+   ditulis ke DB.
+3. Matching dengan satu query per jenis per batch:
+   - `Quotation.gmail_thread_id` (index) → QUOTATION;
+   - `EmailLog.gmail_message_id` (index `ix_email_logs_gmail_message_id`) untuk
+     dedup pesan yang sudah pernah di-ingest dan thread id Gmail (= id pesan
+     pertama di thread) → related entity email OUTBOUND asal;
+   - `EmailLog.rfc_message_id` (index `ix_email_logs_rfc_message_id`) untuk
+     In-Reply-To / References (Message-ID RFC, bukan id Gmail API) → idem;
+   - pengirim user FINANCE dengan lampiran → INVOICE_REQUEST, selain itu CLIENT_MAIL.
+4. EMAIL_LOGS INBOUND (PARSED, atau RECEIVED bila parsing gagal) di-insert per
+   batch lalu commit; cursor disimpan setelah semua batch selesai. Karena
+   dedup by `gmail_message_id`, run yang terputus aman diulang.
+
+Lampiran disimpan content-addressed (`<dir>/<sha256[:2]>/<sha256>`), metadata
+(filename, mime_type, size, sha256) di `attachments_meta_json`.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email import policy
+from email.parser import BytesParser
+from email.utils import getaddresses, parseaddr, parsedate_to_datetime
+import hashlib
+import html
+from pathlib import Path
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.integrations.mailbox import MailboxSource, RawMessage
+from app.models.email_log import EmailDirection, EmailLog, EmailRelatedType, EmailStatus
+from app.models.mailbox_cursor import MailboxCursor
+from app.models.quotation import Quotation
+from app.models.user import User, UserRole
+
+_MESSAGE_REF = re.compile(r"<[^<>\s]+>")
+_HTML_BREAK = re.compile(r"(?i)<br\s*/?>|</p>|</div>|</li>")
+_HTML_TAG = re.compile(r"<[^>]+>")
+_BLANK_LINES = re.compile(r"\n\s*\n\s*\n+")
+
+
+@dataclass
+class ParsedMessage:
+    message_id: str
+    thread_id: Optional[str]
+    rfc_message_id: Optional[str] = None
+    from_email: str = ""
+    to_email: str = ""
+    subject: Optional[str] = None
+    body: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    references: List[str] = field(default_factory=list)
+    attachments: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class InboundRunResult:
+    listed: int = 0
+    duplicates: int = 0
+    stored: int = 0
+    matched: int = 0
+    parse_errors: int = 0
+    cursor: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Parsing (dijalankan di worker pool, jadi harus top-level & picklable)
+# ---------------------------------------------------------------------------
+
+
+def _html_to_text(value: str) -> str:
+    text = html.unescape(_HTML_TAG.sub("", _HTML_BREAK.sub("\n", value)))
+    return _BLANK_LINES.sub("\n\n", "\n".join(line.strip() for line in text.splitlines())).strip()
+
+
+def _store_attachment(directory: str, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    target = Path(directory) / digest[:2] / digest
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_suffix(".part")
+        partial.write_bytes(data)
+        partial.replace(target)
+    return digest
+
+
+def parse_message(message_id: str, thread_id: Optional[str], raw: bytes, attachment_dir: str) -> ParsedMessage:
+    parsed = ParsedMessage(message_id, thread_id)
+    try:
+        message = BytesParser(policy=policy.default).parsebytes(raw)
+        # Header registry policy.default mahal: tiap header dibaca sekali
+        sender, to, subject, date, rfc_message_id = (
+            message[name] for name in ("From", "To", "Subject", "Date", "Message-ID")
+        )
+        parsed.from_email = parseaddr(str(sender or ""))[1].lower()[:320]
+        recipients = getaddresses([str(to or "")])
+        parsed.to_email = (recipients[0][1] if recipients else "").lower()[:320]
+        parsed.subject = str(subject)[:500] if subject is not None else None
+        if date is not None:
+            sent_at = parsedate_to_datetime(str(date))
+            parsed.sent_at = sent_at if sent_at.tzinfo else sent_at.replace(tzinfo=timezone.utc)
+        rfc_ids = _MESSAGE_REF.findall(str(rfc_message_id or ""))
+        parsed.rfc_message_id = rfc_ids[0][:998] if rfc_ids else None
+        parsed.references = _MESSAGE_REF.findall(f"{message['In-Reply-To'] or ''} {message['References'] or ''}")
+
+        body_part = message.get_body(preferencelist=("plain", "html"))
+        if body_part is not None:
+            content = body_part.get_content()
+            parsed.body = _html_to_text(content) if body_part.get_content_subtype() == "html" else content.strip()
+
+        for part in message.iter_attachments():
+            data = part.get_payload(decode=True) or b""
+            parsed.attachments.append(
+                {
+                    "filename": part.get_filename(),
+                    "mime_type": part.get_content_type(),
+                    "size": len(data),
+                    "sha256": _store_attachment(attachment_dir, data),
+                }
+            )
+    except Exception as exc:
+        parsed.error = f"{type(exc).__name__}: {exc}"
+    return parsed
+
+
+# ---------------------------------------------------------------------------
+# Matching & penulisan
+# ---------------------------------------------------------------------------
+
+
+def _resolve_batch(db: Session, messages: Sequence[ParsedMessage]) -> Tuple[set, List[EmailLog], int]:
+    """(id yang sudah ada, EmailLog baru, jumlah yang ter-match ke entitas)."""
+    message_ids = [message.message_id for message in messages]
+    thread_ids = {message.thread_id for message in messages if message.thread_id}
+    references = {ref for message in messages for ref in message.references}
+    # Thread id Gmail = id pesan pertama di thread (biasanya email OUTBOUND kita)
+    lookup_ids = set(message_ids) | thread_ids
+
+    known: Dict[str, Tuple[EmailDirection, EmailRelatedType, Any]] = {
+        row.gmail_message_id: (row.direction, row.related_type, row.related_id)
+        for row in db.execute(
+            select(EmailLog.gmail_message_id, EmailLog.direction, EmailLog.related_type, EmailLog.related_id)
+            .where(EmailLog.gmail_message_id.in_(lookup_ids))
+        )
+    }
+    # In-Reply-To / References → Message-ID email OUTBOUND yang kita kirim
+    replied: Dict[str, Tuple[EmailRelatedType, Any]] = {
+        row.rfc_message_id: (row.related_type, row.related_id)
+        for row in db.execute(
+            select(EmailLog.rfc_message_id, EmailLog.related_type, EmailLog.related_id).where(
+                EmailLog.rfc_message_id.in_(references), EmailLog.direction == EmailDirection.OUTBOUND
+            )
+        )
+    } if references else {}
+    quotations = dict(
+        db.execute(select(Quotation.gmail_thread_id, Quotation.id).where(Quotation.gmail_thread_id.in_(thread_ids))).all()
+    ) if thread_ids else {}
+    senders = {message.from_email for message in messages if message.from_email}
+    users = {
+        row.email.lower(): (row.id, row.role)
+        for row in db.execute(select(User.email, User.id, User.role).where(User.email.in_(senders)))
+    } if senders else {}
+
+    existing = {message_id for message_id in message_ids if message_id in known}
+    logs: List[EmailLog] = []
+    matched = 0
+    for message in messages:
+        if message.message_id in existing:
+            continue
+        existing.add(message.message_id)
+
+        related_type, related_id = EmailRelatedType.CLIENT_MAIL, None
+        user_id, role = users.get(message.from_email, (None, None))
+        if message.thread_id in quotations:
+            related_type, related_id = EmailRelatedType.QUOTATION, quotations[message.thread_id]
+        else:
+            origin = known.get(message.thread_id) if message.thread_id else None
+            if origin is not None and origin[0] == EmailDirection.OUTBOUND:
+                related_type, related_id = origin[1], origin[2]
+            else:
+                # Akhir References = pesan yang langsung dibalas, jadi dicek dulu
+                for ref in message.references[::-1]:
+                    if ref in replied:
+                        related_type, related_id = replied[ref]
+                        break
+                else:
+                    if role == UserRole.FINANCE and message.attachments:
+                        related_type = EmailRelatedType.INVOICE_REQUEST
+        if related_id is not None or related_type != EmailRelatedType.CLIENT_MAIL:
+            matched += 1
+
+        log = EmailLog(
+            direction=EmailDirection.INBOUND,
+            related_type=related_type,
+            related_id=related_id,
+            user_id=user_id,
+            from_email=message.from_email or "unknown",
+            to_email=message.to_email or "unknown",
+            subject=message.subject,
+            status=EmailStatus.RECEIVED if message.error else EmailStatus.PARSED,
+            gmail_message_id=message.message_id,
+            rfc_message_id=message.rfc_message_id,
+            has_attachments=bool(message.attachments),
+            attachments_meta_json=message.attachments or None,
+            sent_at=message.sent_at,
+        )
+        log.final_body = message.body
+        logs.append(log)
+    return existing, logs, matched
+
+
+def _save_cursor(db: Session, mailbox: str, cursor: str) -> None:
+    stmt = pg_insert(MailboxCursor).values(mailbox=mailbox, cursor=cursor)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["mailbox"],
+            set_={"cursor": stmt.excluded.cursor, "updated_at": datetime.now(timezone.utc)},
+        )
+    )
+
+
+async def ingest_mailbox(
+    db: Session,
+    source: MailboxSource,
+    executor: Executor,
+    attachment_dir: str,
+    batch_size: int = 200,
+    fetch_concurrency: int = 8,
+    commit: bool = True,
+) -> InboundRunResult:
+    result = InboundRunResult()
+    with track_job("inbound_email") as job:
+        cursor = db.scalar(select(MailboxCursor.cursor).where(MailboxCursor.mailbox == source.name))
+        changes = await source.list_since(cursor)
+        result.listed = len(changes.message_ids)
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(fetch_concurrency)
+
+        async def fetch_and_parse(message_id: str) -> ParsedMessage:
+            async with semaphore:
+                raw: RawMessage = await source.fetch_raw(message_id)
+            return await loop.run_in_executor(
+                executor, parse_message, raw.message_id, raw.thread_id, raw.raw, attachment_dir
+            )
+
+        def load(ids: Sequence[str]) -> asyncio.Future:
+            return asyncio.ensure_future(asyncio.gather(*(fetch_and_parse(message_id) for message_id in ids)))
+
+        batches = [changes.message_ids[i:i + batch_size] for i in range(0, len(changes.message_ids), batch_size)]
+        pending = load(batches[0]) if batches else None
+        for index in range(len(batches)):
+            messages = await pending
+            # Prefetch batch berikutnya selagi batch ini ditulis
+            pending = load(batches[index + 1]) if index + 1 < len(batches) else None
+
+            _, logs, matched = _resolve_batch(db, messages)
+            db.add_all(logs)
+            db.flush()
+            result.duplicates += len(messages) - len(logs)
+            result.stored += len(logs)
+            result.matched += matched
+            result.parse_errors += sum(1 for message in messages if message.error)
+            job.add_items(len(messages))
+            if commit:
+                db.commit()
+
+        if changes.cursor and changes.cursor != cursor:
+            _save_cursor(db, source.name, changes.cursor)
+        result.cursor = changes.cursor
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+    return result
@@ -0,0 +1,171 @@
+"""
+Render draft invoice PDF (tanpa dependency; PDF 1.4 teks, font Courier bawaan).
+
+Dipanggil di proses worker (`app.services.invoice_rendering`), jadi semua
+input/output picklable dan fungsi-fungsinya top-level. Output di-stream per
+halaman langsung ke store artifact (`write_blob`), tidak pernah dirakit utuh
+di memori.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+import os
+import resource
+from typing import Iterator, List, Optional, Tuple
+
+from app.services.artifacts import write_blob
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4, point
+MARGIN = 50
+FONT_SIZE = 10
+LEADING = 14
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+# Courier 10 pt = 6 pt per karakter → 77 kolom muat di lebar A4 dikurangi margin
+TABLE_HEADER = f"{'Deskripsi':<40}{'Qty':>5}{'Harga satuan':>16}{'Jumlah':>16}"
+
+
+@dataclass
+class InvoiceLine:
+    description: str
+    quantity: int
+    unit_price: Decimal
+    amount: Decimal
+
+
+@dataclass
+class InvoiceDocument:
+    cycle_id: str
+    client_name: str
+    legal_name: Optional[str]
+    billing_address: Optional[str]
+    tax_number: Optional[str]
+    period_start: date
+    period_end: date
+    due_date: date
+    currency: str
+    amount: Decimal
+    lines: List[InvoiceLine] = field(default_factory=list)
+
+
+@dataclass
+class RenderedInvoice:
+    cycle_id: str
+    sha256: str
+    size_bytes: int
+    pages: int
+    pid: int
+    peak_rss_kb: int
+
+
+def _money(value: Decimal) -> str:
+    return f"{value:,.2f}"
+
+
+def invoice_lines(document: InvoiceDocument) -> List[str]:
+    """Isi invoice sebagai baris teks; kolom tabel diratakan spasi (font monospace)."""
+    lines = [
+        "DRAFT INVOICE",
+        "",
+        f"Kepada   : {document.legal_name or document.client_name}",
+    ]
+    lines += [f"           {part}" for part in (document.billing_address or "").splitlines() if part.strip()]
+    if document.tax_number:
+        lines.append(f"NPWP     : {document.tax_number}")
+    lines += [
+        f"Periode  : {document.period_start:%d-%m-%Y} s/d {document.period_end:%d-%m-%Y}",
+        f"Jatuh tempo: {document.due_date:%d-%m-%Y}",
+        f"Referensi: {document.cycle_id}",
+        "",
+        TABLE_HEADER,
+        "-" * len(TABLE_HEADER),
+    ]
+    for line in document.lines:
+        lines.append(
+            f"{line.description[:39]:<40}{line.quantity:>5}"
+            f"{_money(line.unit_price):>16}{_money(line.amount):>16}"
+        )
+    lines += [
+        "-" * len(TABLE_HEADER),
+        f"{'Total (' + document.currency + ')':<45}{_money(document.amount):>32}",
+        "",
+        "Dibuat otomatis oleh CloudSales; bukan faktur final.",
+    ]
+    return lines
+
+
+def paginate(lines: List[str]) -> List[List[str]]:
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+
+def _escape(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _page_stream(lines: List[str], number: int, total: int) -> bytes:
+    parts = [b"BT", f"/F1 {FONT_SIZE} Tf {LEADING} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td".encode()]
+    for line in lines:
+        parts.append(b"(" + _escape(line) + b") '")
+    parts.append(b"ET")
+    footer = f"Halaman {number} dari {total}"
+    parts.append(f"BT /F1 8 Tf {PAGE_WIDTH - MARGIN - 60} {MARGIN // 2} Td".encode() + b" (" + _escape(footer) + b") Tj ET")
+    return b"\n".join(parts)
+
+
+def pdf_chunks(pages: List[List[str]]) -> Iterator[bytes]:
+    """PDF per chunk: header, objek per halaman, lalu xref (offset dihitung sambil jalan)."""
+    offsets: List[int] = []
+    position = 0
+
+    def emit(chunk: bytes) -> bytes:
+        nonlocal position
+        position += len(chunk)
+        return chunk
+
+    def obj(number: int, body: bytes) -> bytes:
+        offsets.append(position)
+        return emit(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    # Objek: 1 catalog, 2 pages, 3 font, lalu (page, content) per halaman
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    yield emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    yield obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    yield obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    yield obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+    for index, (page_id, lines) in enumerate(zip(page_ids, pages), start=1):
+        stream = _page_stream(lines, index, len(pages))
+        yield obj(
+            page_id,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode(),
+        )
+        yield obj(page_id + 1, f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    xref_at = position
+    entries = "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    yield emit(
+        f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n{entries}"
+        f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    )
+
+
+def render_to_store(root: str, document: InvoiceDocument) -> RenderedInvoice:
+    """Worker: render satu invoice langsung ke store artifact di `root`."""
+    pages = paginate(invoice_lines(document))
+    sha256, size = write_blob(root, pdf_chunks(pages))
+    return RenderedInvoice(
+        cycle_id=document.cycle_id,
+        sha256=sha256,
+        size_bytes=size,
+        pages=len(pages),
+        pid=os.getpid(),
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    )
+
+
+def render_pdf(document: InvoiceDocument) -> Tuple[bytes, int]:
+    """Render ke bytes (preview / test manual). Return (pdf, jumlah halaman)."""
+    pages = paginate(invoice_lines(document))
+    return b"".join(pdf_chunks(pages)), len(pages)
@@ -0,0 +1,181 @@
+"""
+Render draft invoice PDF untuk BILLING_CYCLES hasil billing run.
+
+Dijalankan sebagai job (`python -m scripts.invoices render`), tidak pernah di
+proses API. Per batch (keyset per id, partial index
+`ix_billing_cycles_invoice_pending`):
+
+1. satu query cycle + subscription + client, satu query item subscription →
+   `InvoiceDocument` (picklable);
+2. fan-out ke process pool (`executor.map`, chunksize); tiap worker me-render
+   dan men-stream PDF langsung ke store artifact di disk (`render_to_store`);
+3. satu upsert multi-row ARTIFACTS (pinned, URL `artifact://invoices/<id>.pdf`)
+   + satu UPDATE `invoice_file_url` dari `unnest(...)`, hanya untuk cycle
+   yang belum punya file (upload Finance tidak pernah ditimpa).
+
+Hasil melaporkan halaman/detik dan puncak RSS per worker (pid).
+"""
+
+from collections import defaultdict
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import partial
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+import uuid
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.models.billing import BillingCycle, BillingCycleStatus
+from app.models.client import Client
+from app.models.subscription import Subscription, SubscriptionItem
+from app.services.artifacts import ArtifactStore, StoredArtifact
+from app.services.invoice_pdf import InvoiceDocument, InvoiceLine, RenderedInvoice, render_to_store
+
+INVOICE_URL = "artifact://invoices/{cycle_id}.pdf"
+PDF_CONTENT_TYPE = "application/pdf"
+RENDERABLE_STATUSES = (BillingCycleStatus.PENDING, BillingCycleStatus.INVOICE_REQUESTED)
+
+
+@dataclass
+class InvoiceRenderResult:
+    batches: int = 0
+    invoices: int = 0
+    pages: int = 0
+    bytes_written: int = 0
+    elapsed_seconds: float = 0.0
+    # pid worker → puncak RSS (KB)
+    worker_peak_rss_kb: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def load_documents(db: Session, cycle_ids: Sequence[uuid.UUID]) -> List[InvoiceDocument]:
+    rows = db.execute(
+        select(
+            BillingCycle.id,
+            BillingCycle.subscription_id,
+            BillingCycle.period_start,
+            BillingCycle.period_end,
+            BillingCycle.due_date,
+            BillingCycle.currency,
+            BillingCycle.amount,
+            Client.name,
+            Client.legal_name,
+            Client.billing_address,
+            Client.tax_number,
+        )
+        .join(Subscription, Subscription.id == BillingCycle.subscription_id)
+        .join(Client, Client.id == Subscription.client_id)
+        .where(BillingCycle.id.in_(cycle_ids))
+        .order_by(BillingCycle.id)
+    ).all()
+    lines: Dict[uuid.UUID, List[InvoiceLine]] = defaultdict(list)
+    for item in db.execute(
+        select(
+            SubscriptionItem.subscription_id,
+            SubscriptionItem.description,
+            SubscriptionItem.quantity,
+            SubscriptionItem.unit_price,
+            SubscriptionItem.amount,
+        )
+        .where(SubscriptionItem.subscription_id.in_({row.subscription_id for row in rows}))
+        .order_by(SubscriptionItem.subscription_id, SubscriptionItem.created_at)
+    ):
+        lines[item.subscription_id].append(
+            InvoiceLine(item.description or "-", item.quantity, item.unit_price, item.amount)
+        )
+    return [
+        InvoiceDocument(
+            cycle_id=str(row.id),
+            client_name=row.name,
+            legal_name=row.legal_name,
+            billing_address=row.billing_address,
+            tax_number=row.tax_number,
+            period_start=row.period_start,
+            period_end=row.period_end,
+            due_date=row.due_date,
+            currency=row.currency,
+            amount=row.amount,
+            lines=lines[row.subscription_id],
+        )
+        for row in rows
+    ]
+
+
+def render_invoices(
+    db: Session,
+    store: ArtifactStore,
+    executor: Executor,
+    batch_size: int = 200,
+    chunksize: int = 8,
+    cycle_ids: Optional[Iterable[uuid.UUID]] = None,
+    commit: bool = True,
+    max_batches: Optional[int] = None,
+) -> InvoiceRenderResult:
+    """
+    Render semua cycle PENDING / INVOICE_REQUESTED yang belum punya
+    `invoice_file_url` (atau hanya `cycle_ids`). Commit per batch bila `commit`.
+    """
+    result = InvoiceRenderResult()
+    started = time.perf_counter()
+    base = (
+        select(BillingCycle.id)
+        .where(
+            BillingCycle.invoice_file_url.is_(None),
+            BillingCycle.status.in_(RENDERABLE_STATUSES),
+        )
+        .order_by(BillingCycle.id)
+        .limit(batch_size)
+    )
+    if cycle_ids is not None:
+        base = base.where(BillingCycle.id.in_(list(cycle_ids)))
+
+    with track_job("invoice_render") as job:
+        last_id = None
+        while max_batches is None or result.batches < max_batches:
+            stmt = base if last_id is None else base.where(BillingCycle.id > last_id)
+            ids = list(db.scalars(stmt))
+            if not ids:
+                break
+            last_id = ids[-1]
+            rendered = list(executor.map(partial(render_to_store, store.root), load_documents(db, ids), chunksize=chunksize))
+            _record(db, store, rendered)
+
+            result.batches += 1
+            result.invoices += len(rendered)
+            for invoice in rendered:
+                result.pages += invoice.pages
+                result.bytes_written += invoice.size_bytes
+                result.worker_peak_rss_kb[invoice.pid] = max(
+                    result.worker_peak_rss_kb.get(invoice.pid, 0), invoice.peak_rss_kb
+                )
+            job.add_items(len(rendered))
+            if commit:
+                db.commit()
+
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def _record(db: Session, store: ArtifactStore, rendered: Sequence[RenderedInvoice]) -> None:
+    urls = [INVOICE_URL.format(cycle_id=invoice.cycle_id) for invoice in rendered]
+    store.register_many(
+        [
+            StoredArtifact(url, invoice.sha256, store.path_for(invoice.sha256), invoice.size_bytes, PDF_CONTENT_TYPE)
+            for url, invoice in zip(urls, rendered)
+        ],
+        pinned=True,
+    )
+    db.execute(
+        text(
+            "UPDATE billing_cycles AS c SET invoice_file_url = m.url, updated_at = now()"
+            " FROM unnest(CAST(:ids AS uuid[]), CAST(:urls AS text[])) AS m(id, url)"
+            " WHERE c.id = m.id AND c.invoice_file_url IS NULL"
+        ),
+        {"ids": [uuid.UUID(invoice.cycle_id) for invoice in rendered], "urls": urls},
+    )
@@ -0,0 +1,280 @@
+"""
+Pricing quotation: konsistensi field mata uang internal & client.
+
+Aturan (identik di Python `price_line` dan SQL `reprice_quotations`):
+
+1. `exchange_rate` dibulatkan 6 desimal.
+2. `unit_price_client = round(unit_price × exchange_rate, 2)`.
+3. `subtotal_amount = round(unit_price × quantity × (100 − discount) / 100, 2)`;
+   `subtotal_amount_client` sama tetapi dari `unit_price_client` (harga satuan
+   yang tercetak di PDF), bukan dari `subtotal_amount × kurs`.
+4. Total = jumlah subtotal yang sudah dibulatkan, supaya baris PDF selalu
+   menjumlah ke total.
+
+Pembulatan ROUND_HALF_UP ke 2 desimal, sama dengan `round(numeric, 2)`
+PostgreSQL untuk nilai positif. Semua hitungan dalam Decimal/numeric, tanpa float.
+
+`reprice_quotations` menghitung ulang secara set-based: satu statement per
+batch quotation (UPDATE item ... RETURNING di CTE → UPDATE total quotation),
+tanpa me-load objek ORM.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, List, Optional, Sequence
+import uuid
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.models.quotation import Quotation, QuotationItem, QuotationStatus
+
+MONEY = Decimal("0.01")
+RATE = Decimal("0.000001")
+HUNDRED = Decimal(100)
+
+
+class PricingError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class LinePrice:
+    unit_price_client: Decimal
+    subtotal_amount: Decimal
+    subtotal_amount_client: Decimal
+
+
+@dataclass
+class RepriceResult:
+    quotations: int = 0
+    items: int = 0
+
+
+def money(value) -> Decimal:
+    return Decimal(value).quantize(MONEY, rounding=ROUND_HALF_UP)
+
+
+def rate(value) -> Decimal:
+    value = Decimal(value).quantize(RATE, rounding=ROUND_HALF_UP)
+    if value <= 0:
+        raise PricingError(f"Kurs harus positif: {value}")
+    return value
+
+
+def price_line(quantity: int, unit_price, discount_percent, exchange_rate) -> LinePrice:
+    discount = Decimal(discount_percent or 0)
+    if quantity < 0 or not 0 <= discount <= HUNDRED:
+        raise PricingError(f"Item tidak valid: quantity={quantity}, discount={discount}")
+    unit_price = money(unit_price)
+    unit_price_client = money(unit_price * rate(exchange_rate))
+    factor = HUNDRED - discount
+    return LinePrice(
+        unit_price_client=unit_price_client,
+        subtotal_amount=money(unit_price * quantity * factor / HUNDRED),
+        subtotal_amount_client=money(unit_price_client * quantity * factor / HUNDRED),
+    )
+
+
+def price_quotation(quotation: Quotation, exchange_rate=None) -> Quotation:
+    """Hitung ulang satu quotation di memori (form edit Sales); belum di-flush."""
+    if exchange_rate is not None:
+        quotation.exchange_rate = rate(exchange_rate)
+    total = total_client = Decimal(0)
+    for item in quotation.items:
+        line = price_line(item.quantity, item.unit_price, item.discount_percent, quotation.exchange_rate)
+        item.unit_price_client = line.unit_price_client
+        item.subtotal_amount = line.subtotal_amount
+        item.subtotal_amount_client = line.subtotal_amount_client
+        total += line.subtotal_amount
+        total_client += line.subtotal_amount_client
+    quotation.total_amount = total
+    quotation.total_amount_client = total_client
+    return quotation
+
+
+# ---------------------------------------------------------------------------
+# Set-based (SQL)
+# ---------------------------------------------------------------------------
+
+
+def _sql_subtotal(unit_price, quantity, discount_percent):
+    return func.round(unit_price * quantity * (100 - func.coalesce(discount_percent, 0)) / 100, 2)
+
+
+def _reprice_batch(db: Session, quotation_ids: Sequence[uuid.UUID], exchange_rate: Optional[Decimal]) -> int:
+    # Kurs baru (atau kurs tersimpan) per quotation; FOR UPDATE mengunci header
+    # supaya edit Sales yang bersamaan tidak menyisipkan total lama
+    target = (
+        select(
+            Quotation.id,
+            (func.round(exchange_rate, 6) if exchange_rate is not None else Quotation.exchange_rate).label("rate"),
+        )
+        .where(Quotation.id.in_(quotation_ids))
+        .with_for_update(of=Quotation)
+        .cte("target")
+    )
+    unit_price_client = func.round(QuotationItem.unit_price * target.c.rate, 2)
+    items = (
+        update(QuotationItem)
+        .where(QuotationItem.quotation_id == target.c.id)
+        .values(
+            unit_price_client=unit_price_client,
+            subtotal_amount=_sql_subtotal(QuotationItem.unit_price, QuotationItem.quantity, QuotationItem.discount_percent),
+            subtotal_amount_client=_sql_subtotal(unit_price_client, QuotationItem.quantity, QuotationItem.discount_percent),
+        )
+        .returning(QuotationItem.quotation_id, QuotationItem.subtotal_amount, QuotationItem.subtotal_amount_client)
+        .cte("items")
+    )
+    totals = (
+        select(
+            target.c.id,
+            target.c.rate,
+            func.coalesce(func.sum(items.c.subtotal_amount), 0).label("total"),
+            func.coalesce(func.sum(items.c.subtotal_amount_client), 0).label("total_client"),
+            func.count(items.c.quotation_id).label("item_count"),
+        )
+        .select_from(target.outerjoin(items, items.c.quotation_id == target.c.id))
+        .group_by(target.c.id, target.c.rate)
+        .subquery("totals")
+    )
+    result = db.execute(
+        update(Quotation)
+        .where(Quotation.id == totals.c.id)
+        .values(exchange_rate=totals.c.rate, total_amount=totals.c.total, total_amount_client=totals.c.total_client)
+        .returning(totals.c.item_count)
+        .execution_options(synchronize_session=False)
+    )
+    return sum(result.scalars())
+
+
+def reprice_quotations(
+    db: Session,
+    exchange_rate=None,
+    currency: Optional[str] = None,
+    client_currency: Optional[str] = None,
+    statuses: Iterable[QuotationStatus] = (QuotationStatus.DRAFT,),
+    quotation_ids: Optional[Iterable[uuid.UUID]] = None,
+    batch_size: int = 2000,
+    commit: bool = True,
+) -> RepriceResult:
+    """
+    Hitung ulang item & total quotation dengan `statuses` (default DRAFT).
+
+    - `exchange_rate` + `currency`/`client_currency`: pasang kurs baru untuk
+      pasangan mata uang itu (mis. USD→IDR setelah kurs berubah);
+    - tanpa `exchange_rate`: perbaiki konsistensi dengan kurs tersimpan.
+
+    Keyset per id, satu statement per batch; commit per batch bila `commit`.
+    """
+    if exchange_rate is not None:
+        if not (currency and client_currency):
+            raise PricingError("Kurs baru butuh currency & client_currency")
+        exchange_rate = rate(exchange_rate)
+
+    result = RepriceResult()
+    with track_job("reprice_quotations") as job:
+        base = select(Quotation.id).order_by(Quotation.id).limit(batch_size)
+        statuses = [status.value for status in statuses]
+        if statuses:
+            base = base.where(Quotation.status.in_(statuses))
+        if currency:
+            base = base.where(Quotation.currency == currency)
+        if client_currency:
+            base = base.where(Quotation.client_currency == client_currency)
+        if quotation_ids is not None:
+            base = base.where(Quotation.id.in_(list(quotation_ids)))
+
+        last_id = None
+        while True:
+            stmt = base if last_id is None else base.where(Quotation.id > last_id)
+            ids: List[uuid.UUID] = list(db.scalars(stmt))
+            if not ids:
+                break
+            last_id = ids[-1]
+            result.items += _reprice_batch(db, ids, exchange_rate)
+            result.quotations += len(ids)
+            job.add_items(len(ids))
+            if commit:
+                db.commit()
+    return result
+
+
+def reprice_to_market(
+    db: Session,
+    at: Optional[datetime] = None,
+    statuses: Iterable[QuotationStatus] = (QuotationStatus.DRAFT,),
+    rates=None,
+    batch_size: int = 2000,
+    commit: bool = True,
+) -> RepriceResult:
+    """
+    Pasang kurs EXCHANGE_RATES pada waktu `at` (default sekarang) ke semua
+    quotation `statuses`, per pasangan mata uang. Kurs dari
+    `ExchangeRateCache` (default cache proses); pasangan tanpa kurs dilewati.
+    """
+    if rates is None:
+        from app.services.exchange_rates import default_rate_cache
+
+        rates = default_rate_cache()
+    at = at or datetime.now(timezone.utc)
+    statuses = list(statuses)
+    pairs = db.execute(
+        select(Quotation.currency, Quotation.client_currency)
+        .where(Quotation.status.in_([status.value for status in statuses]))
+        .distinct()
+    ).all()
+
+    result = RepriceResult()
+    for currency, client_currency in pairs:
+        market = rates.find_rate(currency, client_currency, at)
+        if market is None:
+            continue
+        pair_result = reprice_quotations(
+            db,
+            exchange_rate=market,
+            currency=currency,
+            client_currency=client_currency,
+            statuses=statuses,
+            batch_size=batch_size,
+            commit=commit,
+        )
+        result.quotations += pair_result.quotations
+        result.items += pair_result.items
+    return result
+
+
+def count_inconsistent(db: Session) -> int:
+    """Jumlah quotation yang field tersimpannya tidak sesuai aturan pricing."""
+    unit_price_client = func.round(QuotationItem.unit_price * Quotation.exchange_rate, 2)
+    subtotal_client = _sql_subtotal(unit_price_client, QuotationItem.quantity, QuotationItem.discount_percent)
+    bad_items = (
+        select(QuotationItem.quotation_id)
+        .join(Quotation, Quotation.id == QuotationItem.quotation_id)
+        .where(
+            (QuotationItem.unit_price_client != unit_price_client)
+            | (QuotationItem.subtotal_amount
+               != _sql_subtotal(QuotationItem.unit_price, QuotationItem.quantity, QuotationItem.discount_percent))
+            | (QuotationItem.subtotal_amount_client != subtotal_client)
+        )
+    )
+    sums = (
+        select(
+            QuotationItem.quotation_id,
+            func.sum(QuotationItem.subtotal_amount).label("total"),
+            func.sum(QuotationItem.subtotal_amount_client).label("total_client"),
+        )
+        .group_by(QuotationItem.quotation_id)
+        .subquery()
+    )
+    bad_totals = (
+        select(Quotation.id)
+        .outerjoin(sums, sums.c.quotation_id == Quotation.id)
+        .where(
+            (Quotation.total_amount != func.coalesce(sums.c.total, 0))
+            | (Quotation.total_amount_client != func.coalesce(sums.c.total_client, 0))
+        )
+    )
+    return db.scalar(select(func.count()).select_from(bad_items.union(bad_totals).subquery()))
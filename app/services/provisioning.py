@@ -0,0 +1,129 @@
+"""
+Service layer untuk PROVISIONING_TASKS.
+
+- `create_task`    : buat task PENDING; `traceparent` default = span aktif, jadi
+  task yang dibuat handler `webhook_events.process_events` (span
+  `webhook.process`, parent = `WebhookEvent.traceparent`) mewarisi trace
+  webhook tersebut. Di luar span event, teruskan `event.traceparent`.
+- `execute_pending`: worker mengambil batch task PENDING (`FOR UPDATE SKIP
+  LOCKED`, dilayani partial index `ix_provisioning_tasks_pending_created_at`),
+  menjalankan executor per `target_system`, lalu menyimpan hasilnya.
+
+Setiap eksekusi punya span `provisioning.execute` dengan parent dari
+`traceparent` task dan link ke span batch worker.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import uuid
+
+from opentelemetry.trace import Link, SpanKind, Status, StatusCode, get_current_span
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.core.tracing import context_from_traceparent, current_traceparent, tracer
+from app.models.provisioning_task import (
+    ProvisioningAction,
+    ProvisioningStatus,
+    ProvisioningTargetSystem,
+    ProvisioningTask,
+)
+
+# Executor menerima task dan mengembalikan external_reference (atau None).
+# Exception = task FAILED dengan error_message.
+ProvisioningExecutor = Callable[[ProvisioningTask], Optional[str]]
+
+
+class ProvisioningExecutorNotFoundError(Exception):
+    pass
+
+
+@dataclass
+class ProvisioningRunResult:
+    succeeded: int = 0
+    failed: int = 0
+
+
+def create_task(
+    db: Session,
+    subscription_item_id: uuid.UUID,
+    action: ProvisioningAction,
+    target_system: ProvisioningTargetSystem,
+    payload: Optional[Dict[str, Any]] = None,
+    traceparent: Optional[str] = None,
+) -> ProvisioningTask:
+    task = ProvisioningTask(
+        subscription_item_id=subscription_item_id,
+        action=action,
+        target_system=target_system,
+        payload_json=payload,
+        status=ProvisioningStatus.PENDING,
+        traceparent=traceparent or current_traceparent(),
+    )
+    db.add(task)
+    return task
+
+
+def claim_pending(db: Session, limit: int = 50) -> List[ProvisioningTask]:
+    stmt = (
+        select(ProvisioningTask)
+        .where(ProvisioningTask.status == ProvisioningStatus.PENDING)
+        .order_by(ProvisioningTask.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(db.scalars(stmt))
+
+
+def _execute(task: ProvisioningTask, executors: Dict[ProvisioningTargetSystem, ProvisioningExecutor], batch_link: Link) -> bool:
+    with tracer.start_as_current_span(
+        "provisioning.execute",
+        context=context_from_traceparent(task.traceparent),
+        kind=SpanKind.CONSUMER,
+        links=[batch_link],
+        attributes={
+            "provisioning.task_id": str(task.id),
+            "provisioning.action": task.action.value,
+            "provisioning.target_system": task.target_system.value,
+        },
+    ) as span:
+        try:
+            executor = executors.get(task.target_system)
+            if executor is None:
+                raise ProvisioningExecutorNotFoundError(f"Tidak ada executor untuk {task.target_system.value}")
+            task.external_reference = executor(task)
+            task.status = ProvisioningStatus.SUCCESS
+            task.error_message = None
+        except Exception as exc:
+            span.record_exception(exc)
+            span.set_status(Status(StatusCode.ERROR))
+            task.status = ProvisioningStatus.FAILED
+            task.error_message = f"{type(exc).__name__}: {exc}"
+        task.executed_at = datetime.now(timezone.utc)
+        return task.status == ProvisioningStatus.SUCCESS
+
+
+def execute_pending(
+    db: Session,
+    executors: Dict[ProvisioningTargetSystem, ProvisioningExecutor],
+    batch_size: int = 50,
+    commit: bool = True,
+) -> ProvisioningRunResult:
+    """Proses satu batch task PENDING. Hasil disimpan saat flush/commit batch."""
+    result = ProvisioningRunResult()
+    with track_job("provisioning") as job:
+        batch_link = Link(get_current_span().get_span_context())
+        tasks = claim_pending(db, batch_size)
+        for task in tasks:
+            if _execute(task, executors, batch_link):
+                result.succeeded += 1
+            else:
+                result.failed += 1
+        job.add_items(len(tasks))
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+    return result
@@ -0,0 +1,237 @@
+"""
+Konversi quotation ACCEPTED → SUBSCRIPTIONS + SUBSCRIPTION_ITEMS.
+
+Pemetaan (sama untuk satu quotation maupun mode bulk):
+
+- subscription: client & Sales dari quotation, status PENDING_ACTIVATION
+  (start_date diisi setelah pembayaran pertama), mata uang = `client_currency`;
+- item: hanya baris dengan `product_id` (baris custom tanpa produk tidak bisa
+  diprovisioning, dihitung sebagai `skipped_items`); `unit_price` =
+  `unit_price_client`, `amount` = `subtotal_amount_client` (diskon ikut);
+- billing period: YEARLY bila semua produk default-nya YEARLY, selain itu MONTHLY;
+- `quotations.related_subscription_id` diisi subscription baru.
+
+Mode bulk (`convert_accepted`, renewal enterprise / migrasi sistem lama) per
+batch dalam satu transaksi:
+
+1. `SELECT ... FOR UPDATE SKIP LOCKED` quotation ACCEPTED yang belum punya
+   subscription;
+2. satu query item + billing period produk;
+3. INSERT multi-row subscriptions `RETURNING id` (urutan dijamin sesuai
+   parameter, `sort_by_parameter_order`) → peta quotation → subscription;
+4. INSERT multi-row subscription_items;
+5. satu UPDATE quotations dari `unnest(quotation_ids, subscription_ids)`;
+6. subscription baru masuk antrian ringkasan MRR (`mark_dirty`).
+
+Aman dijalankan ulang: quotation yang sudah terhubung ke subscription tidak
+terpilih lagi, dan batch yang gagal di-rollback utuh.
+"""
+
+from dataclasses import dataclass
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+import uuid
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.models.product import Product
+from app.models.quotation import Quotation, QuotationItem, QuotationStatus
+from app.models.revenue import mark_dirty
+from app.models.subscription import (
+    BillingPeriod,
+    ProvisioningStatus,
+    Subscription,
+    SubscriptionItem,
+    SubscriptionPaymentMethodType,
+    SubscriptionStatus,
+)
+
+
+class ConversionError(Exception):
+    pass
+
+
+@dataclass
+class ConversionResult:
+    batches: int = 0
+    subscriptions: int = 0
+    items: int = 0
+    skipped_items: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = self.subscriptions + self.items
+        return rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def billing_period_for(periods: Iterable[Optional[str]]) -> BillingPeriod:
+    periods = list(periods)
+    if periods and all(period == BillingPeriod.YEARLY.value for period in periods):
+        return BillingPeriod.YEARLY
+    return BillingPeriod.MONTHLY
+
+
+def _subscription_values(quotation, billing_period: BillingPeriod, payment_method_type: SubscriptionPaymentMethodType) -> dict:
+    return {
+        "client_id": quotation.client_id,
+        "created_by_user_id": quotation.sales_user_id,
+        "status": SubscriptionStatus.PENDING_ACTIVATION,
+        "billing_period": billing_period,
+        "payment_method_type": payment_method_type,
+        "is_manual": payment_method_type == SubscriptionPaymentMethodType.MANUAL,
+        "currency": quotation.client_currency,
+        "notes": f"Dari quotation {quotation.number}",
+    }
+
+
+def _item_values(item) -> dict:
+    return {
+        "product_id": item.product_id,
+        "description": item.description[:255] if item.description else None,
+        "quantity": item.quantity,
+        "unit_price": item.unit_price_client,
+        "amount": item.subtotal_amount_client,
+        "provisioning_status": ProvisioningStatus.PENDING,
+    }
+
+
+def convert_quotation(
+    db: Session,
+    quotation: Quotation,
+    payment_method_type: SubscriptionPaymentMethodType = SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION,
+) -> Subscription:
+    """Konversi satu quotation (saat Sales menandai ACCEPTED); belum di-commit."""
+    if quotation.status != QuotationStatus.ACCEPTED.value:
+        raise ConversionError(f"Quotation {quotation.number} belum ACCEPTED ({quotation.status})")
+    if quotation.related_subscription_id is not None:
+        raise ConversionError(f"Quotation {quotation.number} sudah dikonversi")
+    items = [item for item in quotation.items if item.product_id is not None]
+    periods = db.scalars(
+        select(Product.default_billing_period).where(Product.id.in_({item.product_id for item in items}))
+    ).all()
+    subscription = Subscription(**_subscription_values(quotation, billing_period_for(periods), payment_method_type))
+    subscription.items = [SubscriptionItem(**_item_values(item)) for item in items]
+    db.add(subscription)
+    db.flush()
+    quotation.related_subscription_id = subscription.id
+    return subscription
+
+
+def convert_accepted(
+    db: Session,
+    batch_size: int = 500,
+    payment_method_type: SubscriptionPaymentMethodType = SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION,
+    quotation_ids: Optional[Iterable[uuid.UUID]] = None,
+    commit: bool = True,
+    max_batches: Optional[int] = None,
+) -> ConversionResult:
+    """
+    Konversi semua quotation ACCEPTED yang belum punya subscription (atau
+    hanya `quotation_ids`). Satu transaksi per batch bila `commit`.
+    """
+    result = ConversionResult()
+    started = time.perf_counter()
+    quotation_ids = list(quotation_ids) if quotation_ids is not None else None
+
+    with track_job("quotation_conversion") as job:
+        while max_batches is None or result.batches < max_batches:
+            batch = convert_batch(db, batch_size, payment_method_type, quotation_ids)
+            if not batch.subscriptions:
+                break
+            result.batches += 1
+            result.subscriptions += batch.subscriptions
+            result.items += batch.items
+            result.skipped_items += batch.skipped_items
+            job.add_items(batch.subscriptions)
+            if commit:
+                db.commit()
+
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def convert_batch(
+    db: Session,
+    batch_size: int = 500,
+    payment_method_type: SubscriptionPaymentMethodType = SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION,
+    quotation_ids: Optional[Sequence[uuid.UUID]] = None,
+) -> ConversionResult:
+    """Satu batch; `subscriptions == 0` berarti tidak ada lagi yang perlu dikonversi."""
+    stmt = (
+        select(
+            Quotation.id,
+            Quotation.number,
+            Quotation.client_id,
+            Quotation.sales_user_id,
+            Quotation.client_currency,
+        )
+        .where(
+            Quotation.status == QuotationStatus.ACCEPTED.value,
+            Quotation.related_subscription_id.is_(None),
+        )
+        .order_by(Quotation.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    if quotation_ids is not None:
+        stmt = stmt.where(Quotation.id.in_(quotation_ids))
+    quotations = db.execute(stmt).all()
+    result = ConversionResult()
+    if not quotations:
+        return result
+
+    ids = [row.id for row in quotations]
+    items: Dict[uuid.UUID, List] = {quotation_id: [] for quotation_id in ids}
+    periods: Dict[uuid.UUID, List[Optional[str]]] = {quotation_id: [] for quotation_id in ids}
+    for item in db.execute(
+        select(
+            QuotationItem.quotation_id,
+            QuotationItem.product_id,
+            QuotationItem.description,
+            QuotationItem.quantity,
+            QuotationItem.unit_price_client,
+            QuotationItem.subtotal_amount_client,
+            Product.default_billing_period,
+        )
+        .outerjoin(Product, Product.id == QuotationItem.product_id)
+        .where(QuotationItem.quotation_id.in_(ids))
+        .order_by(QuotationItem.quotation_id, QuotationItem.created_at)
+    ):
+        if item.product_id is None:
+            result.skipped_items += 1
+            continue
+        items[item.quotation_id].append(item)
+        periods[item.quotation_id].append(item.default_billing_period)
+
+    subscription_ids = db.scalars(
+        insert(Subscription).returning(Subscription.id, sort_by_parameter_order=True),
+        [
+            _subscription_values(row, billing_period_for(periods[row.id]), payment_method_type)
+            for row in quotations
+        ],
+    ).all()
+    item_rows = [
+        {"subscription_id": subscription_id, **_item_values(item)}
+        for row, subscription_id in zip(quotations, subscription_ids)
+        for item in items[row.id]
+    ]
+    if item_rows:
+        db.execute(insert(SubscriptionItem), item_rows)
+    # INSERT bulk tidak lewat flush ORM → antrian ringkasan MRR diisi manual
+    mark_dirty(db, subscription_ids)
+    db.execute(
+        text(
+            "UPDATE quotations AS q SET related_subscription_id = m.subscription_id, updated_at = now()"
+            " FROM unnest(CAST(:quotation_ids AS uuid[]), CAST(:subscription_ids AS uuid[]))"
+            " AS m(quotation_id, subscription_id)"
+            " WHERE q.id = m.quotation_id"
+        ),
+        {"quotation_ids": ids, "subscription_ids": list(subscription_ids)},
+    )
+
+    result.subscriptions = len(subscription_ids)
+    result.items = len(item_rows)
+    return result
@@ -0,0 +1,156 @@
+"""
+Sweeper quotation kedaluwarsa.
+
+Quotation SENT yang `valid_until`-nya sudah lewat dipindah ke EXPIRED oleh
+job ini, bukan dicek ulang di tiap query list. Per batch satu statement:
+
+    WITH target AS (SELECT ... WHERE status = 'SENT' AND valid_until < now
+                    ORDER BY valid_until LIMIT n FOR UPDATE SKIP LOCKED)
+    UPDATE quotations SET status = 'EXPIRED' FROM target ... RETURNING ...
+
+memakai index `ix_quotations_status_valid_until`. Baris yang sudah EXPIRED
+tidak lagi cocok dengan filter, jadi batch berikutnya cukup mengulang query
+yang sama (tanpa keyset). SKIP LOCKED: aman dijalankan beberapa worker dan
+tidak menunggu quotation yang sedang diedit Sales.
+
+Opsional (`followups=True`): email tindak lanjut ke client dibuat di batch
+(transaksi) yang sama sebagai EMAIL_LOGS DRAFT dengan `final_body` terisi,
+jadi langsung masuk antrian outbox.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.models.client import Client
+from app.models.email_log import EmailDirection, EmailLog, EmailRelatedType, EmailStatus
+from app.models.quotation import Quotation, QuotationStatus
+from app.models.user import User
+
+FOLLOWUP_SUBJECT = "Penawaran {number} telah berakhir"
+FOLLOWUP_BODY = (
+    "Yth. {client_name},\n\n"
+    "Masa berlaku penawaran {number} sebesar {currency} {amount} telah berakhir pada {valid_until}.\n"
+    "Jika Bapak/Ibu masih berminat, balas email ini dan kami akan mengirimkan penawaran yang diperbarui.\n\n"
+    "Salam,\n{sales_name}"
+)
+
+
+@dataclass
+class ExpiryResult:
+    batches: int = 0
+    expired: int = 0
+    followups: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def count_due(db: Session, now: Optional[datetime] = None) -> int:
+    """Jumlah quotation SENT yang sudah lewat masa berlaku."""
+    now = now or datetime.now(timezone.utc)
+    return db.scalar(
+        select(func.count()).where(Quotation.status == QuotationStatus.SENT.value, Quotation.valid_until < now)
+    )
+
+
+def expire_quotations(
+    db: Session,
+    now: Optional[datetime] = None,
+    batch_size: int = 1000,
+    followups: bool = False,
+    commit: bool = True,
+    max_batches: Optional[int] = None,
+) -> ExpiryResult:
+    """
+    Pindahkan semua quotation SENT dengan `valid_until < now` ke EXPIRED.
+
+    Commit per batch bila `commit`; `max_batches` membatasi satu pemanggilan.
+    """
+    result = ExpiryResult()
+    started = time.perf_counter()
+    now = now or datetime.now(timezone.utc)
+
+    with track_job("quotation_expiry") as job:
+        while max_batches is None or result.batches < max_batches:
+            expired, drafted = expire_batch(db, now, batch_size, followups)
+            if not expired:
+                break
+            result.batches += 1
+            result.expired += expired
+            result.followups += drafted
+            job.add_items(expired)
+            if commit:
+                db.commit()
+
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def expire_batch(db: Session, now: datetime, batch_size: int = 1000, followups: bool = False) -> Tuple[int, int]:
+    """Satu batch; return (jumlah quotation EXPIRED, jumlah draft email)."""
+    target = (
+        select(
+            Quotation.id,
+            Client.name.label("client_name"),
+            func.coalesce(Client.contact_email, Client.billing_email).label("client_email"),
+            User.email.label("sales_email"),
+            User.full_name.label("sales_name"),
+        )
+        .join(Client, Client.id == Quotation.client_id)
+        .join(User, User.id == Quotation.sales_user_id)
+        .where(Quotation.status == QuotationStatus.SENT.value, Quotation.valid_until < now)
+        .order_by(Quotation.valid_until)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True, of=Quotation)
+        .cte("target")
+    )
+    rows = db.execute(
+        update(Quotation)
+        .where(Quotation.id == target.c.id)
+        .values(status=QuotationStatus.EXPIRED.value)
+        .returning(
+            Quotation.id,
+            Quotation.number,
+            Quotation.sales_user_id,
+            Quotation.valid_until,
+            Quotation.client_currency,
+            Quotation.total_amount_client,
+            target.c.client_name,
+            target.c.client_email,
+            target.c.sales_email,
+            target.c.sales_name,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not rows or not followups:
+        return len(rows), 0
+
+    logs: List[EmailLog] = []
+    for row in rows:
+        log = EmailLog(
+            direction=EmailDirection.OUTBOUND,
+            related_type=EmailRelatedType.QUOTATION,
+            related_id=row.id,
+            user_id=row.sales_user_id,
+            from_email=row.sales_email,
+            to_email=row.client_email,
+            subject=FOLLOWUP_SUBJECT.format(number=row.number),
+            status=EmailStatus.DRAFT,
+        )
+        log.final_body = FOLLOWUP_BODY.format(
+            client_name=row.client_name,
+            number=row.number,
+            currency=row.client_currency,
+            amount=f"{row.total_amount_client:,.2f}",
+            valid_until=row.valid_until.date().isoformat(),
+            sales_name=row.sales_name,
+        )
+        logs.append(log)
+    # Body (content-addressed) diisi listener saat flush, search_vector oleh trigger
+    db.add_all(logs)
+    db.flush()
+    return len(rows), len(logs)
@@ -0,0 +1,335 @@
+"""
+Proyeksi revenue 12 bulan ke depan per client × produk × mata uang.
+
+Input dari dua query (tanpa objek ORM):
+
+1. Baris proyeksi: subscription ACTIVE × produk (`sum(SubscriptionItem.amount)`
+   per periode tagih), `next_billing_date`, hari anchor, `billing_period`,
+   `end_date`.
+   Bulan & hari dihitung di SQL sebagai integer, `key` (client × produk ×
+   mata uang) dari `dense_rank()`, hasil diurut per key.
+2. Tingkat koleksi historis per client × mata uang: billing cycle (selain
+   CANCELLED) dengan due date di jendela lookback, nilai tertagih =
+   `least(amount, sum(payment SUCCESS cycle itu))`.
+
+Proyeksi dihitung sekaligus untuk semua baris dengan array NumPy (matriks
+baris × bulan), mengikuti aturan billing run (`app.services.billing`):
+tagihan pertama di `next_billing_date`, berikutnya tiap 1 / 12 bulan di hari
+anchor (di-clamp ke akhir bulan pendek), berhenti setelah `end_date`. Periode yang tertinggal (`next_billing_date` sebelum
+bulan awal) ditagih sekaligus di bulan pertama, seperti billing run mengejar
+ketertinggalan.
+
+Tingkat koleksi client dihaluskan ke rata-rata mata uangnya
+(`PRIOR_CYCLES` cycle semu), jadi client dengan sedikit histori tidak
+mendapat 0% / 100%. Expected = billed × tingkat koleksi.
+
+Nilai dalam mata uang subscription (float64; hasil dibulatkan ke sen saat
+ditampilkan).
+"""
+
+from dataclasses import dataclass
+from datetime import date
+import time
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+HORIZON_MONTHS = 12
+LOOKBACK_MONTHS = 12
+# Bobot rata-rata mata uang dalam tingkat koleksi client (jumlah cycle semu)
+PRIOR_CYCLES = 6.0
+# Dipakai bila mata uang belum punya histori sama sekali
+DEFAULT_COLLECTION_RATE = 1.0
+FETCH_ROWS = 50_000
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+FORECAST_LINES_SQL = text(
+    """
+    SELECT
+        s.client_id::text AS client_id,
+        si.product_id::text AS product_id,
+        s.currency,
+        (dense_rank() OVER (ORDER BY s.client_id, si.product_id, s.currency) - 1)::int AS key,
+        (extract(year FROM s.next_billing_date) * 12 + extract(month FROM s.next_billing_date) - 1)::int
+            AS next_month,
+        extract(day FROM s.next_billing_date)::int AS next_day,
+        coalesce(s.billing_anchor_day, extract(day FROM s.next_billing_date))::int AS anchor_day,
+        coalesce((extract(year FROM s.end_date) * 12 + extract(month FROM s.end_date) - 1)::int, 2147483647)
+            AS end_month,
+        coalesce(extract(day FROM s.end_date)::int, 31) AS end_day,
+        CASE s.billing_period WHEN 'YEARLY' THEN 12 ELSE 1 END AS period_months,
+        sum(si.amount)::float8 AS amount
+    FROM subscriptions AS s
+    JOIN subscription_items AS si ON si.subscription_id = s.id
+    WHERE s.status = 'ACTIVE' AND s.next_billing_date IS NOT NULL
+    GROUP BY s.id, si.product_id
+    ORDER BY key
+    """
+)
+
+COLLECTION_SQL = text(
+    """
+    SELECT
+        s.client_id::text AS client_id,
+        bc.currency,
+        count(*) AS cycles,
+        sum(bc.amount)::float8 AS billed,
+        sum(least(bc.amount, coalesce(paid.amount, 0)))::float8 AS collected
+    FROM billing_cycles AS bc
+    JOIN subscriptions AS s ON s.id = bc.subscription_id
+    LEFT JOIN LATERAL (
+        SELECT sum(p.amount) AS amount
+        FROM payments AS p
+        WHERE p.billing_cycle_id = bc.id AND p.status = 'SUCCESS'
+    ) AS paid ON true
+    WHERE bc.status <> 'CANCELLED' AND bc.due_date >= :since AND bc.due_date < :until
+    GROUP BY s.client_id, bc.currency
+    """
+)
+
+
+class ForecastError(Exception):
+    pass
+
+
+@dataclass
+class ForecastLines:
+    """Input proyeksi, satu elemen per subscription × produk, terurut per `key`."""
+
+    key: np.ndarray  # int, indeks client × produk × mata uang
+    next_month: np.ndarray  # tahun * 12 + bulan - 1
+    next_day: np.ndarray
+    anchor_day: np.ndarray  # hari tagih k >= 1 sebelum di-clamp ke akhir bulan
+    end_month: np.ndarray
+    end_day: np.ndarray
+    period_months: np.ndarray  # 1 / 12
+    amount: np.ndarray  # float64, per periode tagih
+    # Label per key
+    client_ids: np.ndarray
+    product_ids: np.ndarray
+    currencies: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.key)
+
+
+@dataclass
+class CollectionHistory:
+    """Histori per client × mata uang (label `client_id|currency`, terurut)."""
+
+    labels: np.ndarray
+    cycles: np.ndarray
+    billed: np.ndarray
+    collected: np.ndarray
+
+
+@dataclass
+class RevenueForecast:
+    start_month: date
+    client_ids: np.ndarray
+    product_ids: np.ndarray
+    currencies: np.ndarray
+    billed: np.ndarray  # (key, bulan)
+    collection_rate: np.ndarray  # (key,)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def months(self) -> List[date]:
+        index = self.start_month.year * 12 + self.start_month.month - 1
+        return [month_date(index + offset) for offset in range(self.billed.shape[1])]
+
+    @property
+    def expected(self) -> np.ndarray:
+        return self.billed * self.collection_rate[:, None]
+
+    def totals_by_currency(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Mata uang → (billed per bulan, expected per bulan)."""
+        currencies, inverse = np.unique(self.currencies, return_inverse=True)
+        billed = np.zeros((len(currencies), self.billed.shape[1]))
+        expected = np.zeros_like(billed)
+        np.add.at(billed, inverse, self.billed)
+        np.add.at(expected, inverse, self.expected)
+        return {currency: (billed[i], expected[i]) for i, currency in enumerate(currencies)}
+
+    def rows(self) -> Iterator[tuple]:
+        """(client_id, product_id, currency, bulan, billed, tingkat koleksi, expected) per sel bukan nol."""
+        months = self.months
+        expected = self.expected
+        keys, offsets = np.nonzero(self.billed)
+        for key, offset in zip(keys.tolist(), offsets.tolist()):
+            yield (
+                self.client_ids[key],
+                self.product_ids[key],
+                self.currencies[key],
+                months[offset],
+                round(float(self.billed[key, offset]), 2),
+                round(float(self.collection_rate[key]), 4),
+                round(float(expected[key, offset]), 2),
+            )
+
+
+def month_index(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def month_date(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def days_in_month(index: np.ndarray) -> np.ndarray:
+    """Jumlah hari per indeks bulan (tahun * 12 + bulan - 1), vektor."""
+    year, month = np.divmod(index, 12)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    return DAYS_IN_MONTH[month] + ((month == 1) & leap)
+
+
+def _columns(result, count: int) -> List[list]:
+    columns: List[list] = [[] for _ in range(count)]
+    for rows in result.partitions():
+        for column, values in zip(columns, zip(*rows)):
+            column.extend(values)
+    return columns
+
+
+def load_lines(db: Session) -> ForecastLines:
+    result = db.execute(FORECAST_LINES_SQL.execution_options(yield_per=FETCH_ROWS))
+    client_ids, product_ids, currencies, key, *numbers, amount = _columns(result, 11)
+    key = np.asarray(key, dtype=np.int64)
+    # Label key diambil dari baris pertama tiap key (hasil terurut per key)
+    first = np.flatnonzero(np.diff(key, prepend=-1))
+    next_month, next_day, anchor_day, end_month, end_day, period_months = (
+        np.asarray(values, dtype=np.int64) for values in numbers
+    )
+    return ForecastLines(
+        key=key,
+        next_month=next_month,
+        next_day=next_day,
+        anchor_day=anchor_day,
+        end_month=end_month,
+        end_day=end_day,
+        period_months=period_months,
+        amount=np.asarray(amount, dtype=np.float64),
+        client_ids=np.asarray(client_ids, dtype=object)[first],
+        product_ids=np.asarray(product_ids, dtype=object)[first],
+        currencies=np.asarray(currencies, dtype=object)[first],
+    )
+
+
+def load_collection_history(db: Session, start_month: date, lookback_months: int = LOOKBACK_MONTHS) -> CollectionHistory:
+    until = month_index(start_month)
+    result = db.execute(
+        COLLECTION_SQL.execution_options(yield_per=FETCH_ROWS),
+        {"since": month_date(until - lookback_months), "until": start_month},
+    )
+    client_ids, currencies, cycles, billed, collected = _columns(result, 5)
+    labels = np.char.add(np.char.add(np.asarray(client_ids, dtype=str), "|"), np.asarray(currencies, dtype=str))
+    order = np.argsort(labels)
+    return CollectionHistory(
+        labels=labels[order],
+        cycles=np.asarray(cycles, dtype=np.float64)[order],
+        billed=np.asarray(billed, dtype=np.float64)[order],
+        collected=np.asarray(collected, dtype=np.float64)[order],
+    )
+
+
+def collection_rates(
+    history: CollectionHistory,
+    client_ids: np.ndarray,
+    currencies: np.ndarray,
+    prior_cycles: float = PRIOR_CYCLES,
+) -> np.ndarray:
+    """Tingkat koleksi per client × mata uang, dihaluskan ke rata-rata mata uang."""
+    currencies = np.asarray(currencies, dtype=str)
+    history_currencies = (
+        np.char.partition(history.labels, "|")[:, 2] if len(history.labels) else np.array([], dtype=str)
+    )
+
+    # Rata-rata per mata uang (berbobot nilai tagihan)
+    currency_rate = np.full(len(currencies), DEFAULT_COLLECTION_RATE)
+    names, inverse = np.unique(history_currencies, return_inverse=True)
+    billed = np.bincount(inverse, weights=history.billed, minlength=len(names))
+    collected = np.bincount(inverse, weights=history.collected, minlength=len(names))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        prior = np.where(billed > 0, collected / billed, DEFAULT_COLLECTION_RATE)
+    if len(names):
+        position = np.clip(np.searchsorted(names, currencies), 0, len(names) - 1)
+        known = names[position] == currencies
+        currency_rate[known] = prior[position[known]]
+
+    # Histori client (bila ada)
+    rates = currency_rate.copy()
+    if len(history.labels):
+        labels = np.char.add(np.char.add(np.asarray(client_ids, dtype=str), "|"), currencies)
+        position = np.clip(np.searchsorted(history.labels, labels), 0, len(history.labels) - 1)
+        found = (history.labels[position] == labels) & (history.billed[position] > 0)
+        index = position[found]
+        client_rate = history.collected[index] / history.billed[index]
+        cycles = history.cycles[index]
+        rates[found] = (cycles * client_rate + prior_cycles * currency_rate[found]) / (cycles + prior_cycles)
+    return np.clip(rates, 0.0, 1.0)
+
+
+def project_billed(lines: ForecastLines, start_month: date, horizon: int = HORIZON_MONTHS) -> np.ndarray:
+    """
+    Nilai tertagih per key × bulan (float64, `(jumlah key, horizon)`).
+
+    Tagihan ke-k sebuah baris jatuh di bulan `next_month + k * period`
+    (hari `next_day` untuk k = 0, lalu `anchor_day` di-clamp ke akhir bulan
+    itu seperti `add_billing_period`); k dibatasi `end_date`. Tagihan di bulan awal atau
+    sebelumnya masuk ke bulan pertama.
+    """
+    if horizon < 1:
+        raise ForecastError("Horizon minimal 1 bulan")
+    start = month_index(start_month)
+    period = lines.period_months
+
+    # k terakhir yang tanggal tagihnya <= end_date
+    k_end = np.floor_divide(lines.end_month - lines.next_month, period)
+    on_end_month = lines.next_month + k_end * period == lines.end_month
+    # Hanya dipakai di bulan end_date; baris lain cukup diberi bulan apa saja
+    end_days = days_in_month(np.where(on_end_month, lines.end_month, 0))
+    last_day = np.where(k_end == 0, lines.next_day, np.minimum(lines.anchor_day, end_days))
+    k_end = k_end - (on_end_month & (last_day > lines.end_day))
+
+    # Bulan pertama: semua tagihan dengan bulan <= bulan awal
+    k_start = np.floor_divide(start - lines.next_month, period)
+    counts = np.zeros((len(lines), horizon))
+    counts[:, 0] = np.clip(np.minimum(k_start, k_end) + 1, 0, None)
+
+    # Bulan berikutnya: paling banyak satu tagihan per baris per bulan
+    if horizon > 1:
+        delta = (start + np.arange(1, horizon))[None, :] - lines.next_month[:, None]
+        k = np.floor_divide(delta, period[:, None])
+        counts[:, 1:] = (delta >= 0) & (delta - k * period[:, None] == 0) & (k <= k_end[:, None])
+
+    billed = counts * lines.amount[:, None]
+    if not len(lines):
+        return np.zeros((0, horizon))
+    # Baris terurut per key: jumlahkan per segmen key
+    first = np.flatnonzero(np.diff(lines.key, prepend=-1))
+    return np.add.reduceat(billed, first, axis=0)
+
+
+def forecast_revenue(
+    db: Session,
+    start_month: date,
+    horizon: int = HORIZON_MONTHS,
+    lookback_months: int = LOOKBACK_MONTHS,
+) -> RevenueForecast:
+    started = time.perf_counter()
+    start_month = start_month.replace(day=1)
+    lines = load_lines(db)
+    history = load_collection_history(db, start_month, lookback_months)
+    billed = project_billed(lines, start_month, horizon)
+    rates = collection_rates(history, lines.client_ids, lines.currencies)
+    return RevenueForecast(
+        start_month=start_month,
+        client_ids=lines.client_ids,
+        product_ids=lines.product_ids,
+        currencies=lines.currencies,
+        billed=billed,
+        collection_rate=rates,
+        elapsed_seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,379 @@
+"""
+Ringkasan MRR/ARR yang dipelihara inkremental.
+
+Sebelumnya angka MRR berarti join `subscriptions` × `subscription_items` ×
+`products` × `clients` untuk semua client di setiap load dashboard. Sekarang:
+
+- REVENUE_SUMMARY: MRR & jumlah subscription per bulan × tipe produk × mata
+  uang × status client. Dashboard membaca beberapa baris (satu bulan atau
+  rentang bulan pendek), tanpa join;
+- SUBSCRIPTION_REVENUE: kontribusi tiap subscription ACTIVE (per tipe produk)
+  yang sedang dihitung di ringkasan bulan berjalan;
+- REVENUE_DIRTY_SUBSCRIPTIONS: antrian subscription yang berubah. Diisi di
+  transaksi penulis oleh listener `after_flush` (status subscription, item,
+  status client) atau `mark_dirty` untuk path bulk SQL.
+
+`refresh_dirty` (job, tiap menit) per batch dalam satu transaksi: ambil id
+dari antrian, ganti kontribusinya di SUBSCRIPTION_REVENUE (DELETE ... RETURNING
+lama, INSERT ... RETURNING baru), lalu upsert selisih (baru − lama) ke baris
+bulan berjalan. Refresh diserialkan advisory lock, jadi baris ringkasan yang
+"panas" tidak pernah di-update dari transaksi penulis.
+
+Bulan baru di-seed dari SUBSCRIPTION_REVENUE pada refresh pertama bulan itu
+(sebelum batch pertama, walaupun antrian kosong);
+baris bulan yang sudah lewat menjadi posisi akhir bulan. `rebuild` menghitung
+ulang semuanya dari tabel sumber (rekonsiliasi, perubahan tipe produk), dan
+`reconcile` membandingkan ringkasan bulan berjalan dengan hitungan penuh.
+
+MRR: `amount` item (nilai per billing period, diskon sudah termasuk) untuk
+MONTHLY, `amount / 12` untuk YEARLY. ARR = MRR × 12. Nilai disimpan dalam mata
+uang subscription; konversi ke mata uang laporan saat baca (`ExchangeRateCache`).
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, String, case, cast, delete, exists, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.models.client import Client
+from app.models.product import Product
+from app.models.revenue import RevenueDirtySubscription, RevenueSummary, SubscriptionRevenue
+from app.models.subscription import BillingPeriod, Subscription, SubscriptionItem, SubscriptionStatus
+from app.services.exchange_rates import ExchangeRateCache
+from app.services.pricing import money
+
+# Kunci pg_advisory_xact_lock untuk refresh / rebuild ringkasan
+REVENUE_LOCK_KEY = 4_510_045
+
+Dimension = Tuple[str, str, str]  # (product_type, currency, client_status)
+
+
+@dataclass
+class RefreshResult:
+    batches: int = 0
+    subscriptions: int = 0
+    summary_rows: int = 0
+    # Baris bulan berjalan yang dibuat saat refresh pertama bulan itu
+    seeded_rows: int = 0
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class RebuildResult:
+    contributions: int = 0
+    summary_rows: int = 0
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class RevenueDrift:
+    product_type: str
+    currency: str
+    client_status: str
+    stored_subscriptions: int
+    actual_subscriptions: int
+    stored_mrr: Decimal
+    actual_mrr: Decimal
+
+
+@dataclass
+class RevenueTotals:
+    month: date
+    currency: str
+    mrr: Decimal = Decimal("0.00")
+    by_product_type: Dict[str, Decimal] = field(default_factory=dict)
+    # Mata uang tanpa kurs pada bulan itu (tidak ikut dijumlah)
+    unconverted: Dict[str, Decimal] = field(default_factory=dict)
+
+    @property
+    def arr(self) -> Decimal:
+        return self.mrr * 12
+
+
+def current_month(now: Optional[datetime] = None) -> date:
+    now = now or datetime.now(timezone.utc)
+    return now.date().replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Awal bulan `month` digeser `months` bulan (boleh negatif)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def contributions_query(subscription_ids: Optional[Sequence] = None):
+    """Kontribusi MRR per subscription ACTIVE × tipe produk, dihitung dari tabel sumber."""
+    item_mrr = case(
+        (Subscription.billing_period == BillingPeriod.YEARLY, SubscriptionItem.amount / 12),
+        else_=SubscriptionItem.amount,
+    )
+    stmt = (
+        select(
+            Subscription.id.label("subscription_id"),
+            Product.type.label("product_type"),
+            Subscription.currency.label("currency"),
+            cast(Client.status, String).label("client_status"),
+            func.round(func.sum(item_mrr), 4).label("mrr"),
+        )
+        .join(SubscriptionItem, SubscriptionItem.subscription_id == Subscription.id)
+        .join(Product, Product.id == SubscriptionItem.product_id)
+        .join(Client, Client.id == Subscription.client_id)
+        .where(Subscription.status == SubscriptionStatus.ACTIVE)
+        .group_by(Subscription.id, Product.type, Subscription.currency, Client.status)
+    )
+    if subscription_ids is not None:
+        stmt = stmt.where(Subscription.id.in_(subscription_ids))
+    return stmt
+
+
+CONTRIBUTION_COLUMNS = ["subscription_id", "product_type", "currency", "client_status", "mrr"]
+
+
+def _lock(db: Session) -> None:
+    db.execute(select(func.pg_advisory_xact_lock(REVENUE_LOCK_KEY)))
+
+
+def _seed_month(db: Session, month: date) -> int:
+    """Isi bulan baru dari kontribusi saat ini (posisi awal bulan)."""
+    if db.scalar(select(exists().where(RevenueSummary.month == month))):
+        return 0
+    grouped = select(
+        SubscriptionRevenue.product_type,
+        SubscriptionRevenue.currency,
+        SubscriptionRevenue.client_status,
+        func.count(),
+        func.sum(SubscriptionRevenue.mrr),
+    ).group_by(SubscriptionRevenue.product_type, SubscriptionRevenue.currency, SubscriptionRevenue.client_status)
+    return db.execute(
+        insert(RevenueSummary).from_select(
+            ["product_type", "currency", "client_status", "subscriptions", "mrr", "month"],
+            grouped.add_columns(literal(month, Date)),
+        )
+    ).rowcount
+
+
+def refresh_batch(db: Session, month: date, batch_size: int = 1000) -> Tuple[int, int]:
+    """
+    Satu batch antrian; return (jumlah subscription, baris ringkasan yang berubah).
+    `month` harus sudah di-seed (`refresh_dirty`), selisih diterapkan di atasnya.
+    """
+    _lock(db)
+    queued = (
+        select(RevenueDirtySubscription.subscription_id)
+        .order_by(RevenueDirtySubscription.marked_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    ids = list(
+        db.scalars(
+            delete(RevenueDirtySubscription)
+            .where(RevenueDirtySubscription.subscription_id.in_(queued))
+            .returning(RevenueDirtySubscription.subscription_id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    if not ids:
+        return 0, 0
+
+    deltas: Dict[Dimension, List] = defaultdict(lambda: [0, Decimal(0)])
+    for row in db.execute(
+        delete(SubscriptionRevenue)
+        .where(SubscriptionRevenue.subscription_id.in_(ids))
+        .returning(SubscriptionRevenue.product_type, SubscriptionRevenue.currency, SubscriptionRevenue.client_status, SubscriptionRevenue.mrr)
+        .execution_options(synchronize_session=False)
+    ):
+        delta = deltas[(row.product_type, row.currency, row.client_status)]
+        delta[0] -= 1
+        delta[1] -= row.mrr
+    for row in db.execute(
+        insert(SubscriptionRevenue)
+        .from_select(CONTRIBUTION_COLUMNS, contributions_query(ids))
+        .returning(SubscriptionRevenue.product_type, SubscriptionRevenue.currency, SubscriptionRevenue.client_status, SubscriptionRevenue.mrr)
+    ):
+        delta = deltas[(row.product_type, row.currency, row.client_status)]
+        delta[0] += 1
+        delta[1] += row.mrr
+
+    changed = [
+        {
+            "month": month,
+            "product_type": product_type,
+            "currency": currency,
+            "client_status": client_status,
+            "subscriptions": count,
+            "mrr": mrr,
+        }
+        for (product_type, currency, client_status), (count, mrr) in sorted(deltas.items())
+        if count or mrr
+    ]
+    if changed:
+        stmt = pg_insert(RevenueSummary).values(changed)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["month", "product_type", "currency", "client_status"],
+                set_={
+                    "subscriptions": RevenueSummary.subscriptions + stmt.excluded.subscriptions,
+                    "mrr": RevenueSummary.mrr + stmt.excluded.mrr,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+    return len(ids), len(changed)
+
+
+def refresh_dirty(
+    db: Session,
+    batch_size: int = 1000,
+    now: Optional[datetime] = None,
+    commit: bool = True,
+    max_batches: Optional[int] = None,
+) -> RefreshResult:
+    """Proses antrian sampai kosong; satu transaksi per batch bila `commit`."""
+    result = RefreshResult()
+    started = time.perf_counter()
+    month = current_month(now)
+    with track_job("revenue_refresh") as job:
+        # Seed dulu, juga saat antrian kosong: bulan tanpa perubahan tetap
+        # punya baris (posisi awal bulan) di dashboard
+        _lock(db)
+        result.seeded_rows = _seed_month(db, month)
+        if commit:
+            db.commit()
+        while max_batches is None or result.batches < max_batches:
+            subscriptions, rows = refresh_batch(db, month, batch_size)
+            if not subscriptions:
+                break
+            result.batches += 1
+            result.subscriptions += subscriptions
+            result.summary_rows += rows
+            job.add_items(subscriptions)
+            if commit:
+                db.commit()
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def rebuild(db: Session, now: Optional[datetime] = None, commit: bool = True) -> RebuildResult:
+    """
+    Hitung ulang kontribusi & ringkasan bulan berjalan dari tabel sumber.
+    Antrian dikosongkan lebih dulu: perubahan yang masuk selama rebuild tetap
+    di antrian dan diproses refresh berikutnya (idempoten).
+    """
+    result = RebuildResult()
+    started = time.perf_counter()
+    month = current_month(now)
+    with track_job("revenue_rebuild"):
+        _lock(db)
+        db.execute(delete(RevenueDirtySubscription))
+        db.execute(delete(SubscriptionRevenue))
+        result.contributions = db.execute(
+            insert(SubscriptionRevenue).from_select(CONTRIBUTION_COLUMNS, contributions_query())
+        ).rowcount
+        db.execute(delete(RevenueSummary).where(RevenueSummary.month == month))
+        result.summary_rows = _seed_month(db, month)
+        if commit:
+            db.commit()
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def reconcile(db: Session, now: Optional[datetime] = None) -> List[RevenueDrift]:
+    """Selisih ringkasan bulan berjalan vs hitungan penuh dari tabel sumber (kosong = cocok)."""
+    month = current_month(now)
+    contributions = contributions_query().subquery()
+    actual = {
+        (row.product_type, row.currency, row.client_status): (row.subscriptions, row.mrr)
+        for row in db.execute(
+            select(
+                contributions.c.product_type,
+                contributions.c.currency,
+                contributions.c.client_status,
+                func.count().label("subscriptions"),
+                func.sum(contributions.c.mrr).label("mrr"),
+            ).group_by(contributions.c.product_type, contributions.c.currency, contributions.c.client_status)
+        )
+    }
+    stored = {
+        (row.product_type, row.currency, row.client_status): (row.subscriptions, row.mrr)
+        for row in db.execute(
+            select(
+                RevenueSummary.product_type,
+                RevenueSummary.currency,
+                RevenueSummary.client_status,
+                RevenueSummary.subscriptions,
+                RevenueSummary.mrr,
+            ).where(RevenueSummary.month == month)
+        )
+    }
+    drifts = []
+    for key in sorted(set(actual) | set(stored)):
+        stored_count, stored_mrr = stored.get(key, (0, Decimal(0)))
+        actual_count, actual_mrr = actual.get(key, (0, Decimal(0)))
+        if stored_count != actual_count or stored_mrr != actual_mrr:
+            drifts.append(RevenueDrift(*key, stored_count, actual_count, stored_mrr, actual_mrr))
+    return drifts
+
+
+# ---------------------------------------------------------------------------
+# Baca (dashboard)
+# ---------------------------------------------------------------------------
+
+
+def monthly_mrr(
+    db: Session,
+    month_from: date,
+    month_to: date,
+    product_type: Optional[str] = None,
+    currency: Optional[str] = None,
+    client_status: Optional[str] = None,
+) -> List[RevenueSummary]:
+    """Baris ringkasan untuk rentang bulan (inklusif); range scan primary key."""
+    stmt = (
+        select(RevenueSummary)
+        .where(RevenueSummary.month.between(month_from.replace(day=1), month_to.replace(day=1)))
+        .order_by(RevenueSummary.month, RevenueSummary.product_type, RevenueSummary.currency, RevenueSummary.client_status)
+    )
+    if product_type is not None:
+        stmt = stmt.where(RevenueSummary.product_type == product_type)
+    if currency is not None:
+        stmt = stmt.where(RevenueSummary.currency == currency)
+    if client_status is not None:
+        stmt = stmt.where(RevenueSummary.client_status == client_status)
+    return list(db.scalars(stmt))
+
+
+def mrr_totals(
+    rows: Iterable[RevenueSummary],
+    rates: ExchangeRateCache,
+    currency: str,
+    at: Optional[datetime] = None,
+) -> List[RevenueTotals]:
+    """
+    Total per bulan dalam `currency`. Kurs: akhir bulan untuk bulan yang
+    sudah lewat, `at` (default sekarang) untuk bulan berjalan.
+    """
+    at = at or datetime.now(timezone.utc)
+    totals: Dict[date, RevenueTotals] = {}
+    for row in rows:
+        total = totals.setdefault(row.month, RevenueTotals(row.month, currency))
+        month_end = datetime.combine(add_months(row.month, 1), datetime.min.time(), tzinfo=timezone.utc)
+        moment = min(at, month_end)
+        rate = rates.find_rate(row.currency, currency, moment)
+        if rate is None:
+            total.unconverted[row.currency] = total.unconverted.get(row.currency, Decimal(0)) + row.mrr
+            continue
+        converted = row.mrr * rate
+        total.mrr += converted
+        total.by_product_type[row.product_type] = total.by_product_type.get(row.product_type, Decimal(0)) + converted
+    for total in totals.values():
+        total.mrr = money(total.mrr)
+        total.by_product_type = {key: money(value) for key, value in sorted(total.by_product_type.items())}
+    return [totals[month] for month in sorted(totals)]
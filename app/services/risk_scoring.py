@@ -0,0 +1,403 @@
+"""
+Skor risiko telat bayar per client (job malam, sebelum tangga dunning).
+
+Client diproses per chunk (keyset per id, `chunk_size` client). Untuk tiap
+chunk satu query agregat menghasilkan satu baris per client dari histori
+jendela `lookback_days` sebelum `as_of`:
+
+- billing cycle yang jatuh tempo: jumlah, yang dibayar lewat due date /
+  belum dibayar, total & maksimum hari telat, jumlah reminder (EMAIL_LOGS
+  `REMINDER`). "Dibayar" = payment SUCCESS pertama sebelum `as_of`, bukan
+  status cycle saat ini;
+- payment: sukses dan gagal.
+
+Cycle CANCELLED tidak dihitung bila pembatalannya sudah terjadi di `as_of`.
+Waktu pembatalan tidak disimpan, jadi dipakai `updated_at < as_of`: cycle yang
+dibatalkan sesudah `as_of` tetap dihitung (di `as_of` masih tagihan aktif).
+Untuk `as_of` di masa lalu (backtest) ini pendekatan: cycle yang dibatalkan
+sebelum `as_of` lalu diubah lagi sesudahnya ikut dihitung sebagai belum
+dibayar. Untuk job malam (`as_of` = hari ini) hasilnya persis.
+
+`payments.failure_reason` berupa teks bebas dari provider dan belum ada kode
+aplikasi yang menormalkannya, jadi alasan gagal tidak dipakai sebagai fitur.
+
+Fitur & skor dihitung vektor NumPy untuk seluruh chunk: regresi logistik
+dengan bobot tetap (`WEIGHTS`, versi `MODEL_VERSION`). Rasio dihaluskan ke
+prior populasi supaya client dengan sedikit histori tidak langsung 0 / 1.
+Hasil di-upsert ke CLIENT_RISK_SCORES per chunk; memori dibatasi ukuran
+chunk, bukan jumlah client.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import uuid
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.models.client import Client
+from app.models.risk_score import ClientRiskScore
+
+MODEL_VERSION = 2
+LOOKBACK_DAYS = 365
+# Dibayar sampai sekian hari lewat due date belum dihitung telat
+GRACE_DAYS = 3
+CHUNK_SIZE = 2000
+
+# Prior populasi & bobotnya (jumlah observasi semu)
+PRIOR_LATE_RATIO = 0.2
+PRIOR_FAILED_RATIO = 0.1
+PRIOR_WEIGHT = 3.0
+
+FEATURES = (
+    "late_ratio",
+    "log_avg_days_late",
+    "log_max_days_late",
+    "open_overdue_ratio",
+    "reminders_per_cycle",
+    "failed_ratio",
+)
+INTERCEPT = -3.0
+WEIGHTS = np.array([1.0, 0.1, 0.7, 1.0, 0.2, 0.8])
+# (band, skor minimum)
+BANDS = (("HIGH", 800), ("MEDIUM", 600), ("LOW", 0))
+
+CLIENT_HISTORY_SQL = text(
+    """
+    WITH chunk AS (
+        SELECT unnest(CAST(:client_ids AS uuid[])) AS client_id
+    ),
+    cycles AS (
+        SELECT s.client_id,
+               bc.due_date,
+               paid.paid_on,
+               reminders.sent AS reminders
+        FROM chunk
+        JOIN subscriptions AS s ON s.client_id = chunk.client_id
+        JOIN billing_cycles AS bc ON bc.subscription_id = s.id
+        LEFT JOIN LATERAL (
+            SELECT min(p.paid_at)::date AS paid_on
+            FROM payments AS p
+            WHERE p.billing_cycle_id = bc.id AND p.status = 'SUCCESS' AND p.paid_at < :as_of_ts
+        ) AS paid ON true
+        LEFT JOIN LATERAL (
+            SELECT count(*) AS sent
+            FROM email_logs AS e
+            WHERE e.related_type = 'REMINDER' AND e.related_id = bc.id AND e.created_at < :as_of_ts
+        ) AS reminders ON true
+        WHERE bc.due_date >= :since AND bc.due_date < :as_of
+          AND NOT (bc.status = 'CANCELLED' AND bc.updated_at < :as_of_ts)
+    ),
+    cycle_stats AS (
+        SELECT client_id,
+               count(*) AS cycles,
+               count(*) FILTER (WHERE coalesce(paid_on, :as_of) > due_date + :grace_days) AS late,
+               sum(greatest(coalesce(paid_on, :as_of) - due_date, 0)) AS days_late,
+               max(greatest(coalesce(paid_on, :as_of) - due_date, 0)) AS max_days_late,
+               count(*) FILTER (WHERE paid_on IS NULL) AS open_overdue,
+               sum(reminders) AS reminders
+        FROM cycles
+        GROUP BY client_id
+    ),
+    payment_stats AS (
+        SELECT p.client_id,
+               count(*) FILTER (WHERE p.status = 'SUCCESS') AS succeeded,
+               count(*) FILTER (WHERE p.status = 'FAILED') AS failed
+        FROM chunk
+        JOIN payments AS p ON p.client_id = chunk.client_id
+        WHERE p.created_at >= :since_ts AND p.created_at < :as_of_ts
+        GROUP BY p.client_id
+    )
+    SELECT chunk.client_id,
+           coalesce(cs.cycles, 0),
+           coalesce(cs.late, 0),
+           coalesce(cs.days_late, 0),
+           coalesce(cs.max_days_late, 0),
+           coalesce(cs.open_overdue, 0),
+           coalesce(cs.reminders, 0),
+           coalesce(ps.succeeded, 0),
+           coalesce(ps.failed, 0)
+    FROM chunk
+    LEFT JOIN cycle_stats AS cs ON cs.client_id = chunk.client_id
+    LEFT JOIN payment_stats AS ps ON ps.client_id = chunk.client_id
+    ORDER BY chunk.client_id
+    """
+)
+
+# Label backtest per client yang punya cycle jatuh tempo di [as_of, until):
+# true bila ada yang dibayar lewat due date + grace atau belum dibayar di `until`
+# (CANCELLED: sama seperti fitur, dibandingkan dengan `until`)
+LATE_LABEL_SQL = text(
+    """
+    SELECT s.client_id,
+           bool_or(coalesce(paid.paid_on, :until) > bc.due_date + :grace_days) AS late
+    FROM subscriptions AS s
+    JOIN billing_cycles AS bc ON bc.subscription_id = s.id
+    LEFT JOIN LATERAL (
+        SELECT min(p.paid_at)::date AS paid_on
+        FROM payments AS p
+        WHERE p.billing_cycle_id = bc.id AND p.status = 'SUCCESS' AND p.paid_at < :until_ts
+    ) AS paid ON true
+    WHERE s.client_id = ANY(CAST(:client_ids AS uuid[]))
+      AND bc.due_date >= :as_of AND bc.due_date < :until
+      AND NOT (bc.status = 'CANCELLED' AND bc.updated_at < :until_ts)
+    GROUP BY s.client_id
+    """
+)
+
+
+class RiskScoringError(Exception):
+    pass
+
+
+@dataclass
+class ClientFeatures:
+    """Fitur satu chunk client; array sejajar dengan `client_ids`."""
+
+    client_ids: List[uuid.UUID]
+    cycles: np.ndarray
+    matrix: np.ndarray  # (client, len(FEATURES))
+
+    def column(self, name: str) -> np.ndarray:
+        return self.matrix[:, FEATURES.index(name)]
+
+
+@dataclass
+class RiskScoringResult:
+    clients: int = 0
+    chunks: int = 0
+    bands: Counter = field(default_factory=Counter)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def clients_per_second(self) -> float:
+        return self.clients / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class BacktestResult:
+    clients: int = 0
+    labelled: int = 0
+    late: int = 0
+    auc: float = float("nan")
+    # band → (client berlabel, yang telat)
+    bands: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+
+def _as_of_timestamp(as_of: date) -> datetime:
+    return datetime.combine(as_of, dt_time.min, tzinfo=timezone.utc)
+
+
+def _validate(chunk_size: int, lookback_days: int) -> None:
+    if chunk_size <= 0:
+        raise RiskScoringError("chunk_size harus > 0")
+    if lookback_days <= 0:
+        raise RiskScoringError("lookback_days harus > 0")
+
+
+def client_chunks(db: Session, chunk_size: int = CHUNK_SIZE) -> Iterator[List[uuid.UUID]]:
+    """Id client per chunk (keyset per id)."""
+    last_id: Optional[uuid.UUID] = None
+    while True:
+        stmt = select(Client.id).order_by(Client.id).limit(chunk_size)
+        if last_id is not None:
+            stmt = stmt.where(Client.id > last_id)
+        ids = list(db.scalars(stmt))
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def load_features(
+    db: Session, client_ids: Sequence[uuid.UUID], as_of: date, lookback_days: int = LOOKBACK_DAYS
+) -> ClientFeatures:
+    since = as_of - timedelta(days=lookback_days)
+    rows = db.execute(
+        CLIENT_HISTORY_SQL,
+        {
+            "client_ids": list(client_ids),
+            "as_of": as_of,
+            "as_of_ts": _as_of_timestamp(as_of),
+            "since": since,
+            "since_ts": _as_of_timestamp(since),
+            "grace_days": GRACE_DAYS,
+        },
+    ).all()
+    ids = [row[0] for row in rows]
+    values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), 8)
+    cycles, late, days_late, max_days_late, open_overdue, reminders, succeeded, failed = values.T
+    billed = np.maximum(cycles, 1.0)
+    attempts = succeeded + failed
+    matrix = np.column_stack(
+        [
+            (late + PRIOR_WEIGHT * PRIOR_LATE_RATIO) / (cycles + PRIOR_WEIGHT),
+            np.log1p(days_late / billed),
+            np.log1p(max_days_late),
+            open_overdue / billed,
+            reminders / billed,
+            (failed + PRIOR_WEIGHT * PRIOR_FAILED_RATIO) / (attempts + PRIOR_WEIGHT),
+        ]
+    )
+    return ClientFeatures(ids, cycles, matrix)
+
+
+def score(features: ClientFeatures) -> np.ndarray:
+    """Probabilitas telat bayar (0–1) per client."""
+    return 1.0 / (1.0 + np.exp(-(INTERCEPT + features.matrix @ WEIGHTS)))
+
+
+def bands(scores_per_mille: np.ndarray) -> np.ndarray:
+    labels = np.full(len(scores_per_mille), BANDS[-1][0], dtype=object)
+    for band, minimum in reversed(BANDS[:-1]):
+        labels[scores_per_mille >= minimum] = band
+    return labels
+
+
+def _store(
+    db: Session, features: ClientFeatures, scores_per_mille: np.ndarray, labels: np.ndarray, as_of: date
+) -> None:
+    table = ClientRiskScore.__table__
+    stmt = pg_insert(table).values(
+        [
+            {
+                "client_id": client_id,
+                "score": points,
+                "band": band,
+                "model_version": MODEL_VERSION,
+                "cycles": cycles,
+                "late_ratio": late_ratio,
+                "avg_days_late": avg_days_late,
+                "failed_ratio": failed_ratio,
+                "reminders_per_cycle": reminders_per_cycle,
+                "as_of": as_of,
+            }
+            for client_id, points, band, cycles, late_ratio, avg_days_late, failed_ratio, reminders_per_cycle in zip(
+                features.client_ids,
+                scores_per_mille.tolist(),
+                labels.tolist(),
+                features.cycles.astype(int).tolist(),
+                features.column("late_ratio").tolist(),
+                np.expm1(features.column("log_avg_days_late")).tolist(),
+                features.column("failed_ratio").tolist(),
+                features.column("reminders_per_cycle").tolist(),
+            )
+        ]
+    )
+    excluded = stmt.excluded
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.client_id],
+            set_={
+                column: excluded[column]
+                for column in (
+                    "score", "band", "model_version", "cycles", "late_ratio", "avg_days_late",
+                    "failed_ratio", "reminders_per_cycle", "as_of",
+                )
+            }
+            | {"scored_at": text("now()")},
+        )
+    )
+
+
+def score_clients(
+    db: Session,
+    as_of: date,
+    chunk_size: int = CHUNK_SIZE,
+    lookback_days: int = LOOKBACK_DAYS,
+    commit: bool = True,
+) -> RiskScoringResult:
+    """Skor semua client per chunk dan simpan ke CLIENT_RISK_SCORES (commit per chunk)."""
+    _validate(chunk_size, lookback_days)
+    started = time.perf_counter()
+    result = RiskScoringResult()
+    with track_job("risk_scoring") as job:
+        for client_ids in client_chunks(db, chunk_size):
+            features = load_features(db, client_ids, as_of, lookback_days)
+            scores_per_mille = np.rint(score(features) * 1000).astype(np.int16)
+            labels = bands(scores_per_mille)
+            _store(db, features, scores_per_mille, labels, as_of)
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+            result.clients += len(client_ids)
+            result.chunks += 1
+            result.bands.update(labels.tolist())
+            job.add_items(len(client_ids))
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def _auc(scores: np.ndarray, labels: np.ndarray) -> float:
+    """ROC AUC lewat statistik Mann-Whitney (rank rata-rata untuk nilai sama)."""
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    if not positives or not negatives:
+        return float("nan")
+    order = np.argsort(scores, kind="mergesort")
+    sorted_scores = scores[order]
+    ranks = np.empty(len(scores))
+    # Rank rata-rata (mulai 1) untuk skor yang sama
+    _, first, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    average = first + (counts + 1) / 2.0
+    ranks[order] = np.repeat(average, counts)
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2.0) / (positives * negatives))
+
+
+def backtest(
+    db: Session,
+    as_of: date,
+    horizon_days: int = 90,
+    chunk_size: int = CHUNK_SIZE,
+    lookback_days: int = LOOKBACK_DAYS,
+) -> BacktestResult:
+    """
+    Skor pada `as_of` (tanpa disimpan) vs kejadian sesudahnya: client berlabel
+    = punya cycle jatuh tempo dalam `horizon_days`; positif = ada yang telat.
+    """
+    _validate(chunk_size, lookback_days)
+    if horizon_days <= 0:
+        raise RiskScoringError("horizon_days harus > 0")
+    until = as_of + timedelta(days=horizon_days)
+    all_scores: List[np.ndarray] = []
+    all_labels: List[np.ndarray] = []
+    all_bands: List[np.ndarray] = []
+    result = BacktestResult()
+    for client_ids in client_chunks(db, chunk_size):
+        features = load_features(db, client_ids, as_of, lookback_days)
+        outcomes = dict(
+            db.execute(
+                LATE_LABEL_SQL,
+                {
+                    "client_ids": list(client_ids),
+                    "as_of": as_of,
+                    "until": until,
+                    "until_ts": _as_of_timestamp(until),
+                    "grace_days": GRACE_DAYS,
+                },
+            ).all()
+        )
+        labelled = np.array([client_id in outcomes for client_id in features.client_ids], dtype=bool)
+        late = np.array([bool(outcomes.get(client_id)) for client_id in features.client_ids], dtype=bool)
+        probabilities = score(features)
+        result.clients += len(client_ids)
+        all_scores.append(probabilities[labelled])
+        all_labels.append(late[labelled])
+        all_bands.append(bands(np.rint(probabilities[labelled] * 1000)))
+    scores = np.concatenate(all_scores) if all_scores else np.zeros(0)
+    labels = np.concatenate(all_labels) if all_labels else np.zeros(0, dtype=bool)
+    band_labels = np.concatenate(all_bands) if all_bands else np.zeros(0, dtype=object)
+    result.labelled = len(labels)
+    result.late = int(labels.sum())
+    result.auc = _auc(scores, labels)
+    result.bands = {
+        band: (int((band_labels == band).sum()), int(labels[band_labels == band].sum())) for band, _ in BANDS
+    }
+    return result
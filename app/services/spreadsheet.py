@@ -0,0 +1,193 @@
+"""
+Export tabel secara streaming: CSV & XLSX tanpa dependency.
+
+Keduanya menerima iterator baris (mis. hasil server-side cursor) dan
+menghasilkan chunk bytes; memori tetap konstan berapa pun jumlah barisnya.
+
+XLSX ditulis sebagai zip streaming (`zipfile` ke sink non-seekable, entry
+memakai data descriptor) dengan satu worksheet berisi inline string, jadi
+tidak perlu tabel shared string yang harus dibangun utuh sebelum ditulis.
+Library spreadsheet pihak ketiga sengaja tidak dipakai.
+"""
+
+import csv
+from datetime import date, datetime
+from decimal import Decimal
+import io
+import re
+from typing import Iterable, Iterator, List, Optional, Sequence
+from xml.sax.saxutils import escape
+import zipfile
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CHUNK_ROWS = 2000
+
+# Karakter kontrol yang tidak valid di XML 1.0
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+# Awalan sel teks yang dibaca Excel / Sheets sebagai formula (CSV injection)
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_text(value) -> str:
+    """Teks sel CSV; string berawalan formula diberi awalan `'` agar tetap dibaca sebagai teks."""
+    text = _text(value)
+    if isinstance(value, str) and text.startswith(_FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+def csv_chunks(header: Sequence[str], rows: Iterable[Sequence], chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    CSV UTF-8 dengan BOM (dibuka benar oleh Excel), di-yield per `chunk_rows` baris.
+
+    Nilai teks dari data client (nama, nomor invoice, ...) yang diawali `=`,
+    `+`, `-`, `@`, tab atau CR di-escape dengan `'`; angka negatif tidak.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(header)
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_text(value) for value in row])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Sink non-seekable untuk `zipfile`; byte yang ditulis diambil lewat `drain`."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    "</Relationships>"
+)
+# Style 0 = default, 1 = header tebal
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+    '<cellXfs count="2"><xf fontId="0"/><xf fontId="1" applyFont="1"/></cellXfs>'
+    "</styleSheet>"
+)
+
+
+def _workbook(sheet_name: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(sheet_name[:31], {chr(34): "&quot;"})}" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    )
+
+
+def _cell(value, style: Optional[int] = None) -> str:
+    style_attr = f' s="{style}"' if style else ""
+    if isinstance(value, bool):
+        return f'<c t="b"{style_attr}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f"<c{style_attr}><v>{value}</v></c>"
+    if value is None:
+        return "<c/>"
+    text = escape(_INVALID_XML.sub("", _text(value)))
+    return f'<c t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def xlsx_chunks(
+    sheet_name: str,
+    header: Sequence[str],
+    rows: Iterable[Sequence],
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Workbook satu sheet; baris header dicetak tebal dan dibekukan."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _workbook(sheet_name))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        archive.writestr("xl/styles.xml", _STYLES)
+        yield sink.drain()
+        with archive.open("xl/worksheets/sheet1.xml", mode="w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b'<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+                b'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews><sheetData>'
+            )
+            sheet.write(("<row>" + "".join(_cell(name, 1) for name in header) + "</row>").encode("utf-8"))
+            parts: List[str] = []
+            for row in rows:
+                parts.append("<row>" + "".join(_cell(value) for value in row) + "</row>")
+                if len(parts) >= chunk_rows:
+                    sheet.write("".join(parts).encode("utf-8"))
+                    parts.clear()
+                    yield sink.drain()
+            sheet.write("".join(parts).encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
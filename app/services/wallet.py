@@ -0,0 +1,73 @@
+"""
+Service layer untuk WALLET_ACCOUNTS & WALLET_TRANSACTIONS.
+
+Saldo di-update dengan satu `UPDATE ... RETURNING` atomik (tanpa SELECT dulu),
+sehingga posting paralel ke wallet yang sama tidak saling menimpa dan saldo
+tidak bisa negatif untuk transaksi OUT.
+"""
+
+from decimal import Decimal
+from typing import Optional
+import uuid
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.wallet import (
+    WalletAccount,
+    WalletTransaction,
+    WalletTransactionDirection,
+    WalletTransactionRelatedType,
+    WalletTransactionType,
+)
+
+
+class InsufficientBalanceError(Exception):
+    """Saldo wallet tidak cukup untuk transaksi OUT."""
+
+
+class WalletAccountNotFoundError(Exception):
+    """Wallet account tidak ditemukan."""
+
+
+def post_transaction(
+    db: Session,
+    wallet_account_id: uuid.UUID,
+    type: WalletTransactionType,
+    direction: WalletTransactionDirection,
+    amount: Decimal,
+    related_type: Optional[WalletTransactionRelatedType] = None,
+    related_id: Optional[uuid.UUID] = None,
+) -> WalletTransaction:
+    """Posting satu mutasi wallet & update saldo dalam transaksi caller."""
+    amount = Decimal(amount)
+    if amount <= 0:
+        raise ValueError("amount harus lebih besar dari 0")
+
+    delta = amount if direction == WalletTransactionDirection.IN else -amount
+    stmt = (
+        update(WalletAccount)
+        .where(WalletAccount.id == wallet_account_id)
+        .values(balance=WalletAccount.balance + delta)
+        .returning(WalletAccount.balance)
+        .execution_options(synchronize_session=False)
+    )
+    if direction == WalletTransactionDirection.OUT:
+        stmt = stmt.where(WalletAccount.balance >= amount)
+
+    new_balance = db.execute(stmt).scalar_one_or_none()
+    if new_balance is None:
+        if direction == WalletTransactionDirection.OUT and db.get(WalletAccount, wallet_account_id) is not None:
+            raise InsufficientBalanceError(f"Saldo wallet {wallet_account_id} tidak cukup")
+        raise WalletAccountNotFoundError(f"Wallet {wallet_account_id} tidak ditemukan")
+
+    transaction = WalletTransaction(
+        wallet_account_id=wallet_account_id,
+        type=type,
+        direction=direction,
+        amount=amount,
+        related_type=related_type,
+        related_id=related_id,
+    )
+    db.add(transaction)
+    return transaction
@@ -0,0 +1,126 @@
+"""
+Service layer untuk WEBHOOK_EVENTS.
+
+- `record_event`      : simpan payload mentah saat webhook diterima endpoint,
+  beserta `traceparent` span aktif supaya worker bisa melanjutkan trace-nya.
+- `claim_unprocessed` : ambil batch event `processed = false` untuk background job.
+  Memakai `FOR UPDATE SKIP LOCKED` sehingga beberapa worker bisa jalan paralel
+  tanpa memproses event yang sama.
+- `mark_processed`    : tandai batch event sudah diproses (satu UPDATE).
+- `process_events`    : satu batch worker: claim, jalankan handler per event di
+  dalam span `webhook.process` yang parent-nya `WebhookEvent.traceparent`,
+  tandai processed, commit. Task provisioning yang dibuat handler
+  (`create_task`, traceparent default = span aktif) dan eksekusinya nanti
+  masuk ke trace webhook yang sama.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import uuid
+
+from opentelemetry.trace import Link, Span, SpanKind, get_current_span
+from sqlalchemy import false, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import track_job
+from app.core.tracing import context_from_traceparent, current_traceparent, tracer
+from app.models.webhook_event import WebhookEvent
+
+# Handler bisnis per event (update billing cycle, buat task provisioning, ...).
+# Exception menggagalkan seluruh batch (rollback, event diambil ulang nanti).
+WebhookEventHandler = Callable[[Session, WebhookEvent], None]
+
+
+def record_event(
+    db: Session,
+    event_type: str,
+    payload: Dict[str, Any],
+    *,
+    source: str = "XENDIT",
+    xendit_subscription_id: Optional[str] = None,
+    xendit_invoice_id: Optional[str] = None,
+) -> WebhookEvent:
+    event = WebhookEvent(
+        source=source,
+        event_type=event_type,
+        raw_payload_json=payload,
+        xendit_subscription_id=xendit_subscription_id,
+        xendit_invoice_id=xendit_invoice_id,
+        traceparent=current_traceparent(),
+    )
+    db.add(event)
+    return event
+
+
+def claim_unprocessed(db: Session, limit: int = 100) -> List[WebhookEvent]:
+    """
+    Lock & ambil event yang belum diproses (FIFO berdasarkan created_at).
+
+    Lock dilepas saat transaksi caller commit/rollback, jadi caller wajib
+    memanggil `mark_processed` + commit di transaksi yang sama.
+    """
+    stmt = (
+        select(WebhookEvent)
+        .where(WebhookEvent.processed == false())
+        .order_by(WebhookEvent.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(db.scalars(stmt))
+
+
+def mark_processed(
+    db: Session,
+    event_ids: Iterable[uuid.UUID],
+    processed_at: Optional[datetime] = None,
+) -> int:
+    ids = list(event_ids)
+    if not ids:
+        return 0
+    result = db.execute(
+        update(WebhookEvent)
+        .where(WebhookEvent.id.in_(ids))
+        .values(processed=True, processed_at=processed_at or datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+@contextmanager
+def event_span(event: WebhookEvent, links: Optional[List[Link]] = None) -> Iterator[Span]:
+    """Span pemrosesan satu event, melanjutkan trace request webhook-nya."""
+    with tracer.start_as_current_span(
+        "webhook.process",
+        context=context_from_traceparent(event.traceparent),
+        kind=SpanKind.CONSUMER,
+        links=links,
+        attributes={
+            "webhook.event_id": str(event.id),
+            "webhook.source": event.source,
+            "webhook.event_type": event.event_type,
+        },
+    ) as span:
+        yield span
+
+
+def process_events(
+    db: Session,
+    handler: WebhookEventHandler,
+    batch_size: int = 100,
+    commit: bool = True,
+) -> int:
+    """Proses satu batch event yang belum diproses; return jumlah event."""
+    with track_job("webhook_events") as job:
+        batch_link = Link(get_current_span().get_span_context())
+        events = claim_unprocessed(db, batch_size)
+        for event in events:
+            with event_span(event, links=[batch_link]):
+                handler(db, event)
+        mark_processed(db, [event.id for event in events])
+        job.add_items(len(events))
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+    return len(events)
@@ -0,0 +1,700 @@
+"""
+Benchmark hot path ORM & batch job.
+
+Nama benchmark dipakai sebagai key di file hasil JSON, jadi jangan diganti
+tanpa memperbarui baseline.
+"""
+
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import selectinload
+
+from app.models.billing import BillingCycle, BillingCycleStatus
+from app.models.client import Client
+from app.models.document_counter import DocumentCounter
+from app.models.email_body import EmailBody, EmailBodyDictionary, decode_body
+from app.models.email_log import EmailLog
+from app.models.exchange_rate import ExchangeRate
+from app.models.payment import Payment, PaymentStatus
+from app.models.quotation import Quotation, QuotationStatus
+from app.models.revenue import mark_dirty
+from app.models.subscription import BillingPeriod, Subscription, SubscriptionStatus
+from app.models.wallet import (
+    WalletAccount,
+    WalletTransactionDirection,
+    WalletTransactionRelatedType,
+    WalletTransactionType,
+)
+from app.integrations.llm import FakeLlmClient
+from app.services.billing import add_billing_period, run_billing
+from app.services.email_drafts import DraftingService, DraftRequest
+from app.services.client_summary import ClientSummaryCache, load_client_summary
+from app.services.document_numbers import NumberAllocator
+from app.services.email_search import search_emails
+from app.services.exchange_rates import ExchangeRateCache
+from app.services.pricing import price_quotation, reprice_quotations
+from app.services.quotation_conversion import convert_accepted, convert_quotation
+from app.services.quotation_expiry import expire_quotations
+from app.services.revenue_forecast import ForecastLines, forecast_revenue, load_lines, month_date, project_billed
+from app.services.revenue_summary import (
+    contributions_query,
+    current_month,
+    monthly_mrr,
+    mrr_totals,
+    rebuild,
+    refresh_dirty,
+)
+from app.services.wallet import post_transaction
+from app.services.webhook_events import claim_unprocessed, mark_processed, record_event
+from benchmarks.harness import BenchContext, benchmark
+
+CLIENT_PAGE = 200
+PAYMENT_PAGE = 500
+SAMPLE_CLIENTS = 50
+WEBHOOK_INSERTS = 1_000
+WEBHOOK_CLAIM_BATCH = 500
+WEBHOOK_CLAIM_BATCHES = 10
+BILLING_BATCH = 500
+BILLING_MAX_BATCHES = 10
+WALLET_POSTINGS = 1_000
+LLM_DRAFTS = 500
+LLM_MODEL = "gemini-1.5-flash"
+SEARCH_PAGE = 20
+NUMBER_ALLOCATIONS = 5_000
+FX_LOOKUPS = 1_000
+EXPIRY_BATCH = 1_000
+CONVERSION_BATCH = 500
+DASHBOARD_LOADS = 50
+REVENUE_DIRTY = 1_000
+HEAVY_CLIENTS = 20
+CLIENT_SUMMARY_REPEAT = 5
+FORECAST_START = date(2026, 1, 1)
+FORECAST_HORIZON = 12
+FORECAST_SYNTHETIC_LINES = 500_000
+# Campuran kata umum, jarang & frasa
+SEARCH_TERMS = ("invoice", "penawaran gworkspace", "pembayaran berhasil", "QUO/2025/0000235", "reminder tagihan")
+
+
+def _sample_client_ids(ctx: BenchContext):
+    def load():
+        with ctx.session() as db:
+            ids = list(
+                db.scalars(
+                    select(Payment.client_id).group_by(Payment.client_id).limit(SAMPLE_CLIENTS * 4)
+                )
+            )
+        return ctx.rng.sample(ids, min(SAMPLE_CLIENTS, len(ids)))
+
+    return ctx.cached("client_ids", load)
+
+
+# ---------------------------------------------------------------------------
+# ORM hydration
+# ---------------------------------------------------------------------------
+
+
+@benchmark("orm.client_hydration", rounds=5)
+def client_hydration(ctx: BenchContext) -> int:
+    """Load satu halaman Client beserta semua koleksi selectin."""
+    with ctx.session() as db:
+        clients = db.scalars(select(Client).order_by(Client.id).limit(CLIENT_PAGE)).all()
+        return len(clients)
+
+
+@benchmark("orm.payment_list", rounds=5)
+def payment_list(ctx: BenchContext) -> int:
+    """List payment SUCCESS terbaru (joined load client, subscription, billing_cycle)."""
+    with ctx.session() as db:
+        payments = db.scalars(
+            select(Payment)
+            .where(Payment.status == PaymentStatus.SUCCESS)
+            .order_by(Payment.created_at.desc())
+            .limit(PAYMENT_PAGE)
+        ).all()
+        return len(payments)
+
+
+@benchmark("orm.payment_list_by_client", rounds=5)
+def payment_list_by_client(ctx: BenchContext) -> int:
+    """Riwayat payment per client (pola halaman detail client)."""
+    client_ids = _sample_client_ids(ctx)
+    loaded = 0
+    with ctx.session() as db:
+        for client_id in client_ids:
+            loaded += len(
+                db.scalars(
+                    select(Payment)
+                    .where(Payment.client_id == client_id)
+                    .order_by(Payment.created_at.desc())
+                    .limit(50)
+                ).all()
+            )
+            db.expunge_all()
+    return loaded
+
+
+# ---------------------------------------------------------------------------
+# Webhook ingest & claim
+# ---------------------------------------------------------------------------
+
+
+@benchmark("webhook.insert", rounds=5)
+def webhook_insert(ctx: BenchContext) -> int:
+    """Insert WebhookEvent lewat service record_event (ORM unit of work)."""
+    with ctx.rollback_session() as db:
+        for i in range(WEBHOOK_INSERTS):
+            record_event(
+                db,
+                "PAYMENT_SUCCEEDED",
+                {"id": f"evt_bench_{i}", "data": {"amount": 150000, "currency": "IDR", "status": "PAID"}},
+                xendit_invoice_id=f"inv-bench-{i}",
+            )
+        db.flush()
+    return WEBHOOK_INSERTS
+
+
+@benchmark("webhook.claim", rounds=5)
+def webhook_claim(ctx: BenchContext) -> int:
+    """Claim batch event belum diproses (SKIP LOCKED) lalu tandai processed."""
+    claimed = 0
+    with ctx.rollback_session() as db:
+        for _ in range(WEBHOOK_CLAIM_BATCHES):
+            events = claim_unprocessed(db, limit=WEBHOOK_CLAIM_BATCH)
+            if not events:
+                break
+            claimed += mark_processed(db, [event.id for event in events])
+    return claimed
+
+
+# ---------------------------------------------------------------------------
+# Batch jobs
+# ---------------------------------------------------------------------------
+
+
+@benchmark("billing.run", rounds=3)
+def billing_run(ctx: BenchContext) -> int:
+    """Billing run untuk subscription ACTIVE yang jatuh tempo (dibatasi N batch)."""
+
+    def load_as_of():
+        with ctx.session() as db:
+            return db.scalar(
+                select(func.max(Subscription.next_billing_date)).where(
+                    Subscription.status == SubscriptionStatus.ACTIVE
+                )
+            )
+
+    as_of = ctx.cached("billing_as_of", load_as_of)
+    if as_of is None:
+        return 0
+    with ctx.rollback_session() as db:
+        result = run_billing(
+            db,
+            as_of,
+            batch_size=BILLING_BATCH,
+            commit=False,
+            max_batches=BILLING_MAX_BATCHES,
+        )
+    return result.cycles_created
+
+
+@benchmark("wallet.posting", rounds=5)
+def wallet_posting(ctx: BenchContext) -> int:
+    """Posting TOPUP + CHARGE bergantian ke sekumpulan wallet."""
+
+    def load_wallets():
+        with ctx.session() as db:
+            return list(db.scalars(select(WalletAccount.id).order_by(WalletAccount.id).limit(200)))
+
+    wallet_ids = ctx.cached("wallet_ids", load_wallets)
+    if not wallet_ids:
+        return 0
+    with ctx.rollback_session() as db:
+        for i in range(WALLET_POSTINGS):
+            # TOPUP lalu CHARGE ke wallet yang sama, jadi saldo selalu cukup
+            wallet_id = wallet_ids[(i // 2) % len(wallet_ids)]
+            topup = i % 2 == 0
+            post_transaction(
+                db,
+                wallet_id,
+                WalletTransactionType.TOPUP if topup else WalletTransactionType.CHARGE,
+                WalletTransactionDirection.IN if topup else WalletTransactionDirection.OUT,
+                Decimal("10000.00"),
+                related_type=WalletTransactionRelatedType.MANUAL,
+            )
+        db.flush()
+    return WALLET_POSTINGS
+
+
+# ---------------------------------------------------------------------------
+# LLM drafting (fake model: 200ms per panggilan + 5ms per prompt)
+# ---------------------------------------------------------------------------
+
+_DUE_STATES = ("jatuh tempo 3 hari lagi", "jatuh tempo hari ini", "lewat jatuh tempo 7 hari")
+
+
+def _reminder_requests(count: int):
+    return [
+        DraftRequest(
+            "payment_reminder",
+            {"period": "Oktober 2025", "due_state": _DUE_STATES[i % len(_DUE_STATES)]},
+            {"client_name": f"Client {i}", "invoice_number": f"INV-{i:06d}", "amount": "IDR 1.110.000"},
+            model=LLM_MODEL,
+        )
+        for i in range(count)
+    ]
+
+
+@benchmark("llm.draft_bulk", rounds=3)
+def llm_draft_bulk(ctx: BenchContext) -> int:
+    """Draft reminder N client dalam satu draft_many, cache kosong."""
+    with ctx.rollback_session() as db:
+        service = DraftingService(FakeLlmClient(latency_ms=200, per_item_ms=5), LLM_MODEL)
+        drafts = asyncio.run(service.draft_many(db, _reminder_requests(LLM_DRAFTS)))
+        db.flush()
+    return len(drafts)
+
+
+@benchmark("llm.draft_concurrent", rounds=3)
+def llm_draft_concurrent(ctx: BenchContext) -> int:
+    """N request draft tunggal concurrent (collapsing + micro-batching), cache kosong."""
+    with ctx.rollback_session() as db:
+        service = DraftingService(FakeLlmClient(latency_ms=200, per_item_ms=5), LLM_MODEL)
+
+        async def run():
+            return await asyncio.gather(*(service.draft(db, request) for request in _reminder_requests(LLM_DRAFTS)))
+
+        drafts = asyncio.run(run())
+        db.flush()
+    return len(drafts)
+
+
+# ---------------------------------------------------------------------------
+# Pencarian email
+# ---------------------------------------------------------------------------
+
+
+@benchmark("search.email_ilike", rounds=3)
+def search_email_ilike(ctx: BenchContext) -> int:
+    """
+    Baseline: `subject ILIKE '%kata%'` atau final body memuat kata (seq scan).
+    Body terkompresi tidak bisa di-ILIKE di SQL, jadi semua final body dibaca
+    & didekompresi sekali di Python untuk semua kata, lalu hash yang cocok
+    ikut difilter.
+    """
+    terms = [term.casefold() for term in SEARCH_TERMS]
+    matches = {term: [] for term in terms}
+    found = 0
+    with ctx.session() as db:
+        dictionaries = {
+            row.id: bytes(row.content) for row in db.execute(select(EmailBodyDictionary.id, EmailBodyDictionary.content))
+        }
+        rows = db.execute(
+            select(EmailBody.hash, EmailBody.codec, EmailBody.dictionary_id, EmailBody.content)
+            .where(EmailBody.hash.in_(select(EmailLog.final_body_hash)))
+            .execution_options(yield_per=5000)
+        )
+        for digest, codec, dictionary_id, content in rows:
+            body = decode_body(codec, content, dictionaries.get(dictionary_id)).casefold()
+            for term in terms:
+                if term in body:
+                    matches[term].append(bytes(digest))
+        for term in SEARCH_TERMS:
+            found += len(
+                db.execute(
+                    select(EmailLog.id, EmailLog.subject)
+                    .where(or_(EmailLog.subject.ilike(f"%{term}%"), EmailLog.final_body_hash.in_(matches[term.casefold()])))
+                    .order_by(EmailLog.created_at.desc())
+                    .limit(SEARCH_PAGE)
+                ).all()
+            )
+    return found
+
+
+@benchmark("search.email_fts", rounds=5)
+def search_email_fts(ctx: BenchContext) -> int:
+    """Full-text subject + body via GIN `search_vector`, ranked, halaman pertama + snippet."""
+    found = 0
+    with ctx.session() as db:
+        for term in SEARCH_TERMS:
+            found += len(search_emails(db, term, limit=SEARCH_PAGE).hits)
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Nomor dokumen
+# ---------------------------------------------------------------------------
+
+
+@benchmark("numbers.allocate", rounds=5)
+def numbers_allocate(ctx: BenchContext) -> int:
+    """N nomor quotation dari allocator blok 50 (lease = 1 query per 50 nomor)."""
+    allocator = NumberAllocator(ctx.engine, block_size=50)
+    for _ in range(NUMBER_ALLOCATIONS):
+        allocator.allocate("BNC", 2099)
+    with ctx.engine.begin() as connection:
+        connection.execute(delete(DocumentCounter.__table__).where(DocumentCounter.prefix == "BNC"))
+    return NUMBER_ALLOCATIONS
+
+
+# ---------------------------------------------------------------------------
+# Pricing quotation
+# ---------------------------------------------------------------------------
+
+
+@benchmark("pricing.reprice_orm", rounds=3)
+def pricing_reprice_orm(ctx: BenchContext) -> int:
+    """Baseline: load semua quotation + item ke ORM, hitung di Python, flush."""
+    with ctx.rollback_session() as db:
+        quotations = db.scalars(select(Quotation).options(selectinload(Quotation.items))).all()
+        for quotation in quotations:
+            price_quotation(quotation, quotation.exchange_rate * 2)
+        db.flush()
+    return len(quotations)
+
+
+@benchmark("pricing.reprice_bulk", rounds=3)
+def pricing_reprice_bulk(ctx: BenchContext) -> int:
+    """Set-based: satu UPDATE ... RETURNING per 2000 quotation."""
+    with ctx.rollback_session() as db:
+        result = reprice_quotations(db, statuses=list(QuotationStatus), commit=False)
+    return result.quotations
+
+
+# ---------------------------------------------------------------------------
+# Kurs mata uang
+# ---------------------------------------------------------------------------
+
+
+def _fx_moments(ctx: BenchContext):
+    def load():
+        with ctx.session() as db:
+            first, last = db.execute(
+                select(func.min(ExchangeRate.effective_at), func.max(ExchangeRate.effective_at)).where(
+                    ExchangeRate.base_currency == "USD", ExchangeRate.quote_currency == "IDR"
+                )
+            ).one()
+        if first is None:
+            return []
+        return [first + (last - first) * ctx.rng.random() for _ in range(FX_LOOKUPS)]
+
+    return ctx.cached("fx_moments", load)
+
+
+@benchmark("fx.lookup_db", rounds=5)
+def fx_lookup_db(ctx: BenchContext) -> int:
+    """Baseline: satu query `effective_at <= T ORDER BY ... LIMIT 1` per konversi."""
+    moments = _fx_moments(ctx)
+    with ctx.session() as db:
+        for moment in moments:
+            db.scalar(
+                select(ExchangeRate.rate)
+                .where(
+                    ExchangeRate.base_currency == "USD",
+                    ExchangeRate.quote_currency == "IDR",
+                    ExchangeRate.effective_at <= moment,
+                )
+                .order_by(ExchangeRate.effective_at.desc())
+                .limit(1)
+            )
+    return len(moments)
+
+
+@benchmark("fx.lookup_cache", rounds=5)
+def fx_lookup_cache(ctx: BenchContext) -> int:
+    """Snapshot (satu query) + bisect in-memory per konversi; termasuk waktu muat."""
+    moments = _fx_moments(ctx)
+    with ctx.session() as db:
+        rates = ExchangeRateCache.snapshot(db)
+    for moment in moments:
+        rates.rate("USD", "IDR", moment)
+        rates.rate("IDR", "USD", moment)
+    return len(moments) * 2
+
+
+# ---------------------------------------------------------------------------
+# Sweeper quotation kedaluwarsa
+# ---------------------------------------------------------------------------
+
+
+@benchmark("quotations.expire_orm", rounds=5)
+def quotations_expire_orm(ctx: BenchContext) -> int:
+    """Baseline: load quotation SENT kedaluwarsa ke ORM, ubah status, flush (UPDATE per baris)."""
+    with ctx.rollback_session() as db:
+        quotations = db.scalars(
+            select(Quotation).where(
+                Quotation.status == QuotationStatus.SENT.value, Quotation.valid_until < func.now()
+            )
+        ).all()
+        for quotation in quotations:
+            quotation.status = QuotationStatus.EXPIRED.value
+        db.flush()
+    return len(quotations)
+
+
+@benchmark("quotations.expire_bulk", rounds=5)
+def quotations_expire_bulk(ctx: BenchContext) -> int:
+    """Set-based: satu UPDATE ... FROM (SELECT ... SKIP LOCKED) RETURNING per batch."""
+    with ctx.rollback_session() as db:
+        result = expire_quotations(db, batch_size=EXPIRY_BATCH, commit=False)
+    return result.expired
+
+
+@benchmark("quotations.expire_followups", rounds=5)
+def quotations_expire_followups(ctx: BenchContext) -> int:
+    """Set-based + draft email tindak lanjut di batch yang sama."""
+    with ctx.rollback_session() as db:
+        result = expire_quotations(db, batch_size=EXPIRY_BATCH, followups=True, commit=False)
+    return result.expired
+
+
+# ---------------------------------------------------------------------------
+# Konversi quotation → subscription
+# ---------------------------------------------------------------------------
+
+
+def _unlink_accepted(db) -> None:
+    # Dataset sintetis: semua ACCEPTED sudah terhubung; lepas dulu (di-rollback)
+    db.execute(
+        update(Quotation)
+        .where(Quotation.status == QuotationStatus.ACCEPTED.value)
+        .values(related_subscription_id=None)
+    )
+
+
+@benchmark("conversion.orm", rounds=3)
+def conversion_orm(ctx: BenchContext) -> int:
+    """Baseline: `convert_quotation` per quotation (flush per subscription)."""
+    with ctx.rollback_session() as db:
+        _unlink_accepted(db)
+        quotations = db.scalars(
+            select(Quotation)
+            .options(selectinload(Quotation.items))
+            .where(Quotation.status == QuotationStatus.ACCEPTED.value)
+        ).all()
+        for quotation in quotations:
+            convert_quotation(db, quotation)
+        db.flush()
+    return len(quotations)
+
+
+@benchmark("conversion.bulk", rounds=3)
+def conversion_bulk(ctx: BenchContext) -> int:
+    """Multi-row INSERT ... RETURNING + satu UPDATE quotations per 500 quotation."""
+    with ctx.rollback_session() as db:
+        _unlink_accepted(db)
+        result = convert_accepted(db, batch_size=CONVERSION_BATCH, commit=False)
+    return result.subscriptions
+
+
+# ---------------------------------------------------------------------------
+# Ringkasan MRR/ARR
+# ---------------------------------------------------------------------------
+
+
+@benchmark("revenue.dashboard_join", rounds=3)
+def revenue_dashboard_join(ctx: BenchContext) -> int:
+    """Baseline: MRR bulan berjalan per dimensi dihitung dari join tabel sumber per load."""
+    contributions = contributions_query().subquery()
+    stmt = select(
+        contributions.c.product_type,
+        contributions.c.currency,
+        contributions.c.client_status,
+        func.count(),
+        func.sum(contributions.c.mrr),
+    ).group_by(contributions.c.product_type, contributions.c.currency, contributions.c.client_status)
+    with ctx.session() as db:
+        for _ in range(DASHBOARD_LOADS):
+            db.execute(stmt).all()
+    return DASHBOARD_LOADS
+
+
+@benchmark("revenue.dashboard_summary", rounds=3)
+def revenue_dashboard_summary(ctx: BenchContext) -> int:
+    """Range read 12 bulan dari REVENUE_SUMMARY + konversi ke USD per load."""
+    month = current_month()
+    year_ago = month.replace(year=month.year - 1)
+    with ctx.session() as db:
+        rates = ExchangeRateCache.snapshot(db)
+        for _ in range(DASHBOARD_LOADS):
+            mrr_totals(monthly_mrr(db, year_ago, month), rates, "USD")
+    return DASHBOARD_LOADS
+
+
+@benchmark("revenue.refresh", rounds=3)
+def revenue_refresh(ctx: BenchContext) -> int:
+    """1000 subscription di antrian → delta ke ringkasan bulan berjalan."""
+    with ctx.rollback_session() as db:
+        ids = db.scalars(select(Subscription.id).order_by(func.random()).limit(REVENUE_DIRTY)).all()
+        mark_dirty(db, ids)
+        result = refresh_dirty(db, commit=False)
+    return result.subscriptions
+
+
+@benchmark("revenue.rebuild", rounds=3)
+def revenue_rebuild(ctx: BenchContext) -> int:
+    """Rekonsiliasi penuh: hitung ulang semua kontribusi & ringkasan bulan berjalan."""
+    with ctx.rollback_session() as db:
+        result = rebuild(db, commit=False)
+    return result.contributions
+
+
+# ---------------------------------------------------------------------------
+# Ringkasan client (client 360)
+# ---------------------------------------------------------------------------
+
+
+def _heavy_client_ids(ctx: BenchContext):
+    """Client dengan payment terbanyak (ribuan payment & billing cycle)."""
+
+    def load():
+        with ctx.session() as db:
+            return db.scalars(
+                select(Payment.client_id).group_by(Payment.client_id).order_by(func.count().desc()).limit(HEAVY_CLIENTS)
+            ).all()
+
+    return ctx.cached("heavy_client_ids", load)
+
+
+@benchmark("client360.orm", rounds=3)
+def client360_orm(ctx: BenchContext) -> int:
+    """Baseline: Client + koleksi selectin + billing cycle per subscription, agregasi di Python."""
+    open_statuses = {status for status in BillingCycleStatus} - {BillingCycleStatus.PAID, BillingCycleStatus.CANCELLED}
+    with ctx.session() as db:
+        for client_id in _heavy_client_ids(ctx):
+            client = db.get(Client, client_id)
+            subscriptions = client.subscriptions
+            active = sum(1 for subscription in subscriptions if subscription.status == SubscriptionStatus.ACTIVE)
+            outstanding = {}
+            for cycle in db.scalars(
+                select(BillingCycle).where(BillingCycle.subscription_id.in_([s.id for s in subscriptions]))
+            ):
+                if cycle.status in open_statuses:
+                    outstanding[cycle.currency] = outstanding.get(cycle.currency, Decimal(0)) + cycle.amount
+            paid = [p for p in client.payments if p.status == PaymentStatus.SUCCESS and p.paid_at is not None]
+            max(paid, key=lambda p: p.paid_at, default=None)
+            open_quotations = [q for q in client.quotations if q.status in (QuotationStatus.DRAFT.value, QuotationStatus.SENT.value)]
+            wallet = client.wallet_account.balance if client.wallet_account else None
+            (active, outstanding, len(open_quotations), wallet)
+            db.expunge_all()
+    return len(_heavy_client_ids(ctx))
+
+
+@benchmark("client360.query", rounds=3)
+def client360_query(ctx: BenchContext) -> int:
+    """Satu query lateral per client, tanpa cache."""
+    with ctx.session() as db:
+        for client_id in _heavy_client_ids(ctx):
+            load_client_summary(db, client_id)
+    return len(_heavy_client_ids(ctx))
+
+
+@benchmark("client360.cached", rounds=3)
+def client360_cached(ctx: BenchContext) -> int:
+    """Query lateral + cache TTL: load pertama miss, ulangan hit."""
+    cache = ClientSummaryCache(ttl_seconds=60.0)
+    with ctx.session() as db:
+        for _ in range(CLIENT_SUMMARY_REPEAT):
+            for client_id in _heavy_client_ids(ctx):
+                cache.get(db, client_id)
+    return len(_heavy_client_ids(ctx)) * CLIENT_SUMMARY_REPEAT
+
+
+# ---------------------------------------------------------------------------
+# Proyeksi revenue
+# ---------------------------------------------------------------------------
+
+
+def _forecast_lines(ctx: BenchContext) -> ForecastLines:
+    def load():
+        with ctx.session() as db:
+            return load_lines(db)
+
+    return ctx.cached("forecast_lines", load)
+
+
+def _synthetic_forecast_lines(ctx: BenchContext) -> ForecastLines:
+    """Baris asli diulang sampai FORECAST_SYNTHETIC_LINES; tiap ulangan key sendiri."""
+
+    def build():
+        lines = _forecast_lines(ctx)
+        repeats = -(-FORECAST_SYNTHETIC_LINES // len(lines))
+        keys = int(lines.key[-1]) + 1
+        tile = lambda values: np.tile(values, repeats)[:FORECAST_SYNTHETIC_LINES]
+        return ForecastLines(
+            key=(np.repeat(np.arange(repeats), len(lines)) * keys + np.tile(lines.key, repeats))[:FORECAST_SYNTHETIC_LINES],
+            next_month=tile(lines.next_month),
+            next_day=tile(lines.next_day),
+            anchor_day=tile(lines.anchor_day),
+            end_month=tile(lines.end_month),
+            end_day=tile(lines.end_day),
+            period_months=tile(lines.period_months),
+            amount=tile(lines.amount),
+            client_ids=np.tile(lines.client_ids, repeats),
+            product_ids=np.tile(lines.product_ids, repeats),
+            currencies=np.tile(lines.currencies, repeats),
+        )
+
+    return ctx.cached("forecast_synthetic_lines", build)
+
+
+def python_project_billed(lines: ForecastLines, start_month: date, horizon: int) -> dict:
+    """Baseline: simulasi billing run per baris dengan `add_billing_period`."""
+    start = start_month.year * 12 + start_month.month - 1
+    totals: dict = {}
+    for key, next_month, next_day, anchor_day, end_month, end_day, period, amount in zip(
+        lines.key.tolist(),
+        lines.next_month.tolist(),
+        lines.next_day.tolist(),
+        lines.anchor_day.tolist(),
+        lines.end_month.tolist(),
+        lines.end_day.tolist(),
+        lines.period_months.tolist(),
+        lines.amount.tolist(),
+    ):
+        billing_period = BillingPeriod.YEARLY if period == 12 else BillingPeriod.MONTHLY
+        billing_date = month_date(next_month).replace(day=next_day)
+        end_date = None if end_month == 2147483647 else month_date(end_month).replace(day=end_day)
+        row = totals.setdefault(key, [0.0] * horizon)
+        while True:
+            offset = max(billing_date.year * 12 + billing_date.month - 1 - start, 0)
+            if offset >= horizon or (end_date is not None and billing_date > end_date):
+                break
+            row[offset] += amount
+            billing_date = add_billing_period(billing_date, billing_period, anchor_day)
+    return totals
+
+
+@benchmark("forecast.python_loop", rounds=3)
+def forecast_python_loop(ctx: BenchContext) -> int:
+    """Baseline: proyeksi per subscription × produk dengan loop Python (input sudah dimuat)."""
+    lines = _forecast_lines(ctx)
+    python_project_billed(lines, FORECAST_START, FORECAST_HORIZON)
+    return len(lines)
+
+
+@benchmark("forecast.numpy", rounds=5)
+def forecast_numpy(ctx: BenchContext) -> int:
+    """Proyeksi vektor NumPy atas semua baris sekaligus (input sudah dimuat)."""
+    lines = _forecast_lines(ctx)
+    project_billed(lines, FORECAST_START, FORECAST_HORIZON)
+    return len(lines)
+
+
+@benchmark("forecast.numpy_500k", rounds=3)
+def forecast_numpy_500k(ctx: BenchContext) -> int:
+    """Proyeksi NumPy untuk 500k baris sintetis (buku penuh)."""
+    lines = _synthetic_forecast_lines(ctx)
+    project_billed(lines, FORECAST_START, FORECAST_HORIZON)
+    return len(lines)
+
+
+@benchmark("forecast.full", rounds=3)
+def forecast_full(ctx: BenchContext) -> int:
+    """End-to-end: dua query + proyeksi + tingkat koleksi."""
+    with ctx.session() as db:
+        forecast = forecast_revenue(db, FORECAST_START, FORECAST_HORIZON)
+    return len(forecast.billed)
@@ -0,0 +1,73 @@
+"""
+Bandingkan dua file hasil benchmark dan deteksi regresi.
+
+Regresi = median baru lebih lambat dari baseline melebihi `--threshold`
+(default 10%), atau jumlah query per round bertambah (indikasi N+1).
+Exit code 1 jika ada regresi, sehingga bisa dipakai langsung di CI.
+
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/results/latest.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)["results"]
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        base, new = baseline.get(name), current.get(name)
+        if base is None or new is None:
+            rows.append({"name": name, "status": "added" if base is None else "removed"})
+            continue
+        ratio = new["median_s"] / base["median_s"] if base["median_s"] else 1.0
+        status = "ok"
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif new.get("queries", 0) > base.get("queries", 0):
+            status = "REGRESSION (queries)"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        rows.append(
+            {
+                "name": name,
+                "status": status,
+                "base_ms": base["median_s"] * 1000,
+                "new_ms": new["median_s"] * 1000,
+                "ratio": ratio,
+                "base_queries": base.get("queries"),
+                "new_queries": new.get("queries"),
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bandingkan hasil benchmark dengan baseline.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Toleransi perlambatan (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    rows = compare(load(args.baseline), load(args.current), args.threshold)
+    regressions = 0
+    for row in rows:
+        if "ratio" not in row:
+            print(f"{row['name']:<30} {row['status']}")
+            continue
+        print(
+            f"{row['name']:<30} {row['base_ms']:9.2f} ms -> {row['new_ms']:9.2f} ms "
+            f"(x{row['ratio']:.2f}, queries {row['base_queries']} -> {row['new_queries']})  {row['status']}"
+        )
+        regressions += row["status"].startswith("REGRESSION")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Harness benchmark: registry, timing, dan format hasil JSON.
+
+Setiap benchmark adalah fungsi `fn(ctx) -> int` yang mengembalikan jumlah
+operasi (baris/objek) yang dikerjakan dalam satu round. Harness mengukur
+durasi per round, jumlah query SQL, lalu menghitung statistik (min, median,
+mean, p95, ops/sec).
+
+Benchmark yang menulis data memakai `ctx.rollback_session()` sehingga dataset
+tetap sama antar round maupun antar run.
+"""
+
+from __future__ import annotations
+
+import platform
+import random
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import sqlalchemy
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[["BenchContext"], int]
+    rounds: int = 5
+    warmup: int = 1
+    description: str = ""
+
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, rounds: int = 5, warmup: int = 1) -> Callable:
+    """Decorator untuk mendaftarkan benchmark ke REGISTRY."""
+
+    def decorator(func: Callable[["BenchContext"], int]) -> Callable[["BenchContext"], int]:
+        REGISTRY[name] = Benchmark(
+            name=name,
+            func=func,
+            rounds=rounds,
+            warmup=warmup,
+            description=(func.__doc__ or "").strip().splitlines()[0] if func.__doc__ else "",
+        )
+        return func
+
+    return decorator
+
+
+@dataclass
+class BenchContext:
+    engine: Engine
+    seed: int = 42
+    rng: random.Random = field(init=False)
+    query_count: int = field(default=0, init=False)
+    _cache: Dict[str, Any] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+        self.session_factory = sessionmaker(bind=self.engine, autoflush=False)
+        event.listen(self.engine, "before_cursor_execute", self._count_query)
+
+    def _count_query(self, *args) -> None:
+        self.query_count += 1
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        db = self.session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def rollback_session(self) -> Iterator[Session]:
+        """Session di dalam transaksi luar yang selalu di-rollback."""
+        connection = self.engine.connect()
+        transaction = connection.begin()
+        db = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+        try:
+            yield db
+        finally:
+            db.close()
+            transaction.rollback()
+            connection.close()
+
+    def cached(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Cache sampel ID dsb. supaya tidak ikut terukur di tiap round."""
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(bench: Benchmark, ctx: BenchContext, rounds: Optional[int] = None) -> Dict[str, Any]:
+    for _ in range(bench.warmup):
+        bench.func(ctx)
+
+    timings: List[float] = []
+    ops = 0
+    queries = 0
+    for _ in range(rounds or bench.rounds):
+        ctx.query_count = 0
+        started = time.perf_counter()
+        ops = bench.func(ctx)
+        timings.append(time.perf_counter() - started)
+        queries = ctx.query_count
+
+    median = statistics.median(timings)
+    return {
+        "description": bench.description,
+        "rounds": len(timings),
+        "ops": ops,
+        "queries": queries,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "p95_s": _percentile(timings, 95),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "ops_per_sec": ops / median if median > 0 else 0.0,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect_metadata(engine: Engine, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    with engine.connect() as connection:
+        server_version = connection.execute(text("SHOW server_version")).scalar()
+        # Estimasi jumlah baris dari statistik planner (murah, tidak full scan)
+        row_estimates = {
+            name: int(estimate)
+            for name, estimate in connection.execute(
+                text(
+                    "SELECT relname, reltuples FROM pg_class "
+                    "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace "
+                    "ORDER BY relname"
+                )
+            )
+        }
+    meta = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "postgres": server_version,
+        "host": platform.node(),
+        "row_estimates": row_estimates,
+    }
+    meta.update(extra or {})
+    return meta
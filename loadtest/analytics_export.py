@@ -0,0 +1,68 @@
+"""
+Benchmark tarik data analis: query ORM baris-per-baris vs export Parquet.
+
+Baseline meniru pola notebook sekarang: `select(Model)` lewat ORM, tiap
+objek diubah ke dict (siap jadi DataFrame). Pembanding: export penuh
+(`export_table` tanpa watermark) ke direktori sementara yang dihapus di
+akhir. Dilaporkan baris/detik per tabel.
+
+Contoh:
+
+    python -m loadtest.analytics_export --table payments --table billing_cycles
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs export Parquet.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--table", action="append", help="Boleh diulang (default: semua tabel)")
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.db.base import Base
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services.analytics_export import EXPORT_TABLES, export_table
+
+    models = {mapper.local_table.name: mapper.class_ for mapper in Base.registry.mappers}
+    engine = create_engine(args.database_url or settings.DATABASE_URL)
+    root = tempfile.mkdtemp(prefix="analytics-")
+    try:
+        for name in args.table or list(EXPORT_TABLES):
+            model = models[name]
+            columns = [column.key for column in EXPORT_TABLES[name].table.columns]
+            with Session(engine) as db:
+                started = time.perf_counter()
+                rows = [
+                    {column: getattr(obj, column) for column in columns}
+                    for obj in db.scalars(select(model).execution_options(yield_per=1000))
+                ]
+                orm_seconds = time.perf_counter() - started
+                del rows
+            with Session(engine) as db:
+                watermark_to = db.scalar(select(func.now()))
+                result = export_table(db, root, name, None, watermark_to, args.chunk_rows)
+            print(
+                f"{name:<20} {result.rows:>9,} baris  ORM {orm_seconds:>6.2f} s "
+                f"({result.rows / orm_seconds:>8,.0f} baris/s)  Parquet {result.elapsed_seconds:>6.2f} s "
+                f"({result.rows_per_second:>8,.0f} baris/s, {result.files} file, "
+                f"{result.bytes_written / 1024 / 1024:.1f} MB)"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark export aging piutang: streaming (server-side cursor) vs memuat semua baris.
+
+Per kombinasi level × format dilaporkan baris/detik, ukuran file, dan puncak
+alokasi Python (`tracemalloc`) selama export. Output dibuang (tidak ditulis
+ke disk) supaya yang terukur hanya query + serialisasi.
+
+`--reopen-paid` memperbesar buku piutang di dalam transaksi yang di-rollback
+di akhir: semua billing cycle PAID diubah menjadi INVOICED, jadi export detail
+berisi hampir seluruh BILLING_CYCLES. Data tidak berubah.
+
+Contoh:
+
+    python -m loadtest.ar_aging_export --reopen-paid
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date
+import time
+import tracemalloc
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark export aging piutang streaming vs load penuh.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--reopen-paid", action="store_true", help="Anggap cycle PAID belum lunas (di-rollback)")
+    parser.add_argument("--chunk-rows", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine, func, select, text
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services import ar_aging
+    from app.services.spreadsheet import csv_chunks, xlsx_chunks
+
+    def load_all(db, level, export_format):
+        """Baseline: `.all()` lalu serialisasi (pola sebelum streaming)."""
+        query = ar_aging.summary_query if level == ar_aging.AgingLevel.SUMMARY else ar_aging.detail_query
+        header = ar_aging.SUMMARY_HEADER if level == ar_aging.AgingLevel.SUMMARY else ar_aging.DETAIL_HEADER
+        rows = [tuple(row) for row in db.execute(query(args.as_of))]
+        if export_format == ar_aging.ExportFormat.CSV:
+            return csv_chunks(header, rows, args.chunk_rows)
+        return xlsx_chunks("AR aging", header, rows, args.chunk_rows)
+
+    def streamed(db, level, export_format):
+        return ar_aging.export_chunks(db, level, export_format, args.as_of, chunk_rows=args.chunk_rows)
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            outer = connection.begin()
+            if args.reopen_paid:
+                reopened = connection.execute(
+                    text("UPDATE billing_cycles SET status = 'INVOICED' WHERE status = 'PAID'")
+                ).rowcount
+                print(f"{reopened:,} cycle PAID dibuka ulang (di-rollback di akhir)")
+            with Session(bind=connection, join_transaction_mode="create_savepoint") as db:
+                for level in ar_aging.AgingLevel:
+                    query = ar_aging.summary_query if level == ar_aging.AgingLevel.SUMMARY else ar_aging.detail_query
+                    rows = db.scalar(select(func.count()).select_from(query(args.as_of).subquery()))
+                    for export_format in ar_aging.ExportFormat:
+                        for mode, build in (("load penuh", load_all), ("streaming", streamed)):
+                            tracemalloc.start()
+                            started = time.perf_counter()
+                            size = sum(len(chunk) for chunk in build(db, level, export_format))
+                            elapsed = time.perf_counter() - started
+                            _, peak = tracemalloc.get_traced_memory()
+                            tracemalloc.stop()
+                            print(
+                                f"{level.value:<7} {export_format.value:<4} {mode:<10} {rows:>8,} baris  "
+                                f"{elapsed:>6.2f} s  {rows / elapsed:>8,.0f} baris/s  "
+                                f"{size / 1024 / 1024:>6.1f} MB file  puncak {peak / 1024 / 1024:>7.1f} MB"
+                            )
+            outer.rollback()
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
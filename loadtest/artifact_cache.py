@@ -0,0 +1,151 @@
+"""
+Load test cache artifact (PDF quotation/invoice) terhadap origin HTTP lokal.
+
+`FileOrigin` adalah stand-in Cosmic / store upload Finance: server HTTP
+minimal (asyncio, stdlib saja) yang melayani `GET /<nama>.pdf` berisi byte
+deterministik per path, dengan latency buatan, dan menghitung request.
+
+Skenario (`main`):
+1. cold   : N URL berbeda, semua miss → download dari origin;
+2. warm   : URL yang sama diulang → dilayani dari disk, origin tidak disentuh;
+3. dedup  : banyak request bersamaan untuk satu URL baru → satu download;
+4. evict  : URL tambahan melewati `--max-mb` → entry LRU dihapus, ukuran
+   store tetap di bawah batas.
+
+Entry ARTIFACTS milik test (URL origin lokal) dihapus di akhir.
+
+Contoh:
+
+    python -m loadtest.artifact_cache --urls 50 --size-kb 200 --latency-ms 50 --max-mb 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+from pathlib import Path
+import random
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+
+class FileOrigin:
+    def __init__(self, size_bytes: int, latency_ms: float = 0.0) -> None:
+        self.size_bytes = size_bytes
+        self.latency_ms = latency_ms
+        self.requests: Dict[str, int] = {}
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def body(self, path: str) -> bytes:
+        return random.Random(hashlib.sha256(path.encode()).digest()).randbytes(self.size_bytes)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                self.requests[path] = self.requests.get(path, 0) + 1
+                if self.latency_ms:
+                    await asyncio.sleep(self.latency_ms / 1000)
+                body = self.body(path) if method == "GET" else b""
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/pdf\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                )
+                writer.write(body)
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from sqlalchemy import create_engine, delete
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.artifact import Artifact
+    from app.services.artifacts import ArtifactStore
+
+    origin = FileOrigin(args.size_kb * 1024, args.latency_ms)
+    server = await asyncio.start_server(origin.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    prefix = f"http://127.0.0.1:{port}/"
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL)
+    root = tempfile.mkdtemp(prefix="artifacts-")
+    store = ArtifactStore(root, args.max_mb * 1024 * 1024, sessionmaker(bind=engine))
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def get_all(urls: List[str]) -> float:
+        async def one(url: str) -> None:
+            async with semaphore:
+                await store.get(url)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(url) for url in urls))
+        return time.perf_counter() - started
+
+    def report(name: str, count: int, elapsed: float, before: int) -> None:
+        print(
+            f"{name:<6} {count:>6,} get  {elapsed * 1000:>9.1f} ms  "
+            f"{elapsed / count * 1000:>7.2f} ms/get  origin +{origin.total_requests - before:,}"
+        )
+
+    try:
+        urls = [f"{prefix}quotation-{i}.pdf" for i in range(args.urls)]
+        before = origin.total_requests
+        report("cold", len(urls), await get_all(urls), before)
+
+        before = origin.total_requests
+        repeated = urls * args.repeat
+        report("warm", len(repeated), await get_all(repeated), before)
+
+        before = origin.total_requests
+        started = time.perf_counter()
+        await asyncio.gather(*(store.get(f"{prefix}invoice-hot.pdf") for _ in range(args.dedup)))
+        report("dedup", args.dedup, time.perf_counter() - started, before)
+
+        before = origin.total_requests
+        extra = [f"{prefix}invoice-{i}.pdf" for i in range(args.evict_urls)]
+        report("evict", len(extra), await get_all(extra), before)
+        on_disk = sum(path.stat().st_size for path in Path(root).glob("??/*"))
+        print(f"evicted {store.evicted:,} entry, di disk {on_disk / 1024 / 1024:.1f} MB (batas {args.max_mb} MB)")
+    finally:
+        await store.aclose()
+        server.close()
+        with engine.begin() as connection:
+            connection.execute(delete(Artifact.__table__).where(Artifact.url.like(f"{prefix}%")))
+        engine.dispose()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test cache artifact dengan origin HTTP lokal.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--urls", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=4)
+    parser.add_argument("--dedup", type=int, default=100, help="Request bersamaan untuk satu URL")
+    parser.add_argument("--evict-urls", type=int, default=150)
+    parser.add_argument("--size-kb", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--max-mb", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args(argv)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
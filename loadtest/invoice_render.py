@@ -0,0 +1,87 @@
+"""
+Benchmark render draft invoice PDF: serial vs process pool.
+
+Semua berjalan lokal: billing cycle PENDING / INVOICE_REQUESTED dari database,
+PDF ke direktori store sementara. Satu koneksi dengan transaksi luar yang
+di-rollback di akhir tiap putaran (ARTIFACTS & `invoice_file_url` ikut
+dibatalkan), jadi data tidak berubah dan tiap putaran me-render cycle yang sama.
+
+Per putaran dilaporkan invoice/detik, halaman/detik, dan puncak RSS per worker.
+
+Contoh:
+
+    python -m loadtest.invoice_render --workers 0,1,2,4 --batch-size 200 --limit 5
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+import shutil
+import tempfile
+from typing import List, Optional
+
+
+class SerialExecutor(Executor):
+    """Baseline: render di proses utama (tanpa pickling / IPC)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark render invoice PDF serial vs process pool.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--workers", default="0,1,2,4", help="Daftar jumlah worker; 0 = serial di proses utama")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--chunksize", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=5, help="Maksimum batch per putaran")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services.artifacts import ArtifactStore
+    from app.services.invoice_rendering import render_invoices
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL)
+    root = tempfile.mkdtemp(prefix="invoices-")
+    try:
+        for workers in (int(value) for value in args.workers.split(",")):
+            executor = SerialExecutor() if workers == 0 else ProcessPoolExecutor(max_workers=workers)
+            with engine.connect() as connection, executor:
+                outer = connection.begin()
+                factory = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+                store = ArtifactStore(root, settings.ARTIFACT_CACHE_MAX_BYTES, factory)
+                with factory() as db:
+                    result = render_invoices(
+                        db,
+                        store,
+                        executor,
+                        batch_size=args.batch_size,
+                        chunksize=args.chunksize,
+                        commit=False,
+                        max_batches=args.limit,
+                    )
+                outer.rollback()
+            rss = sorted(result.worker_peak_rss_kb.values())
+            print(
+                f"{'serial' if workers == 0 else f'{workers} worker':<9} {result.invoices:>6,} invoice "
+                f"{result.pages:>6,} hlm  {result.elapsed_seconds:>7.2f} s  "
+                f"{result.invoices / result.elapsed_seconds:>7.1f} inv/s  {result.pages_per_second:>7.1f} hlm/s  "
+                f"RSS/worker {rss[0] / 1024:.1f}–{rss[-1] / 1024:.1f} MB"
+            )
+    finally:
+        engine.dispose()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
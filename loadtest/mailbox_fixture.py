@@ -0,0 +1,131 @@
+"""
+Generator fixture mailbox lokal (pengganti Gmail) untuk ingestion inbound.
+
+Menulis file `.eml` ke direktori `INBOUND_LOCAL_MAILBOX_DIR` berdasarkan data
+di database, dengan campuran:
+
+- balasan client di thread quotation (`X-Gmail-Thread-Id` = `gmail_thread_id`);
+- balasan atas email OUTBOUND (`In-Reply-To` = `rfc_message_id`, thread =
+  `gmail_message_id`);
+- email dari user FINANCE dengan lampiran PDF invoice;
+- email lain yang tidak ter-match (CLIENT_MAIL), sebagian HTML-only.
+
+Nama file berurutan (`<prefix>-000001.eml`), jadi menjalankan ulang dengan
+`--prefix` yang lebih besar leksikal meniru pesan baru setelah cursor.
+
+Contoh:
+
+    python -m loadtest.mailbox_fixture --count 2000 --prefix 0001
+    python -m scripts.inbound_mail --once
+"""
+
+from __future__ import annotations
+
+import argparse
+from email.message import EmailMessage
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import random
+from typing import List, Optional
+
+from app.integrations.mailbox import LOCAL_MESSAGE_ID_HEADER, LOCAL_THREAD_ID_HEADER
+
+
+def _pdf(size: int, rng: random.Random) -> bytes:
+    return b"%PDF-1.4\n" + bytes(rng.getrandbits(8) for _ in range(size)) + b"\n%%EOF\n"
+
+
+def generate(db, directory: str, count: int, prefix: str, seed: int = 7) -> int:
+    from sqlalchemy import select
+
+    from app.models.client import Client
+    from app.models.email_log import EmailDirection, EmailLog
+    from app.models.quotation import Quotation
+    from app.models.user import User, UserRole
+
+    rng = random.Random(seed)
+    quotations = db.execute(
+        select(Quotation.gmail_thread_id, Quotation.number, Client.billing_email)
+        .join(Client, Client.id == Quotation.client_id)
+        .where(Quotation.gmail_thread_id.is_not(None))
+        .limit(5000)
+    ).all()
+    outbound = db.execute(
+        select(
+            EmailLog.gmail_message_id, EmailLog.rfc_message_id, EmailLog.to_email, EmailLog.from_email, EmailLog.subject
+        )
+        .where(EmailLog.direction == EmailDirection.OUTBOUND, EmailLog.rfc_message_id.is_not(None))
+        .limit(5000)
+    ).all()
+    finance = db.scalars(select(User.email).where(User.role == UserRole.FINANCE)).all()
+
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    # Sebagian kecil lampiran identik (invoice yang dikirim ulang) → dedup di disk
+    shared_pdfs = [_pdf(rng.randint(20_000, 80_000), rng) for _ in range(5)]
+    now = datetime.now(timezone.utc)
+
+    for index in range(count):
+        message = EmailMessage()
+        message_id = f"in-{prefix}-{index:06d}"
+        message[LOCAL_MESSAGE_ID_HEADER] = message_id
+        message["Message-ID"] = f"<{message_id}@mail.example.com>"
+        message["Date"] = format_datetime(now - timedelta(minutes=count - index))
+        kind = rng.random()
+
+        if kind < 0.45 and quotations:
+            thread_id, number, client_email = rng.choice(quotations)
+            message[LOCAL_THREAD_ID_HEADER] = thread_id
+            message["From"] = client_email
+            message["To"] = "sales@cloudsales.id"
+            message["Subject"] = f"Re: Penawaran {number}"
+            message.set_content(f"Terima kasih, penawaran {number} sudah kami terima.\nKami akan review minggu ini.")
+        elif kind < 0.75 and outbound:
+            original_id, original_rfc_id, to_email, from_email, subject = rng.choice(outbound)
+            # Separuh di thread baru (mis. email dari provider SMTP): hanya In-Reply-To yang cocok
+            thread_id = original_id if rng.random() < 0.5 else f"rep-{prefix}-{index:06d}"
+            message[LOCAL_THREAD_ID_HEADER] = thread_id
+            message["In-Reply-To"] = original_rfc_id
+            message["From"] = to_email
+            message["To"] = from_email
+            message["Subject"] = f"Re: {subject or ''}"
+            message.set_content("Baik, pembayaran akan kami proses.\n\n> (kutipan email sebelumnya)")
+        elif kind < 0.9 and finance:
+            message[LOCAL_THREAD_ID_HEADER] = f"fin-{prefix}-{index:06d}"
+            message["From"] = rng.choice(finance)
+            message["To"] = "billing@cloudsales.id"
+            message["Subject"] = f"Invoice {now:%Y%m}-{index:05d}"
+            message.set_content("Terlampir invoice untuk diproses.")
+            data = rng.choice(shared_pdfs) if rng.random() < 0.3 else _pdf(rng.randint(20_000, 80_000), rng)
+            message.add_attachment(data, maintype="application", subtype="pdf", filename=f"invoice-{index:05d}.pdf")
+        else:
+            message[LOCAL_THREAD_ID_HEADER] = f"ext-{prefix}-{index:06d}"
+            message["From"] = f"prospect{rng.randint(1, 999)}@example.org"
+            message["To"] = "hello@cloudsales.id"
+            message["Subject"] = "Pertanyaan produk"
+            message.set_content("<p>Halo,</p><p>Apakah ada paket <b>enterprise</b>?</p>", subtype="html")
+
+        (target / f"{prefix}-{index:06d}.eml").write_bytes(bytes(message))
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate fixture mailbox .eml dari data database.")
+    parser.add_argument("--directory", help="Default: INBOUND_LOCAL_MAILBOX_DIR")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--prefix", default="0001", help="Prefix nama file (urut leksikal = urutan cursor)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.models import base  # noqa: F401 — registrasi semua model
+
+    with SessionLocal() as db:
+        written = generate(db, args.directory or settings.INBOUND_LOCAL_MAILBOX_DIR, args.count, args.prefix, args.seed)
+    print(f"{written} pesan ditulis")
+
+
+if __name__ == "__main__":
+    main()
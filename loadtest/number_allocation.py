@@ -0,0 +1,134 @@
+"""
+Stress test alokasi nomor quotation paralel (banyak proses × thread).
+
+Tiap thread membuat `--per-thread` quotation (INSERT sungguhan, prefix `TST`
+supaya tidak bercampur data asli; dihapus di akhir). Unique constraint
+`quotations.number` + pengecekan set di akhir membuktikan tidak ada duplikat.
+
+Strategi:
+- `block` : `NumberAllocator` (blok `--block-size`, default 50);
+- `naive` : `SELECT max(number) + 1` di transaksi insert (pembanding; bentrok).
+
+Contoh:
+
+    python -m loadtest.number_allocation --processes 4 --threads 8 --per-thread 200
+    python -m loadtest.number_allocation --strategy naive --processes 4 --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import time
+from typing import Dict, List, Optional
+
+PREFIX = "TST"
+YEAR = 2099
+
+
+def _worker(database_url: str, strategy: str, block_size: int, threads: int, per_thread: int, client_id, sales_user_id) -> Dict:
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.exc import IntegrityError
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.quotation import Quotation
+    from app.services.document_numbers import NumberAllocator
+
+    engine = create_engine(database_url, pool_size=threads, max_overflow=threads)
+    session_factory = sessionmaker(bind=engine)
+    allocator = NumberAllocator(engine, block_size=block_size)
+
+    def naive_number(db) -> str:
+        current = db.scalar(select(func.max(Quotation.number)).where(Quotation.number.like(f"{PREFIX}/{YEAR}/%")))
+        value = int(current.rsplit("/", 1)[1]) + 1 if current else 1
+        return allocator.format(PREFIX, YEAR, value)
+
+    def run_thread(_) -> Dict:
+        numbers: List[str] = []
+        collisions = 0
+        allocate_seconds = 0.0
+        for _ in range(per_thread):
+            with session_factory() as db:
+                started = time.perf_counter()
+                number = allocator.allocate(PREFIX, YEAR) if strategy == "block" else naive_number(db)
+                allocate_seconds += time.perf_counter() - started
+                db.add(Quotation(client_id=client_id, sales_user_id=sales_user_id, number=number))
+                try:
+                    db.commit()
+                    numbers.append(number)
+                except IntegrityError:
+                    db.rollback()
+                    collisions += 1
+        return {"numbers": numbers, "collisions": collisions, "allocate_seconds": allocate_seconds}
+
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(run_thread, range(threads)))
+    engine.dispose()
+    return {
+        "numbers": [number for result in results for number in result["numbers"]],
+        "collisions": sum(result["collisions"] for result in results),
+        "allocate_seconds": sum(result["allocate_seconds"] for result in results),
+        "leases": allocator.leases,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stress test alokasi nomor quotation.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--strategy", choices=("block", "naive"), default="block")
+    parser.add_argument("--block-size", type=int, default=50)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--per-thread", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine, delete, select
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.document_counter import DocumentCounter
+    from app.models.quotation import Quotation
+
+    database_url = args.database_url or settings.DATABASE_URL
+    engine = create_engine(database_url)
+
+    def cleanup() -> None:
+        with engine.begin() as connection:
+            connection.execute(delete(Quotation.__table__).where(Quotation.number.like(f"{PREFIX}/%")))
+            connection.execute(delete(DocumentCounter.__table__).where(DocumentCounter.prefix == PREFIX))
+
+    cleanup()
+    with engine.connect() as connection:
+        client_id, sales_user_id = connection.execute(select(Quotation.client_id, Quotation.sales_user_id).limit(1)).one()
+
+    started = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+        results = pool.starmap(
+            _worker,
+            [
+                (database_url, args.strategy, args.block_size, args.threads, args.per_thread, client_id, sales_user_id)
+                for _ in range(args.processes)
+            ],
+        )
+    elapsed = time.perf_counter() - started
+
+    numbers = [number for result in results for number in result["numbers"]]
+    attempts = args.processes * args.threads * args.per_thread
+    allocate_seconds = sum(result["allocate_seconds"] for result in results)
+    print(f"strategi        : {args.strategy} (block {args.block_size})")
+    print(f"percobaan       : {attempts:,}")
+    print(f"tersimpan       : {len(numbers):,} ({len(set(numbers)):,} unik)")
+    print(f"bentrok (gagal) : {sum(result['collisions'] for result in results):,}")
+    print(f"lease counter   : {sum(result['leases'] for result in results):,}")
+    print(f"alokasi rata2   : {allocate_seconds / attempts * 1e6:,.1f} µs")
+    print(f"total           : {elapsed:.2f} detik ({attempts / elapsed:,.0f} quotation/detik)")
+    cleanup()
+    engine.dispose()
+    if len(numbers) != len(set(numbers)):
+        raise SystemExit("DUPLIKAT ditemukan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark job skor risiko: throughput & puncak memori per ukuran chunk.
+
+Tiap ukuran chunk menjalankan `score_clients` penuh dua kali, masing-masing
+di dalam transaksi yang di-rollback (tabel CLIENT_RISK_SCORES tidak
+berubah): sekali untuk waktu, sekali dengan `tracemalloc` untuk puncak
+memori (alokasi Python + NumPy). Tracing memperlambat job beberapa kali
+lipat, jadi waktu tidak diambil dari putaran kedua.
+
+Contoh:
+
+    python -m loadtest.risk_scoring --as-of 2026-01-01 --chunk-size 500 --chunk-size 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date
+import tracemalloc
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark job skor risiko per ukuran chunk.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--as-of", type=date.fromisoformat, help="Default: hari ini")
+    parser.add_argument("--chunk-size", type=int, action="append", help="Boleh diulang (default: 500, 2000, 5000)")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services.risk_scoring import score_clients
+
+    as_of = args.as_of or date.today()
+    engine = create_engine(args.database_url or settings.DATABASE_URL)
+
+    def run(chunk_size: int):
+        with engine.connect() as connection:
+            transaction = connection.begin()
+            try:
+                with Session(bind=connection, join_transaction_mode="create_savepoint") as db:
+                    return score_clients(db, as_of, chunk_size=chunk_size, commit=False)
+            finally:
+                transaction.rollback()
+
+    try:
+        for chunk_size in args.chunk_size or [500, 2000, 5000]:
+            result = run(chunk_size)
+            tracemalloc.start()
+            run(chunk_size)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"chunk {chunk_size:>6,}  {result.clients:>9,} client  {result.chunks:>4} chunk  "
+                f"{result.elapsed_seconds:>7.2f} s  {result.clients_per_second:>8,.0f} client/s  "
+                f"puncak {peak / 1024 / 1024:>6.1f} MB"
+            )
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+HTTP load-test harness untuk FastAPI app.
+
+Dua mode:
+
+1. `mix`      — closed-loop: N worker concurrent mengirim request sesuai bobot
+                 request mix selama durasi tertentu.
+2. `webhooks` — open-loop: replay jadwal webhook Xendit (sintetis / JSONL /
+                 dari tabel webhook_events) pada kecepatan N× real time,
+                 termasuk duplikat & out-of-order retry.
+
+Laporan: jumlah request, error rate, p50/p95/p99/max latency per endpoint,
+throughput, dan (mode webhooks) keterlambatan jadwal.
+
+Contoh:
+
+    XENDIT_CALLBACK_TOKEN=loadtest uvicorn app.main:app --workers 4 &
+    python -m loadtest.run --base-url http://127.0.0.1:8000 --callback-token loadtest --concurrency 64 \\
+        mix --mix health=1,webhook=4 --duration 60
+    python -m loadtest.run --callback-token loadtest --concurrency 128 --output /tmp/month-end.json \\
+        webhooks --source db --events 50000 --speed 120 \\
+        --duplicate-rate 0.05 --reorder-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from loadtest.xendit_simulator import (
+    ScheduledEvent,
+    recorded_payloads_from_db,
+    recorded_payloads_from_jsonl,
+    synthetic_payloads,
+    with_retries,
+)
+
+WEBHOOK_PATH = "/webhooks/xendit"
+
+# (nama, method, path, json body)
+RequestSpec = Tuple[str, str, str, Optional[Dict[str, Any]]]
+
+
+# ---------------------------------------------------------------------------
+# Statistik
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # nearest-rank
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class Recorder:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    schedule_lag: List[float] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def record(self, name: str, seconds: float, error: Optional[str]) -> None:
+        self.latencies[name].append(seconds)
+        if error:
+            self.errors[name][error] += 1
+
+    def report(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        endpoints = {}
+        total = 0
+        total_errors = 0
+        for name, values in sorted(self.latencies.items()):
+            errors = sum(self.errors[name].values())
+            total += len(values)
+            total_errors += errors
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": errors,
+                "error_rate": errors / len(values) if values else 0.0,
+                "error_breakdown": dict(self.errors[name]),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": max(values) * 1000 if values else 0.0,
+                "rps": len(values) / elapsed if elapsed else 0.0,
+            }
+        report = {
+            "elapsed_s": elapsed,
+            "requests": total,
+            "errors": total_errors,
+            "error_rate": total_errors / total if total else 0.0,
+            "rps": total / elapsed if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+        if self.schedule_lag:
+            report["schedule_lag_p95_ms"] = percentile(self.schedule_lag, 95) * 1000
+        report.update(extra or {})
+        return report
+
+
+async def _send(client: httpx.AsyncClient, recorder: Recorder, spec: RequestSpec, headers: Dict[str, str]) -> None:
+    name, method, path, body = spec
+    started = time.perf_counter()
+    error = None
+    try:
+        response = await client.request(method, path, json=body, headers=headers)
+        if response.status_code >= 400:
+            error = f"HTTP {response.status_code}"
+    except httpx.HTTPError as exc:
+        error = type(exc).__name__
+    recorder.record(name, time.perf_counter() - started, error)
+
+
+# ---------------------------------------------------------------------------
+# Mode 1: request mix (closed loop)
+# ---------------------------------------------------------------------------
+
+
+def _health(rng: random.Random, pool: List[ScheduledEvent]) -> RequestSpec:
+    return ("GET /health", "GET", "/health", None)
+
+
+def _webhook(rng: random.Random, pool: List[ScheduledEvent]) -> RequestSpec:
+    return (f"POST {WEBHOOK_PATH}", "POST", WEBHOOK_PATH, rng.choice(pool).payload)
+
+
+# Registry request mix: tambahkan skenario baru di sini
+SCENARIOS: Dict[str, Callable[[random.Random, List[ScheduledEvent]], RequestSpec]] = {
+    "health": _health,
+    "webhook": _webhook,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"skenario tidak dikenal: {name} (pilihan: {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def run_mix(
+    base_url: str,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    headers: Dict[str, str],
+    seed: int = 42,
+) -> Dict[str, Any]:
+    recorder = Recorder()
+    pool = synthetic_payloads(1_000, 3600, seed=seed)
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed * 1_000 + worker_id)
+            while time.perf_counter() < deadline:
+                scenario = SCENARIOS[rng.choices(names, weights)[0]]
+                await _send(client, recorder, scenario(rng, pool), headers)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    return recorder.report({"mode": "mix", "mix": mix, "concurrency": concurrency})
+
+
+# ---------------------------------------------------------------------------
+# Mode 2: replay webhook (open loop, N× real time)
+# ---------------------------------------------------------------------------
+
+
+async def replay_webhooks(
+    base_url: str,
+    events: List[ScheduledEvent],
+    speed: float,
+    concurrency: int,
+    headers: Dict[str, str],
+) -> Dict[str, Any]:
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    duplicates = sum(event.duplicate for event in events)
+    reordered = sum(event.reordered for event in events)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        loop_started = time.perf_counter()
+        tasks = []
+
+        async def fire(event: ScheduledEvent, due: float) -> None:
+            async with semaphore:
+                # Lag = seberapa telat request berangkat dibanding jadwal
+                recorder.schedule_lag.append(max(0.0, time.perf_counter() - due))
+                name = f"POST {WEBHOOK_PATH}" + (" (retry)" if event.duplicate else "")
+                await _send(client, recorder, (name, "POST", WEBHOOK_PATH, event.payload), headers)
+
+        for event in events:
+            due = loop_started + event.offset_seconds / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(event, due)))
+        await asyncio.gather(*tasks)
+
+    span = events[-1].offset_seconds if events else 0.0
+    return recorder.report(
+        {
+            "mode": "webhooks",
+            "speed": speed,
+            "concurrency": concurrency,
+            "events": len(events),
+            "duplicates": duplicates,
+            "reordered": reordered,
+            "simulated_span_s": span,
+        }
+    )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['requests']:,} request dalam {report['elapsed_s']:.1f}s "
+        f"({report['rps']:,.0f} req/s), error rate {report['error_rate']:.2%}"
+    )
+    for name, row in report["endpoints"].items():
+        print(
+            f"  {name:<32} n={row['requests']:<8} err={row['error_rate']:6.2%}  "
+            f"p50={row['p50_ms']:8.1f}ms p95={row['p95_ms']:8.1f}ms "
+            f"p99={row['p99_ms']:8.1f}ms max={row['max_ms']:8.1f}ms"
+        )
+    if "schedule_lag_p95_ms" in report:
+        print(f"  schedule lag p95: {report['schedule_lag_p95_ms']:.1f}ms")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test CloudSales API.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--callback-token", help="Header x-callback-token untuk endpoint webhook")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Simpan laporan JSON ke file ini")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    mix_parser = sub.add_parser("mix", help="Closed-loop request mix")
+    mix_parser.add_argument("--mix", type=parse_mix, default=parse_mix("health=1,webhook=4"))
+    mix_parser.add_argument("--duration", type=float, default=30.0)
+
+    hook_parser = sub.add_parser("webhooks", help="Replay webhook Xendit N× real time")
+    hook_parser.add_argument("--source", choices=("synthetic", "jsonl", "db"), default="synthetic")
+    hook_parser.add_argument("--path", help="File JSONL (untuk --source jsonl)")
+    hook_parser.add_argument("--database-url", help="Default: settings.DATABASE_URL (untuk --source db)")
+    hook_parser.add_argument("--events", type=int, default=10_000)
+    hook_parser.add_argument("--window", type=float, default=3600.0, help="Rentang waktu event sintetis (detik)")
+    hook_parser.add_argument("--speed", type=float, default=60.0, help="Faktor percepatan (N× real time)")
+    hook_parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    hook_parser.add_argument("--reorder-rate", type=float, default=0.02)
+    hook_parser.add_argument("--reorder-window", type=float, default=120.0)
+
+    args = parser.parse_args(argv)
+    headers = {"x-callback-token": args.callback_token} if args.callback_token else {}
+
+    if args.mode == "mix":
+        report = asyncio.run(run_mix(args.base_url, args.mix, args.concurrency, args.duration, headers, args.seed))
+    else:
+        if args.source == "jsonl":
+            if not args.path:
+                parser.error("--path wajib untuk --source jsonl")
+            events = recorded_payloads_from_jsonl(args.path, limit=args.events)
+        elif args.source == "db":
+            from app.core.config import settings
+
+            events = recorded_payloads_from_db(args.database_url or settings.DATABASE_URL, args.events)
+        else:
+            events = synthetic_payloads(args.events, args.window, seed=args.seed)
+        events = with_retries(
+            events,
+            duplicate_rate=args.duplicate_rate,
+            reorder_rate=args.reorder_rate,
+            reorder_window_seconds=args.reorder_window,
+            seed=args.seed,
+        )
+        report = asyncio.run(replay_webhooks(args.base_url, events, args.speed, args.concurrency, headers))
+
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if report["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Stand-in SMTP lokal untuk worker outbox email (development, test & load test).
+
+Server SMTP minimal (asyncio, stdlib saja) yang menerima semua email dan
+menulisnya ke file JSON lines, dengan injeksi gangguan ala provider asli:
+
+- `--transient-rate`: balas `451` (gagal sementara, worker harus retry),
+- `--permanent-rate`: balas `550` (ditolak, email jadi FAILED),
+- `--latency-ms`    : jeda sebelum balasan DATA (latency provider).
+
+Contoh:
+
+    python -m loadtest.smtp_sink --port 1025 --output /tmp/outbox.jsonl \\
+        --transient-rate 0.05 --latency-ms 80
+    EMAIL_PROVIDER=smtp SMTP_PORT=1025 python -m scripts.email_outbox --once
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from email import message_from_bytes, policy
+from typing import Dict, List, Optional, TextIO
+
+
+class SmtpSink:
+    def __init__(
+        self,
+        output: Optional[TextIO] = None,
+        transient_rate: float = 0.0,
+        permanent_rate: float = 0.0,
+        latency_ms: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.output = output
+        self.transient_rate = transient_rate
+        self.permanent_rate = permanent_rate
+        self.latency_seconds = latency_ms / 1000
+        self.rng = random.Random(seed)
+        self.counts: Dict[str, int] = {"accepted": 0, "transient": 0, "permanent": 0, "connections": 0}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.counts["connections"] += 1
+        sender: Optional[str] = None
+        recipients: List[str] = []
+
+        async def reply(line: str) -> None:
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+
+        await reply("220 smtp-sink ready")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    return
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                verb = line[:4].upper()
+                if verb == "EHLO":
+                    writer.write(b"250-smtp-sink\r\n250-8BITMIME\r\n250-SMTPUTF8\r\n")
+                    await reply("250 SIZE 52428800")
+                elif verb == "HELO":
+                    await reply("250 smtp-sink")
+                elif verb == "MAIL":
+                    sender, recipients = _address(line), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(_address(line))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await _read_data(reader)
+                    if self.latency_seconds:
+                        await asyncio.sleep(self.latency_seconds)
+                    await reply(self._deliver(sender, recipients, data))
+                    sender, recipients = None, []
+                elif verb == "RSET":
+                    sender, recipients = None, []
+                    await reply("250 OK")
+                elif verb == "NOOP":
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    return
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            return
+        finally:
+            writer.close()
+
+    def _deliver(self, sender: Optional[str], recipients: List[str], data: bytes) -> str:
+        roll = self.rng.random()
+        if roll < self.transient_rate:
+            self.counts["transient"] += 1
+            return "451 Temporary failure, try again later"
+        if roll < self.transient_rate + self.permanent_rate:
+            self.counts["permanent"] += 1
+            return "550 Mailbox unavailable"
+        self.counts["accepted"] += 1
+        if self.output is not None:
+            message = message_from_bytes(data, policy=policy.default)
+            record = {
+                "received_at": time.time(),
+                "from": sender,
+                "to": recipients,
+                "message_id": message["Message-ID"],
+                "subject": message["Subject"],
+                "size": len(data),
+            }
+            self.output.write(json.dumps(record) + "\n")
+            self.output.flush()
+        return "250 OK queued"
+
+
+def _address(line: str) -> str:
+    value = line.split(":", 1)[1].strip() if ":" in line else ""
+    return value.split(">", 1)[0].lstrip("<")
+
+
+async def _read_data(reader: asyncio.StreamReader) -> bytes:
+    lines = []
+    while True:
+        line = await reader.readline()
+        if not line or line in (b".\r\n", b".\n"):
+            break
+        lines.append(line[1:] if line.startswith(b"..") else line)
+    return b"".join(lines)
+
+
+async def serve(sink: SmtpSink, host: str, port: int) -> None:
+    server = await asyncio.start_server(sink.handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="SMTP sink lokal dengan injeksi kegagalan.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--output", help="File JSON lines untuk email yang diterima")
+    parser.add_argument("--transient-rate", type=float, default=0.0)
+    parser.add_argument("--permanent-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else None
+    sink = SmtpSink(output, args.transient_rate, args.permanent_rate, args.latency_ms, args.seed)
+    try:
+        asyncio.run(serve(sink, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(sink.counts))
+        if output is not None:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
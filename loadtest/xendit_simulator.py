@@ -0,0 +1,163 @@
+"""
+Simulator webhook Xendit.
+
+Membangun jadwal event (offset detik relatif dari event pertama + payload
+`raw_payload_json`) dari salah satu sumber:
+
+- sintetis  : event PAYMENT_SUCCEEDED / PAYMENT_FAILED / SUBSCRIPTION_CHARGED,
+- file JSONL: satu payload per baris, atau `{"created_at": ..., "payload": {...}}`,
+- database  : tabel `webhook_events` (mis. hasil `scripts.synthetic_data`),
+  urut `created_at` sehingga jeda antar event mengikuti data asli.
+
+Lalu menambahkan perilaku retry Xendit: duplikat (payload sama dikirim ulang
+dengan backoff) dan out-of-order (event digeser maju/mundur dalam window).
+Jadwal di-replay pada kecepatan N× real time oleh `loadtest.run`.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+EVENT_WEIGHTS = (
+    ("PAYMENT_SUCCEEDED", 0.58),
+    ("SUBSCRIPTION_CHARGED", 0.30),
+    ("PAYMENT_FAILED", 0.12),
+)
+
+# Jadwal retry Xendit (detik setelah percobaan sebelumnya)
+RETRY_BACKOFF_SECONDS = (30, 60, 300, 900)
+
+
+@dataclass
+class ScheduledEvent:
+    offset_seconds: float
+    payload: Dict[str, Any]
+    duplicate: bool = False
+    reordered: bool = False
+
+
+def synthetic_payloads(count: int, window_seconds: float, seed: int = 42) -> List[ScheduledEvent]:
+    """Event sintetis dengan waktu kedatangan acak (Poisson-like) dalam window."""
+    rng = random.Random(seed)
+    started = datetime(2025, 11, 30, 23, 0, tzinfo=timezone.utc)
+    offsets = sorted(rng.uniform(0, window_seconds) for _ in range(count))
+    events = []
+    for i, offset in enumerate(offsets):
+        event_type = rng.choices([e for e, _ in EVENT_WEIGHTS], [w for _, w in EVENT_WEIGHTS])[0]
+        invoice_id = f"inv-sim-{rng.getrandbits(64):016x}"
+        data = {
+            "id": invoice_id,
+            "external_id": f"cycle-sim-{i}",
+            "amount": rng.choice((185_000, 1_110_000, 3_330_000, 12_500_000)),
+            "currency": "IDR" if rng.random() < 0.86 else "USD",
+            "status": "FAILED" if event_type == "PAYMENT_FAILED" else "PAID",
+            "payment_method": rng.choice(("EWALLET", "CREDIT_CARD", "VIRTUAL_ACCOUNT")),
+        }
+        if event_type == "PAYMENT_FAILED":
+            data["failure_code"] = rng.choice(("INSUFFICIENT_BALANCE", "CARD_DECLINED", "EXPIRED_CARD"))
+        if event_type == "SUBSCRIPTION_CHARGED":
+            data["recurring_plan_id"] = f"xsub-sim-{rng.randrange(count // 4 + 1)}"
+        events.append(
+            ScheduledEvent(
+                offset_seconds=offset,
+                payload={
+                    "id": f"evt_sim_{i:08d}",
+                    "event": event_type.lower().replace("_", "."),
+                    "created": (started + timedelta(seconds=offset)).isoformat(),
+                    "data": data,
+                },
+            )
+        )
+    return events
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _to_schedule(records: Iterable[tuple]) -> List[ScheduledEvent]:
+    """records: (created_at | None, payload). Tanpa timestamp → jeda 1 detik."""
+    events = []
+    first = None
+    for index, (created_at, payload) in enumerate(records):
+        if created_at is not None and first is None:
+            first = created_at
+        offset = (created_at - first).total_seconds() if created_at is not None and first else float(index)
+        events.append(ScheduledEvent(offset_seconds=max(offset, 0.0), payload=payload))
+    events.sort(key=lambda e: e.offset_seconds)
+    return events
+
+
+def recorded_payloads_from_jsonl(path: str, limit: Optional[int] = None) -> List[ScheduledEvent]:
+    def records():
+        with open(path, encoding="utf-8") as fh:
+            for index, line in enumerate(fh):
+                if limit is not None and index >= limit:
+                    break
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if "payload" in item:
+                    yield _parse_time(item.get("created_at")), item["payload"]
+                else:
+                    yield _parse_time(item.get("created")), item
+
+    return _to_schedule(records())
+
+
+def recorded_payloads_from_db(database_url: str, limit: int, since: Optional[datetime] = None) -> List[ScheduledEvent]:
+    from sqlalchemy import create_engine, select
+
+    from app.models.webhook_event import WebhookEvent
+
+    engine = create_engine(database_url, future=True)
+    stmt = select(WebhookEvent.created_at, WebhookEvent.raw_payload_json).order_by(WebhookEvent.created_at).limit(limit)
+    if since is not None:
+        stmt = stmt.where(WebhookEvent.created_at >= since)
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(stmt).all()
+    finally:
+        engine.dispose()
+    return _to_schedule((row.created_at, row.raw_payload_json) for row in rows)
+
+
+def with_retries(
+    events: List[ScheduledEvent],
+    duplicate_rate: float = 0.05,
+    reorder_rate: float = 0.02,
+    reorder_window_seconds: float = 120.0,
+    seed: int = 42,
+) -> List[ScheduledEvent]:
+    """
+    Tambahkan duplikat & out-of-order seperti perilaku retry Xendit.
+
+    - duplikat: payload identik dikirim ulang 1..N kali mengikuti RETRY_BACKOFF_SECONDS,
+    - out-of-order: offset event digeser acak ±reorder_window_seconds.
+    """
+    rng = random.Random(seed)
+    result: List[ScheduledEvent] = []
+    for event in events:
+        offset = event.offset_seconds
+        reordered = False
+        if rng.random() < reorder_rate:
+            offset = max(0.0, offset + rng.uniform(-reorder_window_seconds, reorder_window_seconds))
+            reordered = True
+        result.append(ScheduledEvent(offset, event.payload, event.duplicate, reordered))
+        if rng.random() < duplicate_rate:
+            retry_at = offset
+            for backoff in RETRY_BACKOFF_SECONDS[: rng.randint(1, len(RETRY_BACKOFF_SECONDS))]:
+                retry_at += backoff
+                result.append(ScheduledEvent(retry_at, copy.deepcopy(event.payload), duplicate=True))
+    result.sort(key=lambda e: e.offset_seconds)
+    return result
@@ -0,0 +1,82 @@
+"""
+Laporan aging piutang (`app.services.ar_aging`).
+
+Contoh pemakaian:
+
+    python -m scripts.ar_aging totals                               # total bucket per mata uang
+    python -m scripts.ar_aging export --output aging.xlsx
+    python -m scripts.ar_aging export --level detail --format csv --output - > aging.csv
+    python -m scripts.ar_aging export --client-status ACTIVE --client-status SUSPENDED --as-of 2026-06-30 --output aging.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date
+import sys
+import time
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Laporan aging piutang.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--as-of", type=date.fromisoformat, help="Default: hari ini")
+    parser.add_argument(
+        "--client-status", action="append", default=[], help="Filter status client (boleh diulang)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("totals", help="Total bucket per mata uang")
+
+    export = commands.add_parser("export", help="Tulis laporan ke file CSV / XLSX secara streaming")
+    export.add_argument("--output", required=True, help="Path file, atau - untuk stdout")
+    export.add_argument("--format", choices=("csv", "xlsx"), help="Default: dari ekstensi --output, lalu csv")
+    export.add_argument("--level", choices=("summary", "detail"), default="summary")
+    export.add_argument("--chunk-rows", type=int, default=2000)
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.client import ClientStatus
+    from app.services import ar_aging
+
+    as_of = args.as_of or date.today()
+    client_statuses = [ClientStatus(value.upper()) for value in args.client_status]
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "totals":
+                for total in ar_aging.aging_totals(db, as_of, client_statuses):
+                    buckets = "  ".join(f"{label} {amount:,.2f}" for label, amount in total.buckets.items())
+                    print(f"{total.currency}  {total.cycles:,} cycle  {buckets}  total {total.total:,.2f}")
+                return
+            export_format = ar_aging.ExportFormat(
+                args.format or ("xlsx" if args.output.lower().endswith(".xlsx") else "csv")
+            )
+            started = time.perf_counter()
+            written = 0
+            stream = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+            try:
+                for chunk in ar_aging.export_chunks(
+                    db, ar_aging.AgingLevel(args.level), export_format, as_of, client_statuses, args.chunk_rows
+                ):
+                    stream.write(chunk)
+                    written += len(chunk)
+            finally:
+                if stream is not sys.stdout.buffer:
+                    stream.close()
+            print(
+                f"{written:,} byte {export_format.value} ({time.perf_counter() - started:.2f} detik)",
+                file=sys.stderr,
+            )
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Maintenance EMAIL_BODIES: training dictionary zlib, kompres ulang, laporan ukuran.
+
+Contoh pemakaian:
+
+    python -m scripts.email_bodies train --sample-size 5000
+    python -m scripts.email_bodies recompress
+    python -m scripts.email_bodies report --list-limit 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintenance storage body email content-addressed.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="Latih dictionary baru dari sampel body")
+    train.add_argument("--sample-size", type=int, default=5000)
+    train.add_argument("--recompress", action="store_true", help="Langsung kompres ulang semua body")
+
+    recompress = commands.add_parser("recompress", help="Kompres ulang body dengan dictionary aktif")
+    recompress.add_argument("--batch-size", type=int, default=2000)
+
+    report = commands.add_parser("report", help="Ukuran tabel, rasio dedup/kompresi, latency list query")
+    report.add_argument("--list-limit", type=int, default=500)
+    report.add_argument("--rounds", type=int, default=15)
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services import email_bodies
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "train":
+                dictionary = email_bodies.train_dictionary(db, args.sample_size)
+                if dictionary is None:
+                    print("Tidak ada body untuk training")
+                    return
+                db.commit()
+                print(f"dictionary {dictionary.id}: {len(dictionary.content):,} bytes dari {dictionary.sample_size:,} sampel")
+                if args.recompress:
+                    _print_recompress(email_bodies.recompress(db, dictionary))
+            elif args.command == "recompress":
+                _print_recompress(email_bodies.recompress(db, batch_size=args.batch_size))
+            else:
+                print(json.dumps(email_bodies.measure(db, args.list_limit, args.rounds), indent=2))
+    finally:
+        engine.dispose()
+
+
+def _print_recompress(result) -> None:
+    print(
+        f"{result.bodies:,} body diperiksa, {result.updated:,} dikompres ulang: "
+        f"{result.bytes_before:,} → {result.bytes_after:,} bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Drafting email via LLM dari CLI (`app.services.email_drafts`).
+
+Memakai `default_drafting_service()`, jadi provider, model, batching & TTL
+cache mengikuti `settings` (`LLM_*`).
+
+Contoh pemakaian:
+
+    python -m scripts.email_drafts templates
+    python -m scripts.email_drafts draft payment_reminder \\
+        --context period=2026-01 --context "due_state=jatuh tempo 3 hari lagi" \\
+        --personalize "client_name=PT Contoh" --personalize invoice_number=INV-001
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+
+def _pairs(values: Optional[List[str]], parser: argparse.ArgumentParser) -> Dict[str, str]:
+    pairs = {}
+    for value in values or []:
+        name, sep, text = value.partition("=")
+        if not sep:
+            parser.error(f"Format harus nama=nilai: {value}")
+        pairs[name] = text
+    return pairs
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Drafting email via LLM.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("templates", help="Daftar template & field konteks")
+
+    draft = commands.add_parser("draft", help="Buat satu draft (lewat cache)")
+    draft.add_argument("template")
+    draft.add_argument("--context", action="append", help="nama=nilai, masuk prompt (boleh diulang)")
+    draft.add_argument("--personalize", action="append", help="nama=nilai untuk placeholder (boleh diulang)")
+    draft.add_argument("--model", help="Default: settings.LLM_MODEL")
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from app.services.email_drafts import TEMPLATES, DraftRequest, default_drafting_service
+
+    if args.command == "templates":
+        for template in TEMPLATES.values():
+            print(f"{template.name:<18} placeholder: {', '.join(template.placeholders)}")
+        return
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+
+    request = DraftRequest(
+        args.template,
+        context=_pairs(args.context, parser),
+        personalization=_pairs(args.personalize, parser),
+        model=args.model,
+    )
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            result = asyncio.run(default_drafting_service().draft(db, request))
+            db.commit()
+    finally:
+        engine.dispose()
+    print(f"# {result.model} / {result.template} ({'cache' if result.cached else 'baru'})\n")
+    print(result.body)
+
+
+if __name__ == "__main__":
+    main()
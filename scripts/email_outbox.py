@@ -0,0 +1,68 @@
+"""
+Worker outbox email: kirim EMAIL_LOGS DRAFT lewat provider (`EMAIL_PROVIDER`).
+
+Contoh pemakaian:
+
+    python -m scripts.email_outbox                  # loop, polling tiap 5 detik
+    python -m scripts.email_outbox --once           # satu batch lalu keluar
+    python -m scripts.email_outbox --batch-size 500 --concurrency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Iterable, Optional
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.integrations.email_provider import build_provider
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services.artifacts import default_artifact_store
+    from app.services.email_outbox import SenderRateLimiter, process_outbox
+
+    provider = build_provider(settings)
+    # Bucket per pengirim dipertahankan antar batch
+    limiter = SenderRateLimiter(settings.EMAIL_SEND_RATE_PER_SECOND, settings.EMAIL_SEND_BURST)
+    try:
+        while True:
+            with SessionLocal() as db:
+                result = await process_outbox(
+                    db,
+                    provider,
+                    limiter,
+                    batch_size=args.batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE,
+                    concurrency=args.concurrency or settings.EMAIL_SEND_CONCURRENCY,
+                    max_attempts=settings.EMAIL_SEND_MAX_ATTEMPTS,
+                    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+                )
+            if result.sent or result.failed:
+                print(f"sent={result.sent} failed={result.failed} retries={result.retries}", flush=True)
+            if args.once:
+                return
+            # Batch penuh → langsung lanjut; kosong/sebagian → tunggu draft baru
+            if result.sent + result.failed < (args.batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE):
+                await asyncio.sleep(args.poll_interval)
+    finally:
+        await provider.aclose()
+        # Client download lampiran dibuat di loop ini, tutup sebelum loop selesai
+        await default_artifact_store().aclose()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Worker pengiriman email DRAFT.")
+    parser.add_argument("--once", action="store_true", help="Proses satu batch lalu keluar")
+    parser.add_argument("--batch-size", type=int, help="Default: EMAIL_OUTBOX_BATCH_SIZE")
+    parser.add_argument("--concurrency", type=int, help="Default: EMAIL_SEND_CONCURRENCY")
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
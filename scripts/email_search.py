@@ -0,0 +1,65 @@
+"""
+Maintenance & uji pencarian full-text EMAIL_LOGS.
+
+Contoh pemakaian:
+
+    python -m scripts.email_search reindex                 # isi vektor body yang masih NULL
+    python -m scripts.email_search reindex --rebuild       # hitung ulang semua
+    python -m scripts.email_search query "invoice vm" --related-type INVOICE_REQUEST
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pencarian full-text email.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reindex = commands.add_parser("reindex", help="Backfill vektor body & search_vector email")
+    reindex.add_argument("--batch-size", type=int, default=1000)
+    reindex.add_argument("--rebuild", action="store_true", help="Hitung ulang semua body, bukan hanya yang NULL")
+
+    query = commands.add_parser("query", help="Jalankan pencarian dari CLI")
+    query.add_argument("text")
+    query.add_argument("--related-type")
+    query.add_argument("--direction")
+    query.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.email_log import EmailDirection, EmailRelatedType
+    from app.services import email_search
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "reindex":
+                updated = email_search.reindex(db, batch_size=args.batch_size, rebuild=args.rebuild)
+                print(f"{updated:,} email di-index")
+                return
+            page = email_search.search_emails(
+                db,
+                args.text,
+                related_type=EmailRelatedType(args.related_type) if args.related_type else None,
+                direction=EmailDirection(args.direction) if args.direction else None,
+                limit=args.limit,
+            )
+            for hit in page.hits:
+                print(f"{hit.rank:.3f}  {hit.created_at:%Y-%m-%d}  {hit.related_type.value:<15} {hit.subject}")
+                if hit.snippet:
+                    print(f"       {hit.snippet}")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
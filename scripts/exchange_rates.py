@@ -0,0 +1,64 @@
+"""
+Kurs mata uang: import feed CSV & cek lookup.
+
+Contoh pemakaian:
+
+    python -m scripts.exchange_rates import kurs.csv --source bi-jisdor
+    python -m scripts.exchange_rates rate USD IDR --at 2025-11-28
+    python -m scripts.exchange_rates pairs
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Kurs mata uang.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_ = commands.add_parser("import", help="Upsert kurs dari file CSV")
+    import_.add_argument("path")
+    import_.add_argument("--source", default="csv")
+    import_.add_argument("--batch-size", type=int, default=5000)
+
+    rate = commands.add_parser("rate", help="Kurs pasangan pada waktu tertentu")
+    rate.add_argument("base")
+    rate.add_argument("quote")
+    rate.add_argument("--at", help="ISO 8601; default sekarang")
+
+    commands.add_parser("pairs", help="Daftar pasangan & jumlah titik")
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services import exchange_rates
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "import":
+                with open(args.path, newline="", encoding="utf-8") as file:
+                    result = exchange_rates.import_csv(db, file, args.source, args.batch_size)
+                print(f"{result.rows:,} kurs di-upsert ({result.batches} batch)")
+                return
+            cache = exchange_rates.ExchangeRateCache.snapshot(db, pivot=settings.REPORTING_CURRENCY)
+            if args.command == "pairs":
+                for (base_currency, quote_currency), points in sorted(cache.pairs().items()):
+                    print(f"{base_currency}/{quote_currency}: {points:,} titik")
+                return
+            at = datetime.fromisoformat(args.at) if args.at else datetime.now(timezone.utc)
+            print(cache.rate(args.base.upper(), args.quote.upper(), at))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
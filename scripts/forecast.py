@@ -0,0 +1,78 @@
+"""
+Proyeksi revenue 12 bulan (`app.services.revenue_forecast`).
+
+Contoh pemakaian:
+
+    python -m scripts.forecast show                         # total per mata uang per bulan
+    python -m scripts.forecast show --start 2026-01-01 --months 18
+    python -m scripts.forecast export --output forecast.csv # per client × produk × bulan
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Proyeksi revenue per client × produk.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--start", type=date.fromisoformat, help="Bulan awal (default: bulan berjalan)")
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--lookback-months", type=int, default=12, help="Jendela histori tingkat koleksi")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("show", help="Billed & expected per mata uang per bulan")
+    export = commands.add_parser("export", help="CSV per client × produk × bulan")
+    export.add_argument("--output", required=True)
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.client import Client
+    from app.models.product import Product
+    from app.services.revenue_forecast import forecast_revenue
+    from app.services.spreadsheet import csv_chunks
+
+    start = (args.start or date.today()).replace(day=1)
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            forecast = forecast_revenue(db, start, horizon=args.months, lookback_months=args.lookback_months)
+            if args.command == "export":
+                products = {str(row.id): row.name for row in db.execute(select(Product.id, Product.name))}
+                clients = {str(row.id): row.name for row in db.execute(select(Client.id, Client.name))}
+                header = (
+                    "client_id", "client", "product_id", "product", "currency", "month",
+                    "billed", "collection_rate", "expected",
+                )
+                rows = (
+                    (client_id, clients.get(client_id), product_id, products.get(product_id), *rest)
+                    for client_id, product_id, *rest in forecast.rows()
+                )
+                with open(args.output, "wb") as handle:
+                    for chunk in csv_chunks(header, rows):
+                        handle.write(chunk)
+    finally:
+        engine.dispose()
+
+    print(
+        f"{len(forecast.billed):,} client × produk, mulai {forecast.start_month:%Y-%m} "
+        f"({forecast.elapsed_seconds:.2f} detik)"
+    )
+    if args.command == "show":
+        months = forecast.months
+        for currency, (billed, expected) in forecast.totals_by_currency().items():
+            print(f"\n{currency}")
+            for month, billed_amount, expected_amount in zip(months, billed, expected):
+                print(f"  {month:%Y-%m}  billed {billed_amount:>22,.2f}  expected {expected_amount:>22,.2f}")
+            print(f"  total    billed {billed.sum():>22,.2f}  expected {expected.sum():>22,.2f}")
+
+
+if __name__ == "__main__":
+    main()
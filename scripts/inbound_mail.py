@@ -0,0 +1,78 @@
+"""
+Worker ingestion email inbound: tarik pesan baru sejak cursor (`INBOUND_MAILBOX`)
+dan simpan sebagai EMAIL_LOGS INBOUND.
+
+Contoh pemakaian:
+
+    python -m scripts.inbound_mail                  # loop, polling tiap 30 detik
+    python -m scripts.inbound_mail --once           # satu putaran lalu keluar
+    python -m scripts.inbound_mail --once --reset-cursor
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+
+async def run(args: argparse.Namespace) -> None:
+    from sqlalchemy import delete
+
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.integrations.mailbox import build_mailbox_source
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.mailbox_cursor import MailboxCursor
+    from app.services.inbound_email import ingest_mailbox
+
+    source = build_mailbox_source(settings)
+    if args.reset_cursor:
+        with SessionLocal() as db:
+            db.execute(delete(MailboxCursor).where(MailboxCursor.mailbox == source.name))
+            db.commit()
+
+    # Parsing MIME & hashing lampiran CPU-bound → proses terpisah
+    executor = ProcessPoolExecutor(max_workers=args.workers or settings.INBOUND_PARSE_WORKERS)
+    try:
+        while True:
+            with SessionLocal() as db:
+                result = await ingest_mailbox(
+                    db,
+                    source,
+                    executor,
+                    attachment_dir=settings.INBOUND_ATTACHMENT_DIR,
+                    batch_size=args.batch_size or settings.INBOUND_BATCH_SIZE,
+                    fetch_concurrency=settings.INBOUND_FETCH_CONCURRENCY,
+                )
+            if result.listed:
+                print(
+                    f"listed={result.listed} stored={result.stored} matched={result.matched} "
+                    f"duplicates={result.duplicates} parse_errors={result.parse_errors} cursor={result.cursor}",
+                    flush=True,
+                )
+            if args.once:
+                return
+            await asyncio.sleep(args.poll_interval)
+    finally:
+        executor.shutdown()
+        await source.aclose()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Worker ingestion email inbound.")
+    parser.add_argument("--once", action="store_true", help="Satu putaran lalu keluar")
+    parser.add_argument("--reset-cursor", action="store_true", help="Hapus cursor mailbox sebelum mulai")
+    parser.add_argument("--batch-size", type=int, help="Default: INBOUND_BATCH_SIZE")
+    parser.add_argument("--workers", type=int, help="Default: INBOUND_PARSE_WORKERS")
+    parser.add_argument("--poll-interval", type=float, default=30.0)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Job invoice: render draft invoice PDF untuk billing cycle hasil billing run.
+
+PDF di-render di process pool dan disimpan di store artifact lokal
+(`ARTIFACT_CACHE_DIR`); `billing_cycles.invoice_file_url` diisi
+`artifact://invoices/<id>.pdf` hanya bila Finance belum meng-upload file.
+
+Contoh pemakaian:
+
+    python -m scripts.invoices pending
+    python -m scripts.invoices render
+    python -m scripts.invoices render --workers 4 --batch-size 500 --limit 2
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Job invoice.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("pending", help="Jumlah billing cycle yang belum punya file invoice")
+
+    render = commands.add_parser("render", help="Render draft invoice PDF ke store artifact")
+    render.add_argument("--workers", type=int, help="Default: INVOICE_RENDER_WORKERS")
+    render.add_argument("--batch-size", type=int, help="Default: INVOICE_RENDER_BATCH_SIZE")
+    render.add_argument("--limit", type=int, help="Maksimum jumlah batch")
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.billing import BillingCycle
+    from app.services.artifacts import ArtifactStore
+    from app.services.invoice_rendering import RENDERABLE_STATUSES, render_invoices
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "pending":
+                count = db.scalar(
+                    select(func.count())
+                    .select_from(BillingCycle)
+                    .where(BillingCycle.invoice_file_url.is_(None), BillingCycle.status.in_(RENDERABLE_STATUSES))
+                )
+                print(f"{count:,} billing cycle belum punya file invoice")
+                return
+
+            store = ArtifactStore(settings.ARTIFACT_CACHE_DIR, settings.ARTIFACT_CACHE_MAX_BYTES, sessionmaker(bind=engine))
+            # Render PDF CPU-bound → proses terpisah
+            with ProcessPoolExecutor(max_workers=args.workers or settings.INVOICE_RENDER_WORKERS) as executor:
+                result = render_invoices(
+                    db,
+                    store,
+                    executor,
+                    batch_size=args.batch_size or settings.INVOICE_RENDER_BATCH_SIZE,
+                    max_batches=args.limit,
+                )
+            print(
+                f"{result.invoices:,} invoice, {result.pages:,} halaman, "
+                f"{result.bytes_written / 1024 / 1024:.1f} MB ({result.batches} batch, "
+                f"{result.elapsed_seconds:.2f} detik, {result.pages_per_second:,.0f} halaman/detik)"
+            )
+            for pid, rss_kb in sorted(result.worker_peak_rss_kb.items()):
+                print(f"  worker {pid}: puncak RSS {rss_kb / 1024:.1f} MB")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Pricing quotation: cek konsistensi & hitung ulang massal.
+
+Contoh pemakaian:
+
+    python -m scripts.pricing check
+    python -m scripts.pricing reprice --currency USD --client-currency IDR --rate 16250.5
+    python -m scripts.pricing reprice --status DRAFT --status SENT     # kurs tersimpan
+    python -m scripts.pricing reprice --market                         # kurs EXCHANGE_RATES terbaru
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pricing quotation.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("check", help="Jumlah quotation yang tidak konsisten dengan aturan pricing")
+
+    reprice = commands.add_parser("reprice", help="Hitung ulang item & total quotation")
+    reprice.add_argument("--rate", help="Kurs baru (butuh --currency & --client-currency)")
+    reprice.add_argument("--market", action="store_true", help="Kurs terbaru dari EXCHANGE_RATES per pasangan")
+    reprice.add_argument("--currency")
+    reprice.add_argument("--client-currency")
+    reprice.add_argument("--status", action="append", help="Default: DRAFT (boleh berulang)")
+    reprice.add_argument("--batch-size", type=int, default=2000)
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.quotation import QuotationStatus
+    from app.services import pricing
+    from app.services.exchange_rates import ExchangeRateCache
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "check":
+                print(f"{pricing.count_inconsistent(db):,} quotation tidak konsisten")
+                return
+            statuses = [QuotationStatus(status) for status in (args.status or ["DRAFT"])]
+            if args.market:
+                result = pricing.reprice_to_market(
+                    db,
+                    statuses=statuses,
+                    rates=ExchangeRateCache.snapshot(db, pivot=settings.REPORTING_CURRENCY),
+                    batch_size=args.batch_size,
+                )
+            else:
+                result = pricing.reprice_quotations(
+                    db,
+                    exchange_rate=args.rate,
+                    currency=args.currency,
+                    client_currency=args.client_currency,
+                    statuses=statuses,
+                    batch_size=args.batch_size,
+                )
+            print(f"{result.quotations:,} quotation, {result.items:,} item dihitung ulang")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Job quotation: sweeper kedaluwarsa & konversi ke subscription.
+
+Contoh pemakaian:
+
+    python -m scripts.quotations due
+    python -m scripts.quotations expire --followups
+    python -m scripts.quotations expire --as-of 2025-12-01T00:00:00+07:00 --batch-size 500
+    python -m scripts.quotations convert --batch-size 500 --payment-method MANUAL
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Job quotation.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--as-of", help="Waktu acuan ISO 8601; default sekarang")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("due", help="Jumlah quotation SENT yang sudah lewat masa berlaku")
+
+    expire = commands.add_parser("expire", help="Pindahkan quotation kedaluwarsa ke EXPIRED")
+    expire.add_argument("--batch-size", type=int, default=1000)
+    expire.add_argument("--followups", action="store_true", help="Buat draft email tindak lanjut ke client")
+
+    convert = commands.add_parser("convert", help="Buat subscription dari quotation ACCEPTED")
+    convert.add_argument("--batch-size", type=int, default=500)
+    convert.add_argument("--payment-method", default="XENDIT_SUBSCRIPTION")
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.subscription import SubscriptionPaymentMethodType
+    from app.services import quotation_conversion, quotation_expiry
+
+    now = datetime.fromisoformat(args.as_of) if args.as_of else datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "due":
+                print(f"{quotation_expiry.count_due(db, now):,} quotation kedaluwarsa")
+                return
+            if args.command == "convert":
+                result = quotation_conversion.convert_accepted(
+                    db,
+                    batch_size=args.batch_size,
+                    payment_method_type=SubscriptionPaymentMethodType(args.payment_method),
+                )
+                print(
+                    f"{result.subscriptions:,} subscription, {result.items:,} item "
+                    f"({result.skipped_items:,} item tanpa produk dilewati), "
+                    f"{result.batches} batch, {result.rows_per_second:,.0f} baris/detik"
+                )
+                return
+            result = quotation_expiry.expire_quotations(
+                db, now, batch_size=args.batch_size, followups=args.followups
+            )
+            print(
+                f"{result.expired:,} quotation EXPIRED, {result.followups:,} draft email "
+                f"({result.batches} batch, {result.elapsed_seconds:.2f} detik)"
+            )
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Job ringkasan MRR/ARR (`app.services.revenue_summary`).
+
+Contoh pemakaian:
+
+    python -m scripts.revenue rebuild               # hitung ulang penuh (deploy awal / rekonsiliasi)
+    python -m scripts.revenue refresh               # proses antrian perubahan sekali
+    python -m scripts.revenue refresh --loop --interval 60
+    python -m scripts.revenue check                 # bandingkan ringkasan vs hitungan penuh
+    python -m scripts.revenue show --months 12 --currency USD
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Job ringkasan MRR/ARR.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    refresh = commands.add_parser("refresh", help="Terapkan perubahan di antrian ke ringkasan bulan berjalan")
+    refresh.add_argument("--batch-size", type=int, default=1000)
+    refresh.add_argument("--loop", action="store_true", help="Ulangi tiap --interval detik")
+    refresh.add_argument("--interval", type=float, default=60.0)
+
+    commands.add_parser("rebuild", help="Hitung ulang kontribusi & ringkasan bulan berjalan dari tabel sumber")
+    commands.add_parser("check", help="Selisih ringkasan bulan berjalan vs hitungan penuh")
+
+    show = commands.add_parser("show", help="MRR/ARR per bulan dalam mata uang laporan")
+    show.add_argument("--months", type=int, default=12)
+    show.add_argument("--currency", help="Default: REPORTING_CURRENCY")
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services import revenue_summary
+    from app.services.exchange_rates import ExchangeRateCache
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "rebuild":
+                result = revenue_summary.rebuild(db)
+                print(
+                    f"{result.contributions:,} kontribusi, {result.summary_rows} baris ringkasan "
+                    f"({result.elapsed_seconds:.2f} detik)"
+                )
+            elif args.command == "check":
+                drifts = revenue_summary.reconcile(db)
+                for drift in drifts:
+                    print(
+                        f"{drift.product_type}/{drift.currency}/{drift.client_status}: "
+                        f"subscription {drift.stored_subscriptions} vs {drift.actual_subscriptions}, "
+                        f"MRR {drift.stored_mrr} vs {drift.actual_mrr}"
+                    )
+                print("cocok" if not drifts else f"{len(drifts)} dimensi berbeda (antrian belum diproses / perlu rebuild)")
+            elif args.command == "show":
+                currency = args.currency or settings.REPORTING_CURRENCY
+                month = revenue_summary.current_month()
+                start = revenue_summary.add_months(month, 1 - args.months)
+                rates = ExchangeRateCache(sessionmaker(bind=engine), pivot=settings.REPORTING_CURRENCY)
+                for total in revenue_summary.mrr_totals(revenue_summary.monthly_mrr(db, start, month), rates, currency):
+                    missing = ", ".join(f"{code} {amount:,.2f}" for code, amount in total.unconverted.items())
+                    print(
+                        f"{total.month:%Y-%m}  MRR {total.mrr:>18,.2f}  ARR {total.arr:>20,.2f} {currency}"
+                        + (f"  (tanpa kurs: {missing})" if missing else "")
+                    )
+            else:
+                while True:
+                    result = revenue_summary.refresh_dirty(db, batch_size=args.batch_size)
+                    if result.subscriptions or result.seeded_rows or not args.loop:
+                        seeded = f", bulan baru {result.seeded_rows} baris" if result.seeded_rows else ""
+                        print(
+                            f"{result.subscriptions:,} subscription, {result.summary_rows} baris ringkasan{seeded} "
+                            f"({result.batches} batch, {result.elapsed_seconds:.2f} detik)",
+                            flush=True,
+                        )
+                    if not args.loop:
+                        break
+                    time.sleep(args.interval)
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
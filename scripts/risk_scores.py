@@ -0,0 +1,94 @@
+"""
+Skor risiko telat bayar per client (`app.services.risk_scoring`).
+
+Contoh pemakaian:
+
+    python -m scripts.risk_scores run                          # job malam, as_of = hari ini
+    python -m scripts.risk_scores run --as-of 2026-01-01 --chunk-size 1000
+    python -m scripts.risk_scores top --limit 20               # client berisiko tertinggi
+    python -m scripts.risk_scores backtest --as-of 2025-09-01  # skor vs telat 90 hari sesudahnya
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date
+from typing import Iterable, Optional
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Skor risiko telat bayar per client.")
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Hitung & simpan skor semua client")
+    run.add_argument("--as-of", type=date.fromisoformat, help="Default: hari ini")
+    run.add_argument("--chunk-size", type=int, default=2000, help="Client per chunk")
+    run.add_argument("--lookback-days", type=int, default=365)
+
+    top = commands.add_parser("top", help="Skor tersimpan tertinggi")
+    top.add_argument("--limit", type=int, default=20)
+
+    backtest = commands.add_parser("backtest", help="AUC & tingkat telat per band")
+    backtest.add_argument("--as-of", type=date.fromisoformat, required=True)
+    backtest.add_argument("--horizon-days", type=int, default=90)
+    backtest.add_argument("--chunk-size", type=int, default=2000)
+    backtest.add_argument("--lookback-days", type=int, default=365)
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.models.client import Client
+    from app.models.risk_score import ClientRiskScore
+    from app.services import risk_scoring
+
+    engine = create_engine(args.database_url or settings.DATABASE_URL, future=True)
+    try:
+        with Session(engine) as db:
+            if args.command == "run":
+                result = risk_scoring.score_clients(
+                    db, args.as_of or date.today(), chunk_size=args.chunk_size, lookback_days=args.lookback_days
+                )
+                bands = ", ".join(f"{band} {result.bands[band]:,}" for band, _ in risk_scoring.BANDS)
+                print(
+                    f"{result.clients:,} client, {result.chunks} chunk ({bands}) "
+                    f"{result.elapsed_seconds:.2f} detik, {result.clients_per_second:,.0f} client/s"
+                )
+            elif args.command == "top":
+                rows = db.execute(
+                    select(Client.name, ClientRiskScore)
+                    .join(Client, Client.id == ClientRiskScore.client_id)
+                    .order_by(ClientRiskScore.score.desc())
+                    .limit(args.limit)
+                )
+                for name, risk in rows:
+                    print(
+                        f"{risk.score:>5} {risk.band:<7} {name[:40]:<40} cycle {risk.cycles:>3}  "
+                        f"telat {risk.late_ratio:>5.0%}  rata-rata {risk.avg_days_late:>6.1f} hari  "
+                        f"gagal {risk.failed_ratio:>5.0%}  (as of {risk.as_of})"
+                    )
+            else:
+                result = risk_scoring.backtest(
+                    db,
+                    args.as_of,
+                    horizon_days=args.horizon_days,
+                    chunk_size=args.chunk_size,
+                    lookback_days=args.lookback_days,
+                )
+                print(
+                    f"{result.clients:,} client, {result.labelled:,} punya tagihan dalam {args.horizon_days} hari, "
+                    f"{result.late:,} telat — AUC {result.auc:.3f}"
+                )
+                for band, (labelled, late) in result.bands.items():
+                    rate = late / labelled if labelled else 0.0
+                    print(f"  {band:<7} {labelled:>7,} client  {late:>7,} telat ({rate:.0%})")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1409 @@
+"""
+Generator data sintetis berskala produksi untuk benchmark & load test.
+
+Tujuan:
+- Mengisi semua tabel di `app/models/` dengan volume realistis
+  (mis. 50k clients, 200k subscriptions, 5M billing cycles, 20M webhook events).
+- Semua FK & nilai enum mengikuti model, distribusi status / currency / payload
+  JSONB dibuat mendekati kondisi produksi.
+- Deterministik: seed + config yang sama selalu menghasilkan data yang sama
+  (termasuk UUID), sehingga hasil benchmark bisa dibandingkan antar run.
+
+Data di-stream per chunk lalu dimuat dengan `COPY ... FROM STDIN` (format text),
+jadi memori tetap kecil walaupun jumlah baris puluhan juta.
+
+Contoh pemakaian:
+
+    python -m scripts.synthetic_data --preset small --truncate
+    python -m scripts.synthetic_data --preset production --seed 7
+    python -m scripts.synthetic_data --preset small --output-dir /tmp/synthetic
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import time
+import uuid
+from array import array
+from dataclasses import dataclass, field, fields, replace
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.models.billing import BillingCycleStatus
+from app.models.client import ClientStatus
+from app.models.email_body import encode_body
+from app.models.email_log import EmailDirection, EmailRelatedType, EmailStatus
+from app.models.payment import PaymentMethod, PaymentStatus
+from app.models.product import ProductType
+from app.models.provisioning_task import (
+    ProvisioningAction,
+    ProvisioningStatus as TaskStatus,
+    ProvisioningTargetSystem,
+)
+from app.models.quotation import QuotationStatus
+from app.models.subscription import (
+    BillingPeriod,
+    ProvisioningStatus as ItemProvisioningStatus,
+    SubscriptionPaymentMethodType,
+    SubscriptionStatus,
+)
+from app.models.user import UserRole
+from app.models.wallet import (
+    WalletTransactionDirection,
+    WalletTransactionRelatedType,
+    WalletTransactionType,
+)
+
+
+# ---------------------------------------------------------------------------
+# Konfigurasi
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SyntheticConfig:
+    """Jumlah baris & parameter distribusi dataset sintetis."""
+
+    seed: int = 42
+    # Tanggal acuan "hari ini" (tetap, supaya dataset reproducible)
+    reference_date: date = date(2025, 12, 1)
+
+    products: int = 80
+    clients: int = 50_000
+    staff_users: int = 250
+    subscriptions: int = 200_000
+    quotations: int = 150_000
+    billing_cycles: int = 5_000_000
+    webhook_events: int = 20_000_000
+
+    # Proporsi client yang punya wallet & akun portal
+    wallet_rate: float = 0.3
+    portal_rate: float = 0.55
+    # Peluang cycle yang telat / belum dibayar mendapat email reminder
+    reminder_rate: float = 0.6
+    # Peluang payment sukses dikirimi email PAYMENT_STATUS
+    payment_email_rate: float = 0.4
+
+    # Jumlah baris yang di-buffer sebelum di-COPY
+    chunk_rows: int = 50_000
+
+
+PRESETS: Dict[str, Dict[str, int]] = {
+    "tiny": dict(
+        products=20,
+        clients=200,
+        staff_users=12,
+        subscriptions=600,
+        quotations=500,
+        billing_cycles=8_000,
+        webhook_events=20_000,
+    ),
+    "small": dict(
+        products=40,
+        clients=2_000,
+        staff_users=40,
+        subscriptions=8_000,
+        quotations=6_000,
+        billing_cycles=200_000,
+        webhook_events=800_000,
+    ),
+    "medium": dict(
+        products=60,
+        clients=10_000,
+        staff_users=100,
+        subscriptions=40_000,
+        quotations=30_000,
+        billing_cycles=1_000_000,
+        webhook_events=4_000_000,
+    ),
+    "production": {},
+}
+
+# Urutan insert (parent dulu) — juga urutan flush buffer supaya FK selalu valid
+TABLE_ORDER: Sequence[str] = (
+    "exchange_rates",
+    "products",
+    "clients",
+    "users",
+    "wallet_accounts",
+    "subscriptions",
+    "subscription_items",
+    "provisioning_tasks",
+    "quotations",
+    "quotation_items",
+    "billing_cycles",
+    "payments",
+    "wallet_transactions",
+    "email_bodies",
+    "email_logs",
+    "webhook_events",
+)
+
+COLUMNS: Dict[str, Sequence[str]] = {
+    "exchange_rates": (
+        "base_currency", "quote_currency", "effective_at", "rate", "source", "created_at",
+    ),
+    "products": (
+        "id", "code", "name", "type", "description", "default_billing_period",
+        "is_active", "google_sku", "metadata_json", "created_at", "updated_at",
+    ),
+    "clients": (
+        "id", "name", "legal_name", "billing_email", "contact_email", "phone",
+        "billing_address", "tax_number", "status", "workspace_domain",
+        "has_portal_account", "google_customer_id", "created_at", "updated_at",
+    ),
+    "users": (
+        "id", "email", "password_hash", "full_name", "role", "client_id",
+        "is_active", "created_at", "updated_at",
+    ),
+    "wallet_accounts": (
+        "id", "client_id", "balance", "currency", "created_at", "updated_at",
+    ),
+    "subscriptions": (
+        "id", "client_id", "created_by_user_id", "status", "billing_period",
+        "start_date", "end_date", "next_billing_date", "payment_method_type",
+        "is_manual", "xendit_subscription_id", "currency", "notes",
+        "created_at", "updated_at",
+    ),
+    "subscription_items": (
+        "id", "subscription_id", "product_id", "description", "quantity",
+        "unit_price", "amount", "provisioning_status",
+        "google_workspace_subscription_id", "gcp_resource_id", "config_json",
+        "created_at", "updated_at",
+    ),
+    "provisioning_tasks": (
+        "id", "subscription_item_id", "action", "target_system", "payload_json",
+        "status", "external_reference", "error_message", "created_at",
+        "executed_at",
+    ),
+    "quotations": (
+        "id", "client_id", "sales_user_id", "number", "status", "total_amount",
+        "currency", "client_currency", "exchange_rate", "total_amount_client",
+        "valid_until", "related_subscription_id", "cosmic_id", "pdf_url",
+        "gmail_thread_id", "created_at", "updated_at",
+    ),
+    "quotation_items": (
+        "id", "quotation_id", "product_id", "description", "quantity",
+        "unit_price", "unit_price_client", "discount_percent", "subtotal_amount",
+        "subtotal_amount_client", "created_at", "updated_at",
+    ),
+    "billing_cycles": (
+        "id", "subscription_id", "period_start", "period_end", "due_date",
+        "amount", "currency", "status", "is_initial_cycle", "quoted_amount",
+        "invoice_number_external", "invoice_file_url", "tax_invoice_file_url",
+        "xendit_invoice_id", "last_reminder_sent_at", "created_at", "updated_at",
+    ),
+    "payments": (
+        "id", "client_id", "subscription_id", "billing_cycle_id", "amount",
+        "currency", "status", "method", "xendit_payment_id",
+        "xendit_subscription_id", "paid_at", "failure_reason", "created_at",
+        "updated_at",
+    ),
+    "wallet_transactions": (
+        "id", "wallet_account_id", "type", "direction", "amount", "related_type",
+        "related_id", "created_at",
+    ),
+    "email_bodies": (
+        "hash", "codec", "content", "size_bytes",
+    ),
+    "email_logs": (
+        "id", "direction", "related_type", "related_id", "user_id", "from_email",
+        "to_email", "subject", "ai_model", "ai_prompt_hash", "ai_generated_body_hash",
+        "final_body_hash", "status", "gmail_message_id", "rfc_message_id", "has_attachments",
+        "attachments_meta_json", "sent_at", "created_at", "updated_at",
+    ),
+    "webhook_events": (
+        "id", "source", "event_type", "raw_payload_json", "xendit_subscription_id",
+        "xendit_invoice_id", "processed", "processed_at", "created_at",
+    ),
+}
+
+
+# ---------------------------------------------------------------------------
+# Distribusi & kamus data
+# ---------------------------------------------------------------------------
+
+CLIENT_STATUS_WEIGHTS = (
+    (ClientStatus.ACTIVE, 0.62),
+    (ClientStatus.LEAD, 0.20),
+    (ClientStatus.SUSPENDED, 0.08),
+    (ClientStatus.CHURNED, 0.10),
+)
+
+# Mayoritas client lokal (IDR), sebagian kecil ditagih dalam USD
+CURRENCY_WEIGHTS = (("IDR", 0.86), ("USD", 0.14))
+
+PRODUCT_TYPE_WEIGHTS = (
+    (ProductType.GWORKSPACE, 0.35),
+    (ProductType.GCP, 0.25),
+    (ProductType.DOMAIN, 0.10),
+    (ProductType.ADDON, 0.15),
+    (ProductType.SERVICE, 0.15),
+)
+
+QUOTATION_OPEN_STATUS_WEIGHTS = (
+    (QuotationStatus.DRAFT, 0.25),
+    (QuotationStatus.SENT, 0.30),
+    (QuotationStatus.REJECTED, 0.20),
+    (QuotationStatus.EXPIRED, 0.25),
+)
+
+WEBHOOK_EVENT_WEIGHTS = (
+    ("PAYMENT_SUCCEEDED", 0.58),
+    ("SUBSCRIPTION_CHARGED", 0.30),
+    ("PAYMENT_FAILED", 0.12),
+)
+
+STAFF_ROLE_WEIGHTS = (
+    (UserRole.SALES, 0.7),
+    (UserRole.FINANCE, 0.2),
+    (UserRole.ADMIN, 0.1),
+)
+
+FAILURE_REASONS = (
+    "INSUFFICIENT_BALANCE",
+    "CARD_DECLINED",
+    "EXPIRED_CARD",
+    "CHANNEL_UNAVAILABLE",
+    "PAYMENT_TIMEOUT",
+    "STOLEN_CARD",
+)
+
+COMPANY_PREFIXES = ("PT", "CV", "PT", "PT", "Yayasan", "Koperasi")
+COMPANY_WORDS = (
+    "Nusantara", "Sinar", "Mitra", "Karya", "Abadi", "Teknologi", "Digital",
+    "Solusi", "Maju", "Bersama", "Cahaya", "Global", "Prima", "Sentosa",
+    "Mandiri", "Jaya", "Utama", "Samudra", "Investama", "Logistik",
+)
+CITIES = (
+    "Jakarta Selatan", "Jakarta Pusat", "Bandung", "Surabaya", "Medan",
+    "Semarang", "Yogyakarta", "Denpasar", "Makassar", "Tangerang",
+)
+FIRST_NAMES = (
+    "Andi", "Budi", "Citra", "Dewi", "Eko", "Fitri", "Gilang", "Hana", "Indra",
+    "Joko", "Kartika", "Lestari", "Made", "Nadia", "Oscar", "Putri", "Rizky",
+    "Sari", "Teguh", "Wulan", "Yusuf",
+)
+LAST_NAMES = (
+    "Santoso", "Wijaya", "Saputra", "Pratama", "Hidayat", "Siregar", "Nugroho",
+    "Kusuma", "Halim", "Gunawan", "Susanto", "Lubis", "Tanjung",
+)
+GCP_REGIONS = ("asia-southeast2", "asia-southeast1", "us-central1")
+GCP_MACHINES = ("e2-standard-2", "e2-standard-4", "n2-standard-8", "e2-medium")
+AI_MODELS = ("gemini-1.5-pro", "gemini-1.5-flash")
+
+# Rentang kurs USD→IDR yang dipakai untuk harga & quotation
+USD_IDR_RANGE = (15_200, 16_600)
+# Panjang series kurs harian EXCHANGE_RATES (mundur dari reference_date)
+EXCHANGE_RATE_DAYS = 15 * 365
+PPN_RATE = Decimal("0.11")
+CENT = Decimal("0.01")
+
+REMINDER_TEMPLATE = (
+    "Yth. {name},\n\n"
+    "Kami ingin mengingatkan bahwa tagihan periode {period} sebesar {currency} {amount} "
+    "jatuh tempo pada {due}. Mohon lakukan pembayaran melalui tautan berikut: {link}\n\n"
+    "Abaikan email ini jika pembayaran sudah dilakukan.\n\n"
+    "Salam,\nTim Billing CloudSales"
+)
+PAYMENT_STATUS_TEMPLATE = (
+    "Yth. {name},\n\n"
+    "Terima kasih, pembayaran sebesar {currency} {amount} untuk periode {period} "
+    "telah kami terima pada {paid}.\n\n"
+    "Salam,\nTim Billing CloudSales"
+)
+QUOTATION_TEMPLATE = (
+    "Halo {name},\n\n"
+    "Terlampir penawaran {number} untuk kebutuhan {product} dengan total "
+    "{currency} {amount}. Penawaran berlaku sampai {valid}.\n\n"
+    "Silakan hubungi kami jika ada pertanyaan.\n\n"
+    "Salam,\n{sales}"
+)
+PROMPT_TEMPLATE = (
+    "Tulis email {kind} yang sopan dalam Bahasa Indonesia untuk client {name}. "
+    "Konteks: {context}. Gunakan nada profesional dan ringkas."
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _weighted(rng: random.Random, weights):
+    values, probs = zip(*weights)
+    return rng.choices(values, probs)[0]
+
+
+def _add_months(d: date, months: int) -> date:
+    month_index = d.month - 1 + months
+    year = d.year + month_index // 12
+    month = month_index % 12 + 1
+    # Clamp ke 28 supaya selalu valid di semua bulan
+    return date(year, month, min(d.day, 28))
+
+
+def _at(d: date, seconds: int = 0) -> datetime:
+    return datetime.combine(d, dt_time(0, 0), tzinfo=timezone.utc) + timedelta(seconds=seconds)
+
+
+def _money(value) -> Decimal:
+    return Decimal(value).quantize(CENT)
+
+
+def _copy_text(value) -> str:
+    """Encode satu nilai ke format text COPY PostgreSQL."""
+    if value is None:
+        return r"\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, Enum):
+        value = value.value
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, bytes):
+        # bytea hex format; backslash di-escape di bawah
+        value = "\\x" + value.hex()
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class DeterministicIds:
+    """
+    UUID deterministik per (jenis entitas, index).
+
+    Dengan cara ini FK bisa dihitung ulang dari index parent tanpa menyimpan
+    jutaan UUID di memori (mis. billing_cycle → payment → webhook).
+    """
+
+    def __init__(self, seed: int) -> None:
+        self._key = seed.to_bytes(8, "big", signed=True)
+
+    def uid(self, kind: str, index: int) -> uuid.UUID:
+        digest = hashlib.blake2b(
+            f"{kind}:{index}".encode(), digest_size=16, key=self._key
+        ).digest()
+        return uuid.UUID(bytes=digest, version=4)
+
+
+# ---------------------------------------------------------------------------
+# Sinks
+# ---------------------------------------------------------------------------
+
+
+class CopySink:
+    """Memuat buffer ke PostgreSQL via `COPY ... FROM STDIN` (psycopg2)."""
+
+    def __init__(self, dbapi_connection) -> None:
+        self.connection = dbapi_connection
+
+    def write(self, table: str, columns: Sequence[str], buffer: io.StringIO) -> None:
+        buffer.seek(0)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)",
+                buffer,
+            )
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+
+class DirectorySink:
+    """Menulis file `<table>.tsv` (format COPY text) untuk dimuat belakangan."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._opened: set = set()
+
+    def write(self, table: str, columns: Sequence[str], buffer: io.StringIO) -> None:
+        target = os.path.join(self.path, f"{table}.tsv")
+        mode = "a" if table in self._opened else "w"
+        self._opened.add(table)
+        with open(target, mode, encoding="utf-8") as fh:
+            fh.write(buffer.getvalue())
+
+    def commit(self) -> None:
+        with open(os.path.join(self.path, "columns.json"), "w", encoding="utf-8") as fh:
+            json.dump({t: list(COLUMNS[t]) for t in TABLE_ORDER if t in self._opened}, fh, indent=2)
+
+
+class ChunkedWriter:
+    """
+    Buffer multi-tabel. Ketika total baris mencapai `chunk_rows`, semua buffer
+    di-flush sesuai TABLE_ORDER (parent dulu) sehingga FK antar chunk tetap valid.
+    """
+
+    def __init__(self, sink, chunk_rows: int) -> None:
+        self.sink = sink
+        self.chunk_rows = chunk_rows
+        self.counts: Dict[str, int] = {table: 0 for table in TABLE_ORDER}
+        self._buffers: Dict[str, io.StringIO] = {}
+        self._pending = 0
+
+    def add(self, table: str, row: Sequence) -> None:
+        buffer = self._buffers.get(table)
+        if buffer is None:
+            buffer = self._buffers[table] = io.StringIO()
+        buffer.write("\t".join(_copy_text(value) for value in row))
+        buffer.write("\n")
+        self.counts[table] += 1
+        self._pending += 1
+        if self._pending >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        for table in TABLE_ORDER:
+            buffer = self._buffers.pop(table, None)
+            if buffer is not None:
+                self.sink.write(table, COLUMNS[table], buffer)
+        self._pending = 0
+
+
+# ---------------------------------------------------------------------------
+# Generator
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Catalog:
+    """State kecil per entitas yang dibutuhkan pass berikutnya (array kompak)."""
+
+    product_types: List[ProductType] = field(default_factory=list)
+    product_prices: List[Decimal] = field(default_factory=list)
+    product_periods: List[Optional[str]] = field(default_factory=list)
+    sales_users: List[int] = field(default_factory=list)
+    client_status: bytearray = field(default_factory=bytearray)
+    client_usd: bytearray = field(default_factory=bytearray)
+    client_wallet: bytearray = field(default_factory=bytearray)
+    client_names: List[str] = field(default_factory=list)
+    sub_client: array = field(default_factory=lambda: array("l"))
+    sub_status: bytearray = field(default_factory=bytearray)
+    sub_yearly: bytearray = field(default_factory=bytearray)
+    sub_method: bytearray = field(default_factory=bytearray)
+    sub_start: array = field(default_factory=lambda: array("l"))
+    sub_cycles: array = field(default_factory=lambda: array("l"))
+    sub_cycle_offset: array = field(default_factory=lambda: array("q"))
+    # Nilai tagihan per periode (sebelum pajak) dalam sen, mata uang subscription
+    sub_amount_cents: array = field(default_factory=lambda: array("q"))
+
+
+CLIENT_STATUSES = list(ClientStatus)
+SUB_STATUSES = list(SubscriptionStatus)
+SUB_METHODS = list(SubscriptionPaymentMethodType)
+
+
+class SyntheticDataGenerator:
+    """Menghasilkan seluruh dataset dalam beberapa pass berurutan."""
+
+    def __init__(self, config: SyntheticConfig) -> None:
+        self.config = config
+        self.ids = DeterministicIds(config.seed)
+        self.catalog = _Catalog()
+        self.today = config.reference_date
+        # Hash body yang sudah ditulis ke email_bodies (dedup content-addressed)
+        self._body_hashes: set = set()
+
+    def _rng(self, name: str) -> random.Random:
+        # RNG terpisah per pass: mengubah satu jumlah tidak mengacak pass lain
+        return random.Random(f"{self.config.seed}:{name}")
+
+    def _body(self, writer: ChunkedWriter, text: Optional[str]) -> Optional[bytes]:
+        """Tulis body ke email_bodies (sekali per konten), kembalikan hash-nya."""
+        if text is None:
+            return None
+        digest, codec, content, size = encode_body(text)
+        if digest not in self._body_hashes:
+            self._body_hashes.add(digest)
+            writer.add("email_bodies", (digest, codec, content, size))
+        return digest
+
+    def run(self, writer: ChunkedWriter) -> Dict[str, int]:
+        for step in (
+            self._exchange_rates,
+            self._products,
+            self._clients,
+            self._subscriptions,
+            self._quotations,
+            self._billing,
+            self._webhooks,
+        ):
+            step(writer)
+            writer.flush()
+        return writer.counts
+
+    # ------------------------------------------------------------------
+    # Pass 0: exchange_rates (kurs harian USD→IDR, random walk dalam rentang)
+    # ------------------------------------------------------------------
+
+    def _exchange_rates(self, writer: ChunkedWriter) -> None:
+        rng = self._rng("exchange_rates")
+        low, high = USD_IDR_RANGE
+        rate = Decimal(sum(USD_IDR_RANGE) // 2)
+        for offset in range(EXCHANGE_RATE_DAYS, -1, -1):
+            effective_at = _at(self.today - timedelta(days=offset))
+            rate = min(max(rate + Decimal(rng.randint(-6000, 6000)) / 100, Decimal(low)), Decimal(high))
+            writer.add("exchange_rates", ("USD", "IDR", effective_at, rate, "synthetic", effective_at))
+
+    # ------------------------------------------------------------------
+    # Pass 1: products
+    # ------------------------------------------------------------------
+
+    def _products(self, writer: ChunkedWriter) -> None:
+        rng = self._rng("products")
+        cat = self.catalog
+        for i in range(self.config.products):
+            ptype = _weighted(rng, PRODUCT_TYPE_WEIGHTS)
+            period = BillingPeriod.YEARLY.value if ptype == ProductType.DOMAIN else (
+                BillingPeriod.YEARLY.value if rng.random() < 0.15 else BillingPeriod.MONTHLY.value
+            )
+            if ptype == ProductType.GWORKSPACE:
+                price = _money(rng.choice((6, 7.2, 12, 14.4, 18, 21.6)))
+                metadata = {"edition": rng.choice(("STARTER", "STANDARD", "PLUS")), "unit": "seat"}
+            elif ptype == ProductType.GCP:
+                price = _money(rng.uniform(25, 900))
+                metadata = {
+                    "region": rng.choice(GCP_REGIONS),
+                    "machine_type": rng.choice(GCP_MACHINES),
+                    "disk_gb": rng.choice((50, 100, 200, 500)),
+                }
+            elif ptype == ProductType.DOMAIN:
+                price = _money(rng.choice((12, 15, 25, 40)))
+                metadata = {"tld": rng.choice((".com", ".co.id", ".id", ".net"))}
+            else:
+                price = _money(rng.uniform(5, 300))
+                metadata = {"sla": rng.choice(("8x5", "24x7")), "tier": rng.randint(1, 3)}
+            created = _at(self.today - timedelta(days=rng.randint(400, 1500)))
+            cat.product_types.append(ptype)
+            cat.product_prices.append(price)
+            cat.product_periods.append(period)
+            writer.add("products", (
+                self.ids.uid("product", i),
+                f"{ptype.value}_{i:04d}",
+                f"{ptype.value.title()} Plan {i}",
+                ptype.value,
+                f"Paket {ptype.value.lower()} nomor {i}",
+                period,
+                rng.random() > 0.08,
+                f"SKU-{rng.getrandbits(32):08X}" if ptype in (ProductType.GWORKSPACE, ProductType.GCP) else None,
+                metadata,
+                created,
+                created,
+            ))
+
+    # ------------------------------------------------------------------
+    # Pass 2: clients, users, wallet_accounts
+    # ------------------------------------------------------------------
+
+    def _clients(self, writer: ChunkedWriter) -> None:
+        rng = self._rng("clients")
+        cat = self.catalog
+        ids = self.ids
+
+        for i in range(self.config.staff_users):
+            role = UserRole.SALES if i == 0 else _weighted(rng, STAFF_ROLE_WEIGHTS)
+            if role == UserRole.SALES:
+                cat.sales_users.append(i)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            created = _at(self.today - timedelta(days=rng.randint(200, 1500)))
+            writer.add("users", (
+                ids.uid("staff", i),
+                f"{first.lower()}.{last.lower()}.{i}@cloudsales.id",
+                "$2b$12$" + hashlib.sha256(f"staff{i}".encode()).hexdigest()[:53],
+                f"{first} {last}",
+                role.value,
+                None,
+                rng.random() > 0.05,
+                created,
+                created,
+            ))
+
+        for i in range(self.config.clients):
+            status = _weighted(rng, CLIENT_STATUS_WEIGHTS)
+            usd = _weighted(rng, CURRENCY_WEIGHTS) == "USD"
+            name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {i}"
+            slug = name.lower().replace(" ", "")
+            has_portal = status != ClientStatus.LEAD and rng.random() < self.config.portal_rate
+            has_wallet = status != ClientStatus.LEAD and rng.random() < self.config.wallet_rate
+            created = _at(
+                self.today - timedelta(days=rng.randint(30, 1800)),
+                rng.randint(0, 86_399),
+            )
+            cat.client_status.append(CLIENT_STATUSES.index(status))
+            cat.client_usd.append(usd)
+            cat.client_wallet.append(has_wallet)
+            cat.client_names.append(name)
+
+            writer.add("clients", (
+                ids.uid("client", i),
+                name,
+                f"{rng.choice(COMPANY_PREFIXES)} {name}" if rng.random() < 0.8 else None,
+                f"finance@{slug}.co.id",
+                f"it@{slug}.co.id" if rng.random() < 0.7 else None,
+                f"+62-21-{rng.randint(1000000, 9999999)}" if rng.random() < 0.85 else None,
+                f"Jl. {rng.choice(COMPANY_WORDS)} No. {rng.randint(1, 250)}, {rng.choice(CITIES)}",
+                f"{rng.randint(10, 99)}.{rng.randint(100, 999)}.{rng.randint(100, 999)}.{rng.randint(0, 9)}-{rng.randint(100, 999)}.000"
+                if status != ClientStatus.LEAD else None,
+                status.value,
+                f"{slug}.co.id" if rng.random() < 0.9 else None,
+                has_portal,
+                f"C{rng.getrandbits(32):08x}" if status != ClientStatus.LEAD else None,
+                created,
+                created + timedelta(days=rng.randint(0, 300)),
+            ))
+
+            if has_portal:
+                for k in range(1 + (rng.random() < 0.3)):
+                    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                    writer.add("users", (
+                        ids.uid("client_user", i * 2 + k),
+                        f"{first.lower()}{k}@{slug}.co.id",
+                        "$2b$12$" + hashlib.sha256(f"client{i}:{k}".encode()).hexdigest()[:53],
+                        f"{first} {last}",
+                        UserRole.CLIENT.value,
+                        ids.uid("client", i),
+                        status != ClientStatus.CHURNED,
+                        created,
+                        created,
+                    ))
+
+            if has_wallet:
+                writer.add("wallet_accounts", (
+                    ids.uid("wallet", i),
+                    ids.uid("client", i),
+                    _money(rng.choice((0, 0, rng.uniform(100_000, 50_000_000)))) if not usd
+                    else _money(rng.choice((0, rng.uniform(10, 5_000)))),
+                    "USD" if usd else "IDR",
+                    created,
+                    created,
+                ))
+
+    # ------------------------------------------------------------------
+    # Pass 3: subscriptions, subscription_items, provisioning_tasks
+    # ------------------------------------------------------------------
+
+    def _subscription_status(self, rng: random.Random, client_status: ClientStatus) -> SubscriptionStatus:
+        if client_status == ClientStatus.CHURNED:
+            return rng.choice((SubscriptionStatus.CANCELLED, SubscriptionStatus.EXPIRED))
+        if client_status == ClientStatus.SUSPENDED:
+            return SubscriptionStatus.SUSPENDED if rng.random() < 0.8 else SubscriptionStatus.CANCELLED
+        roll = rng.random()
+        if roll < 0.84:
+            return SubscriptionStatus.ACTIVE
+        if roll < 0.90:
+            return SubscriptionStatus.PENDING_ACTIVATION
+        return SubscriptionStatus.CANCELLED
+
+    def _subscriptions(self, writer: ChunkedWriter) -> None:
+        rng = self._rng("subscriptions")
+        cat = self.catalog
+        ids = self.ids
+        cfg = self.config
+
+        eligible = [
+            i for i, status in enumerate(cat.client_status)
+            if CLIENT_STATUSES[status] != ClientStatus.LEAD
+        ] or list(range(cfg.clients))
+        base_cycles, extra_cycles = divmod(cfg.billing_cycles, max(cfg.subscriptions, 1))
+        cycle_offset = 0
+        item_seq = 0
+        task_seq = 0
+
+        for s in range(cfg.subscriptions):
+            # Distribusi skewed: sebagian kecil client punya banyak subscription
+            client = eligible[int(len(eligible) * rng.random() ** 2)]
+            client_status = CLIENT_STATUSES[cat.client_status[client]]
+            status = self._subscription_status(rng, client_status)
+            yearly = rng.random() < 0.15
+            n_cycles = base_cycles + (1 if s < extra_cycles else 0)
+            if status == SubscriptionStatus.PENDING_ACTIVATION:
+                # Belum bayar pertama: hanya initial cycle, sisanya dipindah ke sub lain
+                n_cycles = min(n_cycles, 1)
+            step = 12 if yearly else 1
+            start = _add_months(self.today, -step * max(n_cycles - 1, 0)) - timedelta(days=rng.randint(0, 27))
+
+            if cat.client_wallet[client] and rng.random() < 0.5:
+                method = SubscriptionPaymentMethodType.WALLET
+            elif rng.random() < 0.8:
+                method = SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION
+            else:
+                method = SubscriptionPaymentMethodType.MANUAL
+
+            currency = "USD" if cat.client_usd[client] else "IDR"
+            fx = rng.randint(*USD_IDR_RANGE)
+            sub_id = ids.uid("subscription", s)
+            created = _at(start - timedelta(days=rng.randint(3, 30)), rng.randint(0, 86_399))
+            active = status in (SubscriptionStatus.ACTIVE, SubscriptionStatus.SUSPENDED)
+            end_date = None
+            if status in (SubscriptionStatus.CANCELLED, SubscriptionStatus.EXPIRED):
+                end_date = _add_months(start, step * max(n_cycles, 1))
+
+            # Items
+            total_cents = 0
+            n_items = 1 + min(int(rng.expovariate(0.9)), 5)
+            for k in range(n_items):
+                product = rng.randrange(cfg.products)
+                ptype = cat.product_types[product]
+                if ptype == ProductType.GWORKSPACE:
+                    quantity = max(1, int(rng.lognormvariate(2.5, 1.1)))
+                elif ptype == ProductType.GCP:
+                    quantity = rng.randint(1, 6)
+                else:
+                    quantity = 1
+                unit_price = cat.product_prices[product]
+                if currency == "IDR":
+                    unit_price = _money(unit_price * fx)
+                if yearly:
+                    unit_price = _money(unit_price * 12)
+                amount = _money(unit_price * quantity)
+                total_cents += int(amount * 100)
+
+                item_id = ids.uid("subscription_item", item_seq)
+                item_seq += 1
+                if status == SubscriptionStatus.PENDING_ACTIVATION:
+                    prov_status = ItemProvisioningStatus.PENDING
+                elif status == SubscriptionStatus.SUSPENDED:
+                    prov_status = ItemProvisioningStatus.SUSPENDED
+                elif active:
+                    prov_status = ItemProvisioningStatus.ACTIVE
+                else:
+                    prov_status = ItemProvisioningStatus.TERMINATED
+                config = None
+                if ptype == ProductType.GCP:
+                    config = {
+                        "region": rng.choice(GCP_REGIONS),
+                        "machine_type": rng.choice(GCP_MACHINES),
+                        "labels": {"env": rng.choice(("prod", "staging", "dev"))},
+                    }
+                elif ptype == ProductType.GWORKSPACE:
+                    config = {"seats": quantity, "auto_renew": rng.random() < 0.9}
+                writer.add("subscription_items", (
+                    item_id,
+                    sub_id,
+                    ids.uid("product", product),
+                    f"{ptype.value.title()} x{quantity}",
+                    quantity,
+                    unit_price,
+                    amount,
+                    prov_status.value,
+                    f"gws-{item_id.hex[:16]}" if ptype == ProductType.GWORKSPACE and active else None,
+                    f"projects/cs-{item_id.hex[:10]}/instances/vm-{k}" if ptype == ProductType.GCP and active else None,
+                    config,
+                    created,
+                    created,
+                ))
+
+                # Provisioning hanya untuk target Workspace / GCP
+                if ptype not in (ProductType.GWORKSPACE, ProductType.GCP):
+                    continue
+                target = (
+                    ProvisioningTargetSystem.GWORKSPACE
+                    if ptype == ProductType.GWORKSPACE
+                    else ProvisioningTargetSystem.GCP
+                )
+                actions = [ProvisioningAction.ACTIVATE]
+                if rng.random() < 0.2:
+                    actions.append(ProvisioningAction.CHANGE_QUANTITY)
+                if status == SubscriptionStatus.SUSPENDED:
+                    actions.append(ProvisioningAction.SUSPEND)
+                elif end_date is not None:
+                    actions.append(ProvisioningAction.TERMINATE)
+                for a, action in enumerate(actions):
+                    task_created = created + timedelta(days=a * rng.randint(1, 90))
+                    if status == SubscriptionStatus.PENDING_ACTIVATION:
+                        task_status = TaskStatus.PENDING
+                    else:
+                        roll = rng.random()
+                        task_status = (
+                            TaskStatus.SUCCESS if roll < 0.95
+                            else TaskStatus.FAILED if roll < 0.98
+                            else TaskStatus.PENDING
+                        )
+                    done = task_status in (TaskStatus.SUCCESS, TaskStatus.FAILED)
+                    writer.add("provisioning_tasks", (
+                        ids.uid("provisioning_task", task_seq),
+                        item_id,
+                        action.value,
+                        target.value,
+                        {
+                            "domain": f"{cat.client_names[client].lower().replace(' ', '')}.co.id",
+                            "quantity": quantity,
+                            "sku": f"SKU-{product:04d}",
+                        },
+                        task_status.value,
+                        f"op-{rng.getrandbits(48):012x}" if done else None,
+                        "Quota exceeded for resource" if task_status == TaskStatus.FAILED else None,
+                        task_created,
+                        task_created + timedelta(seconds=rng.randint(5, 900)) if done else None,
+                    ))
+                    task_seq += 1
+
+            cat.sub_client.append(client)
+            cat.sub_status.append(SUB_STATUSES.index(status))
+            cat.sub_yearly.append(yearly)
+            cat.sub_method.append(SUB_METHODS.index(method))
+            cat.sub_start.append(start.toordinal())
+            cat.sub_cycles.append(n_cycles)
+            cat.sub_cycle_offset.append(cycle_offset)
+            cat.sub_amount_cents.append(total_cents)
+            cycle_offset += n_cycles
+
+            next_billing = None
+            if active:
+                next_billing = _add_months(start, step * n_cycles)
+            writer.add("subscriptions", (
+                sub_id,
+                ids.uid("client", client),
+                ids.uid("staff", rng.choice(cat.sales_users)),
+                status.value,
+                BillingPeriod.YEARLY.value if yearly else BillingPeriod.MONTHLY.value,
+                start if status != SubscriptionStatus.PENDING_ACTIVATION else None,
+                end_date,
+                next_billing,
+                method.value,
+                method == SubscriptionPaymentMethodType.MANUAL,
+                f"xsub-{sub_id.hex[:20]}" if method == SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION else None,
+                currency,
+                "Migrasi dari sistem lama" if rng.random() < 0.05 else None,
+                created,
+                created + timedelta(days=rng.randint(0, 60)),
+            ))
+
+    # ------------------------------------------------------------------
+    # Pass 4: quotations, quotation_items, email quotation
+    # ------------------------------------------------------------------
+
+    def _quotations(self, writer: ChunkedWriter) -> None:
+        rng = self._rng("quotations")
+        cat = self.catalog
+        ids = self.ids
+        cfg = self.config
+        n_subs = len(cat.sub_client)
+        email_seq = 0
+
+        for q in range(cfg.quotations):
+            # Quotation awal dipetakan 1:1 ke subscription (ACCEPTED)
+            if q < n_subs and rng.random() < 0.9:
+                client = cat.sub_client[q]
+                status = QuotationStatus.ACCEPTED
+                related_sub = ids.uid("subscription", q)
+                created_day = date.fromordinal(cat.sub_start[q]) - timedelta(days=rng.randint(7, 45))
+            else:
+                client = rng.randrange(cfg.clients)
+                status = _weighted(rng, QUOTATION_OPEN_STATUS_WEIGHTS)
+                related_sub = None
+                created_day = self.today - timedelta(days=rng.randint(0, 720))
+            usd_client = cat.client_usd[client]
+            fx = Decimal(1) if usd_client else Decimal(rng.randint(*USD_IDR_RANGE))
+            quotation_id = ids.uid("quotation", q)
+            created = _at(created_day, rng.randint(0, 86_399))
+            sales = rng.choice(cat.sales_users)
+
+            total = Decimal(0)
+            total_client = Decimal(0)
+            first_product = None
+            for k in range(1 + min(int(rng.expovariate(0.8)), 6)):
+                product = rng.randrange(cfg.products)
+                first_product = first_product if first_product is not None else product
+                quantity = rng.randint(1, 200) if cat.product_types[product] == ProductType.GWORKSPACE else rng.randint(1, 4)
+                unit_price = cat.product_prices[product]
+                unit_price_client = _money(unit_price * fx)
+                discount = _money(rng.choice((0, 0, 0, 5, 10, 15))) if rng.random() < 0.4 else None
+                factor = (Decimal(100) - (discount or 0)) / Decimal(100)
+                subtotal = _money(unit_price * quantity * factor)
+                subtotal_client = _money(unit_price_client * quantity * factor)
+                total += subtotal
+                total_client += subtotal_client
+                writer.add("quotation_items", (
+                    ids.uid("quotation_item", q * 8 + k),
+                    quotation_id,
+                    ids.uid("product", product),
+                    f"{cat.product_types[product].value.title()} - {quantity} unit",
+                    quantity,
+                    unit_price,
+                    unit_price_client,
+                    discount,
+                    subtotal,
+                    subtotal_client,
+                    created,
+                    created,
+                ))
+
+            sent = status != QuotationStatus.DRAFT
+            valid_until = created + timedelta(days=30)
+            writer.add("quotations", (
+                quotation_id,
+                ids.uid("client", client),
+                ids.uid("staff", sales),
+                f"QUO/{created.year}/{q + 1:07d}",
+                status.value,
+                total,
+                "USD",
+                "USD" if usd_client else "IDR",
+                fx.quantize(Decimal("0.000001")),
+                total_client,
+                valid_until,
+                related_sub,
+                f"cosmic-{quotation_id.hex[:16]}" if sent else None,
+                f"https://cosmic.example.com/quotations/{quotation_id.hex}.pdf" if sent else None,
+                f"thread-{quotation_id.hex[:16]}" if sent else None,
+                created,
+                created + timedelta(days=rng.randint(0, 20)),
+            ))
+
+            if sent:
+                name = cat.client_names[client]
+                body = QUOTATION_TEMPLATE.format(
+                    name=name,
+                    number=f"QUO/{created.year}/{q + 1:07d}",
+                    product=cat.product_types[first_product].value.title(),
+                    currency="USD" if usd_client else "IDR",
+                    amount=total_client,
+                    valid=valid_until.date().isoformat(),
+                    sales=f"Sales CloudSales #{sales}",
+                )
+                sent_at = created + timedelta(hours=rng.randint(1, 48))
+                writer.add("email_logs", (
+                    ids.uid("email_quotation", email_seq),
+                    EmailDirection.OUTBOUND.value,
+                    EmailRelatedType.QUOTATION.value,
+                    quotation_id,
+                    ids.uid("staff", sales),
+                    f"sales{sales}@cloudsales.id",
+                    f"it@{name.lower().replace(' ', '')}.co.id",
+                    f"Penawaran Harga QUO/{created.year}/{q + 1:07d}",
+                    rng.choice(AI_MODELS),
+                    self._body(writer, PROMPT_TEMPLATE.format(kind="penawaran", name=name, context=f"quotation total {total_client}")),
+                    self._body(writer, body),
+                    self._body(writer, body),
+                    EmailStatus.SENT.value,
+                    f"msg-{quotation_id.hex[:20]}",
+                    f"<msg-{quotation_id.hex[:20]}@mail.cloudsales.id>",
+                    True,
+                    [{"filename": f"quotation-{q + 1}.pdf", "mime_type": "application/pdf", "size": rng.randint(40_000, 400_000)}],
+                    sent_at,
+                    created,
+                    sent_at,
+                ))
+                email_seq += 1
+
+    # ------------------------------------------------------------------
+    # Pass 5: billing_cycles, payments, wallet_transactions, email reminder
+    # ------------------------------------------------------------------
+
+    def _cycle_status(self, rng: random.Random, is_last: bool, sub_status: SubscriptionStatus) -> BillingCycleStatus:
+        if sub_status == SubscriptionStatus.PENDING_ACTIVATION:
+            return rng.choice((BillingCycleStatus.PENDING, BillingCycleStatus.INVOICE_REQUESTED, BillingCycleStatus.INVOICED))
+        if is_last:
+            if sub_status in (SubscriptionStatus.CANCELLED, SubscriptionStatus.EXPIRED):
+                return BillingCycleStatus.CANCELLED if rng.random() < 0.5 else BillingCycleStatus.PAID
+            roll = rng.random()
+            if roll < 0.25:
+                return BillingCycleStatus.PENDING
+            if roll < 0.40:
+                return BillingCycleStatus.INVOICE_REQUESTED
+            if roll < 0.70:
+                return BillingCycleStatus.INVOICED
+            return BillingCycleStatus.PAID
+        roll = rng.random()
+        if roll < 0.93:
+            return BillingCycleStatus.PAID
+        if roll < 0.95:
+            return BillingCycleStatus.FAILED
+        if roll < 0.97:
+            return BillingCycleStatus.CANCELLED
+        # Tunggakan lama yang belum dibayar
+        return BillingCycleStatus.INVOICED
+
+    def _billing(self, writer: ChunkedWriter) -> None:
+        rng = self._rng("billing")
+        cat = self.catalog
+        ids = self.ids
+        cfg = self.config
+        payment_seq = 0
+        wallet_seq = 0
+        email_seq = 0
+        xendit_methods = (PaymentMethod.XENDIT_CC, PaymentMethod.XENDIT_EWALLET, PaymentMethod.XENDIT_VA)
+
+        for s in range(len(cat.sub_client)):
+            client = cat.sub_client[s]
+            sub_id = ids.uid("subscription", s)
+            client_id = ids.uid("client", client)
+            sub_status = SUB_STATUSES[cat.sub_status[s]]
+            method = SUB_METHODS[cat.sub_method[s]]
+            usd = cat.client_usd[client]
+            currency = "USD" if usd else "IDR"
+            step = 12 if cat.sub_yearly[s] else 1
+            start = date.fromordinal(cat.sub_start[s])
+            base = Decimal(cat.sub_amount_cents[s]) / 100
+            name = cat.client_names[client]
+            slug = name.lower().replace(" ", "")
+            xendit_sub = f"xsub-{sub_id.hex[:20]}" if method == SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION else None
+            n_cycles = cat.sub_cycles[s]
+
+            for k in range(n_cycles):
+                cycle_index = cat.sub_cycle_offset[s] + k
+                cycle_id = ids.uid("billing_cycle", cycle_index)
+                period_start = _add_months(start, step * k)
+                period_end = _add_months(start, step * (k + 1)) - timedelta(days=1)
+                due = period_start + timedelta(days=14)
+                status = self._cycle_status(rng, k == n_cycles - 1, sub_status)
+                quoted = _money(base)
+                amount = _money(base * (1 + PPN_RATE))
+                invoiced = status not in (BillingCycleStatus.PENDING, BillingCycleStatus.INVOICE_REQUESTED)
+                created = _at(period_start - timedelta(days=7), rng.randint(0, 86_399))
+
+                paid_at = None
+                if status == BillingCycleStatus.PAID:
+                    late = rng.random() < 0.18
+                    delta = rng.randint(1, 60) if late else -rng.randint(0, 13)
+                    paid_at = _at(due + timedelta(days=delta), rng.randint(0, 86_399))
+                overdue = (
+                    (paid_at is not None and paid_at.date() > due)
+                    or (status in (BillingCycleStatus.INVOICED, BillingCycleStatus.FAILED) and due < self.today)
+                )
+                last_reminder = None
+                if overdue and rng.random() < cfg.reminder_rate:
+                    n_reminders = rng.randint(1, 3)
+                    for r in range(n_reminders):
+                        sent_at = _at(due + timedelta(days=1 + 7 * r), 8 * 3600 + rng.randint(0, 3600))
+                        if paid_at is not None and sent_at > paid_at:
+                            break
+                        last_reminder = sent_at
+                        body = REMINDER_TEMPLATE.format(
+                            name=name,
+                            period=period_start.strftime("%B %Y"),
+                            currency=currency,
+                            amount=amount,
+                            due=due.isoformat(),
+                            link=f"https://checkout.xendit.co/web/{cycle_id.hex[:24]}",
+                        )
+                        writer.add("email_logs", (
+                            ids.uid("email_reminder", email_seq),
+                            EmailDirection.OUTBOUND.value,
+                            EmailRelatedType.REMINDER.value,
+                            cycle_id,
+                            None,
+                            "billing@cloudsales.id",
+                            f"finance@{slug}.co.id",
+                            f"Pengingat Pembayaran - {period_start.strftime('%B %Y')}",
+                            AI_MODELS[1],
+                            self._body(writer, PROMPT_TEMPLATE.format(kind="reminder pembayaran", name=name, context=f"tagihan {currency} {amount} jatuh tempo {due}")),
+                            self._body(writer, body),
+                            self._body(writer, body),
+                            EmailStatus.SENT.value,
+                            f"msg-r{email_seq:010d}",
+                            f"<msg-r{email_seq:010d}@mail.cloudsales.id>",
+                            False,
+                            None,
+                            sent_at,
+                            sent_at,
+                            sent_at,
+                        ))
+                        email_seq += 1
+
+                writer.add("billing_cycles", (
+                    cycle_id,
+                    sub_id,
+                    period_start,
+                    period_end,
+                    due,
+                    amount,
+                    currency,
+                    status.value,
+                    k == 0,
+                    quoted,
+                    f"INV/{period_start.year}/{cycle_index + 1:08d}" if invoiced else None,
+                    f"https://finance.example.com/invoices/{cycle_id.hex}.pdf" if invoiced else None,
+                    f"https://finance.example.com/faktur/{cycle_id.hex}.pdf" if invoiced and not usd else None,
+                    f"inv-{cycle_id.hex[:24]}" if invoiced and method != SubscriptionPaymentMethodType.MANUAL else None,
+                    last_reminder,
+                    created,
+                    paid_at or created,
+                ))
+
+                # Payments (percobaan gagal dulu kadang-kadang, lalu sukses)
+                attempts: List[PaymentStatus] = []
+                if status == BillingCycleStatus.PAID:
+                    if rng.random() < 0.08:
+                        attempts.append(PaymentStatus.FAILED)
+                    attempts.append(PaymentStatus.REFUNDED if rng.random() < 0.005 else PaymentStatus.SUCCESS)
+                elif status == BillingCycleStatus.FAILED:
+                    attempts.append(PaymentStatus.FAILED)
+                elif status == BillingCycleStatus.INVOICED and rng.random() < 0.3:
+                    attempts.append(PaymentStatus.PENDING)
+
+                for a, pay_status in enumerate(attempts):
+                    payment_id = ids.uid("payment", payment_seq)
+                    payment_seq += 1
+                    if method == SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION:
+                        pay_method = rng.choice(xendit_methods)
+                    elif method == SubscriptionPaymentMethodType.MANUAL and rng.random() < 0.7:
+                        pay_method = PaymentMethod.MANUAL
+                    elif method == SubscriptionPaymentMethodType.WALLET:
+                        pay_method = PaymentMethod.MANUAL
+                    else:
+                        pay_method = PaymentMethod.XENDIT_VA
+                    attempted_at = (
+                        paid_at - timedelta(days=len(attempts) - 1 - a) if paid_at is not None
+                        else _at(due, rng.randint(0, 86_399))
+                    )
+                    success = pay_status in (PaymentStatus.SUCCESS, PaymentStatus.REFUNDED)
+                    writer.add("payments", (
+                        payment_id,
+                        client_id,
+                        sub_id,
+                        cycle_id,
+                        amount,
+                        currency,
+                        pay_status.value,
+                        pay_method.value,
+                        f"pay-{payment_id.hex}" if pay_method != PaymentMethod.MANUAL else None,
+                        xendit_sub,
+                        attempted_at if success else None,
+                        rng.choice(FAILURE_REASONS) if pay_status == PaymentStatus.FAILED else None,
+                        attempted_at - timedelta(minutes=rng.randint(1, 30)),
+                        attempted_at,
+                    ))
+
+                    if success and method == SubscriptionPaymentMethodType.WALLET:
+                        writer.add("wallet_transactions", (
+                            ids.uid("wallet_transaction", wallet_seq),
+                            ids.uid("wallet", client),
+                            WalletTransactionType.CHARGE.value,
+                            WalletTransactionDirection.OUT.value,
+                            amount,
+                            WalletTransactionRelatedType.PAYMENT.value,
+                            payment_id,
+                            attempted_at,
+                        ))
+                        wallet_seq += 1
+                        if rng.random() < 0.35:
+                            writer.add("wallet_transactions", (
+                                ids.uid("wallet_transaction", wallet_seq),
+                                ids.uid("wallet", client),
+                                WalletTransactionType.TOPUP.value,
+                                WalletTransactionDirection.IN.value,
+                                _money(amount * rng.randint(1, 6)),
+                                WalletTransactionRelatedType.MANUAL.value,
+                                None,
+                                attempted_at - timedelta(days=rng.randint(1, 20)),
+                            ))
+                            wallet_seq += 1
+
+                    if pay_status == PaymentStatus.SUCCESS and rng.random() < cfg.payment_email_rate:
+                        body = PAYMENT_STATUS_TEMPLATE.format(
+                            name=name,
+                            currency=currency,
+                            amount=amount,
+                            period=period_start.strftime("%B %Y"),
+                            paid=attempted_at.date().isoformat(),
+                        )
+                        sent_at = attempted_at + timedelta(minutes=rng.randint(1, 120))
+                        writer.add("email_logs", (
+                            ids.uid("email_payment", email_seq),
+                            EmailDirection.OUTBOUND.value,
+                            EmailRelatedType.PAYMENT_STATUS.value,
+                            cycle_id,
+                            None,
+                            "billing@cloudsales.id",
+                            f"finance@{slug}.co.id",
+                            f"Pembayaran Diterima - {period_start.strftime('%B %Y')}",
+                            None,
+                            None,
+                            None,
+                            self._body(writer, body),
+                            EmailStatus.SENT.value if rng.random() < 0.995 else EmailStatus.FAILED.value,
+                            f"msg-p{email_seq:010d}",
+                            f"<msg-p{email_seq:010d}@mail.cloudsales.id>",
+                            False,
+                            None,
+                            sent_at,
+                            sent_at,
+                            sent_at,
+                        ))
+                        email_seq += 1
+
+    # ------------------------------------------------------------------
+    # Pass 6: webhook_events
+    # ------------------------------------------------------------------
+
+    def _webhooks(self, writer: ChunkedWriter) -> None:
+        rng = self._rng("webhooks")
+        cat = self.catalog
+        ids = self.ids
+        n_subs = len(cat.sub_client)
+        if not n_subs or not self.config.webhook_events:
+            return
+        total = self.config.webhook_events
+        # Event tersebar rata di 2 tahun terakhir, diurutkan menurut waktu diterima
+        window_seconds = 730 * 86_400
+        window_start = _at(self.today) - timedelta(seconds=window_seconds)
+        unprocessed_from = int(total * 0.99)
+
+        for e in range(total):
+            s = rng.randrange(n_subs)
+            n_cycles = cat.sub_cycles[s]
+            if not n_cycles:
+                continue
+            cycle_index = cat.sub_cycle_offset[s] + rng.randrange(n_cycles)
+            cycle_id = ids.uid("billing_cycle", cycle_index)
+            sub_id = ids.uid("subscription", s)
+            usd = cat.client_usd[cat.sub_client[s]]
+            event_type = _weighted(rng, WEBHOOK_EVENT_WEIGHTS)
+            method = SUB_METHODS[cat.sub_method[s]]
+            xendit_sub = f"xsub-{sub_id.hex[:20]}" if method == SubscriptionPaymentMethodType.XENDIT_SUBSCRIPTION else None
+            amount = _money(Decimal(cat.sub_amount_cents[s]) / 100 * (1 + PPN_RATE))
+            received = window_start + timedelta(seconds=window_seconds * e // total + rng.randint(0, 59))
+            event_id = ids.uid("webhook_event", e)
+
+            payload = {
+                "id": f"evt_{event_id.hex[:24]}",
+                "event": event_type.lower().replace("_", "."),
+                "business_id": "5f27a14a9bf05c73dd040bc8",
+                "created": received.isoformat(),
+                "data": {
+                    "id": f"inv-{cycle_id.hex[:24]}",
+                    "external_id": str(cycle_id),
+                    "amount": float(amount),
+                    "currency": "USD" if usd else "IDR",
+                    "status": "FAILED" if event_type == "PAYMENT_FAILED" else "PAID",
+                    "payment_method": rng.choice(("EWALLET", "CREDIT_CARD", "VIRTUAL_ACCOUNT")),
+                    "payer_email": f"finance@{cat.client_names[cat.sub_client[s]].lower().replace(' ', '')}.co.id",
+                },
+            }
+            if event_type == "PAYMENT_FAILED":
+                payload["data"]["failure_code"] = rng.choice(FAILURE_REASONS)
+            if event_type == "SUBSCRIPTION_CHARGED" and xendit_sub:
+                payload["data"]["recurring_plan_id"] = xendit_sub
+                payload["data"]["cycle_number"] = cycle_index - cat.sub_cycle_offset[s] + 1
+
+            processed = e < unprocessed_from
+            writer.add("webhook_events", (
+                event_id,
+                "XENDIT",
+                event_type,
+                payload,
+                xendit_sub,
+                f"inv-{cycle_id.hex[:24]}",
+                processed,
+                received + timedelta(seconds=rng.randint(1, 120)) if processed else None,
+                received,
+            ))
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def build_config(preset: str = "production", **overrides) -> SyntheticConfig:
+    """Gabungkan preset + override (nilai None diabaikan)."""
+    config = replace(SyntheticConfig(), **PRESETS[preset])
+    valid = {f.name for f in fields(SyntheticConfig)}
+    return replace(config, **{k: v for k, v in overrides.items() if k in valid and v is not None})
+
+
+def truncate_all(dbapi_connection) -> None:
+    with dbapi_connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE TABLE {', '.join(TABLE_ORDER)} CASCADE")
+
+
+def analyze_all(dbapi_connection) -> None:
+    with dbapi_connection.cursor() as cursor:
+        for table in TABLE_ORDER:
+            cursor.execute(f"ANALYZE {table}")
+
+
+def load_into_database(config: SyntheticConfig, database_url: Optional[str] = None, truncate: bool = False) -> Dict[str, int]:
+    """Generate + COPY ke database; dipakai CLI maupun benchmark suite."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core.config import settings
+    from app.models import base  # noqa: F401 — registrasi semua model
+    from app.services.document_numbers import sync_counters
+
+    engine = create_engine(database_url or settings.DATABASE_URL, future=True)
+    try:
+        raw = engine.raw_connection()
+        try:
+            if truncate:
+                truncate_all(raw)
+            sink = CopySink(raw)
+            counts = SyntheticDataGenerator(config).run(ChunkedWriter(sink, config.chunk_rows))
+            sink.commit()
+            raw.autocommit = True
+            analyze_all(raw)
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+        # Counter nomor quotation lanjut dari nomor hasil COPY
+        with Session(engine) as db:
+            sync_counters(db)
+            db.commit()
+        return counts
+    finally:
+        engine.dispose()
+
+
+def write_to_directory(config: SyntheticConfig, path: str) -> Dict[str, int]:
+    sink = DirectorySink(path)
+    counts = SyntheticDataGenerator(config).run(ChunkedWriter(sink, config.chunk_rows))
+    sink.commit()
+    return counts
+
+
+def _print_report(counts: Dict[str, int], elapsed: float) -> None:
+    total = sum(counts.values())
+    for table in TABLE_ORDER:
+        print(f"{table:<22} {counts[table]:>12,}")
+    print(f"{'TOTAL':<22} {total:>12,}  ({elapsed:.1f}s, {total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate dataset sintetis CloudSales.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--reference-date", type=date.fromisoformat)
+    for name in ("products", "clients", "staff_users", "subscriptions", "quotations",
+                 "billing_cycles", "webhook_events", "chunk_rows"):
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int)
+    parser.add_argument("--database-url", help="Default: settings.DATABASE_URL")
+    parser.add_argument("--truncate", action="store_true", help="Kosongkan semua tabel sebelum load")
+    parser.add_argument("--output-dir", help="Tulis file .tsv (format COPY) alih-alih load ke DB")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    overrides = vars(args)
+    config = build_config(overrides.pop("preset"), **overrides)
+    started = time.perf_counter()
+    if args.output_dir:
+        counts = write_to_directory(config, args.output_dir)
+    else:
+        counts = load_into_database(config, args.database_url, truncate=args.truncate)
+    _print_report(counts, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Fixture bersama.
+
+Test yang butuh PostgreSQL memakai fixture `db` dan di-skip bila
+`TEST_DATABASE_URL` tidak di-set (database harus sudah `alembic upgrade head`
+dan berisi data, mis. preset `tiny` dari `scripts.synthetic_data`). Semua
+perubahan di-rollback di akhir test.
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture
+def db():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL tidak di-set")
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.models import base  # noqa: F401 — registrasi semua model
+
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            transaction = connection.begin()
+            try:
+                with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+                    yield session
+            finally:
+                transaction.rollback()
+    finally:
+        engine.dispose()
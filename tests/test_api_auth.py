@@ -0,0 +1,43 @@
+"""Guard token endpoint internal (`require_api_token`): ditolak sebelum query DB."""
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import pytest
+
+from app.api.deps import require_api_token
+from app.core.config import settings
+from app.main import app
+
+PROTECTED = [
+    "/email-logs/search?q=tagihan",
+    "/clients/6f1c0c52-0000-4000-8000-000000000001/summary",
+    "/reports/mrr",
+    "/reports/ar-aging",
+    "/reports/ar-aging?format=csv&level=detail",
+]
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", PROTECTED)
+def test_rejected_when_token_unset(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "API_ACCESS_TOKEN", None)
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"X-Api-Token": ""}).status_code == 401
+
+
+@pytest.mark.parametrize("path", PROTECTED)
+def test_rejected_with_wrong_token(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "API_ACCESS_TOKEN", "s3cret")
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"X-Api-Token": "s3cret-x"}).status_code == 401
+
+
+def test_accepts_matching_token(monkeypatch):
+    monkeypatch.setattr(settings, "API_ACCESS_TOKEN", "s3cret")
+    assert require_api_token("s3cret") is None
+    with pytest.raises(HTTPException):
+        require_api_token("S3CRET")
@@ -0,0 +1,52 @@
+"""Store artifact (`app.services.artifacts`): client HTTP per loop & entry tanpa file."""
+
+import asyncio
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.artifact import Artifact
+from app.services.artifacts import ArtifactStore, StoredArtifact
+
+
+async def current_client(store):
+    return store._http()
+
+
+def test_client_from_running_loop_closed_when_loop_changes(tmp_path):
+    store = ArtifactStore(str(tmp_path), 1024, session_factory=None)
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        first = asyncio.run_coroutine_threadsafe(current_client(store), other).result()
+        second = asyncio.run(current_client(store))
+        assert second is not first
+        # aclose dijadwalkan di loop pemilik client lama
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other).result()
+        assert first.is_closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+
+
+def test_client_reused_within_loop(tmp_path):
+    store = ArtifactStore(str(tmp_path), 1024, session_factory=None)
+
+    async def twice():
+        return store._http(), store._http()
+
+    first, second = asyncio.run(twice())
+    assert first is second
+
+
+def test_lookup_drops_entry_whose_file_is_gone(db, tmp_path):
+    factory = sessionmaker(bind=db.connection(), join_transaction_mode="create_savepoint")
+    store = ArtifactStore(str(tmp_path), 10 * 1024 * 1024, factory)
+    url = "https://example.com/hilang.pdf"
+    store.register(StoredArtifact(url, "ab" * 32, store.path_for("ab" * 32), 10, "application/pdf"))
+
+    assert store.lookup(url) is None
+    assert db.scalar(select(Artifact).where(Artifact.url == url)) is None
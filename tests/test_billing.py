@@ -0,0 +1,34 @@
+"""Billing run (`app.services.billing`): hari anchor bertahan setelah di-clamp."""
+
+from datetime import date
+
+from sqlalchemy import select, update
+
+from app.models.subscription import BillingPeriod, Subscription, SubscriptionStatus
+from app.services.billing import run_billing_batch
+from app.services.exchange_rates import ExchangeRateCache
+
+
+def test_anchor_day_survives_short_month(db):
+    subscription_id = db.scalar(select(Subscription.id).where(Subscription.currency == "USD").limit(1))
+    # Paling awal di antara subscription jatuh tempo, jadi batch 1 mengambil yang ini
+    db.execute(
+        update(Subscription)
+        .where(Subscription.id == subscription_id)
+        .values(
+            status=SubscriptionStatus.ACTIVE,
+            billing_period=BillingPeriod.MONTHLY,
+            next_billing_date=date(2000, 1, 31),
+            billing_anchor_day=None,
+            end_date=None,
+        )
+    )
+    rates = ExchangeRateCache.snapshot(db, pivot="USD")
+
+    dates = []
+    for _ in range(3):
+        assert run_billing_batch(db, date(2000, 4, 1), batch_size=1, rates=rates) == 1
+        db.expire_all()
+        subscription = db.get(Subscription, subscription_id)
+        dates.append((subscription.next_billing_date, subscription.billing_anchor_day))
+    assert dates == [(date(2000, 2, 29), 31), (date(2000, 3, 31), 31), (date(2000, 4, 30), 31)]
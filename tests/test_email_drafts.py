@@ -0,0 +1,27 @@
+"""Drafting LLM (`app.services.email_drafts`): collapsing request yang sama."""
+
+import asyncio
+import uuid
+
+from app.integrations.llm import FakeLlmClient
+from app.services.email_drafts import DraftingService, DraftRequest
+
+
+def test_cancelled_caller_does_not_cancel_shared_draft(db):
+    client = FakeLlmClient(latency_ms=100, per_item_ms=0)
+    service = DraftingService(client, "fake-model", batch_wait_ms=1)
+    # Konteks unik: tidak ada di cache DB
+    request = DraftRequest("payment_reminder", context={"period": uuid.uuid4().hex, "due_state": "lewat 3 hari"})
+
+    async def run():
+        first = asyncio.ensure_future(service.draft(db, request))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(service.draft(db, request))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return first, await second
+
+    first, draft = asyncio.run(run())
+    assert first.cancelled()
+    assert draft.body.startswith("Yth. {{client_name}}")
+    assert client.calls == 1
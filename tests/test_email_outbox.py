@@ -0,0 +1,87 @@
+"""Worker outbox (`app.services.email_outbox`): lease claim & kegagalan per email."""
+
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import select, update
+
+from app.models.email_log import EmailDirection, EmailLog, EmailRelatedType, EmailStatus
+from app.services.artifacts import ArtifactError
+from app.services.email_outbox import SenderRateLimiter, claim_drafts, process_outbox
+
+
+class FakeProvider:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, email):
+        self.sent.append(email)
+        return f"msg-{len(self.sent)}"
+
+    async def aclose(self):
+        pass
+
+
+class FakeArtifacts:
+    """`get` gagal untuk URL tertentu: ArtifactError (terduga) atau ValueError (bug)."""
+
+    async def get(self, url):
+        if url.endswith("missing.pdf"):
+            raise ArtifactError(f"404: {url}")
+        if url.endswith("broken.pdf"):
+            raise ValueError("metadata rusak")
+        raise AssertionError(url)
+
+
+def make_drafts(db, attachment_urls):
+    # Draft lama di database tidak ikut di-claim
+    db.execute(update(EmailLog).where(EmailLog.status == EmailStatus.DRAFT).values(status=EmailStatus.FAILED))
+    logs = []
+    for index, url in enumerate(attachment_urls):
+        log = EmailLog(
+            direction=EmailDirection.OUTBOUND,
+            related_type=EmailRelatedType.OTHER,
+            from_email="billing@example.com",
+            to_email=f"client{index}@example.com",
+            subject=f"Test {index}",
+            status=EmailStatus.DRAFT,
+            attachments_meta_json=[{"url": url, "filename": "x.pdf"}] if url else None,
+        )
+        log.final_body = f"Isi email {index}"
+        db.add(log)
+        logs.append(log)
+    db.flush()
+    return [log.id for log in logs]
+
+
+def test_claim_sets_lease_and_skips_leased_rows(db):
+    ids = make_drafts(db, [None, None, None])
+    # created_at sama (satu transaksi), jadi urutan claim tidak ditentukan
+    first = claim_drafts(db, limit=2)
+    second = claim_drafts(db, limit=10)
+    assert (len(first), len(second)) == (2, 1)
+    assert {item.email_log_id for item in first + second} == set(ids)
+    assert {item.email.body for item in first + second} == {"Isi email 0", "Isi email 1", "Isi email 2"}
+    assert claim_drafts(db, limit=10) == []
+    # Lease kedaluwarsa → di-claim ulang
+    db.execute(update(EmailLog).where(EmailLog.id == ids[0]).values(send_lease_until=None))
+    assert [item.email_log_id for item in claim_drafts(db, limit=10)] == ids[:1]
+
+
+def test_attachment_error_fails_only_that_email(db):
+    ids = make_drafts(db, [None, "https://files.example.com/missing.pdf", "https://files.example.com/broken.pdf", None])
+    provider = FakeProvider()
+    result = asyncio.run(
+        process_outbox(db, provider, SenderRateLimiter(1000, 1000), commit=False, artifacts=FakeArtifacts())
+    )
+    assert (result.sent, result.failed) == (2, 2)
+    assert sorted(email.to_email for email in provider.sent) == ["client0@example.com", "client3@example.com"]
+    db.expire_all()
+    rows = {log.id: log for log in db.scalars(select(EmailLog).where(EmailLog.id.in_(ids)))}
+    assert [rows[id_].status for id_ in ids] == [EmailStatus.SENT, EmailStatus.FAILED, EmailStatus.FAILED, EmailStatus.SENT]
+    assert all(log.send_lease_until is None for log in rows.values())
+    assert rows[ids[0]].gmail_message_id is not None
+    # Message-ID yang dikirim disimpan untuk threading balasan
+    sent = {email.to_email: email.message_id for email in provider.sent}
+    assert rows[ids[0]].rfc_message_id == sent["client0@example.com"]
+    assert rows[ids[0]].rfc_message_id.startswith("<")
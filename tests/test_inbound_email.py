@@ -0,0 +1,56 @@
+"""Ingestion inbound (`app.services.inbound_email`): parsing & matching balasan."""
+
+from email.message import EmailMessage
+import uuid
+
+from app.models.email_log import EmailDirection, EmailLog, EmailRelatedType, EmailStatus
+from app.services.inbound_email import ParsedMessage, _resolve_batch, parse_message
+
+
+def test_parse_message_reads_rfc_ids(tmp_path):
+    message = EmailMessage()
+    message["From"] = "Klien <Finance@Klien.co.id>"
+    message["To"] = "billing@cloudsales.id"
+    message["Subject"] = "Re: Pengingat"
+    message["Message-ID"] = "<balasan-1@klien.co.id>"
+    message["In-Reply-To"] = "<asal-1@cloudsales.id>"
+    message["References"] = "<awal@cloudsales.id> <asal-1@cloudsales.id>"
+    message.set_content("Baik, segera kami bayar.")
+    parsed = parse_message("gmail-123", "thread-9", bytes(message), str(tmp_path))
+    assert parsed.error is None
+    assert parsed.message_id == "gmail-123"
+    assert parsed.rfc_message_id == "<balasan-1@klien.co.id>"
+    assert parsed.references == ["<asal-1@cloudsales.id>", "<awal@cloudsales.id>", "<asal-1@cloudsales.id>"]
+    assert parsed.from_email == "finance@klien.co.id"
+
+
+def test_replies_match_on_rfc_message_id(db):
+    cycle_id = uuid.uuid4()
+    outbound = EmailLog(
+        direction=EmailDirection.OUTBOUND,
+        related_type=EmailRelatedType.REMINDER,
+        related_id=cycle_id,
+        from_email="billing@cloudsales.id",
+        to_email="finance@klien.co.id",
+        subject="Pengingat",
+        status=EmailStatus.SENT,
+        gmail_message_id=f"gmail-{cycle_id.hex}",
+        rfc_message_id=f"<{cycle_id.hex}@cloudsales.id>",
+    )
+    db.add(outbound)
+    db.flush()
+    messages = [
+        # Thread baru, hanya In-Reply-To yang menunjuk email kita
+        ParsedMessage(f"in-1-{cycle_id.hex}", "thread-baru", references=[f"<{cycle_id.hex}@cloudsales.id>"]),
+        # Id Gmail API bukan Message-ID: tidak boleh dicocokkan lewat References
+        ParsedMessage(f"in-2-{cycle_id.hex}", "thread-lain", references=[f"gmail-{cycle_id.hex}"]),
+        # Thread Gmail yang dimulai email kita
+        ParsedMessage(f"in-3-{cycle_id.hex}", f"gmail-{cycle_id.hex}"),
+    ]
+    _, logs, matched = _resolve_batch(db, messages)
+    assert matched == 2
+    assert [(log.related_type, log.related_id) for log in logs] == [
+        (EmailRelatedType.REMINDER, cycle_id),
+        (EmailRelatedType.CLIENT_MAIL, None),
+        (EmailRelatedType.REMINDER, cycle_id),
+    ]
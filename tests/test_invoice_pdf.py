@@ -0,0 +1,89 @@
+"""Writer PDF draft invoice (`app.services.invoice_pdf`): struktur file & paginasi."""
+
+from datetime import date
+from decimal import Decimal
+import hashlib
+import re
+
+from app.services.artifacts import blob_path
+from app.services.invoice_pdf import (
+    LINES_PER_PAGE,
+    InvoiceDocument,
+    InvoiceLine,
+    invoice_lines,
+    paginate,
+    render_pdf,
+    render_to_store,
+)
+
+
+def make_document(line_count: int) -> InvoiceDocument:
+    return InvoiceDocument(
+        cycle_id="6f1c0c52-0000-4000-8000-000000000001",
+        client_name="PT Contoh (Jakarta)",
+        legal_name=None,
+        billing_address="Jl. Sudirman 1\nJakarta\\Selatan",
+        tax_number="01.234.567.8-901.000",
+        period_start=date(2026, 1, 1),
+        period_end=date(2026, 1, 31),
+        due_date=date(2026, 1, 15),
+        currency="IDR",
+        amount=Decimal("1234567.89") * line_count,
+        lines=[
+            InvoiceLine(f"Workspace → seat {index}", 3, Decimal("1234567.89") / 3, Decimal("1234567.89"))
+            for index in range(line_count)
+        ],
+    )
+
+
+def check_structure(pdf: bytes, pages: int) -> None:
+    assert pdf.startswith(b"%PDF-1.4\n")
+    assert pdf.endswith(b"%%EOF\n")
+    # startxref menunjuk ke tabel xref
+    xref_at = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+    assert pdf[xref_at:].startswith(b"xref\n")
+    # Tiap offset xref menunjuk ke "N 0 obj"
+    table = pdf[xref_at:].split(b"trailer", 1)[0].splitlines()
+    size = int(table[1].split()[1])
+    offsets = [int(entry.split()[0]) for entry in table[3:3 + size - 1]]
+    assert len(offsets) == size - 1 == 3 + 2 * pages
+    for number, offset in enumerate(offsets, start=1):
+        assert pdf[offset:].startswith(f"{number} 0 obj\n".encode())
+    # /Length sama dengan panjang stream sebenarnya
+    streams = re.findall(rb"<< /Length (\d+) >>\nstream\n(.*?)\nendstream", pdf, re.S)
+    assert len(streams) == pages
+    assert all(int(length) == len(data) for length, data in streams)
+    assert f"/Count {pages} >>".encode() in pdf
+
+
+def test_single_page_invoice():
+    pdf, pages = render_pdf(make_document(3))
+    assert pages == 1
+    check_structure(pdf, pages)
+    # Kurung & backslash di-escape, karakter di luar cp1252 diganti
+    assert b"(Kepada   : PT Contoh \\(Jakarta\\)) '" in pdf
+    assert b"Jakarta\\\\Selatan" in pdf
+    assert b"NPWP     : 01.234.567.8-901.000" in pdf
+    assert b"(Workspace ? seat 0 " in pdf
+    assert b"Halaman 1 dari 1" in pdf
+
+
+def test_long_invoice_is_paginated():
+    document = make_document(150)
+    lines = invoice_lines(document)
+    pages = paginate(lines)
+    assert [line for page in pages for line in page] == lines
+    assert all(len(page) <= LINES_PER_PAGE for page in pages)
+    pdf, count = render_pdf(document)
+    assert count == len(pages) > 2
+    check_structure(pdf, count)
+    assert f"Halaman {count} dari {count}".encode() in pdf
+
+
+def test_render_to_store_writes_content_addressed_blob(tmp_path):
+    document = make_document(60)
+    pdf, pages = render_pdf(document)
+    rendered = render_to_store(str(tmp_path), document)
+    assert rendered.sha256 == hashlib.sha256(pdf).hexdigest()
+    assert (rendered.size_bytes, rendered.pages) == (len(pdf), pages)
+    assert blob_path(str(tmp_path), rendered.sha256).read_bytes() == pdf
@@ -0,0 +1,80 @@
+"""Aturan pembulatan quotation: `price_line` / `price_quotation` vs `reprice_quotations` (SQL)."""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.models.quotation import Quotation, QuotationItem, QuotationStatus
+from app.services.pricing import LinePrice, PricingError, price_line, price_quotation, rate, reprice_quotations
+
+
+def test_price_line_rounds_half_up():
+    line = price_line(1, Decimal("0.125"), 0, Decimal("1"))
+    assert line.subtotal_amount == Decimal("0.13")
+    # 10.00 × 3 × 0.85 = 25.50; 10.00 × 16250.5 = 162505.00
+    line = price_line(3, Decimal("10.00"), Decimal("15"), Decimal("16250.5"))
+    assert line == LinePrice(Decimal("162505.00"), Decimal("25.50"), Decimal("414387.75"))
+
+
+def test_subtotal_client_uses_printed_unit_price():
+    # unit_price_client = round(0.33 × 1.015, 2) = 0.33; subtotal × kurs akan 33.50
+    line = price_line(100, Decimal("0.33"), 0, Decimal("1.015"))
+    assert line.unit_price_client == Decimal("0.33")
+    assert line.subtotal_amount_client == Decimal("33.00")
+
+
+def test_rate_rounded_to_six_decimals():
+    assert rate("15234.1234565") == Decimal("15234.123457")
+    with pytest.raises(PricingError):
+        rate(0)
+
+
+@pytest.mark.parametrize("quantity, discount", [(-1, 0), (1, -1), (1, 101)])
+def test_price_line_rejects_invalid_items(quantity, discount):
+    with pytest.raises(PricingError):
+        price_line(quantity, Decimal("1"), discount, Decimal("1"))
+
+
+def test_price_quotation_total_is_sum_of_rounded_lines():
+    quotation = Quotation(
+        exchange_rate=Decimal("1"),
+        items=[QuotationItem(quantity=1, unit_price=Decimal("0.01"), discount_percent=Decimal("50")) for _ in range(2)],
+    )
+    price_quotation(quotation, Decimal("3.3333333"))
+    # Tiap baris 0.005 → 0.01; total dari baris yang sudah dibulatkan (bukan round(0.01))
+    assert quotation.total_amount == Decimal("0.02")
+    assert quotation.exchange_rate == Decimal("3.333333")
+    assert [item.unit_price_client for item in quotation.items] == [Decimal("0.03")] * 2
+    assert quotation.total_amount_client == Decimal("0.04")
+
+
+def test_reprice_quotations_matches_price_line(db):
+    statuses = (QuotationStatus.DRAFT, QuotationStatus.SENT)
+    new_rate = Decimal("16123.4567891")
+    reprice_quotations(
+        db, new_rate, currency="USD", client_currency="IDR", statuses=statuses, batch_size=7, commit=False
+    )
+    db.expire_all()
+    quotations = db.scalars(
+        select(Quotation).where(
+            Quotation.status.in_([status.value for status in statuses]),
+            Quotation.currency == "USD",
+            Quotation.client_currency == "IDR",
+        )
+    ).all()
+    if not quotations:
+        pytest.skip("Tidak ada quotation DRAFT/SENT USD→IDR")
+    for quotation in quotations:
+        assert quotation.exchange_rate == rate(new_rate)
+        total = total_client = Decimal(0)
+        for item in quotation.items:
+            line = price_line(item.quantity, item.unit_price, item.discount_percent, quotation.exchange_rate)
+            assert (item.unit_price_client, item.subtotal_amount, item.subtotal_amount_client) == (
+                line.unit_price_client,
+                line.subtotal_amount,
+                line.subtotal_amount_client,
+            )
+            total += line.subtotal_amount
+            total_client += line.subtotal_amount_client
+        assert (quotation.total_amount, quotation.total_amount_client) == (total, total_client)
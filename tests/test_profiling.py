@@ -0,0 +1,74 @@
+"""Profiling request (`app.core.profiling`): atribusi stack per request."""
+
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from app.core import profiling
+from app.core.profiling import ProfilingMiddleware, configure_profiling
+
+
+def _busy_sync(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _busy_async(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _busy_background(stop: threading.Event) -> None:
+    while not stop.is_set():
+        pass
+
+
+@pytest.fixture
+def client(tmp_path):
+    configure_profiling(str(tmp_path), interval_ms=1.0)
+    api = FastAPI()
+
+    @api.get("/sync")
+    def sync_endpoint():
+        _busy_sync(0.15)
+        return {}
+
+    @api.get("/async")
+    async def async_endpoint():
+        _busy_async(0.15)
+        return {}
+
+    api.add_middleware(ProfilingMiddleware, token="s3cret")
+    yield TestClient(api)
+    configure_profiling("logs/profiles", interval_ms=5.0)
+
+
+def _functions(output_dir, profile_id):
+    text = (output_dir / f"{profile_id}.collapsed").read_text(encoding="utf-8")
+    return {frame.split(" (", 1)[0] for line in text.splitlines() for frame in line.rsplit(" ", 1)[0].split(";")}
+
+
+@pytest.mark.parametrize("path, function", [("/sync", "_busy_sync"), ("/async", "_busy_async")])
+def test_profiles_only_the_request(client, tmp_path, path, function):
+    stop = threading.Event()
+    background = threading.Thread(target=_busy_background, args=(stop,), daemon=True)
+    background.start()
+    try:
+        response = client.get(path, headers={"X-Profile": "s3cret"})
+    finally:
+        stop.set()
+        background.join()
+    functions = _functions(tmp_path, response.headers["x-profile-id"])
+    assert function in functions
+    assert "_busy_background" not in functions
+
+
+def test_wrong_token_not_profiled(client):
+    assert "x-profile-id" not in client.get("/sync", headers={"X-Profile": "s3cret-x"}).headers
+    assert "x-profile-id" not in client.get("/sync").headers
+    assert profiling.triggers.status()["remaining"] == 0
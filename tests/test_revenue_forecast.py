@@ -0,0 +1,186 @@
+"""
+Proyeksi NumPy (`project_billed`) harus sama dengan simulasi billing run per
+baris memakai `add_billing_period` (aturan yang dipakai `run_billing_batch`).
+"""
+
+import calendar
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.models.subscription import BillingPeriod
+from app.services.billing import add_billing_period
+from app.services.revenue_forecast import (
+    DEFAULT_COLLECTION_RATE,
+    CollectionHistory,
+    ForecastError,
+    ForecastLines,
+    collection_rates,
+    month_date,
+    month_index,
+    project_billed,
+)
+
+NO_END_MONTH = 2147483647
+START = date(2026, 1, 1)
+
+
+def anchor_day(row) -> int:
+    return row[5] if len(row) > 5 else row[1].day
+
+
+def make_lines(rows) -> ForecastLines:
+    """
+    rows: (key, next_billing_date, end_date | None, period_months, amount[, anchor_day]),
+    terurut per key. Tanpa anchor_day → hari next_billing_date.
+    """
+    keys = sorted({row[0] for row in rows})
+    return ForecastLines(
+        key=np.array([row[0] for row in rows], dtype=np.int64),
+        next_month=np.array([month_index(row[1]) for row in rows], dtype=np.int64),
+        next_day=np.array([row[1].day for row in rows], dtype=np.int64),
+        anchor_day=np.array([anchor_day(row) for row in rows], dtype=np.int64),
+        end_month=np.array([month_index(row[2]) if row[2] else NO_END_MONTH for row in rows], dtype=np.int64),
+        end_day=np.array([row[2].day if row[2] else 31 for row in rows], dtype=np.int64),
+        period_months=np.array([row[3] for row in rows], dtype=np.int64),
+        amount=np.array([row[4] for row in rows], dtype=np.float64),
+        client_ids=np.array([f"client-{key}" for key in keys], dtype=object),
+        product_ids=np.array([f"product-{key}" for key in keys], dtype=object),
+        currencies=np.array(["IDR"] * len(keys), dtype=object),
+    )
+
+
+def simulate_billing_run(rows, start: date, horizon: int) -> np.ndarray:
+    """Tagihan per key × bulan: tagih di next_billing_date, maju dengan `add_billing_period`."""
+    keys = sorted({row[0] for row in rows})
+    billed = np.zeros((len(keys), horizon))
+    first = month_index(start)
+    for row in rows:
+        key, billing_date, end_date, period, amount = row[:5]
+        billing_period = BillingPeriod.YEARLY if period == 12 else BillingPeriod.MONTHLY
+        while True:
+            # Tagihan yang tertinggal ditagih di bulan pertama
+            offset = max(month_index(billing_date) - first, 0)
+            if offset >= horizon or (end_date is not None and billing_date > end_date):
+                break
+            billed[keys.index(key), offset] += amount
+            billing_date = add_billing_period(billing_date, billing_period, anchor_day(row))
+    return billed
+
+
+def random_date(rng, first_month: int, last_month: int) -> date:
+    month = month_date(int(rng.integers(first_month, last_month + 1)))
+    return month.replace(day=int(rng.integers(1, calendar.monthrange(month.year, month.month)[1] + 1)))
+
+
+def random_rows(seed: int, count: int):
+    rng = np.random.default_rng(seed)
+    start = month_index(START)
+    rows = []
+    key = 0
+    for _ in range(count):
+        # Beberapa baris per key (subscription berbeda, client × produk sama)
+        if rng.random() < 0.6:
+            key += 1
+        next_date = random_date(rng, start - 30, start + 14)
+        end_date = None
+        if rng.random() < 0.5:
+            end_date = random_date(rng, month_index(next_date) - 2, start + 30)
+        period = 12 if rng.random() < 0.3 else 1
+        # Sebagian next_billing_date sudah di-clamp dari anchor 29–31
+        anchor = int(rng.integers(29, 32)) if next_date.day >= 28 and rng.random() < 0.5 else next_date.day
+        rows.append((key, next_date, end_date, period, float(rng.integers(1, 1000)), anchor))
+    return rows
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_project_billed_matches_billing_run(seed):
+    rows = random_rows(seed, 3000)
+    for horizon in (1, 12, 18):
+        np.testing.assert_allclose(
+            project_billed(make_lines(rows), START, horizon), simulate_billing_run(rows, START, horizon)
+        )
+
+
+@pytest.mark.parametrize(
+    "next_date, end_date, period",
+    [
+        # Hari 29–31 di-clamp ke akhir bulan pendek saja
+        (date(2026, 1, 31), None, 1),
+        (date(2026, 1, 29), None, 1),
+        (date(2024, 2, 29), None, 12),
+        # end_date di bulan tagihan: sebelum / sesudah / tepat di hari tagih
+        (date(2026, 1, 31), date(2026, 3, 30), 1),
+        (date(2026, 1, 31), date(2026, 3, 31), 1),
+        (date(2026, 1, 31), date(2026, 2, 27), 1),
+        (date(2026, 1, 31), date(2026, 2, 28), 1),
+        (date(2026, 1, 31), date(2026, 4, 29), 1),
+        (date(2026, 1, 31), date(2026, 4, 30), 1),
+        (date(2026, 1, 31), date(2026, 1, 30), 1),
+        (date(2026, 1, 31), date(2026, 1, 31), 1),
+        # Tertinggal beberapa periode, end_date sudah lewat di tengah ketertinggalan
+        (date(2025, 3, 30), date(2025, 9, 15), 1),
+        (date(2025, 3, 30), None, 1),
+        (date(2020, 5, 31), date(2027, 5, 28), 12),
+        # Mulai setelah horizon
+        (date(2028, 1, 1), None, 1),
+    ],
+)
+def test_project_billed_edge_cases(next_date, end_date, period):
+    rows = [(0, next_date, end_date, period, 100.0)]
+    np.testing.assert_allclose(project_billed(make_lines(rows), START, 12), simulate_billing_run(rows, START, 12))
+
+
+@pytest.mark.parametrize(
+    "next_date, anchor, end_date",
+    [
+        # next_billing_date sudah di-clamp ke akhir Februari, anchor tetap 29–31
+        (date(2026, 2, 28), 31, None),
+        (date(2026, 2, 28), 30, date(2026, 4, 29)),
+        (date(2026, 2, 28), 30, date(2026, 4, 30)),
+        (date(2028, 2, 29), 31, date(2028, 3, 30)),
+    ],
+)
+def test_project_billed_keeps_anchor_after_clamp(next_date, anchor, end_date):
+    rows = [(0, next_date, end_date, 1, 100.0, anchor)]
+    np.testing.assert_allclose(project_billed(make_lines(rows), START, 12), simulate_billing_run(rows, START, 12))
+
+
+def test_add_billing_period_clamps_per_month():
+    dates = [date(2026, 1, 31)]
+    for _ in range(4):
+        dates.append(add_billing_period(dates[-1], BillingPeriod.MONTHLY, 31))
+    assert dates == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30), date(2026, 5, 31)]
+    assert add_billing_period(date(2024, 2, 29), BillingPeriod.YEARLY) == date(2025, 2, 28)
+    assert add_billing_period(date(2025, 2, 28), BillingPeriod.YEARLY, 29) == date(2026, 2, 28)
+    assert add_billing_period(date(2027, 2, 28), BillingPeriod.YEARLY, 29) == date(2028, 2, 29)
+
+
+def test_project_billed_rejects_empty_horizon():
+    with pytest.raises(ForecastError):
+        project_billed(make_lines([(0, START, None, 1, 1.0)]), START, 0)
+
+
+def test_collection_rates_smoothed_to_currency_average():
+    history = CollectionHistory(
+        labels=np.array(["a|IDR", "b|IDR", "c|USD"]),
+        cycles=np.array([2.0, 10.0, 4.0]),
+        billed=np.array([100.0, 300.0, 50.0]),
+        collected=np.array([0.0, 300.0, 60.0]),
+    )
+    rates = collection_rates(
+        history,
+        np.array(["a", "b", "new", "c", "x"], dtype=object),
+        np.array(["IDR", "IDR", "IDR", "USD", "EUR"], dtype=object),
+        prior_cycles=6.0,
+    )
+    idr = 300.0 / 400.0
+    expected = [
+        (2 * 0.0 + 6 * idr) / 8,
+        (10 * 1.0 + 6 * idr) / 16,
+        idr,
+        1.0,  # 60 / 50 = 1.2, dibatasi ke 1
+        DEFAULT_COLLECTION_RATE,
+    ]
+    np.testing.assert_allclose(rates, expected)
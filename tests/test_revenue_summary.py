@@ -0,0 +1,25 @@
+"""Ringkasan MRR inkremental (`app.services.revenue_summary`): seed bulan baru."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select
+
+from app.models.revenue import RevenueDirtySubscription, RevenueSummary, SubscriptionRevenue
+from app.services.revenue_summary import refresh_dirty
+
+
+def test_new_month_seeded_with_empty_queue(db):
+    db.execute(delete(RevenueDirtySubscription))
+    now = datetime(2099, 3, 15, tzinfo=timezone.utc)
+    result = refresh_dirty(db, now=now, commit=False)
+    assert (result.batches, result.subscriptions) == (0, 0)
+
+    month = now.date().replace(day=1)
+    summary = db.execute(
+        select(func.count(), func.coalesce(func.sum(RevenueSummary.subscriptions), 0)).where(RevenueSummary.month == month)
+    ).one()
+    contributions = db.scalar(select(func.count()).select_from(SubscriptionRevenue))
+    assert result.seeded_rows == summary[0] > 0
+    assert summary[1] == contributions
+    # Refresh berikutnya di bulan yang sama tidak men-seed ulang
+    assert refresh_dirty(db, now=now, commit=False).seeded_rows == 0
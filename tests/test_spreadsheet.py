@@ -0,0 +1,92 @@
+"""Writer CSV & XLSX streaming (`app.services.spreadsheet`)."""
+
+import csv
+from datetime import date, datetime
+from decimal import Decimal
+import io
+import xml.etree.ElementTree as ElementTree
+import zipfile
+
+from app.services.spreadsheet import csv_chunks, xlsx_chunks
+
+NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+ROWS = [
+    ("INV-1", Decimal("1250.50"), 3, date(2026, 1, 31), datetime(2026, 2, 1, 8, 30, 15), True, None),
+    ('PT "Maju" & <Co>', 0.25, -1, None, None, False, "baris\x00kontrol\x1f"),
+]
+
+
+def read_sheet(data: bytes):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert {
+            "[Content_Types].xml",
+            "_rels/.rels",
+            "xl/workbook.xml",
+            "xl/_rels/workbook.xml.rels",
+            "xl/styles.xml",
+            "xl/worksheets/sheet1.xml",
+        } <= set(archive.namelist())
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    rows = []
+    for row in sheet.iterfind("s:sheetData/s:row", NS):
+        cells = []
+        for cell in row.iterfind("s:c", NS):
+            kind = cell.get("t")
+            if kind == "inlineStr":
+                cells.append(cell.find("s:is/s:t", NS).text or "")
+            elif kind == "b":
+                cells.append(cell.find("s:v", NS).text == "1")
+            elif cell.find("s:v", NS) is not None:
+                cells.append(Decimal(cell.find("s:v", NS).text))
+            else:
+                cells.append(None)
+        rows.append(cells)
+    return workbook.find("s:sheets/s:sheet", NS).get("name"), rows
+
+
+def test_xlsx_cells_roundtrip():
+    name, rows = read_sheet(b"".join(xlsx_chunks('Aging "AR"', ("a", "b", "c", "d", "e", "f", "g"), ROWS)))
+    assert name == 'Aging "AR"'
+    assert rows == [
+        ["a", "b", "c", "d", "e", "f", "g"],
+        ["INV-1", Decimal("1250.50"), Decimal(3), "2026-01-31", "2026-02-01 08:30:15", True, None],
+        ['PT "Maju" & <Co>', Decimal("0.25"), Decimal(-1), None, None, False, "bariskontrol"],
+    ]
+
+
+def test_xlsx_streams_in_chunks():
+    rows = [(index, f"client {index}") for index in range(5000)]
+    chunks = list(xlsx_chunks("Sheet", ("id", "nama"), iter(rows), chunk_rows=1000))
+    # Header zip + satu chunk per 1000 baris + penutup
+    assert len(chunks) >= 6
+    _, parsed = read_sheet(b"".join(chunks))
+    assert len(parsed) == 5001
+    assert parsed[-1] == [Decimal(4999), "client 4999"]
+
+
+def test_csv_matches_single_shot_writer():
+    rows = [(index, f"nama, {index}", Decimal("1.50"), date(2026, 1, 1), None) for index in range(25)]
+    chunks = list(csv_chunks(("id", "nama", "nilai", "tanggal", "kosong"), rows, chunk_rows=10))
+    assert len(chunks) == 3
+    data = b"".join(chunks).decode("utf-8")
+    assert data.startswith("\ufeff")
+    parsed = list(csv.reader(io.StringIO(data[1:])))
+    assert parsed[0] == ["id", "nama", "nilai", "tanggal", "kosong"]
+    assert parsed[1:] == [[str(index), f"nama, {index}", "1.50", "2026-01-01", ""] for index in range(25)]
+
+
+def test_csv_escapes_formula_text_but_not_numbers():
+    rows = [
+        ("=HYPERLINK(\"http://x\")", Decimal("-12.50"), -3),
+        ("+62 812", "@SUM(A1)", "-1+1"),
+        ("\tTAB", "\rCR", "PT Normal"),
+    ]
+    data = b"".join(csv_chunks(("a", "b", "c"), rows)).decode("utf-8")
+    parsed = list(csv.reader(io.StringIO(data[1:], newline="")))
+    assert parsed[1:] == [
+        ["'=HYPERLINK(\"http://x\")", "-12.50", "-3"],
+        ["'+62 812", "'@SUM(A1)", "'-1+1"],
+        ["'\tTAB", "'\rCR", "PT Normal"],
+    ]
@@ -0,0 +1,80 @@
+"""Tracing: span route HTTP & propagasi `traceparent` webhook → provisioning."""
+
+from fastapi.testclient import TestClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind
+import pytest
+from sqlalchemy import select, update
+
+from app.main import app
+from app.models.provisioning_task import (
+    ProvisioningAction,
+    ProvisioningStatus,
+    ProvisioningTargetSystem,
+    ProvisioningTask,
+)
+from app.models.subscription import SubscriptionItem
+from app.models.webhook_event import WebhookEvent
+from app.services.provisioning import create_task, execute_pending
+from app.services.webhook_events import process_events
+
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+@pytest.fixture(scope="module")
+def spans():
+    # Provider global hanya bisa di-set sekali per proses
+    exporter = InMemorySpanExporter()
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    yield exporter
+    exporter.clear()
+
+
+def test_route_span_emitted_with_caller_context(spans):
+    spans.clear()
+    with TestClient(app) as client:
+        # 401 dari dependency token: tidak butuh database
+        response = client.get("/reports/mrr", headers={"traceparent": TRACEPARENT})
+    assert response.status_code == 401
+    server = [span for span in spans.get_finished_spans() if span.kind == SpanKind.SERVER]
+    assert len(server) == 1
+    assert server[0].name == "GET /reports/mrr"
+    assert server[0].attributes["http.route"] == "/reports/mrr"
+    assert format(server[0].context.trace_id, "032x") == TRACEPARENT.split("-")[1]
+    assert format(server[0].parent.span_id, "016x") == TRACEPARENT.split("-")[2]
+
+
+def test_provisioning_span_continues_webhook_trace(db, spans):
+    # Event & task lama di database tidak ikut diproses
+    db.execute(update(WebhookEvent).where(WebhookEvent.processed.is_(False)).values(processed=True))
+    db.execute(
+        update(ProvisioningTask)
+        .where(ProvisioningTask.status == ProvisioningStatus.PENDING)
+        .values(status=ProvisioningStatus.FAILED)
+    )
+    item_id = db.scalars(select(SubscriptionItem.id).limit(1)).one()
+    event = WebhookEvent(source="XENDIT", event_type="PAYMENT_SUCCEEDED", raw_payload_json={}, traceparent=TRACEPARENT)
+    db.add(event)
+    db.flush()
+
+    def handler(db, event):
+        create_task(db, item_id, ProvisioningAction.ACTIVATE, ProvisioningTargetSystem.GWORKSPACE)
+
+    spans.clear()
+    assert process_events(db, handler, commit=False) == 1
+    result = execute_pending(db, {ProvisioningTargetSystem.GWORKSPACE: lambda task: "ok"}, commit=False)
+    assert result.succeeded == 1
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    processing, execution = finished["webhook.process"], finished["provisioning.execute"]
+    trace_id = int(TRACEPARENT.split("-")[1], 16)
+    assert processing.context.trace_id == execution.context.trace_id == trace_id
+    assert processing.parent.span_id == int(TRACEPARENT.split("-")[2], 16)
+    assert execution.parent.span_id == processing.context.span_id